@@ -1,14 +1,97 @@
-import torch
-from transformers import GPT2LMHeadModel, GPT2Tokenizer
+import os
+import asyncio
+import threading
 import logging
+from ai_models.registry import default_registry, lazy_import
+from ai_models.tokenization import EncodingCache
+from ai_models.cpu_optimization import configure_threads, quantize_dynamic_int8, model_size_mb
+from ai_models.result_cache import make_key, weights_fingerprint
+from tools.metrics import metrics
 
-# Initialize logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Heavy dependencies are imported on first use
+torch = lazy_import('torch')
+
+logger = logging.getLogger(__name__)
+
+# File name of the pickled module written by save_optimized
+OPTIMIZED_MODEL_FILE = 'chat_model.optimized.pt'
 
 class ChatModelError(Exception):
     """Custom exception for chat model errors."""
     pass
 
+def _sample_next_token(logits, temperature=0.7, top_k=50, top_p=0.95):
+    """
+    Sample the next token ids from a batch of logits with temperature, top-k and top-p filtering.
+    
+    Args:
+        logits (torch.Tensor): Next-token logits of shape (batch, vocab_size).
+        temperature (float): Sampling temperature.
+        top_k (int): Keep only the K most likely tokens (0 disables the filter).
+        top_p (float): Keep the smallest set of tokens whose cumulative probability exceeds top_p.
+    
+    Returns:
+        torch.Tensor: The sampled token ids of shape (batch,).
+    """
+    logits = logits / temperature
+    if top_k:
+        kth_best = torch.topk(logits, min(top_k, logits.size(-1))).values[..., -1, None]
+        logits = logits.masked_fill(logits < kth_best, float('-inf'))
+    if top_p < 1.0:
+        sorted_logits, sorted_indices = torch.sort(logits, descending=True)
+        cumulative = torch.softmax(sorted_logits, dim=-1).cumsum(dim=-1)
+        # Drop tokens once the cumulative probability exceeds top_p, always keeping the best one
+        remove = cumulative > top_p
+        remove[..., 1:] = remove[..., :-1].clone()
+        remove[..., 0] = False
+        logits = logits.masked_fill(remove.scatter(-1, sorted_indices, remove), float('-inf'))
+    return torch.multinomial(torch.softmax(logits, dim=-1), num_samples=1).squeeze(-1)
+
+def _stream_text(tokenizer, token_ids, stop_event=None):
+    """
+    Decode a stream of token ids into text increments as they arrive.
+    
+    Byte-level BPE can split a multi-byte character across several tokens, so text is only
+    emitted once the pending tokens decode without a trailing replacement character. Only a
+    short window of recent tokens is re-decoded at each step.
+    
+    Args:
+        tokenizer: The tokenizer used to decode token ids.
+        token_ids (iterator of int): The generated token ids.
+        stop_event (threading.Event): Optional event that stops decoding when set.
+    
+    Yields:
+        str: The newly decoded text.
+    """
+    tokens = []
+    prefix_offset = read_offset = 0
+    started = False
+    while stop_event is None or not stop_event.is_set():
+        token_id = next(token_ids, None)
+        finished = token_id is None
+        if finished:
+            # Flush whatever is still pending once generation ends
+            if read_offset == len(tokens):
+                break
+        else:
+            tokens.append(token_id)
+
+        prefix_text = tokenizer.decode(tokens[prefix_offset:read_offset], skip_special_tokens=True)
+        new_text = tokenizer.decode(tokens[prefix_offset:], skip_special_tokens=True)
+        if not finished and (len(new_text) <= len(prefix_text) or new_text.endswith('\ufffd')):
+            continue
+        prefix_offset, read_offset = read_offset, len(tokens)
+
+        chunk = new_text[len(prefix_text):]
+        if not started:
+            # Match generate_response, which strips leading whitespace from the response
+            chunk = chunk.lstrip()
+            started = bool(chunk)
+        if chunk:
+            yield chunk
+        if finished:
+            break
+
 class ChatModel:
     """
     A Chatbot model based on GPT-2 for generating conversational responses.
@@ -17,31 +100,56 @@ class ChatModel:
     and dynamically generating responses based on input queries.
     """
 
-    def __init__(self, model_name='gpt2', max_length=512, device=None):
+    def __init__(self, model_name='gpt2', max_length=512, device=None, use_fast_tokenizer=True, cache_size=0,
+                 dtype=None, registry=None, result_cache=None):
         """
         Initialize the chat model.
         
+        Models and tokenizers come from a process-wide registry, so instances created with the
+        same settings share one copy of the weights instead of reloading them from disk.
+        
         Args:
             model_name (str): Pre-trained model name or path.
             max_length (int): Maximum length of responses.
             device (str): Device to run the model on ('cpu' or 'cuda').
+            use_fast_tokenizer (bool): Use the Rust-backed fast tokenizer when available.
+            cache_size (int): Number of encoded conversation segments to keep in an LRU cache (0 disables it).
+            dtype (str): Optional parameter dtype, e.g. 'float16' (defaults to the checkpoint's).
+            registry (ModelRegistry): Registry to load through (defaults to the process-wide one).
+            result_cache (ResultCache): Optional cache of generate_response results. It is only
+                consulted while decoding is deterministic (``do_sample`` is False).
         """
         self.device = device if device else ('cuda' if torch.cuda.is_available() else 'cpu')
         self.model_name = model_name
         self.max_length = max_length
+        self.do_sample = True
+        self.temperature = 0.7
+        self.top_k = 50
+        self.top_p = 0.95
+        self.use_fast_tokenizer = use_fast_tokenizer
+        self.encoding_cache = EncodingCache(cache_size) if cache_size else None
+        self.dtype = dtype
+        self.registry = registry or default_registry
+        self.result_cache = result_cache
+        # Fingerprint of the loaded weights, computed on first cache use
+        self._weights_hash = None
 
         # Load pre-trained model and tokenizer
         try:
-            self.tokenizer = GPT2Tokenizer.from_pretrained(self.model_name)
-            self.model = GPT2LMHeadModel.from_pretrained(self.model_name).to(self.device)
-            logging.info(f"Model '{self.model_name}' loaded successfully on {self.device}.")
+            self.tokenizer = self._load_tokenizer(self.model_name)
+            self.model = self._load_lm(self.model_name)
+            logger.info(f"Model '{self.model_name}' loaded successfully on {self.device}.")
         except Exception as e:
             raise ChatModelError(f"Failed to load model: {e}")
 
+    @metrics.timed('chat_response_seconds')
     def generate_response(self, conversation_history, user_input, max_length=None):
         """
         Generate a response based on the conversation history and user input.
         
+        With a result cache and greedy decoding (``do_sample`` False), repeated prompts are
+        answered from the cache; sampled responses are never cached.
+        
         Args:
             conversation_history (str): The conversation context as a string.
             user_input (str): The new user input.
@@ -53,28 +161,170 @@ class ChatModel:
         Raises:
             ChatModelError: If the response generation fails.
         """
+        metrics.increment('chat_requests_total')
         try:
             # Prepare input for the model by appending user input to conversation history
             input_text = f"{conversation_history} {self.tokenizer.eos_token} {user_input} {self.tokenizer.eos_token}"
-            input_ids = self.tokenizer.encode(input_text, return_tensors='pt').to(self.device)
+            max_length = max_length or self.max_length
+            if self.result_cache is None or self.do_sample:
+                return self._generate_text(input_text, max_length)
+
+            if self._weights_hash is None:
+                self._weights_hash = weights_fingerprint(self.model)
+            # GPT-2's byte-level tokenizer is whitespace sensitive, so the prompt is keyed verbatim
+            key = make_key(self.model_name, self._weights_hash, input_text,
+                           {'task': 'generate', 'max_length': max_length, 'do_sample': False})
+            return self.result_cache.get_or_compute(key, lambda: self._generate_text(input_text, max_length))
 
-            # Generate response
+        except Exception as e:
+            raise ChatModelError(f"Response generation failed: {e}")
+
+    def _generate_text(self, input_text, max_length):
+        """
+        Private helper that runs generate on a prompt and decodes the new tokens.
+        
+        Args:
+            input_text (str): The full prompt.
+            max_length (int): Maximum length of prompt plus response, in tokens.
+        
+        Returns:
+            str: The generated response.
+        """
+        input_ids = torch.tensor([self._encode(input_text)], device=self.device)
+
+        # Generate response; the sampling parameters only apply when sampling
+        sampling = {'top_k': self.top_k, 'top_p': self.top_p, 'temperature': self.temperature} if self.do_sample else {}
+        with metrics.timer('chat_forward_seconds'):
             response_ids = self.model.generate(
                 input_ids,
-                max_length=max_length or self.max_length,
+                max_length=max_length,
                 pad_token_id=self.tokenizer.eos_token_id,
-                do_sample=True,
-                top_k=50,
-                top_p=0.95,
-                temperature=0.7
+                do_sample=self.do_sample,
+                **sampling
             )
+        metrics.increment('chat_tokens_total', response_ids.shape[-1] - input_ids.shape[-1])
 
-            # Decode the response and return it
+        # Decode the response and return it
+        with metrics.timer('chat_decode_seconds'):
             response_text = self.tokenizer.decode(response_ids[:, input_ids.shape[-1]:][0], skip_special_tokens=True)
-            return response_text.strip()
+        return response_text.strip()
 
-        except Exception as e:
-            raise ChatModelError(f"Response generation failed: {e}")
+    def stream_response(self, conversation_history, user_input, max_new_tokens=None, stop_event=None):
+        """
+        Generate a response incrementally, yielding decoded text as tokens are sampled.
+        
+        Generation stops at the EOS token, after ``max_new_tokens`` tokens, when ``stop_event``
+        is set, or when the caller closes the generator.
+        
+        Args:
+            conversation_history (str): The conversation context as a string.
+            user_input (str): The new user input.
+            max_new_tokens (int): Maximum number of tokens to generate (defaults to max_length).
+            stop_event (threading.Event): Optional event that cancels generation when set.
+        
+        Yields:
+            str: Newly decoded pieces of the response.
+        
+        Raises:
+            ChatModelError: If the response generation fails.
+        """
+        session = self.start_session(conversation_history)
+        yield from session.stream(user_input, max_new_tokens, stop_event)
+
+    async def astream_response(self, conversation_history, user_input, max_new_tokens=None):
+        """
+        Asynchronously generate a response, yielding decoded text as tokens are sampled.
+        
+        Decoding runs in a worker thread so the event loop is never blocked. Cancelling the
+        consuming task or closing the async generator stops generation after the current token.
+        
+        Args:
+            conversation_history (str): The conversation context as a string.
+            user_input (str): The new user input.
+            max_new_tokens (int): Maximum number of tokens to generate (defaults to max_length).
+        
+        Yields:
+            str: Newly decoded pieces of the response.
+        
+        Raises:
+            ChatModelError: If the response generation fails.
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        stop_event = threading.Event()
+        finished = object()
+
+        def produce():
+            try:
+                for chunk in self.stream_response(conversation_history, user_input, max_new_tokens, stop_event):
+                    loop.call_soon_threadsafe(queue.put_nowait, chunk)
+            except ChatModelError as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            except Exception as e:
+                # Anything else would otherwise end the stream as if the response were complete
+                loop.call_soon_threadsafe(queue.put_nowait, ChatModelError(f"Response generation failed: {e}"))
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, finished)
+
+        producer = loop.run_in_executor(None, produce)
+        try:
+            while True:
+                item = await queue.get()
+                if item is finished:
+                    break
+                if isinstance(item, ChatModelError):
+                    raise item
+                yield item
+        finally:
+            stop_event.set()
+            await asyncio.wait([producer])
+
+    def start_session(self, conversation_history="", **kwargs):
+        """
+        Start a multi-turn conversation that reuses the KV cache between turns.
+        
+        Args:
+            conversation_history (str): Optional conversation context to seed the session with.
+            **kwargs: Extra arguments forwarded to ChatSession.
+        
+        Returns:
+            ChatSession: The new conversation session.
+        """
+        return ChatSession(self, conversation_history, **kwargs)
+
+    @metrics.timed('chat_tokenize_seconds')
+    def _encode(self, text):
+        """
+        Private helper that tokenizes conversation text, consulting the encoding cache when enabled.
+        
+        The text is split on the EOS marker that separates turns. The tokenizer never merges
+        across a special token, so each turn can be encoded (and cached) on its own and a
+        growing conversation only pays for the turns it has not seen before.
+        
+        Args:
+            text (str): The conversation text to encode.
+        
+        Returns:
+            list: The token ids.
+        """
+        if self.encoding_cache is None:
+            return self.tokenizer.encode(text)
+
+        ids = []
+        for i, segment in enumerate(text.split(self.tokenizer.eos_token)):
+            if i:
+                ids.append(self.tokenizer.eos_token_id)
+            ids.extend(self.encoding_cache.get_or_encode(segment, self.tokenizer.encode))
+        return ids
+
+    def cache_stats(self):
+        """
+        Report encoding cache usage.
+        
+        Returns:
+            dict: Cache hits, misses, hit ratio and size, or None if caching is disabled.
+        """
+        return self.encoding_cache.stats() if self.encoding_cache else None
 
     def clear_conversation(self):
         """
@@ -82,7 +332,7 @@ class ChatModel:
         """
         return self.tokenizer.eos_token
 
-    def adjust_parameters(self, max_length=None, temperature=None, top_k=None, top_p=None):
+    def adjust_parameters(self, max_length=None, temperature=None, top_k=None, top_p=None, do_sample=None):
         """
         Adjust parameters for response generation.
         
@@ -91,21 +341,99 @@ class ChatModel:
             temperature (float): Sampling temperature.
             top_k (int): Top-K sampling.
             top_p (float): Top-p (nucleus) sampling.
+            do_sample (bool): Sample responses (True) or decode greedily (False). Only greedy
+                responses can be served from the result cache.
         
         Returns:
             dict: Updated parameters.
         """
         if max_length:
             self.max_length = max_length
+        if do_sample is not None:
+            self.do_sample = do_sample
+        self.temperature = temperature or 0.7
+        self.top_k = top_k or 50
+        self.top_p = top_p or 0.95
         parameters = {
             'max_length': self.max_length,
-            'temperature': temperature or 0.7,
-            'top_k': top_k or 50,
-            'top_p': top_p or 0.95
+            'do_sample': self.do_sample,
+            'temperature': self.temperature,
+            'top_k': self.top_k,
+            'top_p': self.top_p
         }
-        logging.info(f"Parameters adjusted: {parameters}")
+        logger.info(f"Parameters adjusted: {parameters}")
         return parameters
 
+    def optimize_for_cpu(self, quantize=True, num_threads=None):
+        """
+        Switch the model to an optimized CPU serving mode.
+        
+        GPT-2's Conv1D projections are converted to Linear layers and dynamically quantized
+        to int8, and PyTorch's thread pool is sized to the CPUs available to this process.
+        
+        Args:
+            quantize (bool): Apply dynamic int8 quantization to Linear layers.
+            num_threads (int): Intra-op thread count (defaults to the available CPUs).
+        
+        Raises:
+            ChatModelError: If the model is not on the CPU or optimization fails.
+        """
+        if self.device != 'cpu':
+            raise ChatModelError("CPU optimization requires the model to run on 'cpu'.")
+        try:
+            threads = configure_threads(num_threads)
+            size_before = model_size_mb(self.model)
+            if quantize:
+                self.model = quantize_dynamic_int8(self.model)
+                self._weights_hash = None
+            logger.info(
+                f"Model optimized for CPU with {threads} threads "
+                f"({size_before:.1f} MB -> {model_size_mb(self.model):.1f} MB)."
+            )
+        except Exception as e:
+            raise ChatModelError(f"Failed to optimize model for CPU: {e}")
+
+    def save_optimized(self, path):
+        """
+        Save the current (optionally quantized) model module alongside the tokenizer.
+        
+        Generation needs the full Hugging Face module rather than a traced graph, so the
+        quantized module is pickled as a whole and can be reloaded without re-quantizing.
+        
+        Args:
+            path (str): The directory path where the model will be saved.
+        
+        Raises:
+            ChatModelError: If the save operation fails.
+        """
+        try:
+            os.makedirs(path, exist_ok=True)
+            torch.save(self.model, os.path.join(path, OPTIMIZED_MODEL_FILE))
+            self.tokenizer.save_pretrained(path)
+            logger.info(f"Optimized model saved successfully to {path}.")
+        except Exception as e:
+            raise ChatModelError(f"Failed to save optimized model: {e}")
+
+    def load_optimized(self, path):
+        """
+        Load a model saved by save_optimized.
+        
+        Args:
+            path (str): The directory path from where the model will be loaded.
+        
+        Raises:
+            ChatModelError: If the model cannot be loaded.
+        """
+        try:
+            self.tokenizer = self._load_tokenizer(path, refresh=True)
+            self.model = torch.load(os.path.join(path, OPTIMIZED_MODEL_FILE), map_location=self.device, weights_only=False)
+            self._weights_hash = None
+            if self.encoding_cache:
+                self.encoding_cache.clear()
+            logger.info(f"Optimized model loaded successfully from {path}.")
+        except Exception as e:
+            raise ChatModelError(f"Failed to load optimized model: {e}")
+
     def save_model(self, path):
         """
         Save the model weights and tokenizer to a given path.
@@ -119,7 +447,7 @@ class ChatModel:
         try:
             self.model.save_pretrained(path)
             self.tokenizer.save_pretrained(path)
-            logging.info(f"Model saved successfully to {path}.")
+            logger.info(f"Model saved successfully to {path}.")
         except Exception as e:
             raise ChatModelError(f"Failed to save model: {e}")
 
@@ -134,13 +462,184 @@ class ChatModel:
             ChatModelError: If the model load operation fails.
         """
         try:
-            self.tokenizer = GPT2Tokenizer.from_pretrained(path)
-            self.model = GPT2LMHeadModel.from_pretrained(path).to(self.device)
-            logging.info(f"Model loaded successfully from {path}.")
+            self.tokenizer = self._load_tokenizer(path, refresh=True)
+            if self.encoding_cache:
+                self.encoding_cache.clear()
+            self.model = self._load_lm(path, refresh=True)
+            self._weights_hash = None
+            logger.info(f"Model loaded successfully from {path}.")
         except Exception as e:
             raise ChatModelError(f"Failed to load model: {e}")
 
+    def _load_tokenizer(self, name_or_path, refresh=False):
+        """
+        Private helper that fetches the GPT-2 tokenizer from the model registry.
+        """
+        return self.registry.get_tokenizer(
+            'GPT2TokenizerFast', 'GPT2Tokenizer', name_or_path, self.use_fast_tokenizer, refresh=refresh
+        )
+
+    def _load_lm(self, name_or_path, refresh=False):
+        """
+        Private helper that fetches the GPT-2 language model from the model registry.
+        """
+        return self.registry.get_model('GPT2LMHeadModel', name_or_path, self.device, self.dtype, refresh=refresh)
+
+class ChatSession:
+    """
+    A multi-turn conversation with a ChatModel that keeps its token ids and KV cache between turns.
+    
+    Each turn only feeds the new user tokens through the model instead of re-encoding and
+    re-running the whole conversation. When the context would exceed the model's position
+    limit, the oldest tokens are dropped down to ``keep_ratio`` of the window (aligned to a
+    turn boundary when possible) and the cache is rebuilt once, so the cost of rebuilding is
+    amortized over many turns and per-turn latency stays roughly flat.
+    """
+
+    def __init__(self, chat_model, conversation_history="", max_context=None, keep_ratio=0.5):
+        """
+        Initialize the chat session.
+        
+        Args:
+            chat_model (ChatModel): The model used to generate responses.
+            conversation_history (str): Optional conversation context to seed the session with.
+            max_context (int): Maximum number of tokens kept in context (defaults to the model's position limit).
+            keep_ratio (float): Fraction of the context window kept when older tokens are dropped.
+        
+        Raises:
+            ChatModelError: If the conversation history cannot be encoded.
+        """
+        self.chat_model = chat_model
+        self.max_context = max_context or getattr(chat_model.model.config, 'n_positions', 1024)
+        self.keep_ratio = keep_ratio
+        try:
+            self.token_ids = chat_model._encode(conversation_history) if conversation_history else []
+        except Exception as e:
+            raise ChatModelError(f"Failed to encode the conversation history: {e}")
+        self.past_key_values = None
+        self.cached_length = 0
+
+    def send(self, user_input, max_new_tokens=None):
+        """
+        Add a user turn to the conversation and generate the model's response.
+        
+        Args:
+            user_input (str): The new user input.
+            max_new_tokens (int): Maximum number of tokens to generate (defaults to the
+                model's max_length, capped at half the context window).
+        
+        Returns:
+            str: The generated response.
+        
+        Raises:
+            ChatModelError: If the response generation fails.
+        """
+        try:
+            response_ids = list(self._generate(user_input, max_new_tokens))
+            with metrics.timer('chat_decode_seconds'):
+                return self.chat_model.tokenizer.decode(response_ids, skip_special_tokens=True).strip()
+        except ChatModelError:
+            raise
+        except Exception as e:
+            raise ChatModelError(f"Response generation failed: {e}")
+
+    def stream(self, user_input, max_new_tokens=None, stop_event=None):
+        """
+        Add a user turn to the conversation and yield the response text as tokens are sampled.
+        
+        Args:
+            user_input (str): The new user input.
+            max_new_tokens (int): Maximum number of tokens to generate.
+            stop_event (threading.Event): Optional event that cancels generation when set.
+        
+        Yields:
+            str: Newly decoded pieces of the response.
+        
+        Raises:
+            ChatModelError: If the response generation fails.
+        """
+        tokens = self._generate(user_input, max_new_tokens)
+        try:
+            yield from _stream_text(self.chat_model.tokenizer, tokens, stop_event)
+        except Exception as e:
+            raise ChatModelError(f"Response generation failed: {e}")
+        finally:
+            tokens.close()
+
+    def reset(self):
+        """
+        Clear the conversation and its KV cache.
+        """
+        self.token_ids = []
+        self.past_key_values = None
+        self.cached_length = 0
+
+    def _generate(self, user_input, max_new_tokens=None):
+        """
+        Private generator that appends a user turn and yields response token ids as they are sampled.
+        
+        Args:
+            user_input (str): The new user input.
+            max_new_tokens (int): Maximum number of tokens to generate.
+        
+        Yields:
+            int: The sampled token ids, excluding the terminating EOS token.
+        """
+        model = self.chat_model
+        eos_token_id = model.tokenizer.eos_token_id
+        max_new_tokens = min(max_new_tokens or model.max_length, self.max_context // 2)
+
+        self.token_ids.extend(model._encode(f" {model.tokenizer.eos_token} {user_input} {model.tokenizer.eos_token}"))
+        self._truncate(self.max_context - max_new_tokens)
+
+        with torch.inference_mode():
+            for _ in range(max_new_tokens):
+                # Feed every token that is not covered by the cache yet
+                pending = torch.tensor([self.token_ids[self.cached_length:]], device=model.device)
+                with metrics.timer('chat_forward_seconds'):
+                    outputs = model.model(pending, past_key_values=self.past_key_values, use_cache=True)
+                self.past_key_values = outputs.past_key_values
+                self.cached_length = len(self.token_ids)
+
+                logits = outputs.logits[:, -1, :]
+                if model.do_sample:
+                    next_token = _sample_next_token(logits, model.temperature, model.top_k, model.top_p).item()
+                else:
+                    next_token = logits.argmax(dim=-1).item()
+                if next_token == eos_token_id:
+                    break
+                self.token_ids.append(next_token)
+                metrics.increment('chat_tokens_total')
+                yield next_token
+
+    def _truncate(self, limit):
+        """
+        Private helper that drops the oldest tokens once the context exceeds ``limit``.
+        
+        GPT-2 uses absolute position embeddings, so the cached keys and values cannot simply be
+        shifted; the cache is discarded and rebuilt from the kept window on the next forward pass.
+        
+        Args:
+            limit (int): Maximum number of tokens allowed in context.
+        """
+        if len(self.token_ids) <= limit:
+            return
+
+        keep = max(min(int(self.max_context * self.keep_ratio), limit), 1)
+        kept = self.token_ids[-keep:]
+        eos_token_id = self.chat_model.tokenizer.eos_token_id
+        if eos_token_id in kept[:keep // 2]:
+            # Start the window at a turn boundary rather than in the middle of a turn
+            kept = kept[kept.index(eos_token_id):]
+
+        logger.info(f"Conversation context truncated from {len(self.token_ids)} to {len(kept)} tokens.")
+        self.token_ids = kept
+        self.past_key_values = None
+        self.cached_length = 0
+
+
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     # Example usage
     conversation_history = "User: Hello, how are you?"
     user_input = "What's the weather like today?"
@@ -150,4 +649,4 @@ if __name__ == "__main__":
         response = chat_model.generate_response(conversation_history, user_input)
         print(f"Chatbot: {response}")
     except ChatModelError as e:
-        logging.error(f"ChatModel error: {e}")
+        logger.error(f"ChatModel error: {e}")
@@ -0,0 +1,367 @@
+import asyncio
+import queue
+import threading
+import logging
+from concurrent.futures import Future
+
+from ai_models.chat_model import ChatModelError, _sample_next_token
+from ai_models.registry import lazy_import
+
+# Heavy dependencies are imported on first use
+torch = lazy_import('torch')
+
+logger = logging.getLogger(__name__)
+
+
+def _cache_to_layers(past_key_values):
+    """
+    Convert a model's KV cache into a list of (key, value) tensors per layer.
+
+    Handles both legacy tuple caches and DynamicCache objects from newer transformers releases.
+    """
+    if hasattr(past_key_values, 'layers'):
+        return [(layer.keys, layer.values) for layer in past_key_values.layers]
+    if hasattr(past_key_values, 'to_legacy_cache'):
+        return [tuple(layer[:2]) for layer in past_key_values.to_legacy_cache()]
+    return [tuple(layer[:2]) for layer in past_key_values]
+
+
+def _layers_to_cache(layers):
+    """
+    Convert a list of (key, value) tensors per layer into a cache the model accepts.
+    """
+    try:
+        from transformers import DynamicCache
+    except ImportError:
+        return tuple(layers)
+    if hasattr(DynamicCache, 'from_legacy_cache'):
+        return DynamicCache.from_legacy_cache(tuple(layers))
+    return DynamicCache(layers)
+
+
+def _left_pad(tensor, length, dim):
+    """
+    Left-pad a tensor with zeros along ``dim`` up to ``length``.
+    """
+    missing = length - tensor.size(dim)
+    if missing <= 0:
+        return tensor
+    shape = list(tensor.shape)
+    shape[dim] = missing
+    return torch.cat([tensor.new_zeros(shape), tensor], dim=dim)
+
+
+class _GenerationRequest:
+    """
+    A queued generation request and its per-sequence decoding state.
+    """
+
+    __slots__ = ('prompt_ids', 'max_new_tokens', 'future', 'generated')
+
+    def __init__(self, prompt_ids, max_new_tokens, future):
+        self.prompt_ids = prompt_ids
+        self.max_new_tokens = max_new_tokens
+        self.future = future
+        self.generated = []
+
+
+class ChatBatchScheduler:
+    """
+    A continuous-batching scheduler that serves many concurrent chat requests from one ChatModel.
+
+    Requests are queued from any thread or event loop and decoded together in shared forward
+    passes by a single background worker. Prompts are left-padded so every sequence ends at the
+    last column, each sequence has its own position ids and stop conditions, and sequences join
+    the running batch or leave it between decode steps, so a long response never holds up a
+    short one. Each caller receives its response through a future.
+    """
+
+    def __init__(self, chat_model, max_batch_size=8, max_queue_size=0):
+        """
+        Initialize the scheduler.
+
+        Args:
+            chat_model (ChatModel): The model shared by all requests.
+            max_batch_size (int): Maximum number of sequences decoded together.
+            max_queue_size (int): Maximum number of waiting requests (0 means unbounded).
+        """
+        if max_batch_size < 1:
+            raise ChatModelError("max_batch_size must be a positive integer.")
+        self.chat_model = chat_model
+        self.max_batch_size = max_batch_size
+        self.max_positions = getattr(chat_model.model.config, 'n_positions', 1024)
+        self.tokens_generated = 0
+        self.requests_completed = 0
+        self._queue = queue.Queue(max_queue_size)
+        self._stopped = threading.Event()
+        self._worker = None
+        self._reset_batch()
+
+    def start(self):
+        """
+        Start the background decoding worker.
+
+        Returns:
+            ChatBatchScheduler: The scheduler itself, for chaining.
+        """
+        if self._worker is None or not self._worker.is_alive():
+            self._stopped.clear()
+            self._worker = threading.Thread(target=self._run, name="chat-batch-scheduler", daemon=True)
+            self._worker.start()
+            logger.info(f"Chat batch scheduler started with max batch size {self.max_batch_size}.")
+        return self
+
+    def stop(self):
+        """
+        Stop the background worker, failing any requests that have not completed.
+        """
+        self._stopped.set()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+        error = ChatModelError("Chat batch scheduler stopped.")
+        for request in self._active:
+            request.future.set_exception(error)
+        self._reset_batch()
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request.future.set_running_or_notify_cancel():
+                request.future.set_exception(error)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def submit(self, conversation_history, user_input, max_new_tokens=None):
+        """
+        Queue a generation request.
+
+        Args:
+            conversation_history (str): The conversation context as a string.
+            user_input (str): The new user input.
+            max_new_tokens (int): Maximum number of tokens to generate (defaults to the model's max_length).
+
+        Returns:
+            concurrent.futures.Future: Resolves to the generated response text.
+
+        Raises:
+            ChatModelError: If the scheduler is not running or its queue is full.
+        """
+        if self._worker is None or self._stopped.is_set():
+            raise ChatModelError("Chat batch scheduler is not running.")
+
+        eos = self.chat_model.tokenizer.eos_token
+        prompt_ids = self.chat_model._encode(f"{conversation_history} {eos} {user_input} {eos}")
+        max_new_tokens = min(max_new_tokens or self.chat_model.max_length, self.max_positions // 2)
+        # Keep the most recent context so the prompt and response fit in the position embeddings
+        prompt_ids = prompt_ids[-(self.max_positions - max_new_tokens):]
+
+        future = Future()
+        try:
+            self._queue.put_nowait(_GenerationRequest(prompt_ids, max_new_tokens, future))
+        except queue.Full:
+            raise ChatModelError("Chat batch scheduler queue is full.")
+        return future
+
+    async def generate(self, conversation_history, user_input, max_new_tokens=None):
+        """
+        Queue a generation request and await its response.
+
+        Args:
+            conversation_history (str): The conversation context as a string.
+            user_input (str): The new user input.
+            max_new_tokens (int): Maximum number of tokens to generate (defaults to the model's max_length).
+
+        Returns:
+            str: The generated response.
+
+        Raises:
+            ChatModelError: If the request cannot be queued or generation fails.
+        """
+        return await asyncio.wrap_future(self.submit(conversation_history, user_input, max_new_tokens))
+
+    def stats(self):
+        """
+        Report scheduler activity.
+
+        Returns:
+            dict: Completed requests, generated tokens, active sequences and queue depth.
+        """
+        return {
+            'requests_completed': self.requests_completed,
+            'tokens_generated': self.tokens_generated,
+            'active': len(self._active),
+            'queued': self._queue.qsize(),
+        }
+
+    def _reset_batch(self):
+        """
+        Private helper that clears the running batch state.
+        """
+        self._active = []
+        self._layers = None
+        self._attention_mask = None
+        self._positions = None
+        self._next_tokens = None
+
+    def _run(self):
+        """
+        Private worker loop: admit queued requests, run one decode step, retire finished sequences.
+        """
+        while not self._stopped.is_set():
+            admitted = self._admit()
+            if not self._active and not admitted:
+                continue
+            try:
+                with torch.inference_mode():
+                    if admitted:
+                        self._prefill(admitted)
+                    else:
+                        self._decode_step()
+                self._retire()
+            except Exception as e:
+                logger.error(f"Chat batch scheduler step failed: {e}")
+                error = ChatModelError(f"Response generation failed: {e}")
+                for request in set(self._active) | set(admitted):
+                    if not request.future.done():
+                        request.future.set_exception(error)
+                self._reset_batch()
+
+    def _admit(self):
+        """
+        Private helper that takes waiting requests from the queue while there is room in the batch.
+
+        Blocks briefly when the batch is empty so the worker does not spin.
+
+        Returns:
+            list: The newly admitted requests.
+        """
+        admitted = []
+        while len(self._active) + len(admitted) < self.max_batch_size:
+            try:
+                if self._active or admitted:
+                    request = self._queue.get_nowait()
+                else:
+                    request = self._queue.get(timeout=0.05)
+            except queue.Empty:
+                break
+            if request.future.set_running_or_notify_cancel():
+                admitted.append(request)
+        return admitted
+
+    def _prefill(self, requests):
+        """
+        Private helper that runs the prompts of newly admitted requests and merges them into the batch.
+
+        Args:
+            requests (list of _GenerationRequest): The admitted requests.
+        """
+        device = self.chat_model.device
+        length = max(len(request.prompt_ids) for request in requests)
+        input_ids = torch.zeros((len(requests), length), dtype=torch.long, device=device)
+        attention_mask = torch.zeros((len(requests), length), dtype=torch.long, device=device)
+        for row, request in enumerate(requests):
+            input_ids[row, length - len(request.prompt_ids):] = torch.tensor(request.prompt_ids, device=device)
+            attention_mask[row, length - len(request.prompt_ids):] = 1
+        position_ids = (attention_mask.cumsum(-1) - 1).clamp(min=0)
+
+        outputs = self.chat_model.model(
+            input_ids, attention_mask=attention_mask, position_ids=position_ids, use_cache=True
+        )
+        layers = _cache_to_layers(outputs.past_key_values)
+        positions = attention_mask.sum(-1)
+        next_tokens = self._sample(outputs.logits[:, -1, :])
+        for request, token in zip(requests, next_tokens.tolist()):
+            request.generated.append(token)
+
+        if self._active:
+            # Left-pad whichever side is shorter so both share the same cache length
+            total = max(attention_mask.size(1), self._attention_mask.size(1))
+            layers = [
+                (torch.cat([_left_pad(old_key, total, 2), _left_pad(key, total, 2)]),
+                 torch.cat([_left_pad(old_value, total, 2), _left_pad(value, total, 2)]))
+                for (old_key, old_value), (key, value) in zip(self._layers, layers)
+            ]
+            attention_mask = torch.cat([_left_pad(self._attention_mask, total, 1), _left_pad(attention_mask, total, 1)])
+            positions = torch.cat([self._positions, positions])
+            # Sequences already in the batch were not stepped this round, so keep their pending tokens
+            next_tokens = torch.cat([self._next_tokens, next_tokens])
+
+        self._active.extend(requests)
+        self._layers = layers
+        self._attention_mask = attention_mask
+        self._positions = positions
+        self._next_tokens = next_tokens
+
+    def _decode_step(self):
+        """
+        Private helper that feeds the pending token of every active sequence and samples the next one.
+        """
+        attention_mask = torch.cat([self._attention_mask, self._attention_mask.new_ones((len(self._active), 1))], dim=1)
+        outputs = self.chat_model.model(
+            self._next_tokens[:, None],
+            past_key_values=_layers_to_cache(self._layers),
+            attention_mask=attention_mask,
+            position_ids=self._positions[:, None],
+            use_cache=True,
+        )
+        self._layers = _cache_to_layers(outputs.past_key_values)
+        self._attention_mask = attention_mask
+        self._positions = self._positions + 1
+        self._next_tokens = self._sample(outputs.logits[:, -1, :])
+        for request, token in zip(self._active, self._next_tokens.tolist()):
+            request.generated.append(token)
+
+    def _sample(self, logits):
+        """
+        Private helper that picks one token per row: sampled with the model's sampling
+        parameters, or the most likely one when the model decodes greedily (``do_sample`` False).
+        """
+        model = self.chat_model
+        if not model.do_sample:
+            return logits.argmax(dim=-1)
+        return _sample_next_token(logits, model.temperature, model.top_k, model.top_p)
+
+    def _retire(self):
+        """
+        Private helper that resolves finished sequences and removes them from the batch.
+        """
+        eos_token_id = self.chat_model.tokenizer.eos_token_id
+        keep = []
+        for row, request in enumerate(self._active):
+            finished = (
+                request.generated[-1] == eos_token_id
+                or len(request.generated) >= request.max_new_tokens
+                or self._positions[row].item() >= self.max_positions
+            )
+            if not finished:
+                keep.append(row)
+                continue
+            tokens = [token for token in request.generated if token != eos_token_id]
+            self.tokens_generated += len(tokens)
+            self.requests_completed += 1
+            request.future.set_result(self.chat_model.tokenizer.decode(tokens, skip_special_tokens=True).strip())
+
+        if len(keep) == len(self._active):
+            return
+        if not keep:
+            self._reset_batch()
+            return
+
+        index = torch.tensor(keep, device=self._attention_mask.device)
+        self._active = [self._active[row] for row in keep]
+        self._attention_mask = self._attention_mask.index_select(0, index)
+        # Drop leading columns that are padding for every remaining sequence
+        start = int((self._attention_mask.sum(0) > 0).nonzero()[0])
+        self._attention_mask = self._attention_mask[:, start:]
+        self._layers = [
+            (key.index_select(0, index)[:, :, start:], value.index_select(0, index)[:, :, start:])
+            for key, value in self._layers
+        ]
+        self._positions = self._positions.index_select(0, index)
+        self._next_tokens = self._next_tokens.index_select(0, index)
@@ -0,0 +1,94 @@
+import os
+import copy
+import logging
+
+from ai_models.registry import lazy_import
+
+# Heavy dependencies are imported on first use
+torch = lazy_import('torch')
+
+logger = logging.getLogger(__name__)
+
+
+def configure_threads(num_threads=None, interop_threads=None):
+    """
+    Tune PyTorch's intra-op and inter-op thread pools for CPU inference.
+
+    Args:
+        num_threads (int): Intra-op threads (defaults to the number of CPUs this process may use).
+        interop_threads (int): Optional inter-op threads. PyTorch only allows setting this
+            before any parallel work has run, so later calls are ignored with a log line.
+
+    Returns:
+        int: The intra-op thread count in effect.
+    """
+    if num_threads is None:
+        num_threads = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count()
+    torch.set_num_threads(max(int(num_threads), 1))
+    if interop_threads is not None:
+        try:
+            torch.set_num_interop_threads(interop_threads)
+        except RuntimeError as e:
+            logger.info(f"Inter-op thread count left unchanged: {e}")
+    return torch.get_num_threads()
+
+
+def conv1d_to_linear(model):
+    """
+    Replace GPT-2 style Conv1D layers with equivalent nn.Linear layers, in place.
+
+    GPT-2 implements its projections as transformers' Conv1D (a transposed linear layer),
+    which dynamic quantization does not recognize. Converting them first lets the
+    attention and MLP projections be quantized as well.
+
+    Args:
+        model (torch.nn.Module): The model to convert.
+
+    Returns:
+        torch.nn.Module: The same model, for chaining.
+    """
+    for name, module in model.named_children():
+        if type(module).__name__ == 'Conv1D':
+            in_features, out_features = module.weight.shape
+            linear = torch.nn.Linear(in_features, out_features, device=module.weight.device, dtype=module.weight.dtype)
+            with torch.no_grad():
+                linear.weight.copy_(module.weight.t())
+                linear.bias.copy_(module.bias)
+            setattr(model, name, linear)
+        else:
+            conv1d_to_linear(module)
+    return model
+
+
+def quantize_dynamic_int8(model):
+    """
+    Return a copy of a model with its Linear (and GPT-2 Conv1D) layers dynamically quantized to int8.
+
+    Weights are stored as int8 and activations are quantized on the fly, which cuts
+    memory roughly 4x for the quantized layers and speeds up CPU matrix multiplies.
+
+    Args:
+        model (torch.nn.Module): The fp32 model to quantize (left unchanged).
+
+    Returns:
+        torch.nn.Module: The quantized model in eval mode.
+    """
+    from torch.ao.quantization import quantize_dynamic
+    model = conv1d_to_linear(copy.deepcopy(model).eval())
+    return quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def model_size_mb(model):
+    """
+    Estimate the in-memory size of a model's parameters and buffers in megabytes.
+
+    Dynamically quantized layers keep their packed weights outside the parameter list,
+    so their state dict is measured instead.
+    """
+    total = 0
+    for value in model.state_dict().values():
+        if isinstance(value, torch.Tensor):
+            total += value.numel() * value.element_size()
+        elif isinstance(value, tuple):
+            total += sum(t.numel() * t.element_size() for t in value if isinstance(t, torch.Tensor))
+    return total / (1024 * 1024)
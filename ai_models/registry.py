@@ -0,0 +1,195 @@
+import copy
+import importlib
+import threading
+import logging
+
+from ai_models.tokenization import load_tokenizer
+
+logger = logging.getLogger(__name__)
+
+
+class LazyModule:
+    """
+    A module proxy that defers the actual import until an attribute is first accessed.
+
+    Used for heavy dependencies such as torch and transformers so that importing the model
+    modules stays fast and processes that never run inference never pay for those imports.
+    """
+
+    def __init__(self, name):
+        """
+        Initialize the proxy.
+
+        Args:
+            name (str): Fully qualified module name to import on first use.
+        """
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attribute):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attribute)
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<LazyModule '{self._name}' ({state})>"
+
+
+def lazy_import(name):
+    """
+    Return a proxy for a module that is imported on first attribute access.
+
+    Args:
+        name (str): Fully qualified module name.
+
+    Returns:
+        LazyModule: The module proxy.
+    """
+    return LazyModule(name)
+
+
+torch = lazy_import('torch')
+transformers = lazy_import('transformers')
+
+
+class ModelRegistry:
+    """
+    A process-wide cache of loaded models and tokenizers.
+
+    Models are keyed by (name or path, model class, number of labels, device, dtype) and
+    tokenizers by (name or path, fast or slow), so every ReviewModel/ChatModel built with the
+    same settings shares one copy of the weights. Weights are loaded from safetensors when the
+    checkpoint provides them; safetensors files are read through a memory map, so several
+    worker processes loading the same checkpoint share one page-cache copy of the file.
+    Shared models must be treated as read-only; methods that transform a model (such as CPU
+    quantization) work on a copy.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty registry.
+        """
+        self._models = {}
+        self._tokenizers = {}
+        self._lock = threading.RLock()
+
+    def get_tokenizer(self, fast_class_name, slow_class_name, name_or_path, use_fast=True, refresh=False):
+        """
+        Return a cached tokenizer, loading it on first use.
+
+        Args:
+            fast_class_name (str): Name of the fast tokenizer class in transformers.
+            slow_class_name (str): Name of the fallback tokenizer class in transformers.
+            name_or_path (str): Pre-trained tokenizer name or path.
+            use_fast (bool): Whether to try the fast tokenizer first.
+            refresh (bool): Reload from disk even if a cached tokenizer exists.
+
+        Returns:
+            The tokenizer.
+        """
+        key = (name_or_path, slow_class_name, use_fast)
+        with self._lock:
+            if refresh or key not in self._tokenizers:
+                self._tokenizers[key] = load_tokenizer(
+                    getattr(transformers, fast_class_name), getattr(transformers, slow_class_name), name_or_path, use_fast
+                )
+            return self._tokenizers[key]
+
+    def get_model(self, class_name, name_or_path, device='cpu', dtype=None, num_labels=None, refresh=False):
+        """
+        Return a cached model in eval mode, loading it on first use.
+
+        Args:
+            class_name (str): Name of the model class in transformers.
+            name_or_path (str): Pre-trained model name or path.
+            device (str): Device to place the model on.
+            dtype (str or torch.dtype): Optional parameter dtype (e.g. 'float16').
+            num_labels (int): Number of labels for classification models.
+            refresh (bool): Reload from disk even if a cached model exists.
+
+        Returns:
+            torch.nn.Module: The shared model.
+        """
+        key = self._key(class_name, name_or_path, num_labels, device, dtype)
+        with self._lock:
+            if refresh or key not in self._models:
+                base = None if refresh or num_labels is None else self._find_encoder(key)
+                if base is not None:
+                    self._models[key] = self._with_new_head(base, num_labels)
+                    logger.info(f"Reused encoder of '{name_or_path}' with a new {num_labels}-label head.")
+                else:
+                    self._models[key] = self._load(class_name, name_or_path, device, dtype, num_labels)
+            return self._models[key]
+
+    def clear(self):
+        """
+        Drop every cached model and tokenizer.
+        """
+        with self._lock:
+            self._models.clear()
+            self._tokenizers.clear()
+
+    @staticmethod
+    def _key(class_name, name_or_path, num_labels, device, dtype):
+        """
+        Private helper that builds the cache key for a model.
+        """
+        return (name_or_path, class_name, num_labels, str(device), str(dtype).replace('torch.', ''))
+
+    def _find_encoder(self, key):
+        """
+        Private helper that finds a cached model differing from ``key`` only in its label count.
+        """
+        for cached_key, model in self._models.items():
+            if cached_key[:2] == key[:2] and cached_key[3:] == key[3:] and hasattr(model, 'classifier'):
+                return model
+        return None
+
+    @staticmethod
+    def _load(class_name, name_or_path, device, dtype, num_labels):
+        """
+        Private helper that loads a model from disk, preferring safetensors weights.
+        """
+        model_class = getattr(transformers, class_name)
+        # A label count that differs from the checkpoint's gets a freshly initialized head
+        kwargs = {'num_labels': num_labels, 'ignore_mismatched_sizes': True} if num_labels is not None else {}
+        try:
+            model = model_class.from_pretrained(name_or_path, use_safetensors=True, **kwargs)
+        except OSError:
+            # The checkpoint only ships pickled weights
+            model = model_class.from_pretrained(name_or_path, **kwargs)
+        if isinstance(dtype, str):
+            dtype = getattr(torch, dtype)
+        return model.to(device=device, dtype=dtype).eval()
+
+    @staticmethod
+    def _with_new_head(base, num_labels):
+        """
+        Private helper that builds a classifier sharing ``base``'s encoder with a freshly initialized head.
+
+        Args:
+            base (torch.nn.Module): A cached sequence-classification model.
+            num_labels (int): Number of labels for the new head.
+
+        Returns:
+            torch.nn.Module: The new model; only its classifier layer is new.
+        """
+        model = copy.copy(base)
+        model._modules = base._modules.copy()
+        model._parameters = base._parameters.copy()
+        model._buffers = base._buffers.copy()
+        model.config = copy.deepcopy(base.config)
+        model.config.num_labels = num_labels
+        model.num_labels = num_labels
+
+        classifier = base.classifier
+        model.classifier = torch.nn.Linear(classifier.in_features, num_labels).to(
+            device=classifier.weight.device, dtype=classifier.weight.dtype
+        )
+        model._init_weights(model.classifier)
+        return model
+
+
+# Process-wide registry shared by every model instance unless one is passed explicitly
+default_registry = ModelRegistry()
@@ -0,0 +1,289 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+
+from ai_models.registry import lazy_import
+from tools.metrics import metrics
+
+# Heavy dependencies are imported on first use
+torch = lazy_import('torch')
+
+logger = logging.getLogger(__name__)
+
+# Inserts between two eviction passes over the persistent tier
+EVICTION_INTERVAL = 256
+
+
+def make_key(model_name, weights_hash, inputs, params=None):
+    """
+    Build a content-addressed cache key for one inference call.
+
+    Args:
+        model_name (str): Model name or path.
+        weights_hash (str): Fingerprint of the weights actually loaded (see weights_fingerprint).
+        inputs: The (already normalized) model input; any JSON-serializable value.
+        params (dict): Settings that change the output, e.g. generation parameters.
+
+    Returns:
+        str: A hex digest identifying the call.
+    """
+    payload = json.dumps([model_name, weights_hash, inputs, params or {}], sort_keys=True, separators=(',', ':'))
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=20).hexdigest()
+
+
+def weights_fingerprint(model):
+    """
+    Hash a model's parameters and buffers, so cached results never outlive the weights that produced them.
+
+    Quantized tensors are hashed through their integer representation; entries of a state
+    dict that are not tensors (such as packed parameters of quantized layers) are hashed
+    through the tensors they contain.
+
+    Args:
+        model (torch.nn.Module or torch.jit.ScriptModule): The model.
+
+    Returns:
+        str: A hex digest of the class name and every tensor's name, dtype, shape and bytes.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(type(model).__name__.encode('utf-8'))
+
+    def update(name, value):
+        if isinstance(value, torch.Tensor):
+            tensor = value.detach().cpu()
+            if tensor.is_quantized:
+                tensor = tensor.int_repr()
+            digest.update(f"{name}:{tensor.dtype}:{tuple(tensor.shape)}".encode('utf-8'))
+            digest.update(tensor.contiguous().reshape(-1).view(torch.uint8).numpy().tobytes())
+        elif isinstance(value, (tuple, list)):
+            for index, item in enumerate(value):
+                update(f"{name}.{index}", item)
+        else:
+            digest.update(f"{name}:{value!r}".encode('utf-8'))
+
+    with torch.no_grad():
+        for name, value in model.state_dict().items():
+            update(name, value)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    A two-tier cache of inference results: an in-memory LRU in front of an optional SQLite file.
+
+    Keys come from make_key. Values must be JSON-serializable. Each entry records how long
+    the result took to compute, so the cache can report the latency it saved. Entries expire
+    after ``ttl`` seconds in both tiers; the persistent tier is also bounded to
+    ``max_disk_entries`` rows, evicting the least recently used. The SQLite file runs in WAL
+    mode, so several processes (e.g. review_pipeline workers) can share one cache.
+    """
+
+    def __init__(self, max_size=4096, path=None, ttl=None, max_disk_entries=100000):
+        """
+        Initialize the result cache.
+
+        Args:
+            max_size (int): Maximum number of results kept in memory.
+            path (str): SQLite file for the persistent tier (None keeps results in memory only).
+            ttl (float): Seconds a result stays valid (None never expires).
+            max_disk_entries (int): Maximum number of rows in the persistent tier.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be a positive integer.")
+        self.max_size = max_size
+        self.path = path
+        self.ttl = ttl
+        self.max_disk_entries = max_disk_entries
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.seconds_saved = 0.0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._inserts = 0
+        self._connection = self._connect(path) if path else None
+
+    def get(self, key):
+        """
+        Look up a cached result.
+
+        Args:
+            key (str): A key from make_key.
+
+        Returns:
+            The cached result, or None on a miss.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, cost, expires = entry
+                if expires is None or expires > now:
+                    self._entries.move_to_end(key)
+                    self.memory_hits += 1
+                    self.seconds_saved += cost
+                    metrics.increment('result_cache_hits_total')
+                    metrics.increment('result_cache_seconds_saved_total', cost)
+                    return value
+                del self._entries[key]
+
+            if self._connection is not None:
+                row = self._connection.execute(
+                    "SELECT value, cost, expires FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and (row[2] is None or row[2] > now):
+                    self._connection.execute("UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+                    value = json.loads(row[0])
+                    self._remember(key, value, row[1], row[2])
+                    self.disk_hits += 1
+                    self.seconds_saved += row[1]
+                    metrics.increment('result_cache_hits_total')
+                    metrics.increment('result_cache_seconds_saved_total', row[1])
+                    return value
+
+            self.misses += 1
+            metrics.increment('result_cache_misses_total')
+            return None
+
+    def put(self, key, value, cost=0.0):
+        """
+        Store a result in both tiers.
+
+        Args:
+            key (str): A key from make_key.
+            value: The JSON-serializable result.
+            cost (float): Seconds it took to compute, credited to seconds_saved on each hit.
+
+        Returns:
+            The stored value.
+        """
+        now = time.time()
+        expires = now + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._remember(key, value, cost, expires)
+            if self._connection is not None:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO results (key, value, cost, expires, accessed) VALUES (?, ?, ?, ?, ?)",
+                    (key, json.dumps(value), cost, expires, now),
+                )
+                self._inserts += 1
+                if self._inserts % EVICTION_INTERVAL == 0:
+                    self._evict(now)
+        return value
+
+    def get_or_compute(self, key, compute):
+        """
+        Return a cached result, computing, timing and storing it on a miss.
+
+        Args:
+            key (str): A key from make_key.
+            compute (callable): Function of no arguments producing the result.
+
+        Returns:
+            The result.
+        """
+        value = self.get(key)
+        if value is None:
+            start = time.perf_counter()
+            value = compute()
+            self.put(key, value, time.perf_counter() - start)
+        return value
+
+    def clear(self):
+        """
+        Drop every cached result from both tiers and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            if self._connection is not None:
+                self._connection.execute("DELETE FROM results")
+            self.memory_hits = self.disk_hits = self.misses = 0
+            self.seconds_saved = 0.0
+
+    def close(self):
+        """
+        Close the persistent tier.
+        """
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def stats(self):
+        """
+        Report cache usage.
+
+        Returns:
+            dict: Hits per tier, misses, hit ratio, seconds of inference saved, and the size of each tier.
+        """
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            disk_size = None
+            if self._connection is not None:
+                disk_size = self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            return {
+                'hits': hits,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_ratio': hits / lookups if lookups else 0.0,
+                'seconds_saved': self.seconds_saved,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'disk_size': disk_size,
+            }
+
+    def _remember(self, key, value, cost, expires):
+        """
+        Private helper that stores an entry in the memory tier, evicting the least recently used if full.
+        """
+        self._entries[key] = (value, cost, expires)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _evict(self, now):
+        """
+        Private helper that drops expired rows and trims the persistent tier to max_disk_entries.
+        """
+        self._connection.execute("DELETE FROM results WHERE expires IS NOT NULL AND expires <= ?", (now,))
+        self._connection.execute(
+            "DELETE FROM results WHERE key IN "
+            "(SELECT key FROM results ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,),
+        )
+
+    @staticmethod
+    def _connect(path):
+        """
+        Private helper that opens (and if needed creates) the SQLite file.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # Autocommit; each statement is its own transaction
+        connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, cost REAL NOT NULL, expires REAL, accessed REAL NOT NULL)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+        logger.info(f"Result cache opened at {path}.")
+        return connection
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    # Example usage
+    cache = ResultCache(max_size=2)
+    key = make_key('bert-base-uncased', 'example-weights', 'great product', {'num_labels': 3})
+    print(cache.get_or_compute(key, lambda: {'label': 'positive', 'confidence': 0.98}))
+    print(cache.get_or_compute(key, lambda: {'label': 'positive', 'confidence': 0.98}))
+    print(cache.stats())
@@ -1,10 +1,31 @@
-import torch
-from transformers import BertTokenizer, BertForSequenceClassification
-import torch.nn.functional as F
+import os
+import time
+import itertools
 import logging
+from ai_models.registry import default_registry, lazy_import
+from ai_models.tokenization import EncodingCache
+from ai_models.cpu_optimization import configure_threads, quantize_dynamic_int8, model_size_mb
+from ai_models.result_cache import make_key, weights_fingerprint
+from tools.metrics import metrics
 
-# Initialize logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Heavy dependencies are imported on first use
+torch = lazy_import('torch')
+F = lazy_import('torch.nn.functional')
+np = lazy_import('numpy')
+
+logger = logging.getLogger(__name__)
+
+# Mapping from predicted class index to sentiment label
+LABEL_MAP = {0: 'negative', 1: 'neutral', 2: 'positive'}
+
+# File name of the TorchScript export written by save_optimized
+TORCHSCRIPT_FILE = 'review_model.torchscript.pt'
+
+# Ways classify_long_reviews can combine the window logits of one review
+AGGREGATIONS = ('mean', 'max', 'attention')
+
+# Ways embed_reviews can pool the encoder's token states into one vector
+POOLINGS = ('mean', 'cls')
 
 class ReviewModelError(Exception):
     """Custom exception for review model errors."""
@@ -18,31 +39,51 @@ class ReviewModel:
     complex multi-class categorization, depending on how it is fine-tuned.
     """
 
-    def __init__(self, model_name='bert-base-uncased', num_labels=3, device=None):
+    def __init__(self, model_name='bert-base-uncased', num_labels=3, device=None, use_fast_tokenizer=True, cache_size=0,
+                 dtype=None, registry=None, result_cache=None):
         """
         Initialize the review model.
         
+        Models and tokenizers come from a process-wide registry, so instances created with the
+        same settings share one copy of the weights instead of reloading them from disk.
+        
         Args:
             model_name (str): Pre-trained BERT model name or path.
             num_labels (int): The number of classification labels (default is 3 for sentiment analysis).
             device (str): Device to run the model on ('cpu' or 'cuda').
+            use_fast_tokenizer (bool): Use the Rust-backed fast tokenizer when available.
+            cache_size (int): Number of encoded reviews to keep in an LRU cache (0 disables it).
+            dtype (str): Optional parameter dtype, e.g. 'float16' (defaults to the checkpoint's).
+            registry (ModelRegistry): Registry to load through (defaults to the process-wide one).
+            result_cache (ResultCache): Optional cache of classification results. Reviews that
+                differ only in whitespace (which the BERT tokenizer ignores) share an entry.
         """
         self.device = device if device else ('cuda' if torch.cuda.is_available() else 'cpu')
         self.model_name = model_name
         self.num_labels = num_labels
+        self.use_fast_tokenizer = use_fast_tokenizer
+        self.encoding_cache = EncodingCache(cache_size) if cache_size else None
+        self.dtype = dtype
+        self.registry = registry or default_registry
+        self.result_cache = result_cache
+        # Fingerprint of the loaded weights, computed on first cache use
+        self._weights_hash = None
 
         # Load pre-trained model and tokenizer
         try:
-            self.tokenizer = BertTokenizer.from_pretrained(self.model_name)
-            self.model = BertForSequenceClassification.from_pretrained(self.model_name, num_labels=self.num_labels).to(self.device)
-            logging.info(f"Model '{self.model_name}' with {self.num_labels} labels loaded successfully on {self.device}.")
+            self.tokenizer = self._load_tokenizer(self.model_name)
+            self.model = self._load_classifier(self.model_name)
+            logger.info(f"Model '{self.model_name}' with {self.num_labels} labels loaded successfully on {self.device}.")
         except Exception as e:
             raise ReviewModelError(f"Failed to load model: {e}")
 
+    @metrics.timed('review_classify_seconds')
     def classify_review(self, review_text):
         """
         Classify the sentiment of a user review.
         
+        Reviews longer than 512 tokens are truncated; classify_long_reviews scores all of them.
+        
         Args:
             review_text (str): The review text to classify.
         
@@ -52,36 +93,477 @@ class ReviewModel:
         Raises:
             ReviewModelError: If the classification fails.
         """
+        metrics.increment('review_requests_total')
         try:
-            # Preprocess the input review
-            inputs = self.tokenizer.encode_plus(
-                review_text,
-                return_tensors="pt",
-                max_length=512,
-                padding=True,
-                truncation=True
-            )
-            input_ids = inputs['input_ids'].to(self.device)
-            attention_mask = inputs['attention_mask'].to(self.device)
+            if self.result_cache is not None:
+                key = self._result_keys([review_text])[0]
+                return dict(self.result_cache.get_or_compute(key, lambda: self._classify_one(review_text)))
+            return self._classify_one(review_text)
 
-            # Run the model
-            with torch.no_grad():
-                outputs = self.model(input_ids, attention_mask=attention_mask)
+        except Exception as e:
+            raise ReviewModelError(f"Review classification failed: {e}")
+
+    def _classify_one(self, review_text):
+        """
+        Private helper that runs the model on a single review.
+        
+        Args:
+            review_text (str): The review text to classify.
+        
+        Returns:
+            dict: A dictionary with sentiment label and probability.
+        """
+        # Preprocess the input review
+        inputs = self.tokenizer.pad({'input_ids': self._encode([review_text])}, return_tensors="pt")
+
+        # Run the model and return the result as a dictionary
+        logits = self._forward(inputs['input_ids'], inputs['attention_mask'])
+        return self._to_results(logits)[0]
+
+    def classify_reviews(self, texts, batch_size=32, sort_window=None):
+        """
+        Classify an iterable of reviews using length-bucketed, dynamically padded batches.
+        
+        Reviews are consumed lazily in windows of ``sort_window`` items. Each window is
+        sorted by token length and split into batches that are padded only to the longest
+        review in the batch, so short reviews never pay for long ones. Results are yielded
+        in the original input order, which keeps memory bounded for arbitrarily long streams.
+        
+        Args:
+            texts (iterable of str): The review texts to classify.
+            batch_size (int): Maximum number of reviews per forward pass.
+            sort_window (int): Number of reviews buffered and sorted together
+                (defaults to ``8 * batch_size``).
+        
+        Yields:
+            dict: A dictionary with sentiment label and probability for each review.
+        
+        Raises:
+            ReviewModelError: If the classification fails.
+        """
+        if batch_size < 1:
+            raise ReviewModelError("batch_size must be a positive integer.")
+        sort_window = max(sort_window or 8 * batch_size, batch_size)
+
+        texts = iter(texts)
+        while True:
+            window = list(itertools.islice(texts, sort_window))
+            if not window:
+                return
+            yield from self._classify_window(window, batch_size)
 
-            logits = outputs.logits
-            probs = F.softmax(logits, dim=1)
-            confidence, predicted_label = torch.max(probs, dim=1)
+    def classify_long_reviews(self, texts, batch_size=32, window_size=512, overlap=128, aggregation='mean',
+                              sort_window=None):
+        """
+        Classify an iterable of reviews of any length by scoring overlapping token windows.
+        
+        Each review is tokenized once, without truncation, and its token ids are cut into
+        windows of ``window_size`` tokens (special tokens included) that overlap by ``overlap``
+        tokens. The windows of all reviews in a buffered group are packed together into
+        length-bucketed batches, so short reviews and the tails of long ones share forward
+        passes. The window logits of each review are then combined:
+        
+        - 'mean': the average of the window logits.
+        - 'max': the largest logit of each label over the windows.
+        - 'attention': the window logits weighted by a softmax over the windows' negative
+          prediction entropy, so confident windows count more than ambiguous ones.
+        
+        Args:
+            texts (iterable of str): The review texts to classify.
+            batch_size (int): Maximum number of windows per forward pass.
+            window_size (int): Tokens per window, capped at the model's maximum length.
+            overlap (int): Tokens shared by consecutive windows (less than half a window).
+            aggregation (str): One of 'mean', 'max' or 'attention'.
+            sort_window (int): Number of reviews buffered and packed together
+                (defaults to ``8 * batch_size``).
+        
+        Yields:
+            dict: Sentiment label, probability and the number of windows scored, for each review.
+        
+        Raises:
+            ReviewModelError: If the arguments are invalid or the classification fails.
+        """
+        if batch_size < 1:
+            raise ReviewModelError("batch_size must be a positive integer.")
+        if aggregation not in AGGREGATIONS:
+            raise ReviewModelError(f"aggregation must be one of {', '.join(AGGREGATIONS)}.")
+        window_size = min(window_size, self._max_length())
+        # Room left for the [CLS] and [SEP] tokens
+        content = window_size - 2
+        if content < 1 or not 0 <= overlap < (content + 1) // 2:
+            raise ReviewModelError("window_size must exceed 2 and overlap must be less than half a window.")
+        sort_window = max(sort_window or 8 * batch_size, 1)
+
+        texts = iter(texts)
+        while True:
+            window = list(itertools.islice(texts, sort_window))
+            if not window:
+                return
+            yield from self._classify_long_window(window, batch_size, content, overlap, aggregation)
+
+    @metrics.timed('review_window_seconds')
+    def _classify_long_window(self, window, batch_size, content, overlap, aggregation):
+        """
+        Private helper that classifies one buffered group of reviews of any length.
+        
+        Args:
+            window (list of str): The review texts to classify.
+            batch_size (int): Maximum number of windows per forward pass.
+            content (int): Review tokens per window, excluding special tokens.
+            overlap (int): Tokens shared by consecutive windows.
+            aggregation (str): One of AGGREGATIONS.
+        
+        Returns:
+            list: Result dictionaries in the same order as ``window``.
+        """
+        metrics.increment('review_reviews_total', len(window))
+        try:
+            if self.result_cache is None:
+                return self._classify_long_batches(window, batch_size, content, overlap, aggregation)
 
-            # Return the result as a dictionary
-            label_map = {0: 'negative', 1: 'neutral', 2: 'positive'}
-            return {
-                'label': label_map[predicted_label.item()],
-                'confidence': confidence.item()
-            }
+            params = {'window': content, 'overlap': overlap, 'aggregation': aggregation}
+            keys = self._result_keys(window, params)
+            first = {}
+            for i, key in enumerate(keys):
+                first.setdefault(key, i)
+            found = {key: self.result_cache.get(key) for key in first}
+            missing = [key for key, result in found.items() if result is None]
+            if missing:
+                start = time.perf_counter()
+                fresh = self._classify_long_batches(
+                    [window[first[key]] for key in missing], batch_size, content, overlap, aggregation
+                )
+                cost = (time.perf_counter() - start) / len(missing)
+                for key, result in zip(missing, fresh):
+                    found[key] = self.result_cache.put(key, result, cost)
+            return [dict(found[key]) for key in keys]
 
         except Exception as e:
             raise ReviewModelError(f"Review classification failed: {e}")
 
+    def _classify_long_batches(self, window, batch_size, content, overlap, aggregation):
+        """
+        Private helper that scores the token windows of many reviews in packed batches and aggregates them per review.
+        
+        Args:
+            window (list of str): The review texts to classify.
+            batch_size (int): Maximum number of windows per forward pass.
+            content (int): Review tokens per window, excluding special tokens.
+            overlap (int): Tokens shared by consecutive windows.
+            aggregation (str): One of AGGREGATIONS.
+        
+        Returns:
+            list: Result dictionaries in the same order as ``window``.
+        """
+        # One entry per token window, remembering which review it came from
+        owners = []
+        chunks = []
+        cls, sep = [self.tokenizer.cls_token_id], [self.tokenizer.sep_token_id]
+        for index, ids in enumerate(self._encode_full(window)):
+            for chunk in self._split_windows(ids, content, overlap):
+                owners.append(index)
+                chunks.append(cls + chunk + sep)
+
+        order = sorted(range(len(chunks)), key=lambda i: len(chunks[i]))
+        logits = [None] * len(chunks)
+        for start in range(0, len(order), batch_size):
+            indices = order[start:start + batch_size]
+            batch = self.tokenizer.pad({'input_ids': [chunks[i] for i in indices]}, return_tensors="pt")
+            for index, row in zip(indices, self._forward(batch['input_ids'], batch['attention_mask']).float()):
+                logits[index] = row
+
+        per_review = [[] for _ in window]
+        for owner, row in zip(owners, logits):
+            per_review[owner].append(row)
+        combined = torch.stack([self._aggregate(torch.stack(rows), aggregation) for rows in per_review])
+        results = self._to_results(combined)
+        for result, rows in zip(results, per_review):
+            result['windows'] = len(rows)
+        return results
+
+    @metrics.timed('review_tokenize_seconds')
+    def _encode_full(self, texts):
+        """
+        Private helper that tokenizes whole reviews once, without special tokens or truncation.
+        
+        Args:
+            texts (list of str): The review texts to encode.
+        
+        Returns:
+            list: Token id sequences in the same order as ``texts``.
+        """
+        return self.tokenizer(texts, add_special_tokens=False, truncation=False, verbose=False)['input_ids']
+
+    @staticmethod
+    def _split_windows(ids, content, overlap):
+        """
+        Private helper that cuts token ids into windows of ``content`` tokens overlapping by ``overlap``.
+        
+        Returns:
+            list: The windows; an empty review yields one empty window.
+        """
+        step = content - overlap
+        return [ids[start:start + content] for start in range(0, max(len(ids) - overlap, 1), step)]
+
+    @staticmethod
+    def _aggregate(logits, aggregation):
+        """
+        Private helper that combines the window logits of one review into a single row.
+        
+        Args:
+            logits (torch.Tensor): Window logits of shape (windows, num_labels).
+            aggregation (str): One of AGGREGATIONS.
+        
+        Returns:
+            torch.Tensor: The combined logits of shape (num_labels,).
+        """
+        if aggregation == 'max':
+            return logits.max(dim=0).values
+        if aggregation == 'attention':
+            log_probs = F.log_softmax(logits, dim=1)
+            entropy = -(log_probs.exp() * log_probs).sum(dim=1)
+            return (F.softmax(-entropy, dim=0)[:, None] * logits).sum(dim=0)
+        return logits.mean(dim=0)
+
+    def _max_length(self):
+        """
+        Private helper that returns the longest input, in tokens, the loaded model accepts.
+        """
+        config = getattr(self.model, 'config', None)
+        # TorchScript exports carry no config; BERT checkpoints accept 512 positions
+        return min(getattr(config, 'max_position_embeddings', 512), 512)
+
+    @metrics.timed('review_window_seconds')
+    def _classify_window(self, window, batch_size):
+        """
+        Private helper that classifies one buffered window of reviews.
+        
+        Args:
+            window (list of str): The review texts to classify.
+            batch_size (int): Maximum number of reviews per forward pass.
+        
+        Returns:
+            list: Result dictionaries in the same order as ``window``.
+        """
+        metrics.increment('review_reviews_total', len(window))
+        try:
+            if self.result_cache is None:
+                return self._classify_batches(window, batch_size)
+
+            # Only distinct reviews missing from the result cache go through the model
+            keys = self._result_keys(window)
+            first = {}
+            for i, key in enumerate(keys):
+                first.setdefault(key, i)
+            found = {key: self.result_cache.get(key) for key in first}
+            missing = [key for key, result in found.items() if result is None]
+            if missing:
+                start = time.perf_counter()
+                fresh = self._classify_batches([window[first[key]] for key in missing], batch_size)
+                cost = (time.perf_counter() - start) / len(missing)
+                for key, result in zip(missing, fresh):
+                    found[key] = self.result_cache.put(key, result, cost)
+            return [dict(found[key]) for key in keys]
+
+        except Exception as e:
+            raise ReviewModelError(f"Review classification failed: {e}")
+
+    def _classify_batches(self, window, batch_size):
+        """
+        Private helper that runs the model over a window in length-bucketed batches.
+        
+        Args:
+            window (list of str): The review texts to classify.
+            batch_size (int): Maximum number of reviews per forward pass.
+        
+        Returns:
+            list: Result dictionaries in the same order as ``window``.
+        """
+        encoded = self._encode(window)
+
+        # Bucket by length so each batch is padded to a similar size
+        order = sorted(range(len(window)), key=lambda i: len(encoded[i]))
+        results = [None] * len(window)
+        for start in range(0, len(order), batch_size):
+            indices = order[start:start + batch_size]
+            batch = self.tokenizer.pad({'input_ids': [encoded[i] for i in indices]}, return_tensors="pt")
+            logits = self._forward(batch['input_ids'], batch['attention_mask'])
+            for index, result in zip(indices, self._to_results(logits)):
+                results[index] = result
+        return results
+
+    def embed_reviews(self, texts, batch_size=32, pooling='mean', normalize=True, dtype='float32', path=None):
+        """
+        Compute one pooled encoder embedding per review.
+        
+        Reviews are tokenized like classify_reviews (truncated to 512 tokens, through the
+        encoding cache when enabled), sorted by length into dynamically padded batches, and run
+        through the BERT encoder only. Each batch is written straight into its rows of one
+        contiguous matrix, which can be a memory-mapped .npy file so collections larger than
+        memory can be embedded and later opened with ``numpy.load(path, mmap_mode='r')``.
+        
+        Args:
+            texts (list of str): The review texts to embed.
+            batch_size (int): Maximum number of reviews per forward pass.
+            pooling (str): 'mean' averages the token states under the attention mask;
+                'cls' takes the state of the [CLS] token.
+            normalize (bool): Scale each embedding to unit length, so dot products are cosine similarities.
+            dtype (str): NumPy dtype of the matrix, e.g. 'float32' or 'float16'.
+            path (str): Optional .npy file to write the matrix to as a memory map.
+        
+        Returns:
+            numpy.ndarray: A (len(texts), hidden_size) matrix (a numpy.memmap when ``path`` is given).
+        
+        Raises:
+            ReviewModelError: If the arguments are invalid, the model has no accessible encoder
+                (e.g. a TorchScript export), or the embedding fails.
+        """
+        if batch_size < 1:
+            raise ReviewModelError("batch_size must be a positive integer.")
+        if pooling not in POOLINGS:
+            raise ReviewModelError(f"pooling must be one of {', '.join(POOLINGS)}.")
+        encoder = getattr(self.model, 'base_model', None)
+        if encoder is None or encoder is self.model:
+            raise ReviewModelError("Embeddings need a Hugging Face model; TorchScript exports only expose logits.")
+
+        try:
+            texts = list(texts)
+            shape = (len(texts), encoder.config.hidden_size)
+            if path:
+                embeddings = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+            else:
+                embeddings = np.empty(shape, dtype=dtype)
+
+            encoded = self._encode(texts)
+            order = sorted(range(len(texts)), key=lambda i: len(encoded[i]))
+            for start in range(0, len(order), batch_size):
+                indices = order[start:start + batch_size]
+                batch = self.tokenizer.pad({'input_ids': [encoded[i] for i in indices]}, return_tensors="pt")
+                pooled = self._embed(encoder, batch['input_ids'], batch['attention_mask'], pooling)
+                if normalize:
+                    pooled = F.normalize(pooled, dim=1)
+                embeddings[indices] = pooled.numpy()
+
+            if path:
+                embeddings.flush()
+                logger.info(f"Wrote {len(texts)} review embeddings to {path}.")
+            return embeddings
+
+        except Exception as e:
+            raise ReviewModelError(f"Review embedding failed: {e}")
+
+    @metrics.timed('review_embed_seconds')
+    def _embed(self, encoder, input_ids, attention_mask, pooling):
+        """
+        Private helper that runs the encoder on one batch and pools its token states.
+        
+        Args:
+            encoder (torch.nn.Module): The model's BERT encoder.
+            input_ids (torch.Tensor): Padded token ids of shape (batch, seq_len).
+            attention_mask (torch.Tensor): Attention mask of the same shape.
+            pooling (str): One of POOLINGS.
+        
+        Returns:
+            torch.Tensor: Float32 embeddings of shape (batch, hidden_size), on the CPU.
+        """
+        attention_mask = attention_mask.to(self.device)
+        with torch.inference_mode():
+            states = encoder(input_ids.to(self.device), attention_mask=attention_mask).last_hidden_state.float()
+            if pooling == 'cls':
+                pooled = states[:, 0]
+            else:
+                mask = attention_mask[:, :, None].to(states.dtype)
+                pooled = (states * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
+        return pooled.cpu()
+
+    @metrics.timed('review_tokenize_seconds')
+    def _encode(self, texts):
+        """
+        Private helper that tokenizes reviews, consulting the encoding cache when enabled.
+        
+        Args:
+            texts (list of str): The review texts to encode.
+        
+        Returns:
+            list: Token id sequences (truncated to 512 tokens) in the same order as ``texts``.
+        """
+        if self.encoding_cache is None:
+            return self.tokenizer(texts, max_length=512, truncation=True)['input_ids']
+
+        encoded = [self.encoding_cache.get(text) for text in texts]
+        missing = [i for i, ids in enumerate(encoded) if ids is None]
+        if missing:
+            fresh = self.tokenizer([texts[i] for i in missing], max_length=512, truncation=True)['input_ids']
+            for i, ids in zip(missing, fresh):
+                encoded[i] = self.encoding_cache.put(texts[i], ids)
+        return [list(ids) for ids in encoded]
+
+    def _result_keys(self, texts, params=None):
+        """
+        Private helper that builds the result cache keys of reviews.
+        
+        Runs of whitespace are collapsed first: the BERT tokenizer splits on them, so such
+        reviews are encoded identically.
+        
+        Args:
+            texts (list of str): The review texts.
+            params (dict): Settings of a long-document classification (None for truncated input).
+        
+        Returns:
+            list: One key per review.
+        """
+        if self._weights_hash is None:
+            self._weights_hash = weights_fingerprint(self.model)
+        if params is None:
+            params = {'task': 'classify', 'num_labels': self.num_labels, 'max_length': 512}
+        else:
+            params = dict(params, task='classify_long', num_labels=self.num_labels)
+        return [make_key(self.model_name, self._weights_hash, ' '.join(text.split()), params) for text in texts]
+
+    def cache_stats(self):
+        """
+        Report encoding cache usage.
+        
+        Returns:
+            dict: Cache hits, misses, hit ratio and size, or None if caching is disabled.
+        """
+        return self.encoding_cache.stats() if self.encoding_cache else None
+
+    @metrics.timed('review_forward_seconds')
+    def _forward(self, input_ids, attention_mask):
+        """
+        Private helper that runs a single inference-mode forward pass.
+        
+        Args:
+            input_ids (torch.Tensor): Padded token ids of shape (batch, seq_len).
+            attention_mask (torch.Tensor): Attention mask of the same shape.
+        
+        Returns:
+            torch.Tensor: The classification logits of shape (batch, num_labels).
+        """
+        with torch.inference_mode():
+            outputs = self.model(input_ids.to(self.device), attention_mask.to(self.device))
+        # Hugging Face outputs and TorchScript exports both expose the logits by key
+        return outputs['logits']
+
+    @metrics.timed('review_decode_seconds')
+    def _to_results(self, logits):
+        """
+        Private helper that converts logits into label/confidence dictionaries.
+        
+        Args:
+            logits (torch.Tensor): Classification logits of shape (batch, num_labels).
+        
+        Returns:
+            list: One dictionary with sentiment label and probability per row.
+        """
+        probs = F.softmax(logits, dim=1)
+        confidences, predicted_labels = torch.max(probs, dim=1)
+        return [
+            {'label': LABEL_MAP[label], 'confidence': confidence}
+            for label, confidence in zip(predicted_labels.tolist(), confidences.tolist())
+        ]
+
     def adjust_model_params(self, num_labels=None):
         """
         Adjust the number of labels for the classification task.
@@ -98,11 +580,89 @@ class ReviewModel:
         if num_labels:
             self.num_labels = num_labels
             try:
-                self.model = BertForSequenceClassification.from_pretrained(self.model_name, num_labels=self.num_labels).to(self.device)
-                logging.info(f"Model adjusted to {self.num_labels} labels.")
+                # Only the classification head changes; the registry reuses the loaded encoder
+                self.model = self._load_classifier(self.model_name)
+                self._weights_hash = None
+                logger.info(f"Model adjusted to {self.num_labels} labels.")
             except Exception as e:
                 raise ReviewModelError(f"Failed to adjust model parameters: {e}")
 
+    def optimize_for_cpu(self, quantize=True, num_threads=None):
+        """
+        Switch the model to an optimized CPU serving mode.
+        
+        Linear layers are dynamically quantized to int8 and PyTorch's thread pool is sized to
+        the CPUs available to this process. Inference already runs under torch.inference_mode.
+        
+        Args:
+            quantize (bool): Apply dynamic int8 quantization to Linear layers.
+            num_threads (int): Intra-op thread count (defaults to the available CPUs).
+        
+        Raises:
+            ReviewModelError: If the model is not on the CPU or optimization fails.
+        """
+        if self.device != 'cpu':
+            raise ReviewModelError("CPU optimization requires the model to run on 'cpu'.")
+        try:
+            threads = configure_threads(num_threads)
+            size_before = model_size_mb(self.model)
+            if quantize:
+                self.model = quantize_dynamic_int8(self.model)
+                self._weights_hash = None
+            logger.info(
+                f"Model optimized for CPU with {threads} threads "
+                f"({size_before:.1f} MB -> {model_size_mb(self.model):.1f} MB)."
+            )
+        except Exception as e:
+            raise ReviewModelError(f"Failed to optimize model for CPU: {e}")
+
+    def save_optimized(self, path):
+        """
+        Export the current (optionally optimized) model as TorchScript, alongside the tokenizer.
+        
+        Args:
+            path (str): The directory path where the export will be saved.
+        
+        Raises:
+            ReviewModelError: If the export fails.
+        """
+        try:
+            # Trace with a padded batch so the attention-mask path is captured
+            example = self.tokenizer.pad(
+                {'input_ids': self.tokenizer(["an example review used for tracing", "short"])['input_ids']},
+                return_tensors="pt"
+            )
+            with torch.no_grad():
+                traced = torch.jit.trace(
+                    self.model, (example['input_ids'].to(self.device), example['attention_mask'].to(self.device)), strict=False
+                )
+            os.makedirs(path, exist_ok=True)
+            traced.save(os.path.join(path, TORCHSCRIPT_FILE))
+            self.tokenizer.save_pretrained(path)
+            logger.info(f"Optimized model exported successfully to {path}.")
+        except Exception as e:
+            raise ReviewModelError(f"Failed to export optimized model: {e}")
+
+    def load_optimized(self, path):
+        """
+        Load a TorchScript export written by save_optimized.
+        
+        Args:
+            path (str): The directory path from where the export will be loaded.
+        
+        Raises:
+            ReviewModelError: If the export cannot be loaded.
+        """
+        try:
+            self.tokenizer = self._load_tokenizer(path, refresh=True)
+            self.model = torch.jit.load(os.path.join(path, TORCHSCRIPT_FILE), map_location=self.device)
+            self._weights_hash = None
+            if self.encoding_cache:
+                self.encoding_cache.clear()
+            logger.info(f"Optimized model loaded successfully from {path}.")
+        except Exception as e:
+            raise ReviewModelError(f"Failed to load optimized model: {e}")
+
     def save_model(self, path):
         """
         Save the model weights and tokenizer to a given path.
@@ -116,7 +676,7 @@ class ReviewModel:
         try:
             self.model.save_pretrained(path)
             self.tokenizer.save_pretrained(path)
-            logging.info(f"Model saved successfully to {path}.")
+            logger.info(f"Model saved successfully to {path}.")
         except Exception as e:
             raise ReviewModelError(f"Failed to save model: {e}")
 
@@ -131,14 +691,34 @@ class ReviewModel:
             ReviewModelError: If the model load operation fails.
         """
         try:
-            self.tokenizer = BertTokenizer.from_pretrained(path)
-            self.model = BertForSequenceClassification.from_pretrained(path, num_labels=self.num_labels).to(self.device)
-            logging.info(f"Model loaded successfully from {path}.")
+            self.tokenizer = self._load_tokenizer(path, refresh=True)
+            if self.encoding_cache:
+                self.encoding_cache.clear()
+            self.model = self._load_classifier(path, refresh=True)
+            self._weights_hash = None
+            logger.info(f"Model loaded successfully from {path}.")
         except Exception as e:
             raise ReviewModelError(f"Failed to load model: {e}")
 
+    def _load_tokenizer(self, name_or_path, refresh=False):
+        """
+        Private helper that fetches the BERT tokenizer from the model registry.
+        """
+        return self.registry.get_tokenizer(
+            'BertTokenizerFast', 'BertTokenizer', name_or_path, self.use_fast_tokenizer, refresh=refresh
+        )
+
+    def _load_classifier(self, name_or_path, refresh=False):
+        """
+        Private helper that fetches the sequence classifier from the model registry.
+        """
+        return self.registry.get_model(
+            'BertForSequenceClassification', name_or_path, self.device, self.dtype, self.num_labels, refresh=refresh
+        )
+
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     # Example usage
     try:
         review_text = "This product was excellent! I had a great experience."
@@ -146,4 +726,4 @@ if __name__ == "__main__":
         result = review_model.classify_review(review_text)
         print(f"Sentiment: {result['label']}, Confidence: {result['confidence']:.2f}")
     except ReviewModelError as e:
-        logging.error(f"ReviewModel error: {e}")
+        logger.error(f"ReviewModel error: {e}")
@@ -0,0 +1,293 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+import time
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from ai_models.review_model import ReviewModel, ReviewModelError
+from tools.json_stream import iter_json_records
+
+logger = logging.getLogger(__name__)
+
+# Model held by each worker process, created once by the pool initializer
+_worker_model = None
+
+
+class ReviewPipelineError(Exception):
+    """Custom exception for review pipeline errors."""
+    pass
+
+
+def _file_format(path):
+    """
+    Infer 'csv', 'json' or 'jsonl' from a file extension.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension == '.json':
+        return 'json'
+    if extension in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    raise ReviewPipelineError(f"Unsupported file format: {path}")
+
+
+def iter_records(path):
+    """
+    Stream records from a CSV file, JSON array or JSON Lines file one at a time.
+
+    Args:
+        path (str): Path to a .csv, .json or .jsonl file.
+
+    Yields:
+        dict: One record per row.
+    """
+    fmt = _file_format(path)
+    if fmt == 'csv':
+        with open(path, newline='', encoding='utf-8') as handle:
+            yield from csv.DictReader(handle)
+    else:
+        for _, _, record in iter_json_records(path, fmt='array' if fmt == 'json' else 'jsonl'):
+            yield record
+
+
+def _init_worker(model_name, num_labels, threads):
+    """
+    Pool initializer: pin the torch thread count and load one ReviewModel per worker process.
+    """
+    global _worker_model
+    # Set before torch is first imported in this process so OpenMP honours it too
+    os.environ['OMP_NUM_THREADS'] = str(threads)
+    os.environ['MKL_NUM_THREADS'] = str(threads)
+    from ai_models.cpu_optimization import configure_threads
+    configure_threads(threads)
+    _worker_model = ReviewModel(model_name=model_name, num_labels=num_labels, device='cpu')
+
+
+def _classify_chunk(texts, batch_size):
+    """
+    Classify one chunk of review texts in a worker process.
+
+    Returns:
+        tuple: The result dictionaries and the time spent classifying, in seconds.
+    """
+    start = time.perf_counter()
+    results = list(_worker_model.classify_reviews(texts, batch_size=batch_size))
+    return results, time.perf_counter() - start
+
+
+class ReviewPipeline:
+    """
+    Classify reviews from a CSV/JSON/JSONL file with a pool of worker processes.
+
+    The input is streamed in chunks; each chunk is classified by a worker holding its own
+    ReviewModel, and labelled rows are appended to the output as soon as their chunk
+    completes, in input order. A checkpoint file next to the output records how many rows
+    have been written, so an interrupted run can resume where it stopped.
+    """
+
+    def __init__(self, model_name='bert-base-uncased', num_labels=3, workers=None, threads_per_worker=None,
+                 chunk_size=256, batch_size=32, text_column='review'):
+        """
+        Initialize the pipeline.
+
+        Args:
+            model_name (str): Pre-trained BERT model name or path.
+            num_labels (int): The number of classification labels.
+            workers (int): Number of worker processes (defaults to the number of CPUs).
+            threads_per_worker (int): Torch threads per worker (defaults to CPUs // workers, so cores are not oversubscribed).
+            chunk_size (int): Number of rows sent to a worker at a time.
+            batch_size (int): Batch size used by each worker's ReviewModel.
+            text_column (str): Name of the field that holds the review text.
+        """
+        cpus = os.cpu_count() or 1
+        self.model_name = model_name
+        self.num_labels = num_labels
+        self.workers = workers or cpus
+        self.threads_per_worker = threads_per_worker or max(cpus // self.workers, 1)
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.text_column = text_column
+
+    def run(self, input_path, output_path, resume=False):
+        """
+        Classify every record of ``input_path`` and write labelled records to ``output_path``.
+
+        Args:
+            input_path (str): Path to the input .csv, .json or .jsonl file.
+            output_path (str): Path to the output .csv or .jsonl file.
+            resume (bool): Continue from the checkpoint of a previous run instead of starting over.
+
+        Returns:
+            dict: Row counts, rows per second and per-stage timings in seconds.
+
+        Raises:
+            ReviewPipelineError: If reading, classification or writing fails.
+        """
+        if _file_format(output_path) == 'json':
+            raise ReviewPipelineError("JSON array output cannot be appended to; write .jsonl instead.")
+        checkpoint_path = f"{output_path}.checkpoint"
+        offset, output_size = self._read_checkpoint(checkpoint_path) if resume else (0, 0)
+        timings = {'read': 0.0, 'classify': 0.0, 'wait': 0.0, 'write': 0.0}
+        rows_written = 0
+        start = time.perf_counter()
+
+        try:
+            records = itertools.islice(iter_records(input_path), offset, None)
+            with self._open_output(output_path, output_size) as handle, ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(self.model_name, self.num_labels, self.threads_per_worker),
+            ) as pool:
+                writer = None
+                pending = deque()
+                rows_read = offset
+                while True:
+                    # Keep a bounded number of chunks in flight so memory stays constant
+                    while len(pending) < 2 * self.workers:
+                        read_start = time.perf_counter()
+                        chunk = list(itertools.islice(records, self.chunk_size))
+                        timings['read'] += time.perf_counter() - read_start
+                        if not chunk:
+                            break
+                        texts = self._texts(chunk, rows_read)
+                        rows_read += len(chunk)
+                        pending.append((chunk, pool.submit(_classify_chunk, texts, self.batch_size)))
+                    if not pending:
+                        break
+
+                    chunk, future = pending.popleft()
+                    wait_start = time.perf_counter()
+                    results, classify_time = future.result()
+                    timings['wait'] += time.perf_counter() - wait_start
+                    timings['classify'] += classify_time
+
+                    write_start = time.perf_counter()
+                    writer = self._write_chunk(handle, writer, output_path, chunk, results, offset + rows_written == 0)
+                    handle.flush()
+                    rows_written += len(chunk)
+                    self._write_checkpoint(checkpoint_path, offset + rows_written, handle.tell())
+                    timings['write'] += time.perf_counter() - write_start
+        except (OSError, ValueError, RuntimeError, ReviewModelError) as e:
+            raise ReviewPipelineError(f"Review pipeline failed after {offset + rows_written} rows: {e}")
+
+        elapsed = time.perf_counter() - start
+        report = {
+            'rows': rows_written,
+            'resumed_from': offset,
+            'elapsed': elapsed,
+            'rows_per_sec': rows_written / elapsed if elapsed else 0.0,
+            'timings': timings,
+        }
+        logger.info(
+            f"Classified {rows_written} rows in {elapsed:.1f}s ({report['rows_per_sec']:.1f} rows/sec); "
+            f"read {timings['read']:.1f}s, classify {timings['classify']:.1f}s (worker total), "
+            f"wait {timings['wait']:.1f}s, write {timings['write']:.1f}s."
+        )
+        return report
+
+    def _texts(self, chunk, first_row):
+        """
+        Private helper that extracts the review texts of a chunk (a null value counts as empty text).
+
+        Raises:
+            ReviewPipelineError: If a record has no ``text_column`` field, e.g. a misnamed CSV column.
+        """
+        texts = []
+        for row, record in enumerate(chunk, first_row):
+            if not isinstance(record, dict) or self.text_column not in record:
+                raise ReviewPipelineError(f"Row {row} has no '{self.text_column}' field.")
+            texts.append(str(record[self.text_column] or ''))
+        return texts
+
+    def _write_chunk(self, handle, writer, output_path, chunk, results, first):
+        """
+        Private helper that appends one classified chunk to the output.
+
+        Returns:
+            csv.DictWriter: The CSV writer (created on first use), or None for JSON Lines output.
+        """
+        rows = [dict(record, label=result['label'], confidence=result['confidence']) for record, result in zip(chunk, results)]
+        if _file_format(output_path) == 'jsonl':
+            handle.writelines(json.dumps(row, ensure_ascii=False) + '\n' for row in rows)
+            return None
+        if writer is None:
+            writer = csv.DictWriter(handle, fieldnames=list(rows[0].keys()))
+            if first:
+                writer.writeheader()
+        writer.writerows(rows)
+        return writer
+
+    @staticmethod
+    def _open_output(output_path, output_size):
+        """
+        Private helper that opens the output for appending, dropping anything written after the checkpoint.
+        """
+        handle = open(output_path, 'a+', newline='', encoding='utf-8')
+        handle.truncate(output_size)
+        handle.seek(output_size)
+        return handle
+
+    @staticmethod
+    def _read_checkpoint(checkpoint_path):
+        """
+        Private helper that returns the (row offset, output size) recorded by a previous run.
+        """
+        if not os.path.exists(checkpoint_path):
+            return 0, 0
+        with open(checkpoint_path) as handle:
+            checkpoint = json.load(handle)
+        logger.info(f"Resuming from row {checkpoint['offset']}.")
+        return checkpoint['offset'], checkpoint['output_size']
+
+    @staticmethod
+    def _write_checkpoint(checkpoint_path, offset, output_size):
+        """
+        Private helper that atomically records progress.
+        """
+        temporary_path = f"{checkpoint_path}.tmp"
+        with open(temporary_path, 'w') as handle:
+            json.dump({'offset': offset, 'output_size': output_size}, handle)
+        os.replace(temporary_path, checkpoint_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Classify reviews from a CSV/JSON/JSONL file with a pool of workers.")
+    parser.add_argument("input", help="Input .csv, .json or .jsonl file.")
+    parser.add_argument("output", help="Output .csv or .jsonl file.")
+    parser.add_argument("--model", default="bert-base-uncased", help="Model name or local checkpoint path.")
+    parser.add_argument("--num-labels", type=int, default=3, help="Number of classification labels.")
+    parser.add_argument("--text-column", default="review", help="Field holding the review text.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes.")
+    parser.add_argument("--threads-per-worker", type=int, default=None, help="Torch threads per worker.")
+    parser.add_argument("--chunk-size", type=int, default=256, help="Rows sent to a worker at a time.")
+    parser.add_argument("--batch-size", type=int, default=32, help="Batch size within each worker.")
+    parser.add_argument("--resume", action="store_true", help="Resume from the output's checkpoint.")
+    args = parser.parse_args()
+
+    pipeline = ReviewPipeline(
+        model_name=args.model,
+        num_labels=args.num_labels,
+        workers=args.workers,
+        threads_per_worker=args.threads_per_worker,
+        chunk_size=args.chunk_size,
+        batch_size=args.batch_size,
+        text_column=args.text_column,
+    )
+    try:
+        report = pipeline.run(args.input, args.output, resume=args.resume)
+    except ReviewPipelineError as e:
+        logger.error(f"Review pipeline error: {e}")
+        raise SystemExit(1)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
@@ -0,0 +1,428 @@
+import argparse
+import asyncio
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from ai_models.review_model import ReviewModel, ReviewModelError
+from tools.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest gap in the moving average of request inter-arrival times
+ARRIVAL_SMOOTHING = 0.2
+
+# Largest request body the HTTP endpoint accepts, in bytes
+MAX_BODY_BYTES = 1 << 20
+
+HTTP_REASONS = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable',
+}
+
+
+class ReviewServerBusy(ReviewModelError):
+    """Raised when the review server's request queue is full."""
+    pass
+
+
+class ReviewBatchServer:
+    """
+    An asyncio micro-batching service in front of one ReviewModel.
+
+    Callers await ``classify`` (or POST to the HTTP endpoint started by ``serve``) one review
+    at a time. A collector task groups queued requests into batches of up to
+    ``max_batch_size`` and runs each batch as one forward pass on a worker thread, so the event
+    loop keeps accepting requests while the model runs, and requests that arrive during a
+    forward pass form the next batch. Each caller's future is resolved with its own result.
+
+    The collection window adapts to the load: a batch is closed as soon as it is full, and
+    the server only waits for more requests (up to ``max_wait_ms``) while a moving average of
+    the inter-arrival time says the batch would fill within that window. Under light load a
+    request is therefore sent on its own without waiting. When ``max_queue_size`` requests are
+    already waiting, new ones are rejected with ReviewServerBusy (HTTP 503) instead of queueing
+    without bound.
+    """
+
+    def __init__(self, review_model, max_batch_size=32, max_wait_ms=5.0, max_queue_size=1024):
+        """
+        Initialize the server.
+
+        Args:
+            review_model (ReviewModel): The model shared by all requests.
+            max_batch_size (int): Maximum number of reviews per forward pass.
+            max_wait_ms (float): Longest time a batch waits for more requests, in milliseconds.
+            max_queue_size (int): Maximum number of waiting requests (0 means unbounded).
+        """
+        if max_batch_size < 1:
+            raise ReviewModelError("max_batch_size must be a positive integer.")
+        if max_wait_ms < 0:
+            raise ReviewModelError("max_wait_ms must not be negative.")
+        self.review_model = review_model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue_size = max_queue_size
+        self.requests_completed = 0
+        self.requests_rejected = 0
+        self.batches = 0
+        self._queue = None
+        self._collector = None
+        self._executor = None
+        self._last_arrival = None
+        self._interarrival = None
+
+    async def start(self):
+        """
+        Start the collector task and the inference worker thread on the running event loop.
+
+        Returns:
+            ReviewBatchServer: The server itself, for chaining.
+        """
+        if self._collector is None or self._collector.done():
+            self._queue = asyncio.Queue(self.max_queue_size)
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='review-batch')
+            self._collector = asyncio.get_running_loop().create_task(self._collect())
+            logger.info(
+                f"Review batch server started with max batch size {self.max_batch_size} "
+                f"and max wait {self.max_wait * 1000:.1f} ms."
+            )
+        return self
+
+    async def stop(self):
+        """
+        Stop the collector task, failing any requests that have not been run.
+        """
+        if self._collector is not None:
+            self._collector.cancel()
+            try:
+                await self._collector
+            except asyncio.CancelledError:
+                pass
+            self._collector = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._queue is not None:
+            error = ReviewModelError("Review batch server stopped.")
+            while not self._queue.empty():
+                _, future, _ = self._queue.get_nowait()
+                if not future.done():
+                    future.set_exception(error)
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.stop()
+
+    async def classify(self, review_text):
+        """
+        Queue a review and await its classification.
+
+        Args:
+            review_text (str): The review text to classify.
+
+        Returns:
+            dict: A dictionary with sentiment label and probability.
+
+        Raises:
+            ReviewServerBusy: If the request queue is full.
+            ReviewModelError: If the server is not running or classification fails.
+        """
+        if self._collector is None or self._collector.done():
+            raise ReviewModelError("Review batch server is not running.")
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        future = loop.create_future()
+        try:
+            self._queue.put_nowait((review_text, future, now))
+        except asyncio.QueueFull:
+            self.requests_rejected += 1
+            metrics.increment('review_server_rejected_total')
+            raise ReviewServerBusy("Review batch server queue is full.")
+        self._record_arrival(now)
+        return await future
+
+    def stats(self):
+        """
+        Report server activity.
+
+        Returns:
+            dict: Completed and rejected requests, batches run, mean batch size, queue depth
+            and the current collection window in milliseconds.
+        """
+        return {
+            'requests_completed': self.requests_completed,
+            'requests_rejected': self.requests_rejected,
+            'batches': self.batches,
+            'mean_batch_size': self.requests_completed / self.batches if self.batches else 0.0,
+            'queued': self._queue.qsize() if self._queue is not None else 0,
+            'window_ms': self._window() * 1000,
+        }
+
+    async def serve(self, host='127.0.0.1', port=8080):
+        """
+        Start the HTTP endpoint.
+
+        Routes:
+            POST /classify: body {"text": "..."} returns one result; {"texts": [...]} returns a list.
+            GET /stats: the server's stats as JSON.
+            GET /metrics: the metrics registry in the Prometheus text format.
+            GET /health: {"status": "ok"}.
+
+        Args:
+            host (str): Interface to listen on.
+            port (int): Port to listen on (0 picks a free port).
+
+        Returns:
+            asyncio.Server: The listening server; close it to stop accepting connections.
+        """
+        await self.start()
+        server = await asyncio.start_server(self._handle_connection, host, port)
+        address = server.sockets[0].getsockname()
+        logger.info(f"Review batch server listening on http://{address[0]}:{address[1]}.")
+        return server
+
+    def _record_arrival(self, now):
+        """
+        Private helper that updates the moving average of the inter-arrival time.
+        """
+        if self._last_arrival is not None:
+            gap = now - self._last_arrival
+            if self._interarrival is None:
+                self._interarrival = gap
+            else:
+                self._interarrival += ARRIVAL_SMOOTHING * (gap - self._interarrival)
+        self._last_arrival = now
+
+    def _window(self):
+        """
+        Private helper that picks how long the next batch waits for more requests, in seconds.
+
+        Returns:
+            float: ``max_wait`` capped at the expected time to fill a batch, or 0 when requests
+            arrive too sparsely for waiting to add anything to the batch.
+        """
+        if self._interarrival is None or self._interarrival >= self.max_wait:
+            return 0.0
+        return min(self.max_wait, (self.max_batch_size - 1) * self._interarrival)
+
+    async def _collect(self):
+        """
+        Private collector loop: gather a batch, run it on the worker thread, resolve its futures.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._next_batch(loop)
+            if not batch:
+                continue
+            texts = [text for text, _, _ in batch]
+            start = loop.time()
+            for _, _, queued in batch:
+                metrics.observe('review_server_queue_seconds', start - queued)
+            try:
+                results = await loop.run_in_executor(self._executor, self._run_batch, texts)
+            except asyncio.CancelledError:
+                error = ReviewModelError("Review batch server stopped.")
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                raise
+            except Exception as e:
+                logger.error(f"Review batch of {len(batch)} failed: {e}")
+                error = e if isinstance(e, ReviewModelError) else ReviewModelError(f"Review classification failed: {e}")
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+            self.batches += 1
+            self.requests_completed += len(batch)
+            metrics.increment('review_server_batches_total')
+            metrics.increment('review_server_requests_total', len(batch))
+            for (_, future, _), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    async def _next_batch(self, loop):
+        """
+        Private helper that waits for a request, then collects more until the batch is full or the window closes.
+
+        Returns:
+            list: (text, future, enqueue time) tuples whose callers are still waiting.
+        """
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self._window()
+        while len(batch) < self.max_batch_size:
+            # Take whatever is already queued before waiting on the clock
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            remaining = deadline - loop.time()
+            if len(batch) >= self.max_batch_size or remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        # Callers that gave up (e.g. a cancelled task) do not take a slot in the forward pass
+        return [item for item in batch if not item[1].done()]
+
+    @metrics.timed('review_server_batch_seconds')
+    def _run_batch(self, texts):
+        """
+        Private helper, run on the worker thread, that classifies one batch in a single forward pass.
+        """
+        return self.review_model._classify_window(texts, self.max_batch_size)
+
+    async def _handle_connection(self, reader, writer):
+        """
+        Private helper that serves HTTP/1.1 requests on one (keep-alive) connection.
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                length = _content_length(headers.get('content-length'))
+                if length is None:
+                    # Without a valid length the body cannot be framed, so the connection ends here
+                    self._write_response(writer, 400, {'error': 'Invalid Content-Length header.'}, keep_alive=False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    self._write_response(writer, 413, {'error': 'Request body too large.'}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+                parts = request_line.decode('latin-1').split()
+                method, path = (parts[0], parts[1]) if len(parts) >= 2 else ('', '')
+                status, payload, extra = await self._route(method, path, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                self._write_response(writer, status, payload, keep_alive, extra)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            # Answer instead of dropping the connection without a status line
+            logger.exception(f"Review server request failed: {e}")
+            try:
+                self._write_response(writer, 500, {'error': 'Internal server error.'}, keep_alive=False)
+                await writer.drain()
+            except ConnectionError:
+                pass
+        finally:
+            writer.close()
+
+    async def _route(self, method, path, body):
+        """
+        Private helper that dispatches one HTTP request.
+
+        Returns:
+            tuple: Status code, response payload (dict, list or str) and extra headers.
+        """
+        path = path.split('?', 1)[0]
+        if path == '/classify':
+            if method != 'POST':
+                return 405, {'error': 'Use POST.'}, {'Allow': 'POST'}
+            try:
+                request = json.loads(body or b'null')
+                if isinstance(request, dict) and isinstance(request.get('text'), str):
+                    return 200, await self.classify(request['text']), {}
+                texts = request.get('texts') if isinstance(request, dict) else None
+                if isinstance(texts, list) and all(isinstance(text, str) for text in texts):
+                    return 200, list(await asyncio.gather(*[self.classify(text) for text in texts])), {}
+                return 400, {'error': 'Expected {"text": str} or {"texts": [str, ...]}.'}, {}
+            except ValueError as e:
+                # JSONDecodeError, or UnicodeDecodeError for a body that is not UTF-8
+                return 400, {'error': f"Invalid JSON: {e}"}, {}
+            except ReviewServerBusy as e:
+                return 503, {'error': str(e)}, {'Retry-After': '1'}
+            except ReviewModelError as e:
+                return 500, {'error': str(e)}, {}
+        if method != 'GET':
+            return 405, {'error': 'Use GET.'}, {'Allow': 'GET'}
+        if path == '/health':
+            return 200, {'status': 'ok'}, {}
+        if path == '/stats':
+            return 200, self.stats(), {}
+        if path == '/metrics':
+            return 200, metrics.export_prometheus(), {}
+        return 404, {'error': f"No route for {path}."}, {}
+
+    @staticmethod
+    def _write_response(writer, status, payload, keep_alive=True, extra_headers=None):
+        """
+        Private helper that writes one HTTP response (text for strings, JSON otherwise).
+        """
+        if isinstance(payload, str):
+            body, content_type = payload.encode('utf-8'), 'text/plain; version=0.0.4'
+        else:
+            body, content_type = json.dumps(payload).encode('utf-8'), 'application/json'
+        headers = {
+            'Content-Type': content_type,
+            'Content-Length': str(len(body)),
+            'Connection': 'keep-alive' if keep_alive else 'close',
+        }
+        headers.update(extra_headers or {})
+        head = f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+        head += ''.join(f"{name}: {value}\r\n" for name, value in headers.items())
+        writer.write(head.encode('latin-1') + b'\r\n' + body)
+
+
+def _content_length(value):
+    """
+    Parse a Content-Length header value (None or empty means no body).
+
+    Returns:
+        int: The body length, or None if the value is not a non-negative decimal integer.
+    """
+    if not value:
+        return 0
+    if not (value.isascii() and value.isdigit()):
+        return None
+    return int(value)
+
+
+async def _serve_forever(review_model, host, port, max_batch_size, max_wait_ms, max_queue_size):
+    """
+    Run the HTTP endpoint until the process is interrupted.
+    """
+    async with ReviewBatchServer(review_model, max_batch_size, max_wait_ms, max_queue_size) as batch_server:
+        server = await batch_server.serve(host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve ReviewModel classifications over HTTP with micro-batching.")
+    parser.add_argument("--model", default="bert-base-uncased", help="Model name or local checkpoint path.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on.")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on.")
+    parser.add_argument("--max-batch-size", type=int, default=32, help="Maximum reviews per forward pass.")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="Longest time a batch waits for more requests.")
+    parser.add_argument("--max-queue-size", type=int, default=1024, help="Waiting requests before new ones get 503.")
+    parser.add_argument("--device", default=None, help="Device to run on ('cpu' or 'cuda').")
+    args = parser.parse_args()
+
+    try:
+        review_model = ReviewModel(model_name=args.model, device=args.device)
+        asyncio.run(_serve_forever(
+            review_model, args.host, args.port, args.max_batch_size, args.max_wait_ms, args.max_queue_size
+        ))
+    except ReviewModelError as e:
+        logger.error(f"ReviewModel error: {e}")
+        raise SystemExit(1)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
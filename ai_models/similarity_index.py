@@ -0,0 +1,385 @@
+import logging
+
+from ai_models.registry import lazy_import
+from tools.metrics import metrics
+
+# Heavy dependencies are imported on first use
+np = lazy_import('numpy')
+
+logger = logging.getLogger(__name__)
+
+# Rows reserved when the index first grows
+INITIAL_CAPACITY = 1024
+
+
+class SimilarityIndexError(Exception):
+    """Custom exception for similarity index errors."""
+    pass
+
+
+class SimilarityIndex:
+    """
+    An in-process cosine similarity index over review embeddings (see ReviewModel.embed_reviews).
+
+    Vectors are normalized on insertion and kept in one contiguous matrix (float32, or float16
+    to halve memory), so similarity is a dot product. Exact search multiplies blocks of
+    ``block_size`` queries by blocks of ``block_size`` stored rows, upcasting each block to
+    float32 and merging per-block top-k candidates, so memory stays bounded however large the
+    index grows.
+
+    With ``lsh_bits`` set, every vector is also hashed into one bucket per table by the signs
+    of its projections onto random hyperplanes. Searches then only score the rows that share a
+    bucket with the query in at least one table: much faster on large indexes, at the cost of
+    occasionally missing a neighbour (more tables raise recall, more bits shrink the buckets).
+
+    Each row can carry a payload, such as the label a review was classified with, so
+    near-identical reviews can reuse it instead of being classified again:
+
+        embeddings = review_model.embed_reviews(texts)
+        matches = index.lookup(embeddings, threshold=0.98)
+        # classify only the reviews whose match is None, then index.add(their embeddings, labels)
+    """
+
+    def __init__(self, dim, dtype='float32', block_size=4096, lsh_bits=0, lsh_tables=4, seed=0):
+        """
+        Initialize an empty index.
+
+        Args:
+            dim (int): Dimension of the vectors.
+            dtype (str): Storage dtype, 'float32' or 'float16'.
+            block_size (int): Rows per block in the blocked matrix multiplies.
+            lsh_bits (int): Hyperplanes per LSH table (0 disables LSH and always searches exactly).
+            lsh_tables (int): Number of LSH tables.
+            seed (int): Seed of the random hyperplanes.
+        """
+        if dim < 1 or block_size < 1:
+            raise SimilarityIndexError("dim and block_size must be positive integers.")
+        if dtype not in ('float32', 'float16'):
+            raise SimilarityIndexError("dtype must be 'float32' or 'float16'.")
+        if not 0 <= lsh_bits <= 62:
+            raise SimilarityIndexError("lsh_bits must be between 0 and 62.")
+        self.dim = dim
+        self.dtype = dtype
+        self.block_size = block_size
+        self.lsh_bits = lsh_bits
+        self.lsh_tables = lsh_tables if lsh_bits else 0
+        self.seed = seed
+        self._vectors = np.empty((0, dim), dtype=dtype)
+        self._size = 0
+        self._payloads = []
+        if self.lsh_tables:
+            rng = np.random.default_rng(seed)
+            self._planes = rng.standard_normal((self.lsh_tables, lsh_bits, dim)).astype(np.float32)
+            self._powers = (1 << np.arange(lsh_bits, dtype=np.int64))
+            self._buckets = [{} for _ in range(self.lsh_tables)]
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def vectors(self):
+        """
+        numpy.ndarray: A read-only view of the stored, normalized vectors.
+        """
+        view = self._vectors[:self._size]
+        view.flags.writeable = False
+        return view
+
+    def add(self, vectors, payloads=None):
+        """
+        Add vectors to the index.
+
+        Args:
+            vectors (numpy.ndarray): A (n, dim) matrix, or a single (dim,) vector.
+            payloads (list): Optional value per vector, returned by lookup.
+
+        Returns:
+            numpy.ndarray: The ids assigned to the vectors, in order.
+        """
+        vectors = self._normalize(vectors)
+        if payloads is not None and len(payloads) != len(vectors):
+            raise SimilarityIndexError("payloads must have one entry per vector.")
+        return self._insert(vectors, payloads)
+
+    @metrics.timed('similarity_search_seconds')
+    def search(self, queries, k=10, exact=None):
+        """
+        Find the k most similar stored vectors for each query.
+
+        Args:
+            queries (numpy.ndarray): A (n, dim) matrix, or a single (dim,) vector.
+            k (int): Number of neighbours per query.
+            exact (bool): Score every row even if LSH is enabled (defaults to exact only without LSH).
+
+        Returns:
+            tuple: (scores, ids) arrays of shape (n, k), best first. Slots without a neighbour
+            have id -1 and score -inf.
+        """
+        if k < 1:
+            raise SimilarityIndexError("k must be a positive integer.")
+        queries = self._normalize(queries).astype(np.float32)
+        if exact is None:
+            exact = not self.lsh_tables
+        if exact:
+            return self._search_exact(queries, k)
+        return self._search_buckets(queries, k)
+
+    def lookup(self, vectors, threshold=0.95, exact=None):
+        """
+        Find, for each vector, the most similar stored row if it is at least ``threshold`` similar.
+
+        Args:
+            vectors (numpy.ndarray): A (n, dim) matrix, or a single (dim,) vector.
+            threshold (float): Minimum cosine similarity of a match.
+            exact (bool): Score every row even if LSH is enabled.
+
+        Returns:
+            list: Per vector, an (id, score, payload) tuple, or None when nothing is close enough.
+        """
+        scores, ids = self.search(vectors, k=1, exact=exact)
+        return [
+            (int(row), float(score), self._payloads[row]) if row >= 0 and score >= threshold else None
+            for row, score in zip(ids[:, 0], scores[:, 0])
+        ]
+
+    @metrics.timed('similarity_duplicates_seconds')
+    def near_duplicates(self, threshold=0.95, exact=None):
+        """
+        List every pair of stored rows whose cosine similarity is at least ``threshold``.
+
+        Args:
+            threshold (float): Minimum cosine similarity.
+            exact (bool): Compare every pair even if LSH is enabled (otherwise only pairs that
+                share a bucket are compared).
+
+        Returns:
+            list: (i, j, score) tuples with i < j, sorted by i then j.
+        """
+        if exact is None:
+            exact = not self.lsh_tables
+        pairs = self._pairs_exact(threshold) if exact else self._pairs_buckets(threshold)
+        return sorted(pairs)
+
+    def deduplicate(self, threshold=0.95, exact=None):
+        """
+        Group near-duplicate rows and pick the earliest row of each group as its representative.
+
+        Groups are the connected components of the near_duplicates graph, so a chain of
+        reviews that each closely match the next lands in one group.
+
+        Args:
+            threshold (float): Minimum cosine similarity of a near-duplicate pair.
+            exact (bool): Compare every pair even if LSH is enabled.
+
+        Returns:
+            numpy.ndarray: For each row, the id of its representative (itself for unique rows).
+        """
+        parents = np.arange(self._size)
+
+        def find(row):
+            while parents[row] != row:
+                parents[row] = parents[parents[row]]
+                row = parents[row]
+            return row
+
+        for i, j, _ in self.near_duplicates(threshold, exact):
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                # Keep the smaller id as the root, so it is the group's earliest row
+                parents[max(root_i, root_j)] = min(root_i, root_j)
+        return np.array([find(row) for row in range(self._size)], dtype=np.int64)
+
+    def payload(self, row):
+        """
+        Return the payload stored with a row.
+        """
+        return self._payloads[row]
+
+    def save(self, path):
+        """
+        Save the vectors and settings to a .npz file (payloads are not saved).
+
+        Args:
+            path (str): Output path.
+        """
+        np.savez(
+            path, vectors=self._vectors[:self._size], dim=self.dim, block_size=self.block_size,
+            lsh_bits=self.lsh_bits, lsh_tables=self.lsh_tables, seed=self.seed,
+        )
+        logger.info(f"Similarity index with {self._size} vectors saved to {path}.")
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load an index written by save.
+
+        Args:
+            path (str): Path of the .npz file.
+
+        Returns:
+            SimilarityIndex: The index, with empty payloads.
+        """
+        with np.load(path) as data:
+            vectors = data['vectors']
+            index = cls(
+                int(data['dim']), dtype=str(vectors.dtype), block_size=int(data['block_size']),
+                lsh_bits=int(data['lsh_bits']), lsh_tables=int(data['lsh_tables']), seed=int(data['seed']),
+            )
+        # The saved vectors are already normalized
+        index._insert(vectors.astype(np.float32), None)
+        return index
+
+    def _normalize(self, vectors):
+        """
+        Private helper that checks the shape of input vectors and scales them to unit length.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors[None, :]
+        if vectors.ndim != 2 or vectors.shape[1] != self.dim:
+            raise SimilarityIndexError(f"Expected vectors of dimension {self.dim}, got shape {vectors.shape}.")
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def _insert(self, vectors, payloads):
+        """
+        Private helper that appends normalized vectors and files them into their LSH buckets.
+
+        Returns:
+            numpy.ndarray: The ids assigned to the vectors, in order.
+        """
+        count = len(vectors)
+        self._reserve(self._size + count)
+        ids = np.arange(self._size, self._size + count)
+        self._vectors[self._size:self._size + count] = vectors
+        self._size += count
+        self._payloads.extend(payloads if payloads is not None else [None] * count)
+
+        if self.lsh_tables:
+            for table, codes in zip(self._buckets, self._hash(vectors)):
+                for row, code in zip(ids.tolist(), codes.tolist()):
+                    table.setdefault(code, []).append(row)
+        return ids
+
+    def _reserve(self, rows):
+        """
+        Private helper that grows the matrix (doubling its capacity) to hold at least ``rows`` rows.
+        """
+        if rows <= len(self._vectors):
+            return
+        grown = np.empty((max(rows, 2 * len(self._vectors), INITIAL_CAPACITY), self.dim), dtype=self.dtype)
+        grown[:self._size] = self._vectors[:self._size]
+        self._vectors = grown
+
+    def _block(self, start):
+        """
+        Private helper that returns stored rows [start, start + block_size) as float32.
+        """
+        return self._vectors[start:min(start + self.block_size, self._size)].astype(np.float32, copy=False)
+
+    def _hash(self, vectors):
+        """
+        Private helper that computes the bucket code of each vector in each LSH table.
+
+        Returns:
+            numpy.ndarray: Codes of shape (lsh_tables, n).
+        """
+        signs = np.einsum('tbd,nd->tnb', self._planes, vectors) > 0
+        return signs.astype(np.int64) @ self._powers
+
+    def _search_exact(self, queries, k):
+        """
+        Private helper that scores every stored row with blocked matrix multiplies, keeping a running top-k.
+        """
+        count = len(queries)
+        scores = np.full((count, k), -np.inf, dtype=np.float32)
+        ids = np.full((count, k), -1, dtype=np.int64)
+        for query_start in range(0, count, self.block_size):
+            query_block = queries[query_start:query_start + self.block_size]
+            best_scores = scores[query_start:query_start + self.block_size]
+            best_ids = ids[query_start:query_start + self.block_size]
+            for start in range(0, self._size, self.block_size):
+                block_scores = query_block @ self._block(start).T
+                block_ids = np.broadcast_to(np.arange(start, start + block_scores.shape[1]), block_scores.shape)
+                merged_scores = np.concatenate([best_scores, block_scores], axis=1)
+                merged_ids = np.concatenate([best_ids, block_ids], axis=1)
+                top = np.argpartition(-merged_scores, k - 1, axis=1)[:, :k]
+                best_scores[:] = np.take_along_axis(merged_scores, top, axis=1)
+                best_ids[:] = np.take_along_axis(merged_ids, top, axis=1)
+        return self._sorted(scores, ids)
+
+    def _search_buckets(self, queries, k):
+        """
+        Private helper that scores only the rows sharing an LSH bucket with each query.
+        """
+        scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        ids = np.full((len(queries), k), -1, dtype=np.int64)
+        codes = self._hash(queries)
+        for row, query in enumerate(queries):
+            candidates = set()
+            for table, code in zip(self._buckets, codes[:, row].tolist()):
+                candidates.update(table.get(code, ()))
+            if not candidates:
+                continue
+            candidates = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+            candidate_scores = self._vectors[candidates].astype(np.float32, copy=False) @ query
+            top = np.argsort(-candidate_scores, kind='stable')[:k]
+            scores[row, :len(top)] = candidate_scores[top]
+            ids[row, :len(top)] = candidates[top]
+        return self._sorted(scores, ids)
+
+    def _pairs_exact(self, threshold):
+        """
+        Private helper that finds near-duplicate pairs over the upper triangle of blocked self-similarities.
+        """
+        pairs = []
+        for start in range(0, self._size, self.block_size):
+            rows = self._block(start)
+            for other in range(start, self._size, self.block_size):
+                block_scores = rows @ self._block(other).T
+                hits = block_scores >= threshold
+                if other == start:
+                    # Only pairs above the diagonal, so each pair is reported once; masking the
+                    # comparison rather than zeroing the scores keeps thresholds <= 0 correct
+                    hits = np.triu(hits, k=1)
+                i, j = np.nonzero(hits)
+                pairs.extend(zip((i + start).tolist(), (j + other).tolist(), block_scores[i, j].tolist()))
+        return pairs
+
+    def _pairs_buckets(self, threshold):
+        """
+        Private helper that finds near-duplicate pairs among rows sharing an LSH bucket.
+        """
+        pairs = {}
+        for table in self._buckets:
+            for rows in table.values():
+                if len(rows) < 2:
+                    continue
+                rows = np.asarray(rows, dtype=np.int64)
+                vectors = self._vectors[rows].astype(np.float32, copy=False)
+                block_scores = vectors @ vectors.T
+                i, j = np.nonzero(np.triu(block_scores >= threshold, k=1))
+                for a, b, score in zip(rows[i].tolist(), rows[j].tolist(), block_scores[i, j].tolist()):
+                    pairs[(a, b)] = score
+        return [(a, b, score) for (a, b), score in pairs.items()]
+
+    @staticmethod
+    def _sorted(scores, ids):
+        """
+        Private helper that orders each row of top-k results best first.
+        """
+        order = np.argsort(-scores, axis=1, kind='stable')
+        return np.take_along_axis(scores, order, axis=1), np.take_along_axis(ids, order, axis=1)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    # Example usage
+    rng = np.random.default_rng(0)
+    index = SimilarityIndex(dim=8)
+    base = rng.standard_normal((4, 8))
+    index.add(base, payloads=['positive', 'negative', 'neutral', 'positive'])
+    print(index.lookup(base + 0.01 * rng.standard_normal((4, 8)), threshold=0.99))
+    index.add(base[:2] + 0.001)
+    print(index.near_duplicates(threshold=0.99))
+    print(index.deduplicate(threshold=0.99))
@@ -0,0 +1,139 @@
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+def load_tokenizer(fast_class, slow_class, name_or_path, use_fast=True):
+    """
+    Load a tokenizer, preferring the Rust-backed fast implementation.
+
+    Args:
+        fast_class (type): The fast tokenizer class (e.g. BertTokenizerFast).
+        slow_class (type): The pure-Python tokenizer class used as a fallback.
+        name_or_path (str): Pre-trained tokenizer name or path.
+        use_fast (bool): Whether to try the fast tokenizer first.
+
+    Returns:
+        The loaded tokenizer.
+    """
+    if use_fast:
+        try:
+            return fast_class.from_pretrained(name_or_path)
+        except Exception as e:
+            logger.info(f"Fast tokenizer unavailable for '{name_or_path}', falling back to {slow_class.__name__}: {e}")
+    return slow_class.from_pretrained(name_or_path)
+
+
+class EncodingCache:
+    """
+    A bounded, thread-safe LRU cache of encoded token ids keyed by a hash of the input text.
+
+    Hit and miss counters are kept so the cache can be sized from production traffic.
+    """
+
+    def __init__(self, max_size=4096):
+        """
+        Initialize the encoding cache.
+
+        Args:
+            max_size (int): Maximum number of encoded inputs to keep.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be a positive integer.")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(text):
+        """
+        Private helper that hashes a text into a compact cache key.
+        """
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+    def get(self, text):
+        """
+        Look up the cached token ids for a text.
+
+        Args:
+            text (str): The input text.
+
+        Returns:
+            tuple: The cached token ids, or None on a miss.
+        """
+        key = self._key(text)
+        with self._lock:
+            ids = self._entries.get(key)
+            if ids is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return ids
+
+    def put(self, text, ids):
+        """
+        Store the token ids for a text, evicting the least recently used entry if full.
+
+        Args:
+            text (str): The input text.
+            ids (list of int): The encoded token ids.
+
+        Returns:
+            tuple: The stored (immutable) token ids.
+        """
+        ids = tuple(ids)
+        key = self._key(text)
+        with self._lock:
+            self._entries[key] = ids
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return ids
+
+    def get_or_encode(self, text, encode):
+        """
+        Return the cached token ids for a text, encoding and storing them on a miss.
+
+        Args:
+            text (str): The input text.
+            encode (callable): Function mapping a text to a list of token ids.
+
+        Returns:
+            tuple: The token ids.
+        """
+        ids = self.get(text)
+        if ids is None:
+            ids = self.put(text, encode(text))
+        return ids
+
+    def clear(self):
+        """
+        Drop all cached encodings and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Report cache usage.
+
+        Returns:
+            dict: Hits, misses, hit ratio, current size and maximum size.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+            }
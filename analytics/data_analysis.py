@@ -0,0 +1,583 @@
+import os
+import re
+import glob
+import json
+import math
+import mmap
+import time
+import bisect
+import hashlib
+import logging
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from tools.metrics import DEFAULT_BUCKETS
+
+logger = logging.getLogger(__name__)
+
+# Lines written with '%(asctime)s - %(levelname)s - %(message)s', captured as (minute, level, message)
+LOG_PATTERN = re.compile(rb'^(\d{4}-\d\d-\d\d \d\d:\d\d):\d\d,\d{3} - ([A-Z]+) - ([^\r\n]*)', re.MULTILINE)
+
+# Variable parts of a message masked, in this order, to group messages into templates:
+# quoted words, hex ids (0x-prefixed or 8+ hex digits) and numbers
+TEMPLATE_RULES = (
+    (re.compile(rb"'[^'\s]*'|\"[^\"\s]*\""), b"'*'"),
+    (re.compile(rb'\b(?:0x[0-9a-fA-F]+|[0-9a-fA-F]{8,})\b'), b'#'),
+    (re.compile(rb'\d+(?:\.\d+)?'), b'#'),
+)
+
+# Templates of messages that report a duration, such as "in #s", "took # ms" or "after # seconds"
+LATENCY_TEMPLATE = re.compile(rb'\b(?:in|took|after)\s+#\s*(?:ms|s|sec|secs|seconds)\b')
+
+# The first duration on each line of a block of such messages, as (value, unit)
+LATENCY_PATTERN = re.compile(rb'^.*?\b(?:in|took|after)\s+(\d+(?:\.\d+)?)\s*(ms|s|sec|secs|seconds)\b', re.MULTILINE)
+
+# Levels counted as errors in error rates
+ERROR_LEVELS = ('ERROR', 'CRITICAL')
+
+# Bytes of log scanned as one unit; each chunk keeps its own summary in the index
+CHUNK_BYTES = 32 << 20
+
+# Templates kept per level in each chunk summary; rarer ones are dropped
+TOP_MESSAGES_PER_CHUNK = 500
+
+# Bytes at the start of a file hashed to detect rotation or truncation
+HEAD_BYTES = 4096
+
+# Bump when the index layout changes, so old indexes are rebuilt
+INDEX_VERSION = 1
+
+
+class LogAnalysisError(Exception):
+    """Custom exception for log analysis errors."""
+    pass
+
+
+def template(message):
+    """
+    Reduce a log message to its template by masking numbers, hex values and quoted strings.
+
+    Example:
+        "Classified 32 reviews in 0.41s" -> "Classified # reviews in #s"
+
+    Args:
+        message (str): The log message.
+
+    Returns:
+        str: The template.
+    """
+    return _mask(message.encode('utf-8')).decode('utf-8')
+
+
+def _mask(data):
+    """
+    Apply TEMPLATE_RULES to a block of bytes (one message per line) in a few passes over the whole block.
+    """
+    for pattern, replacement in TEMPLATE_RULES:
+        data = pattern.sub(replacement, data)
+    return data
+
+
+def parse_minute(value):
+    """
+    Normalize a time bound to the 'YYYY-MM-DD HH:MM' form used in the index.
+
+    Args:
+        value (str or datetime): An ISO 8601 date or datetime, or a datetime object.
+
+    Returns:
+        str: The minute, or None if ``value`` is None.
+    """
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        try:
+            value = datetime.fromisoformat(str(value).replace(',', '.'))
+        except ValueError:
+            raise LogAnalysisError(f"Invalid time bound: {value!r}")
+    return value.strftime('%Y-%m-%d %H:%M')
+
+
+def empty_summary():
+    """
+    Return a summary of no log lines.
+
+    Summaries are JSON-serializable dicts: total lines, lines per level, lines per level per
+    minute, template counts per level, latency histograms per template and the earliest and
+    latest minute seen.
+    """
+    return {'lines': 0, 'levels': {}, 'minutes': {}, 'messages': {}, 'latency': {}, 'first': None, 'last': None}
+
+
+def merge_summaries(summaries, cap=None):
+    """
+    Combine several summaries into one.
+
+    Args:
+        summaries (iterable of dict): Summaries from scan_range or other merges.
+        cap (int): Keep only this many templates per level (None keeps all).
+
+    Returns:
+        dict: The combined summary.
+    """
+    merged = empty_summary()
+    messages = {}
+    for summary in summaries:
+        merged['lines'] += summary['lines']
+        for level, count in summary['levels'].items():
+            merged['levels'][level] = merged['levels'].get(level, 0) + count
+        for minute, levels in summary['minutes'].items():
+            target = merged['minutes'].setdefault(minute, {})
+            for level, count in levels.items():
+                target[level] = target.get(level, 0) + count
+        for level, templates in summary['messages'].items():
+            messages.setdefault(level, Counter()).update(templates)
+        for name, histogram in summary['latency'].items():
+            target = merged['latency'].get(name)
+            if target is None:
+                merged['latency'][name] = {**histogram, 'buckets': list(histogram['buckets'])}
+                continue
+            target['count'] += histogram['count']
+            target['sum'] += histogram['sum']
+            target['max'] = max(target['max'], histogram['max'])
+            target['buckets'] = [a + b for a, b in zip(target['buckets'], histogram['buckets'])]
+        for key, pick in (('first', min), ('last', max)):
+            if summary[key] is not None:
+                merged[key] = summary[key] if merged[key] is None else pick(merged[key], summary[key])
+    merged['messages'] = {level: dict(counter.most_common(cap)) for level, counter in messages.items()}
+    return merged
+
+
+def scan_range(path, start, end, since=None, until=None):
+    """
+    Summarize the log lines in a byte range of a file, scanning it through a memory map.
+
+    The whole range is matched by one regular expression over the mapped bytes, so lines are
+    never read into Python strings one at a time. Messages are reduced to templates by a few
+    substitutions over all of them at once, durations are extracted in one pass over the
+    lines whose template reports one, and only distinct templates are decoded. Lines that do
+    not start with a timestamp (such as traceback lines) are skipped.
+
+    Args:
+        path (str): The log file.
+        start (int): Offset of the first byte, at the start of a line.
+        end (int): Offset just past the last byte, at the end of a line.
+        since (str): Only count lines from this minute on ('YYYY-MM-DD HH:MM').
+        until (str): Only count lines up to and including this minute.
+
+    Returns:
+        dict: The summary (see empty_summary).
+    """
+    if end <= start:
+        return empty_summary()
+    with open(path, 'rb') as handle:
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            rows = LOG_PATTERN.findall(view, start, end)
+    if since or until:
+        low, high = (since or '').encode('ascii'), until.encode('ascii') if until else b'\xff'
+        rows = [row for row in rows if low <= row[0] <= high]
+    if not rows:
+        return empty_summary()
+
+    minute_column, level_column, message_column = zip(*rows)
+    del rows
+    per_minute = Counter(zip(minute_column, level_column))
+    template_column = _mask(b'\n'.join(message_column)).split(b'\n')
+    per_template = Counter(zip(level_column, template_column))
+
+    summary = empty_summary()
+    summary['lines'] = len(level_column)
+    for (minute, level), count in per_minute.items():
+        minute, level = minute.decode('ascii'), level.decode('ascii')
+        levels = summary['minutes'].setdefault(minute, {})
+        levels[level] = levels.get(level, 0) + count
+        summary['levels'][level] = summary['levels'].get(level, 0) + count
+    summary['first'], summary['last'] = min(summary['minutes']), max(summary['minutes'])
+
+    messages = {}
+    for (level, name), count in per_template.items():
+        templates = messages.setdefault(level.decode('ascii'), Counter())
+        templates[name.decode('utf-8', 'replace')] += count
+    summary['messages'] = {level: dict(counter.most_common(TOP_MESSAGES_PER_CHUNK)) for level, counter in messages.items()}
+
+    timed = {name for _, name in per_template if LATENCY_TEMPLATE.search(name)}
+    if timed:
+        names, raws = [], []
+        for name, raw in zip(template_column, message_column):
+            if name in timed:
+                names.append(name)
+                raws.append(raw)
+        durations = {}
+        for name, (value, unit) in zip(names, LATENCY_PATTERN.findall(b'\n'.join(raws))):
+            durations.setdefault(name, []).append(float(value) / 1000 if unit == b'ms' else float(value))
+        for name, values in durations.items():
+            summary['latency'][name.decode('utf-8', 'replace')] = _histogram(values)
+    return summary
+
+
+def _histogram(values):
+    """
+    Build a latency histogram (count, sum, max and counts per DEFAULT_BUCKETS bucket) from durations in seconds.
+    """
+    values.sort()
+    below = [bisect.bisect_right(values, bound) for bound in DEFAULT_BUCKETS] + [len(values)]
+    return {
+        'count': len(values),
+        'sum': math.fsum(values),
+        'max': values[-1],
+        'buckets': [count - previous for previous, count in zip([0] + below, below)],
+    }
+
+
+def latency_percentile(histogram, fraction):
+    """
+    Estimate a percentile from a latency histogram as the upper bound of the bucket holding it.
+
+    Args:
+        histogram (dict): A latency histogram from a summary.
+        fraction (float): The percentile as a fraction, e.g. 0.95.
+
+    Returns:
+        float: The estimate in seconds, never above the largest observation.
+    """
+    target = fraction * histogram['count']
+    seen = 0
+    for bound, count in zip(DEFAULT_BUCKETS, histogram['buckets']):
+        seen += count
+        if seen >= target and count:
+            return min(bound, histogram['max'])
+    return histogram['max']
+
+
+def _scan_task(task):
+    """
+    Unpack a (path, start, end) task for a worker process.
+    """
+    return scan_range(*task)
+
+
+class LogIndex:
+    """
+    A persistent index of one log file: per-chunk summaries keyed by byte offset and time.
+
+    The file is cut at line boundaries into chunks of about CHUNK_BYTES, each summarized once
+    by scan_range (in parallel worker processes when there are several) and saved as JSON next
+    to the logs. Later updates only scan the bytes appended since, merging a short trailing
+    chunk with the new bytes' summary, so tailing a growing log costs the size of the growth.
+    A file that shrinks, or whose first bytes or inode change (rotation), is re-indexed from
+    scratch. Queries over a time range reuse the summaries of chunks that fall inside it and
+    rescan only the chunks that straddle its bounds.
+    """
+
+    def __init__(self, path, index_path=None, workers=None):
+        """
+        Initialize the index, loading a saved one if present.
+
+        Args:
+            path (str): The log file.
+            index_path (str): Where to save the index (defaults to '.index/<name>.json' beside the log).
+            workers (int): Worker processes for scanning. Defaults to the CPU count.
+        """
+        self.path = path
+        self.index_path = index_path or os.path.join(os.path.dirname(path) or '.', '.index', os.path.basename(path) + '.json')
+        self.workers = workers or os.cpu_count() or 1
+        self._state = self._load()
+
+    @property
+    def size(self):
+        """
+        int: Bytes of the file covered by the index.
+        """
+        return self._state['end']
+
+    def update(self):
+        """
+        Bring the index up to date with the file, scanning only bytes not indexed yet.
+
+        Returns:
+            int: Number of bytes scanned.
+        """
+        if not os.path.exists(self.path):
+            raise LogAnalysisError(f"Log file not found: {self.path}")
+        size = os.path.getsize(self.path)
+        state = self._state
+        if state['end'] and not self._same_file(size):
+            logger.info(f"{self.path} was rotated or truncated; rebuilding its index.")
+            state = self._state = self._new_state()
+        if not state['head_digest'] and size:
+            state['head_length'] = min(size, HEAD_BYTES)
+            state['head_digest'] = self._head_digest(state['head_length'])
+        state['identity'] = self._identity()
+
+        ranges = self._ranges(state['end'], size)
+        if not ranges:
+            return 0
+        start = time.perf_counter()
+        if self.workers > 1 and len(ranges) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(ranges))) as pool:
+                summaries = list(pool.map(_scan_task, [(self.path, low, high) for low, high in ranges]))
+        else:
+            summaries = [scan_range(self.path, low, high) for low, high in ranges]
+
+        chunks = state['chunks']
+        for (low, high), summary in zip(ranges, summaries):
+            if chunks and chunks[-1]['end'] == low and high - chunks[-1]['start'] <= CHUNK_BYTES:
+                # Fold the new bytes into a short trailing chunk instead of adding a tiny one
+                chunks[-1] = self._chunk(chunks[-1]['start'], high, merge_summaries(
+                    [chunks[-1]['summary'], summary], TOP_MESSAGES_PER_CHUNK
+                ))
+            else:
+                chunks.append(self._chunk(low, high, summary))
+        scanned = ranges[-1][1] - state['end']
+        state['end'] = ranges[-1][1]
+        self._save()
+        logger.info(f"Indexed {scanned / 1e6:.1f} MB of {self.path} in {time.perf_counter() - start:.2f}s.")
+        return scanned
+
+    def summary(self, since=None, until=None):
+        """
+        Summarize the indexed part of the file, optionally within a time range.
+
+        Args:
+            since (str or datetime): Only count lines from this time on.
+            until (str or datetime): Only count lines up to this time (to the minute).
+
+        Returns:
+            dict: The summary (see empty_summary).
+        """
+        since, until = parse_minute(since), parse_minute(until)
+        summaries = []
+        for chunk in self._state['chunks']:
+            first, last = chunk['summary']['first'], chunk['summary']['last']
+            if first is None or (since and last < since) or (until and first > until):
+                continue
+            if (since and first < since) or (until and last > until):
+                summaries.append(scan_range(self.path, chunk['start'], chunk['end'], since, until))
+            else:
+                summaries.append(chunk['summary'])
+        return merge_summaries(summaries)
+
+    def _ranges(self, start, size):
+        """
+        Private helper that cuts [start, size) into chunk ranges ending at line boundaries.
+
+        A trailing partial line is left for the next update.
+        """
+        if size <= start:
+            return []
+        with open(self.path, 'rb') as handle:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                end = view.rfind(b'\n', start, size) + 1
+                ranges = []
+                while start < end:
+                    newline = view.find(b'\n', min(start + CHUNK_BYTES, end) - 1, end)
+                    stop = newline + 1 if newline >= 0 else end
+                    ranges.append((start, stop))
+                    start = stop
+        return ranges
+
+    @staticmethod
+    def _chunk(start, end, summary):
+        """
+        Private helper that builds an index entry for one chunk.
+        """
+        return {'start': start, 'end': end, 'summary': summary}
+
+    def _same_file(self, size):
+        """
+        Private helper that checks the file is the one that was indexed and has only grown.
+        """
+        state = self._state
+        if size < state['end'] or self._identity() != state['identity']:
+            return False
+        return self._head_digest(state['head_length']) == state['head_digest']
+
+    def _identity(self):
+        """
+        Private helper that returns the (device, inode) pair of the file.
+        """
+        stat = os.stat(self.path)
+        return [stat.st_dev, stat.st_ino]
+
+    def _head_digest(self, length):
+        """
+        Private helper that hashes the first ``length`` bytes of the file.
+        """
+        with open(self.path, 'rb') as handle:
+            return hashlib.blake2b(handle.read(length), digest_size=16).hexdigest()
+
+    def _new_state(self):
+        """
+        Private helper that returns the state of an empty index.
+        """
+        return {'version': INDEX_VERSION, 'identity': None, 'head_length': 0, 'head_digest': None, 'end': 0, 'chunks': []}
+
+    def _load(self):
+        """
+        Private helper that loads the saved index, or starts an empty one if it is missing or stale.
+        """
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as handle:
+                state = json.load(handle)
+            if state.get('version') == INDEX_VERSION:
+                return state
+        except (OSError, ValueError):
+            pass
+        return self._new_state()
+
+    def _save(self):
+        """
+        Private helper that writes the index atomically.
+        """
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        temporary = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as handle:
+            json.dump(self._state, handle, separators=(',', ':'))
+        os.replace(temporary, self.index_path)
+
+
+class LogAnalyzer:
+    """
+    Aggregate reports over every log file in a directory, backed by one LogIndex per file.
+    """
+
+    def __init__(self, log_dir='logs', pattern='*.log', workers=None):
+        """
+        Initialize the analyzer.
+
+        Args:
+            log_dir (str): Directory holding the logs.
+            pattern (str): Glob of the log files within ``log_dir``.
+            workers (int): Worker processes for scanning. Defaults to the CPU count.
+        """
+        self.log_dir = log_dir
+        self.pattern = pattern
+        self.workers = workers
+        self._indexes = {}
+
+    def files(self):
+        """
+        Return the log files currently in the directory, sorted by name.
+        """
+        return sorted(glob.glob(os.path.join(self.log_dir, self.pattern)))
+
+    def update(self):
+        """
+        Bring every file's index up to date.
+
+        Returns:
+            dict: Bytes scanned per file.
+        """
+        scanned = {}
+        for path in self.files():
+            if path not in self._indexes:
+                self._indexes[path] = LogIndex(path, workers=self.workers)
+            scanned[path] = self._indexes[path].update()
+        return scanned
+
+    def report(self, since=None, until=None, top=10, resolution='hour'):
+        """
+        Update the indexes and build an aggregate report.
+
+        Args:
+            since (str or datetime): Only count lines from this time on.
+            until (str or datetime): Only count lines up to this time (to the minute).
+            top (int): Number of entries in the top message and latency lists.
+            resolution (str): 'minute', 'hour' or 'day' buckets for the error rate timeline.
+
+        Returns:
+            dict: Per-file and overall line counts, levels and error rates, the error rate
+            timeline, the most frequent messages and errors, and latency statistics per message.
+        """
+        widths = {'minute': 16, 'hour': 13, 'day': 10}
+        if resolution not in widths:
+            raise LogAnalysisError(f"resolution must be one of {', '.join(widths)}.")
+        self.update()
+        files = {path: self._indexes[path].summary(since, until) for path in self.files()}
+        overall = merge_summaries(files.values())
+
+        timeline = {}
+        for minute, levels in overall['minutes'].items():
+            period = timeline.setdefault(minute[:widths[resolution]], Counter())
+            period.update(levels)
+
+        return {
+            'range': {'since': parse_minute(since), 'until': parse_minute(until)},
+            'first': overall['first'],
+            'last': overall['last'],
+            'lines': overall['lines'],
+            'levels': overall['levels'],
+            'error_rate': self._error_rate(overall['levels']),
+            'files': {
+                os.path.basename(path): {
+                    'bytes': self._indexes[path].size,
+                    'lines': summary['lines'],
+                    'levels': summary['levels'],
+                    'error_rate': self._error_rate(summary['levels']),
+                }
+                for path, summary in files.items()
+            },
+            'timeline': [
+                {'period': period, 'lines': sum(levels.values()), 'errors': self._errors(levels),
+                 'error_rate': self._error_rate(levels)}
+                for period, levels in sorted(timeline.items())
+            ],
+            'top_messages': self._top_messages(overall['messages'], top),
+            'top_errors': self._top_messages(
+                {level: templates for level, templates in overall['messages'].items() if level in ERROR_LEVELS}, top
+            ),
+            'latency': sorted(
+                (
+                    {'message': name, 'count': histogram['count'], 'mean': histogram['sum'] / histogram['count'],
+                     'p50': latency_percentile(histogram, 0.5), 'p95': latency_percentile(histogram, 0.95),
+                     'max': histogram['max']}
+                    for name, histogram in overall['latency'].items()
+                ),
+                key=lambda entry: -entry['count'],
+            )[:top],
+        }
+
+    def follow(self, interval=5.0, **report_options):
+        """
+        Tail the logs, yielding a fresh report whenever new lines have been written.
+
+        Args:
+            interval (float): Seconds between checks.
+            **report_options: Passed to report.
+
+        Yields:
+            dict: A report after each update that found new bytes.
+        """
+        yield self.report(**report_options)
+        while True:
+            time.sleep(interval)
+            if any(self.update().values()):
+                yield self.report(**report_options)
+
+    @staticmethod
+    def _errors(levels):
+        return sum(levels.get(level, 0) for level in ERROR_LEVELS)
+
+    @classmethod
+    def _error_rate(cls, levels):
+        total = sum(levels.values())
+        return cls._errors(levels) / total if total else 0.0
+
+    @staticmethod
+    def _top_messages(messages, top):
+        """
+        Private helper that lists the most frequent (level, template) pairs.
+        """
+        entries = [
+            {'level': level, 'message': name, 'count': count}
+            for level, templates in messages.items() for name, count in templates.items()
+        ]
+        return sorted(entries, key=lambda entry: -entry['count'])[:top]
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    # Example usage
+    analyzer = LogAnalyzer('logs')
+    print(json.dumps(analyzer.report(), indent=2))
@@ -0,0 +1,138 @@
+import argparse
+import json
+import logging
+
+from analytics.data_analysis import LogAnalyzer, LogAnalysisError
+
+logger = logging.getLogger(__name__)
+
+
+def format_text(report):
+    """
+    Render a LogAnalyzer report as plain text.
+
+    Args:
+        report (dict): A report from LogAnalyzer.report.
+
+    Returns:
+        str: The rendered report.
+    """
+    lines = [
+        f"Log report: {report['lines']} lines from {report['first'] or '-'} to {report['last'] or '-'}",
+        f"Error rate: {report['error_rate']:.2%}",
+        "",
+        "Files:",
+    ]
+    for name, entry in report['files'].items():
+        levels = ', '.join(f"{level} {count}" for level, count in sorted(entry['levels'].items()))
+        lines.append(
+            f"  {name}: {entry['bytes'] / 1e6:.1f} MB, {entry['lines']} lines, "
+            f"error rate {entry['error_rate']:.2%} ({levels or 'empty'})"
+        )
+
+    lines += ["", "Error rate timeline:"]
+    for period in report['timeline']:
+        lines.append(f"  {period['period']}: {period['errors']}/{period['lines']} ({period['error_rate']:.2%})")
+
+    for title, key in (("Top messages", 'top_messages'), ("Top errors", 'top_errors')):
+        lines += ["", f"{title}:"]
+        for entry in report[key]:
+            lines.append(f"  {entry['count']:>10}  {entry['level']:<8} {entry['message']}")
+
+    lines += ["", "Latency (seconds):"]
+    for entry in report['latency']:
+        lines.append(
+            f"  {entry['count']:>10}  mean {entry['mean']:.3f}  p50 {entry['p50']:.3f}  "
+            f"p95 {entry['p95']:.3f}  max {entry['max']:.3f}  {entry['message']}"
+        )
+    return '\n'.join(lines) + '\n'
+
+
+def format_markdown(report):
+    """
+    Render a LogAnalyzer report as Markdown tables.
+
+    Args:
+        report (dict): A report from LogAnalyzer.report.
+
+    Returns:
+        str: The rendered report.
+    """
+    def cell(value):
+        return str(value).replace('|', '\\|')
+
+    lines = [
+        "# Log report",
+        "",
+        f"{report['lines']} lines from {report['first'] or '-'} to {report['last'] or '-'}, "
+        f"error rate {report['error_rate']:.2%}.",
+        "",
+        "| File | MB | Lines | Error rate |",
+        "| --- | ---: | ---: | ---: |",
+    ]
+    for name, entry in report['files'].items():
+        lines.append(f"| {cell(name)} | {entry['bytes'] / 1e6:.1f} | {entry['lines']} | {entry['error_rate']:.2%} |")
+
+    lines += ["", "## Error rate timeline", "", "| Period | Lines | Errors | Error rate |", "| --- | ---: | ---: | ---: |"]
+    for period in report['timeline']:
+        lines.append(f"| {period['period']} | {period['lines']} | {period['errors']} | {period['error_rate']:.2%} |")
+
+    for title, key in (("Top messages", 'top_messages'), ("Top errors", 'top_errors')):
+        lines += ["", f"## {title}", "", "| Count | Level | Message |", "| ---: | --- | --- |"]
+        for entry in report[key]:
+            lines.append(f"| {entry['count']} | {entry['level']} | {cell(entry['message'])} |")
+
+    lines += ["", "## Latency (seconds)", "", "| Count | Mean | p50 | p95 | Max | Message |",
+              "| ---: | ---: | ---: | ---: | ---: | --- |"]
+    for entry in report['latency']:
+        lines.append(
+            f"| {entry['count']} | {entry['mean']:.3f} | {entry['p50']:.3f} | {entry['p95']:.3f} | "
+            f"{entry['max']:.3f} | {cell(entry['message'])} |"
+        )
+    return '\n'.join(lines) + '\n'
+
+
+FORMATTERS = {
+    'text': format_text,
+    'markdown': format_markdown,
+    'json': lambda report: json.dumps(report, indent=2) + '\n',
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report error rates, latencies and top messages from the logs.")
+    parser.add_argument("--logs", default="logs", help="Directory holding the log files.")
+    parser.add_argument("--pattern", default="*.log", help="Glob of the log files within the directory.")
+    parser.add_argument("--since", default=None, help="Only count lines from this time on (ISO 8601).")
+    parser.add_argument("--until", default=None, help="Only count lines up to this time (ISO 8601).")
+    parser.add_argument("--top", type=int, default=10, help="Entries in the top message and latency lists.")
+    parser.add_argument("--resolution", choices=('minute', 'hour', 'day'), default='hour', help="Timeline buckets.")
+    parser.add_argument("--format", choices=sorted(FORMATTERS), default='text', help="Output format.")
+    parser.add_argument("--output", default=None, help="Write the report to this file instead of stdout.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for scanning (default: CPU count).")
+    parser.add_argument("--follow", type=float, default=None, metavar="SECONDS",
+                        help="Keep tailing the logs, printing a new report when they grow.")
+    args = parser.parse_args()
+
+    analyzer = LogAnalyzer(args.logs, args.pattern, args.workers)
+    options = {'since': args.since, 'until': args.until, 'top': args.top, 'resolution': args.resolution}
+    try:
+        reports = analyzer.follow(args.follow, **options) if args.follow else [analyzer.report(**options)]
+        for report in reports:
+            rendered = FORMATTERS[args.format](report)
+            if args.output:
+                with open(args.output, 'w', encoding='utf-8') as handle:
+                    handle.write(rendered)
+                logger.info(f"Report written to {args.output}.")
+            else:
+                print(rendered, end='', flush=True)
+    except LogAnalysisError as e:
+        logger.error(f"Log analysis error: {e}")
+        raise SystemExit(1)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
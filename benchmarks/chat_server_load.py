@@ -0,0 +1,120 @@
+import argparse
+import asyncio
+import statistics
+import time
+import logging
+
+from ai_models.chat_model import ChatModel, ChatModelError
+from ai_models.chat_server import ChatBatchScheduler
+from benchmarks.chat_sessions import synthetic_turns
+
+logger = logging.getLogger(__name__)
+
+
+def percentile(values, fraction):
+    """
+    Return the value at the given fraction (0-1) of the sorted values.
+    """
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+async def _client(scheduler, prompts, new_tokens, latencies):
+    """
+    A closed-loop client that sends its prompts one after another and records each latency.
+    """
+    for history, user_input in prompts:
+        start = time.perf_counter()
+        await scheduler.generate(history, user_input, new_tokens)
+        latencies.append(time.perf_counter() - start)
+
+
+async def _load(scheduler, prompts, concurrency, new_tokens):
+    """
+    Spread the prompts over ``concurrency`` clients and run them against the scheduler.
+    """
+    latencies = []
+    await asyncio.gather(*[
+        _client(scheduler, prompts[i::concurrency], new_tokens, latencies) for i in range(concurrency)
+    ])
+    return latencies
+
+
+def run_load(chat_model, prompts, concurrency, new_tokens, max_batch_size):
+    """
+    Run a load test against a ChatBatchScheduler.
+
+    Args:
+        chat_model (ChatModel): The model to serve.
+        prompts (list of tuple): (conversation_history, user_input) pairs.
+        concurrency (int): Number of concurrent clients.
+        new_tokens (int): Maximum number of tokens to generate per request.
+        max_batch_size (int): Scheduler batch size (1 serves requests sequentially).
+
+    Returns:
+        dict: Throughput in tokens per second and p50/p99 request latency in milliseconds.
+    """
+    with ChatBatchScheduler(chat_model, max_batch_size=max_batch_size) as scheduler:
+        start = time.perf_counter()
+        latencies = asyncio.run(_load(scheduler, prompts, concurrency, new_tokens))
+        elapsed = time.perf_counter() - start
+        tokens = scheduler.stats()['tokens_generated']
+    return {
+        'max_batch_size': max_batch_size,
+        'requests': len(latencies),
+        'tokens_per_sec': tokens / elapsed,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'mean_ms': statistics.mean(latencies) * 1000,
+    }
+
+
+def benchmark_chat_server(chat_model, requests=64, concurrency=16, new_tokens=32, max_batch_size=8):
+    """
+    Compare sequential serving with continuous batching under the same concurrent load.
+
+    Args:
+        chat_model (ChatModel): The model to serve.
+        requests (int): Total number of requests.
+        concurrency (int): Number of concurrent clients.
+        new_tokens (int): Maximum number of tokens to generate per request.
+        max_batch_size (int): Batch size for the continuous-batching run.
+
+    Returns:
+        dict: Load-test results for the sequential and batched runs.
+    """
+    turns = synthetic_turns(requests * 2)
+    prompts = list(zip(turns[::2], turns[1::2]))
+    return {
+        'sequential': run_load(chat_model, prompts, concurrency, new_tokens, max_batch_size=1),
+        'batched': run_load(chat_model, prompts, concurrency, new_tokens, max_batch_size=max_batch_size),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the continuous-batching chat scheduler.")
+    parser.add_argument("--model", default="gpt2", help="Model name or local checkpoint path.")
+    parser.add_argument("--requests", type=int, default=64, help="Total number of requests.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Number of concurrent clients.")
+    parser.add_argument("--new-tokens", type=int, default=32, help="Maximum tokens generated per request.")
+    parser.add_argument("--batch-size", type=int, default=8, help="Maximum batch size for the batched run.")
+    parser.add_argument("--device", default=None, help="Device to run on ('cpu' or 'cuda').")
+    args = parser.parse_args()
+
+    try:
+        chat_model = ChatModel(model_name=args.model, device=args.device)
+        report = benchmark_chat_server(chat_model, args.requests, args.concurrency, args.new_tokens, args.batch_size)
+    except ChatModelError as e:
+        logger.error(f"ChatModel error: {e}")
+        raise SystemExit(1)
+
+    for name, result in report.items():
+        print(
+            f"{name:>10} (batch {result['max_batch_size']}): {result['tokens_per_sec']:.1f} tokens/sec, "
+            f"p50 {result['p50_ms']:.1f} ms, p99 {result['p99_ms']:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
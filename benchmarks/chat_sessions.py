@@ -0,0 +1,150 @@
+import argparse
+import random
+import statistics
+import time
+import logging
+
+from ai_models.chat_model import ChatModel, ChatModelError
+
+logger = logging.getLogger(__name__)
+
+WORDS = "how what why when is the weather order delivery refund price today my account help please thanks".split()
+
+
+def synthetic_turns(count, min_words=3, max_words=10, seed=0):
+    """
+    Generate reproducible synthetic user turns.
+
+    Args:
+        count (int): Number of turns to generate.
+        min_words (int): Minimum number of words per turn.
+        max_words (int): Maximum number of words per turn.
+        seed (int): Random seed.
+
+    Returns:
+        list: The generated user inputs.
+    """
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))).capitalize() + "?"
+        for _ in range(count)
+    ]
+
+
+def run_full_history(chat_model, turns, new_tokens):
+    """
+    Run a conversation through generate_response, re-encoding the full history every turn.
+
+    Args:
+        chat_model (ChatModel): The model to benchmark.
+        turns (list of str): The user inputs.
+        new_tokens (int): Number of tokens to generate per turn.
+
+    Returns:
+        list: Per-turn latencies in seconds (shorter than ``turns`` if the context overflowed).
+    """
+    eos = chat_model.tokenizer.eos_token
+    history = ""
+    latencies = []
+    for user_input in turns:
+        prompt_length = len(chat_model.tokenizer.encode(f"{history} {eos} {user_input} {eos}"))
+        start = time.perf_counter()
+        try:
+            response = chat_model.generate_response(history, user_input, max_length=prompt_length + new_tokens)
+        except ChatModelError as e:
+            logger.warning(f"Full-history path failed after {len(latencies)} turns: {e}")
+            break
+        latencies.append(time.perf_counter() - start)
+        history = f"{history} {eos} {user_input} {eos} {response}"
+    return latencies
+
+
+def run_session(chat_model, turns, new_tokens):
+    """
+    Run a conversation through a ChatSession that reuses the KV cache between turns.
+
+    Args:
+        chat_model (ChatModel): The model to benchmark.
+        turns (list of str): The user inputs.
+        new_tokens (int): Number of tokens to generate per turn.
+
+    Returns:
+        list: Per-turn latencies in seconds.
+    """
+    session = chat_model.start_session()
+    latencies = []
+    for user_input in turns:
+        start = time.perf_counter()
+        session.send(user_input, max_new_tokens=new_tokens)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def summarize(latencies, edge=10):
+    """
+    Summarize per-turn latencies, contrasting early and late turns.
+
+    Args:
+        latencies (list of float): Per-turn latencies in seconds.
+        edge (int): Number of turns averaged at each end of the conversation.
+
+    Returns:
+        dict: Turn count and mean latency (ms) overall, for the first turns and for the last turns.
+    """
+    if not latencies:
+        return {'turns': 0, 'mean_ms': None, 'first_ms': None, 'last_ms': None}
+    return {
+        'turns': len(latencies),
+        'mean_ms': statistics.mean(latencies) * 1000,
+        'first_ms': statistics.mean(latencies[:edge]) * 1000,
+        'last_ms': statistics.mean(latencies[-edge:]) * 1000,
+    }
+
+
+def benchmark_chat_sessions(chat_model, turns=50, new_tokens=16):
+    """
+    Compare per-turn latency of full-history generation and KV-cached sessions.
+
+    Args:
+        chat_model (ChatModel): The model to benchmark.
+        turns (int): Number of conversation turns.
+        new_tokens (int): Number of tokens to generate per turn.
+
+    Returns:
+        dict: Latency summaries for both paths.
+    """
+    user_turns = synthetic_turns(turns)
+    return {
+        'full_history': summarize(run_full_history(chat_model, user_turns, new_tokens)),
+        'session': summarize(run_session(chat_model, user_turns, new_tokens)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-turn ChatModel latency over long conversations.")
+    parser.add_argument("--model", default="gpt2", help="Model name or local checkpoint path.")
+    parser.add_argument("--turns", type=int, default=50, help="Number of conversation turns.")
+    parser.add_argument("--new-tokens", type=int, default=16, help="Tokens generated per turn.")
+    parser.add_argument("--device", default=None, help="Device to run on ('cpu' or 'cuda').")
+    args = parser.parse_args()
+
+    try:
+        chat_model = ChatModel(model_name=args.model, device=args.device)
+        report = benchmark_chat_sessions(chat_model, args.turns, args.new_tokens)
+    except ChatModelError as e:
+        logger.error(f"ChatModel error: {e}")
+        raise SystemExit(1)
+
+    for name, summary in report.items():
+        if not summary['turns']:
+            print(f"{name:>13}: no completed turns")
+            continue
+        print(
+            f"{name:>13}: {summary['turns']} turns, mean {summary['mean_ms']:.1f} ms, "
+            f"first 10 {summary['first_ms']:.1f} ms, last 10 {summary['last_ms']:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
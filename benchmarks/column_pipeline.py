@@ -0,0 +1,112 @@
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+import logging
+
+from tools.formatter import Formatter
+from tools.column_pipeline import ColumnPipeline, pd
+
+logger = logging.getLogger(__name__)
+
+# Normalization applied to the synthetic users table
+USERS_SPEC = {
+    'name': ['strip', 'title'],
+    'email': ['strip', 'lower'],
+    'country': ['upper'],
+    'signup_date': [('datetime', {'current_format': '%d/%m/%Y %H:%M', 'target_format': '%Y-%m-%d %H:%M:%S'})],
+}
+
+
+def write_synthetic_users(path, rows, seed=0):
+    """
+    Write a reproducible users CSV with messy casing, padding and day-first dates.
+
+    Args:
+        path (str): Output path.
+        rows (int): Number of rows.
+        seed (int): Random seed.
+    """
+    rng = random.Random(seed)
+    first_names = ['ada', 'GRACE', 'alan', 'Linus', 'margaret', 'KEN', 'barbara', 'dennis']
+    with open(path, 'w', newline='', encoding='utf-8') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(['id', 'name', 'email', 'country', 'signup_date'])
+        for i in range(rows):
+            name = rng.choice(first_names)
+            writer.writerow([
+                i,
+                f"  {name} {rng.choice(first_names)}lace ",
+                f" {name.upper()}{i}@Example.COM",
+                rng.choice(['us', 'de', 'fr', 'jp', 'br']),
+                f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{rng.randint(2015, 2024)} {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}",
+            ])
+
+
+def per_cell_loop(input_path, output_path):
+    """
+    The baseline: read row by row and call the Formatter methods on every cell.
+    """
+    with open(input_path, newline='', encoding='utf-8') as source, open(output_path, 'w', newline='', encoding='utf-8') as target:
+        reader = csv.DictReader(source)
+        writer = csv.DictWriter(target, fieldnames=reader.fieldnames)
+        writer.writeheader()
+        for row in reader:
+            row['name'] = Formatter.format_string(row['name'].strip(), 'title')
+            row['email'] = Formatter.format_string(row['email'].strip(), 'lower')
+            row['country'] = Formatter.format_string(row['country'], 'upper')
+            row['signup_date'] = Formatter.format_datetime(row['signup_date'], '%d/%m/%Y %H:%M')
+            writer.writerow(row)
+
+
+def benchmark_column_pipeline(rows, chunk_size):
+    """
+    Compare the per-cell Formatter loop with the column pipeline on each available backend.
+
+    Args:
+        rows (int): Number of synthetic rows.
+        chunk_size (int): Rows per chunk for the pipeline.
+
+    Returns:
+        dict: Rows per second per path, and whether every output matched the baseline.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        input_path = os.path.join(directory, 'users_raw.csv')
+        write_synthetic_users(input_path, rows)
+        paths = {'per-cell loop': lambda output: per_cell_loop(input_path, output)}
+        for backend in ['python'] + (['pandas'] if pd is not None else []):
+            paths[f"ColumnPipeline ({backend})"] = (
+                lambda output, backend=backend: ColumnPipeline(USERS_SPEC, backend=backend).run(input_path, output, chunk_size)
+            )
+
+        report, outputs = {}, []
+        for name, run in paths.items():
+            output = os.path.join(directory, f"{len(outputs)}.csv")
+            start = time.perf_counter()
+            run(output)
+            report[name] = rows / (time.perf_counter() - start)
+            with open(output, encoding='utf-8') as handle:
+                outputs.append(handle.read())
+        report['outputs_match'] = all(output == outputs[0] for output in outputs)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the column pipeline against a per-cell Formatter loop.")
+    parser.add_argument("--rows", type=int, default=200000, help="Number of synthetic rows.")
+    parser.add_argument("--chunk-size", type=int, default=50000, help="Rows per pipeline chunk.")
+    args = parser.parse_args()
+
+    report = benchmark_column_pipeline(args.rows, args.chunk_size)
+    matches = report.pop('outputs_match')
+    baseline = next(iter(report.values()))
+    for name, rate in report.items():
+        print(f"{name:<28} {rate:>10.0f} rows/sec  ({rate / baseline:.1f}x)")
+    print(f"outputs identical: {matches}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
@@ -0,0 +1,117 @@
+import argparse
+import time
+import logging
+
+import torch
+
+from ai_models.review_model import ReviewModel, ReviewModelError
+from ai_models.chat_model import ChatModel, ChatModelError
+from ai_models.cpu_optimization import model_size_mb
+from benchmarks.review_batching import synthetic_reviews
+from benchmarks.chat_sessions import synthetic_turns
+
+logger = logging.getLogger(__name__)
+
+
+def _timed(fn):
+    """
+    Call ``fn`` and return its result together with the elapsed wall time in seconds.
+    """
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def review_report(model_name, reviews=256, batch_size=32, num_threads=None):
+    """
+    Compare an fp32 ReviewModel with its int8-optimized counterpart.
+
+    Args:
+        model_name (str): Model name or local checkpoint path.
+        reviews (int): Number of synthetic reviews to classify.
+        batch_size (int): Batch size used for classification.
+        num_threads (int): Intra-op thread count for the optimized model.
+
+    Returns:
+        dict: Label agreement, confidence deltas, throughput and model size for both variants.
+    """
+    texts = synthetic_reviews(reviews)
+    baseline = ReviewModel(model_name=model_name, device='cpu')
+    optimized = ReviewModel(model_name=model_name, device='cpu')
+    optimized.optimize_for_cpu(num_threads=num_threads)
+
+    fp32, fp32_elapsed = _timed(lambda: list(baseline.classify_reviews(texts, batch_size=batch_size)))
+    int8, int8_elapsed = _timed(lambda: list(optimized.classify_reviews(texts, batch_size=batch_size)))
+    deltas = [abs(a['confidence'] - b['confidence']) for a, b in zip(fp32, int8)]
+    return {
+        'label_agreement': sum(a['label'] == b['label'] for a, b in zip(fp32, int8)) / len(texts),
+        'mean_confidence_delta': sum(deltas) / len(deltas),
+        'max_confidence_delta': max(deltas),
+        'fp32_reviews_per_sec': len(texts) / fp32_elapsed,
+        'int8_reviews_per_sec': len(texts) / int8_elapsed,
+        'fp32_size_mb': model_size_mb(baseline.model),
+        'int8_size_mb': model_size_mb(optimized.model),
+    }
+
+
+def chat_report(model_name, prompts=64, num_threads=None):
+    """
+    Compare next-token predictions and forward latency of an fp32 ChatModel and its int8 counterpart.
+
+    Args:
+        model_name (str): Model name or local checkpoint path.
+        prompts (int): Number of synthetic prompts.
+        num_threads (int): Intra-op thread count for the optimized model.
+
+    Returns:
+        dict: Top-1 next-token agreement, logit deltas, forward latency and model size for both variants.
+    """
+    baseline = ChatModel(model_name=model_name, device='cpu')
+    optimized = ChatModel(model_name=model_name, device='cpu')
+    optimized.optimize_for_cpu(num_threads=num_threads)
+
+    agreement, deltas, fp32_elapsed, int8_elapsed = 0, [], 0.0, 0.0
+    with torch.inference_mode():
+        for prompt in synthetic_turns(prompts):
+            input_ids = torch.tensor([baseline._encode(prompt)])
+            fp32, elapsed = _timed(lambda: baseline.model(input_ids).logits[0, -1])
+            fp32_elapsed += elapsed
+            int8, elapsed = _timed(lambda: optimized.model(input_ids).logits[0, -1])
+            int8_elapsed += elapsed
+            agreement += int(fp32.argmax() == int8.argmax())
+            deltas.append((fp32 - int8).abs().max().item())
+    return {
+        'top1_agreement': agreement / prompts,
+        'max_logit_delta': max(deltas),
+        'fp32_forward_ms': fp32_elapsed / prompts * 1000,
+        'int8_forward_ms': int8_elapsed / prompts * 1000,
+        'fp32_size_mb': model_size_mb(baseline.model),
+        'int8_size_mb': model_size_mb(optimized.model),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report accuracy and latency of int8 CPU optimization.")
+    parser.add_argument("--review-model", default="bert-base-uncased", help="ReviewModel name or path.")
+    parser.add_argument("--chat-model", default="gpt2", help="ChatModel name or path.")
+    parser.add_argument("--threads", type=int, default=None, help="Intra-op thread count.")
+    args = parser.parse_args()
+
+    try:
+        reports = {
+            'review': review_report(args.review_model, num_threads=args.threads),
+            'chat': chat_report(args.chat_model, num_threads=args.threads),
+        }
+    except (ReviewModelError, ChatModelError) as e:
+        logger.error(f"Model error: {e}")
+        raise SystemExit(1)
+
+    for name, report in reports.items():
+        print(f"[{name}]")
+        for key, value in report.items():
+            print(f"  {key:<24} {value:.4f}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
@@ -0,0 +1,139 @@
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import tempfile
+import time
+import logging
+
+from src.database import ResultStore, review_row
+from benchmarks.review_batching import synthetic_reviews
+
+logger = logging.getLogger(__name__)
+
+LABELS = ('negative', 'neutral', 'positive')
+
+
+def synthetic_rows(count, seed=0):
+    """
+    Build reproducible review result rows, created one second apart.
+
+    Args:
+        count (int): Number of rows.
+        seed (int): Random seed.
+
+    Returns:
+        list: Rows for ResultStore.
+    """
+    rng = random.Random(seed)
+    texts = synthetic_reviews(min(count, 10000), min_words=5, max_words=40, seed=seed)
+    start = 1.7e9
+    return [
+        review_row(f"{texts[i % len(texts)]} #{i}", {'label': rng.choice(LABELS), 'confidence': rng.random()},
+                   'bert-base-uncased', created=start + i)
+        for i in range(count)
+    ]
+
+
+def _timed_store(directory, name, write):
+    """
+    Time ``write(store)`` against a fresh store, including the final flush and close.
+
+    Returns:
+        tuple: (seconds, row count in the store).
+    """
+    store = ResultStore(os.path.join(directory, f"{name}.db"))
+    start = time.perf_counter()
+    write(store)
+    store.flush()
+    elapsed = time.perf_counter() - start
+    rows = store.count()
+    store.close()
+    return elapsed, rows
+
+
+async def _submit_all(store, rows):
+    """
+    Submit rows from a coroutine, as an async web tier would.
+    """
+    for row in rows:
+        await store.submit_async(row)
+    await store.flush_async()
+
+
+def benchmark_database_writes(rows=1000000, per_row_rows=None, batch_size=10000):
+    """
+    Compare per-row inserts with executemany bulk writes and the buffered background writer.
+
+    Args:
+        rows (int): Rows written by the bulk and buffered paths.
+        per_row_rows (int): Rows written one transaction each (defaults to ``rows``).
+        batch_size (int): Rows per executemany call.
+
+    Returns:
+        dict: Rows per second for each path, the speedups over per-row writes, and query timings.
+    """
+    data = synthetic_rows(rows)
+    per_row_rows = per_row_rows or rows
+    directory = tempfile.mkdtemp(prefix='result-store-')
+    try:
+        def per_row(store):
+            for row in data[:per_row_rows]:
+                store.insert(row)
+
+        def bulk(store):
+            for start in range(0, len(data), batch_size):
+                store.insert_many(data[start:start + batch_size])
+
+        results = {'rows': rows, 'per_row_rows': per_row_rows}
+        for name, write in (
+            ('per_row', per_row),
+            ('bulk', bulk),
+            ('buffered', lambda store: store.submit_many(data)),
+            ('buffered_async', lambda store: asyncio.run(_submit_all(store, data))),
+        ):
+            elapsed, written = _timed_store(directory, name, write)
+            expected = per_row_rows if name == 'per_row' else rows
+            if written != expected:
+                raise RuntimeError(f"{name} wrote {written} rows, expected {expected}.")
+            results[f'{name}_rows_per_sec'] = written / elapsed
+        for name in ('bulk', 'buffered', 'buffered_async'):
+            results[f'{name}_speedup'] = results[f'{name}_rows_per_sec'] / results['per_row_rows_per_sec']
+
+        with ResultStore(os.path.join(directory, 'bulk.db')) as store:
+            middle = data[len(data) // 2]
+            queries = {
+                'label_hour': lambda: store.find(label='positive', since=middle[-1], until=middle[-1] + 3600, limit=None),
+                'input_hash': lambda: store.find(input_hash=middle[2]),
+                'label_counts': lambda: store.label_counts(),
+            }
+            for name, query in queries.items():
+                start = time.perf_counter()
+                query()
+                results[f'query_{name}_ms'] = (time.perf_counter() - start) * 1000
+        return results
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-row vs bulk writes to the result store.")
+    parser.add_argument("--rows", type=int, default=1000000, help="Rows written by the bulk and buffered paths.")
+    parser.add_argument("--per-row-rows", type=int, default=None, help="Rows written one per transaction (default: --rows).")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Rows per executemany call.")
+    args = parser.parse_args()
+
+    result = benchmark_database_writes(args.rows, args.per_row_rows, args.batch_size)
+    print(f"Per-row inserts:  {result['per_row_rows_per_sec']:,.0f} rows/sec ({result['per_row_rows']} rows)")
+    for name, title in (('bulk', 'Bulk executemany'), ('buffered', 'Buffered writer'), ('buffered_async', 'Buffered, async')):
+        print(f"{title + ':':<17} {result[f'{name}_rows_per_sec']:,.0f} rows/sec ({result[f'{name}_speedup']:.1f}x)")
+    print(
+        f"Queries: label + hour {result['query_label_hour_ms']:.1f} ms, input hash {result['query_input_hash_ms']:.2f} ms, "
+        f"label counts {result['query_label_counts_ms']:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
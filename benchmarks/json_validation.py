@@ -0,0 +1,121 @@
+import argparse
+import random
+import time
+import logging
+
+import jsonschema
+
+from tools.validator import Validator, fastjsonschema
+
+logger = logging.getLogger(__name__)
+
+TRANSACTION_SCHEMA = {
+    '$schema': 'http://json-schema.org/draft-07/schema#',
+    'type': 'object',
+    'properties': {
+        'transaction_id': {'type': 'string', 'pattern': '^txn-[0-9]+$'},
+        'user_id': {'type': 'integer', 'minimum': 1},
+        'amount': {'type': 'number', 'minimum': 0},
+        'currency': {'type': 'string', 'enum': ['USD', 'EUR', 'GBP']},
+        'timestamp': {'type': 'string'},
+        'items': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'properties': {'sku': {'type': 'string'}, 'quantity': {'type': 'integer', 'minimum': 1}},
+                'required': ['sku', 'quantity'],
+            },
+        },
+    },
+    'required': ['transaction_id', 'user_id', 'amount', 'currency'],
+}
+
+
+def synthetic_transactions(count, invalid_ratio=0.01, seed=0):
+    """
+    Generate reproducible synthetic transaction records, a fraction of them invalid.
+
+    Args:
+        count (int): Number of records to generate.
+        invalid_ratio (float): Fraction of records with a schema violation.
+        seed (int): Random seed.
+
+    Returns:
+        list: The generated records.
+    """
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        record = {
+            'transaction_id': f"txn-{i}",
+            'user_id': rng.randint(1, 10000),
+            'amount': round(rng.uniform(1, 500), 2),
+            'currency': rng.choice(['USD', 'EUR', 'GBP']),
+            'timestamp': f"2024-09-{rng.randint(1, 30):02d} {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00",
+            'items': [{'sku': f"sku-{rng.randint(1, 999)}", 'quantity': rng.randint(1, 5)} for _ in range(rng.randint(1, 4))],
+        }
+        if rng.random() < invalid_ratio:
+            record['amount'] = -record['amount']
+        records.append(record)
+    return records
+
+
+def _per_record(validate, records):
+    """
+    Validate records one call at a time, counting failures instead of stopping.
+    """
+    failures = 0
+    for record in records:
+        try:
+            validate(record)
+        except Exception:
+            failures += 1
+    return failures
+
+
+def benchmark_json_validation(records, schema=TRANSACTION_SCHEMA):
+    """
+    Compare uncached, cached and bulk JSON schema validation throughput.
+
+    Args:
+        records (list of dict): The records to validate.
+        schema (dict): The JSON schema.
+
+    Returns:
+        dict: Records per second for each path.
+    """
+    paths = {
+        'jsonschema.validate (uncached)': lambda: _per_record(lambda r: jsonschema.validate(r, schema), records),
+    }
+    for backend in ['jsonschema'] + (['fastjsonschema'] if fastjsonschema is not None else []):
+        paths[f"validate_json ({backend}, cached)"] = (
+            lambda backend=backend: _per_record(lambda r: Validator.validate_json(r, schema), records)
+        )
+        paths[f"validate_json_many ({backend})"] = lambda: len(Validator.validate_json_many(records, schema))
+
+    report = {}
+    for name, run in paths.items():
+        backend = 'fastjsonschema' if 'fastjsonschema' in name else 'jsonschema'
+        Validator.json_schema_backend = backend
+        Validator.clear_json_schema_cache()
+        start = time.perf_counter()
+        run()
+        report[name] = len(records) / (time.perf_counter() - start)
+    Validator.json_schema_backend = 'auto'
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON schema validation throughput.")
+    parser.add_argument("--records", type=int, default=5000, help="Number of synthetic records.")
+    args = parser.parse_args()
+
+    report = benchmark_json_validation(synthetic_transactions(args.records))
+    baseline = next(iter(report.values()))
+    for name, rate in report.items():
+        print(f"{name:<38} {rate:>12.0f} records/sec  ({rate / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
@@ -0,0 +1,146 @@
+import argparse
+import os
+import random
+import re
+import shutil
+import tempfile
+import time
+import logging
+from collections import Counter
+from datetime import datetime, timedelta
+
+from analytics.data_analysis import LogAnalyzer
+
+logger = logging.getLogger(__name__)
+
+MESSAGES = (
+    ('INFO', "Model '{model}' with 3 labels loaded successfully on cpu."),
+    ('INFO', "Classified {count} reviews in {seconds:.3f}s."),
+    ('INFO', "Transformed {count} rows in {seconds:.2f}s ({rate} rows/sec)."),
+    ('DEBUG', "Cache lookup for key {key} took {ms:.1f} ms."),
+    ('WARNING', "Review batch server queue at {count} requests."),
+    ('ERROR', "Review classification failed: CUDA out of memory (tried to allocate {count} MiB)"),
+    ('ERROR', "JSON validation failed for record {count}: 'rating' is a required property"),
+    ('CRITICAL', "Worker {count} exited unexpectedly."),
+)
+
+# Relative frequency of each message above
+WEIGHTS = (2, 40, 10, 40, 4, 2, 2, 0.1)
+
+
+def synthetic_log(path, megabytes, start=datetime(2024, 1, 1), seed=0):
+    """
+    Write a reproducible log in the '%(asctime)s - %(levelname)s - %(message)s' format.
+
+    Args:
+        path (str): Output file (appended to).
+        megabytes (float): Approximate size to write.
+        start (datetime): Timestamp of the first line; lines are 10 ms apart.
+        seed (int): Random seed.
+
+    Returns:
+        datetime: The timestamp after the last line, to continue from.
+    """
+    rng = random.Random(seed)
+    target = int(megabytes * 1e6)
+    written = 0
+    moment = start
+    step = timedelta(milliseconds=10)
+    with open(path, 'a', encoding='utf-8') as handle:
+        while written < target:
+            lines = []
+            for level, message in rng.choices(MESSAGES, WEIGHTS, k=1000):
+                text = message.format(
+                    model='bert-base-uncased', count=rng.randint(1, 512), seconds=rng.expovariate(10),
+                    rate=rng.randint(1000, 90000), key=f"{rng.getrandbits(64):016x}", ms=rng.expovariate(1),
+                )
+                stamp = moment.strftime('%Y-%m-%d %H:%M:%S') + f",{moment.microsecond // 1000:03d}"
+                lines.append(f"{stamp} - {level} - {text}\n")
+                moment += step
+            chunk = ''.join(lines)
+            handle.write(chunk)
+            written += len(chunk)
+    return moment
+
+
+def readline_baseline(path):
+    """
+    The naive approach: read the log line by line and parse each line with a regular expression.
+
+    Returns:
+        Counter: Lines per level.
+    """
+    pattern = re.compile(r'^\S+ \S+ - ([A-Z]+) - ')
+    levels = Counter()
+    with open(path, 'r', encoding='utf-8') as handle:
+        for line in handle:
+            match = pattern.match(line)
+            if match:
+                levels[match.group(1)] += 1
+    return levels
+
+
+def benchmark_log_analytics(megabytes=256, workers=None, tail_megabytes=4):
+    """
+    Time a cold index, a warm report, an incremental tail update and a line-by-line baseline.
+
+    Args:
+        megabytes (float): Size of the synthetic log.
+        workers (int): Worker processes for the parallel cold index (defaults to the CPU count).
+        tail_megabytes (float): Size of the data appended before the tail update.
+
+    Returns:
+        dict: Seconds taken by each step, and whether all paths agree on the level counts.
+    """
+    directory = tempfile.mkdtemp(prefix='log-analytics-')
+    try:
+        path = os.path.join(directory, 'session.log')
+        resume = synthetic_log(path, megabytes)
+        results = {'megabytes': os.path.getsize(path) / 1e6}
+
+        start = time.perf_counter()
+        baseline = readline_baseline(path)
+        results['readline_seconds'] = time.perf_counter() - start
+
+        for name, count in (('serial', 1), ('parallel', workers or os.cpu_count() or 1)):
+            shutil.rmtree(os.path.join(directory, '.index'), ignore_errors=True)
+            start = time.perf_counter()
+            report = LogAnalyzer(directory, workers=count).report()
+            results[f'cold_{name}_seconds'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        warm = LogAnalyzer(directory).report()
+        results['warm_seconds'] = time.perf_counter() - start
+
+        synthetic_log(path, tail_megabytes, start=resume, seed=1)
+        start = time.perf_counter()
+        tailed = LogAnalyzer(directory).report()
+        results['tail_seconds'] = time.perf_counter() - start
+
+        results['agree'] = report['levels'] == warm['levels'] == dict(baseline)
+        results['tail_lines'] = tailed['lines'] - report['lines']
+        return results
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the memory-mapped log analytics engine.")
+    parser.add_argument("--megabytes", type=float, default=256, help="Size of the synthetic log.")
+    parser.add_argument("--tail-megabytes", type=float, default=4, help="Data appended before the tail update.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    args = parser.parse_args()
+
+    result = benchmark_log_analytics(args.megabytes, args.workers, args.tail_megabytes)
+    print(f"Log size:          {result['megabytes']:.0f} MB")
+    print(f"Readline baseline: {result['readline_seconds']:.2f}s (level counts only)")
+    print(f"Cold, 1 worker:    {result['cold_serial_seconds']:.2f}s")
+    print(f"Cold, parallel:    {result['cold_parallel_seconds']:.2f}s")
+    print(f"Warm report:       {result['warm_seconds']:.3f}s")
+    print(f"Tail update:       {result['tail_seconds']:.3f}s ({result['tail_lines']} new lines)")
+    print(f"Level counts agree: {result['agree']}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
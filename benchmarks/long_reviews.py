@@ -0,0 +1,94 @@
+import argparse
+import time
+import logging
+from collections import Counter
+
+from ai_models.review_model import ReviewModel, ReviewModelError
+from benchmarks.review_batching import synthetic_reviews
+
+logger = logging.getLogger(__name__)
+
+
+def classify_chunks_one_by_one(model, reviews, window_size=512, overlap=128):
+    """
+    The naive long-review baseline: decode each token window back to text and classify it on its own.
+
+    Each review's label is the majority label of its windows.
+
+    Args:
+        model (ReviewModel): The model to use.
+        reviews (list of str): The review texts.
+        window_size (int): Tokens per window, special tokens included.
+        overlap (int): Tokens shared by consecutive windows.
+
+    Returns:
+        list: The label of each review.
+    """
+    labels = []
+    for ids in model._encode_full(reviews):
+        chunks = model._split_windows(ids, window_size - 2, overlap)
+        votes = Counter(model.classify_review(model.tokenizer.decode(chunk))['label'] for chunk in chunks)
+        labels.append(votes.most_common(1)[0][0])
+    return labels
+
+
+def benchmark_long_reviews(model, reviews, batch_size=32, window_size=512, overlap=128):
+    """
+    Compare per-window classification with packed sliding-window batches on long reviews.
+
+    Args:
+        model (ReviewModel): The model to benchmark.
+        reviews (list of str): The reviews to classify.
+        batch_size (int): Windows per forward pass for the packed path.
+        window_size (int): Tokens per window, special tokens included.
+        overlap (int): Tokens shared by consecutive windows.
+
+    Returns:
+        dict: Reviews per second for both paths, the speedup, windows scored and label agreement.
+    """
+    start = time.perf_counter()
+    naive = classify_chunks_one_by_one(model, reviews, window_size, overlap)
+    naive_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    packed = list(model.classify_long_reviews(reviews, batch_size, window_size, overlap, aggregation='mean'))
+    packed_elapsed = time.perf_counter() - start
+
+    return {
+        'reviews': len(reviews),
+        'windows': sum(result['windows'] for result in packed),
+        'naive_reviews_per_sec': len(reviews) / naive_elapsed,
+        'packed_reviews_per_sec': len(reviews) / packed_elapsed,
+        'speedup': naive_elapsed / packed_elapsed,
+        'label_agreement': sum(a == b['label'] for a, b in zip(naive, packed)) / len(reviews),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sliding-window classification of long reviews.")
+    parser.add_argument("--model", default="bert-base-uncased", help="Model name or local checkpoint path.")
+    parser.add_argument("--reviews", type=int, default=64, help="Number of synthetic reviews.")
+    parser.add_argument("--min-words", type=int, default=300, help="Minimum words per review.")
+    parser.add_argument("--max-words", type=int, default=1500, help="Maximum words per review.")
+    parser.add_argument("--batch-size", type=int, default=32, help="Windows per forward pass.")
+    parser.add_argument("--window-size", type=int, default=512, help="Tokens per window.")
+    parser.add_argument("--overlap", type=int, default=128, help="Tokens shared by consecutive windows.")
+    parser.add_argument("--device", default=None, help="Device to run on ('cpu' or 'cuda').")
+    args = parser.parse_args()
+
+    try:
+        model = ReviewModel(model_name=args.model, device=args.device)
+        reviews = synthetic_reviews(args.reviews, args.min_words, args.max_words)
+        result = benchmark_long_reviews(model, reviews, args.batch_size, args.window_size, args.overlap)
+    except ReviewModelError as e:
+        logger.error(f"ReviewModel error: {e}")
+        raise SystemExit(1)
+
+    print(f"Naive:  {result['naive_reviews_per_sec']:.1f} reviews/sec")
+    print(f"Packed: {result['packed_reviews_per_sec']:.1f} reviews/sec ({result['speedup']:.2f}x)")
+    print(f"Windows scored: {result['windows']}, label agreement: {result['label_agreement']:.1%}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
@@ -0,0 +1,91 @@
+import argparse
+import random
+import time
+import logging
+
+from ai_models.review_model import ReviewModel, ReviewModelError
+
+logger = logging.getLogger(__name__)
+
+WORDS = (
+    "the product was excellent great bad terrible good okay i had an experience it is not very "
+    "love hate this service fast slow delivery price quality support would buy again never"
+).split()
+
+
+def synthetic_reviews(count, min_words=5, max_words=120, seed=0):
+    """
+    Generate reproducible synthetic reviews with a wide spread of lengths.
+
+    Args:
+        count (int): Number of reviews to generate.
+        min_words (int): Minimum number of words per review.
+        max_words (int): Maximum number of words per review.
+        seed (int): Random seed.
+
+    Returns:
+        list: The generated review texts.
+    """
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words)))
+        for _ in range(count)
+    ]
+
+
+def benchmark_review_batching(model, reviews, batch_size=32):
+    """
+    Compare per-item and batched review classification throughput.
+
+    Args:
+        model (ReviewModel): The model to benchmark.
+        reviews (list of str): The reviews to classify.
+        batch_size (int): Batch size for the batched path.
+
+    Returns:
+        dict: Reviews per second for both paths, the speedup and the label agreement.
+    """
+    start = time.perf_counter()
+    single = [model.classify_review(review) for review in reviews]
+    single_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = list(model.classify_reviews(reviews, batch_size=batch_size))
+    batched_elapsed = time.perf_counter() - start
+
+    agreement = sum(a['label'] == b['label'] for a, b in zip(single, batched)) / len(reviews)
+    return {
+        'reviews': len(reviews),
+        'batch_size': batch_size,
+        'single_reviews_per_sec': len(reviews) / single_elapsed,
+        'batched_reviews_per_sec': len(reviews) / batched_elapsed,
+        'speedup': single_elapsed / batched_elapsed,
+        'label_agreement': agreement,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-item vs batched ReviewModel inference.")
+    parser.add_argument("--model", default="bert-base-uncased", help="Model name or local checkpoint path.")
+    parser.add_argument("--reviews", type=int, default=512, help="Number of synthetic reviews.")
+    parser.add_argument("--batch-size", type=int, default=32, help="Batch size for the batched path.")
+    parser.add_argument("--device", default=None, help="Device to run on ('cpu' or 'cuda').")
+    args = parser.parse_args()
+
+    try:
+        model = ReviewModel(model_name=args.model, device=args.device)
+        report = benchmark_review_batching(model, synthetic_reviews(args.reviews), args.batch_size)
+    except ReviewModelError as e:
+        logger.error(f"ReviewModel error: {e}")
+        raise SystemExit(1)
+
+    print(f"Reviews:          {report['reviews']}")
+    print(f"Per-item:         {report['single_reviews_per_sec']:.1f} reviews/sec")
+    print(f"Batched (bs={report['batch_size']}):  {report['batched_reviews_per_sec']:.1f} reviews/sec")
+    print(f"Speedup:          {report['speedup']:.2f}x")
+    print(f"Label agreement:  {report['label_agreement']:.2%}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
@@ -0,0 +1,157 @@
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import logging
+
+from ai_models.review_model import ReviewModel, ReviewModelError
+from ai_models.review_server import ReviewBatchServer
+from benchmarks.chat_server_load import percentile
+from benchmarks.review_batching import synthetic_reviews
+
+logger = logging.getLogger(__name__)
+
+
+async def _post(reader, writer, path, payload):
+    """
+    Send one POST request on a keep-alive connection and read the response.
+
+    Returns:
+        tuple: The status code and the decoded JSON body.
+    """
+    body = json.dumps(payload).encode('utf-8')
+    writer.write(
+        f"POST {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def _client(port, reviews, latencies, rejected):
+    """
+    A closed-loop HTTP client that sends its reviews one after another and records each latency.
+    """
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        for review in reviews:
+            start = time.perf_counter()
+            status, _ = await _post(reader, writer, '/classify', {'text': review})
+            if status == 503:
+                rejected.append(review)
+                continue
+            if status != 200:
+                raise ReviewModelError(f"Server answered {status}.")
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def _load(review_model, reviews, concurrency, max_batch_size, max_wait_ms, max_queue_size):
+    """
+    Start a server on a free port, spread the reviews over ``concurrency`` clients and run them.
+    """
+    latencies, rejected = [], []
+    async with ReviewBatchServer(review_model, max_batch_size, max_wait_ms, max_queue_size) as batch_server:
+        server = await batch_server.serve('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            start = time.perf_counter()
+            await asyncio.gather(*[
+                _client(port, reviews[i::concurrency], latencies, rejected) for i in range(concurrency)
+            ])
+            elapsed = time.perf_counter() - start
+        stats = batch_server.stats()
+    return latencies, len(rejected), elapsed, stats
+
+
+def run_load(review_model, reviews, concurrency, max_batch_size, max_wait_ms=5.0, max_queue_size=1024):
+    """
+    Run a load test against a ReviewBatchServer over HTTP.
+
+    Args:
+        review_model (ReviewModel): The model to serve.
+        reviews (list of str): The reviews to send.
+        concurrency (int): Number of concurrent clients.
+        max_batch_size (int): Server batch size (1 serves requests one forward pass each).
+        max_wait_ms (float): Longest time a batch waits for more requests.
+        max_queue_size (int): Waiting requests before the server rejects new ones.
+
+    Returns:
+        dict: Throughput in reviews per second, p50/p99 request latency in milliseconds,
+        rejected requests and the mean batch size the server ran.
+    """
+    latencies, rejected, elapsed, stats = asyncio.run(
+        _load(review_model, reviews, concurrency, max_batch_size, max_wait_ms, max_queue_size)
+    )
+    return {
+        'max_batch_size': max_batch_size,
+        'requests': len(latencies),
+        'rejected': rejected,
+        'reviews_per_sec': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'mean_ms': statistics.mean(latencies) * 1000,
+        'mean_batch_size': stats['mean_batch_size'],
+    }
+
+
+def benchmark_review_server(review_model, requests=512, concurrency=32, max_batch_size=32, max_wait_ms=5.0):
+    """
+    Compare one forward pass per request with micro-batching under the same concurrent load.
+
+    Args:
+        review_model (ReviewModel): The model to serve.
+        requests (int): Total number of requests.
+        concurrency (int): Number of concurrent clients.
+        max_batch_size (int): Batch size for the micro-batched run.
+        max_wait_ms (float): Longest time a batch waits for more requests.
+
+    Returns:
+        dict: Load-test results for the unbatched and batched runs.
+    """
+    reviews = synthetic_reviews(requests, min_words=5, max_words=60)
+    return {
+        'unbatched': run_load(review_model, reviews, concurrency, max_batch_size=1, max_wait_ms=0.0),
+        'batched': run_load(review_model, reviews, concurrency, max_batch_size, max_wait_ms),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the micro-batching review server over HTTP.")
+    parser.add_argument("--model", default="bert-base-uncased", help="Model name or local checkpoint path.")
+    parser.add_argument("--requests", type=int, default=512, help="Total number of requests.")
+    parser.add_argument("--concurrency", type=int, default=32, help="Number of concurrent clients.")
+    parser.add_argument("--batch-size", type=int, default=32, help="Maximum batch size for the batched run.")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="Longest time a batch waits for more requests.")
+    parser.add_argument("--device", default=None, help="Device to run on ('cpu' or 'cuda').")
+    args = parser.parse_args()
+
+    try:
+        review_model = ReviewModel(model_name=args.model, device=args.device)
+        report = benchmark_review_server(review_model, args.requests, args.concurrency, args.batch_size, args.max_wait_ms)
+    except ReviewModelError as e:
+        logger.error(f"ReviewModel error: {e}")
+        raise SystemExit(1)
+
+    for name, result in report.items():
+        print(
+            f"{name:>10} (batch {result['max_batch_size']}): {result['reviews_per_sec']:.1f} reviews/sec, "
+            f"p50 {result['p50_ms']:.1f} ms, p99 {result['p99_ms']:.1f} ms, "
+            f"mean batch {result['mean_batch_size']:.1f}, rejected {result['rejected']}"
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
@@ -0,0 +1,147 @@
+import argparse
+import random
+import time
+import logging
+
+import numpy as np
+
+from ai_models.review_model import ReviewModel, ReviewModelError
+from ai_models.similarity_index import SimilarityIndex
+from benchmarks.review_batching import synthetic_reviews
+
+logger = logging.getLogger(__name__)
+
+
+def synthetic_stream(count, duplicate_ratio=0.5, seed=0):
+    """
+    Generate a review stream in which a share of reviews are copy-paste duplicates of earlier ones.
+
+    Duplicates differ from their original only in case, whitespace and trailing punctuation.
+
+    Args:
+        count (int): Number of reviews.
+        duplicate_ratio (float): Fraction of reviews that copy an earlier review.
+        seed (int): Random seed.
+
+    Returns:
+        list: The review texts.
+    """
+    rng = random.Random(seed)
+    originals = synthetic_reviews(count, min_words=5, max_words=60, seed=seed)
+    stream = []
+    for text in originals:
+        if stream and rng.random() < duplicate_ratio:
+            copy = rng.choice(stream)
+            text = rng.choice([copy.upper(), copy + "!", "  " + copy.replace(" ", "  "), copy])
+        stream.append(text)
+    return stream
+
+
+def benchmark_search(vectors, queries, k=10, lsh_bits=12, lsh_tables=8):
+    """
+    Compare exact blocked search with LSH bucketed search.
+
+    Args:
+        vectors (numpy.ndarray): Vectors to index.
+        queries (numpy.ndarray): Query vectors.
+        k (int): Neighbours per query.
+        lsh_bits (int): Hyperplanes per LSH table.
+        lsh_tables (int): Number of LSH tables.
+
+    Returns:
+        dict: Queries per second for both modes and the LSH recall of the exact nearest neighbour.
+    """
+    index = SimilarityIndex(vectors.shape[1], lsh_bits=lsh_bits, lsh_tables=lsh_tables)
+    index.add(vectors)
+
+    start = time.perf_counter()
+    _, exact_ids = index.search(queries, k, exact=True)
+    exact_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    _, lsh_ids = index.search(queries, k, exact=False)
+    lsh_elapsed = time.perf_counter() - start
+
+    return {
+        'vectors': len(vectors),
+        'exact_queries_per_sec': len(queries) / exact_elapsed,
+        'lsh_queries_per_sec': len(queries) / lsh_elapsed,
+        'lsh_recall_at_1': float((exact_ids[:, 0] == lsh_ids[:, 0]).mean()),
+    }
+
+
+def benchmark_dedupe(model, reviews, threshold=0.98, batch_size=32):
+    """
+    Compare classifying every review with classifying one representative per near-duplicate group.
+
+    Args:
+        model (ReviewModel): The model to use.
+        reviews (list of str): The reviews to classify.
+        threshold (float): Minimum cosine similarity of near-duplicates.
+        batch_size (int): Batch size for embedding and classification.
+
+    Returns:
+        dict: Reviews per second for both paths, the reviews actually classified and the label agreement.
+    """
+    start = time.perf_counter()
+    everything = list(model.classify_reviews(reviews, batch_size=batch_size))
+    all_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    embeddings = model.embed_reviews(reviews, batch_size=batch_size, dtype='float16')
+    index = SimilarityIndex(embeddings.shape[1], dtype='float16')
+    index.add(embeddings)
+    representatives = index.deduplicate(threshold)
+    unique = np.unique(representatives)
+    labels = dict(zip(unique.tolist(), model.classify_reviews([reviews[i] for i in unique], batch_size=batch_size)))
+    deduped = [labels[row] for row in representatives.tolist()]
+    dedupe_elapsed = time.perf_counter() - start
+
+    return {
+        'reviews': len(reviews),
+        'classified': len(unique),
+        'all_reviews_per_sec': len(reviews) / all_elapsed,
+        'dedupe_reviews_per_sec': len(reviews) / dedupe_elapsed,
+        'label_agreement': sum(a['label'] == b['label'] for a, b in zip(everything, deduped)) / len(reviews),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the review similarity index and near-duplicate reuse.")
+    parser.add_argument("--model", default="bert-base-uncased", help="Model name or local checkpoint path.")
+    parser.add_argument("--reviews", type=int, default=1000, help="Number of synthetic reviews.")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.5, help="Fraction of copy-paste duplicates.")
+    parser.add_argument("--threshold", type=float, default=0.98, help="Near-duplicate similarity threshold.")
+    parser.add_argument("--vectors", type=int, default=100000, help="Random vectors for the search benchmark.")
+    parser.add_argument("--dim", type=int, default=768, help="Dimension of the random vectors.")
+    parser.add_argument("--device", default=None, help="Device to run on ('cpu' or 'cuda').")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((args.vectors, args.dim)).astype(np.float32)
+    # Queries are perturbed copies of indexed vectors, like near-duplicate reviews
+    queries = vectors[:1000] + 0.1 * rng.standard_normal((1000, args.dim)).astype(np.float32)
+    search = benchmark_search(vectors, queries)
+    print(
+        f"Search over {search['vectors']} vectors: exact {search['exact_queries_per_sec']:.0f} queries/sec, "
+        f"LSH {search['lsh_queries_per_sec']:.0f} queries/sec (recall@1 {search['lsh_recall_at_1']:.1%})"
+    )
+
+    try:
+        model = ReviewModel(model_name=args.model, device=args.device)
+        dedupe = benchmark_dedupe(model, synthetic_stream(args.reviews, args.duplicate_ratio), args.threshold)
+    except ReviewModelError as e:
+        logger.error(f"ReviewModel error: {e}")
+        raise SystemExit(1)
+
+    print(f"Classify all:  {dedupe['all_reviews_per_sec']:.1f} reviews/sec")
+    print(
+        f"Dedupe first:  {dedupe['dedupe_reviews_per_sec']:.1f} reviews/sec "
+        f"({dedupe['classified']} of {dedupe['reviews']} classified, "
+        f"label agreement {dedupe['label_agreement']:.1%})"
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
@@ -0,0 +1,396 @@
+import argparse
+import io
+import os
+import json
+import time
+import string
+import platform
+import tempfile
+import subprocess
+import logging
+
+from ai_models.registry import lazy_import
+from ai_models.review_model import ReviewModel
+from ai_models.chat_model import ChatModel
+from tools.validator import Validator
+from tools.formatter import Formatter
+from benchmarks.review_batching import WORDS as REVIEW_WORDS, synthetic_reviews, benchmark_review_batching
+from benchmarks.chat_sessions import WORDS as CHAT_WORDS, synthetic_turns, run_session, summarize
+from benchmarks.json_validation import TRANSACTION_SCHEMA, synthetic_transactions
+from benchmarks.xml_formatting import wide_document
+
+torch = lazy_import('torch')
+transformers = lazy_import('transformers')
+
+logger = logging.getLogger(__name__)
+
+# Version of the results layout; results are only compared against a baseline of the same version
+RESULTS_VERSION = 1
+
+# Default relative change that counts as a regression
+DEFAULT_TOLERANCE = 0.15
+
+# Shortest wall-clock time of one timing sample; fast operations are looped until a sample lasts this long
+MIN_SAMPLE_SECONDS = 0.2
+
+# Measurements whose single call takes less than NOISY_SECONDS vary by tens of percent between
+# runs (timer resolution, caches, scheduling), so they are only flagged beyond NOISY_TOLERANCE
+NOISY_SECONDS = 1e-3
+NOISY_TOLERANCE = 0.5
+
+# Input sizes per benchmark group, for full and --quick runs
+SIZES = {
+    'full': {'reviews': 256, 'turns': 20, 'records': [1000, 10000], 'xml': [1000, 10000], 'dates': [10000, 100000]},
+    'quick': {'reviews': 64, 'turns': 6, 'records': [1000], 'xml': [1000], 'dates': [10000]},
+}
+
+
+def build_tiny_checkpoints(directory, seed=0):
+    """
+    Create (once) tiny, randomly initialized BERT and GPT-2 checkpoints for offline benchmarking.
+
+    The models are a few hundred kilobytes, so timings measure the code paths around them
+    (tokenization, batching, padding, caching) rather than matrix multiplications, and no
+    download is needed. The same seed always produces the same weights.
+
+    Args:
+        directory (str): Where to write the 'bert' and 'gpt2' checkpoint directories.
+        seed (int): Random seed for the weights.
+
+    Returns:
+        tuple: (bert path, gpt2 path).
+    """
+    bert_path, gpt2_path = os.path.join(directory, 'bert'), os.path.join(directory, 'gpt2')
+    if not os.path.exists(os.path.join(bert_path, 'config.json')):
+        os.makedirs(bert_path, exist_ok=True)
+        vocab = (["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + list(string.ascii_lowercase) + list("!.,?'")
+                 + sorted(set(REVIEW_WORDS) | set(CHAT_WORDS)) + ["##" + c for c in string.ascii_lowercase])
+        with open(os.path.join(bert_path, 'vocab.txt'), 'w', encoding='utf-8') as handle:
+            handle.write('\n'.join(vocab) + '\n')
+        transformers.BertTokenizer(os.path.join(bert_path, 'vocab.txt')).save_pretrained(bert_path)
+        torch.manual_seed(seed)
+        config = transformers.BertConfig(
+            vocab_size=len(vocab), hidden_size=32, num_hidden_layers=2, num_attention_heads=2,
+            intermediate_size=64, max_position_embeddings=512, num_labels=3,
+        )
+        transformers.BertForSequenceClassification(config).save_pretrained(bert_path)
+        logger.info(f"Tiny BERT checkpoint written to {bert_path}.")
+
+    if not os.path.exists(os.path.join(gpt2_path, 'config.json')):
+        os.makedirs(gpt2_path, exist_ok=True)
+        # Byte-level vocabulary without merges: every byte is one token
+        vocab = {character: index for index, character in enumerate(_byte_characters())}
+        vocab['<|endoftext|>'] = len(vocab)
+        with open(os.path.join(gpt2_path, 'vocab.json'), 'w', encoding='utf-8') as handle:
+            json.dump(vocab, handle)
+        with open(os.path.join(gpt2_path, 'merges.txt'), 'w', encoding='utf-8') as handle:
+            handle.write('#version: 0.2\n')
+        transformers.GPT2Tokenizer(os.path.join(gpt2_path, 'vocab.json'), os.path.join(gpt2_path, 'merges.txt')).save_pretrained(gpt2_path)
+        torch.manual_seed(seed)
+        config = transformers.GPT2Config(
+            vocab_size=len(vocab), n_positions=1024, n_embd=32, n_layer=2, n_head=2,
+            bos_token_id=len(vocab) - 1, eos_token_id=len(vocab) - 1,
+            # Tied embeddings make a random model repeat its last input token, which is always EOS here,
+            # so every response would be empty
+            tie_word_embeddings=False,
+        )
+        transformers.GPT2LMHeadModel(config).save_pretrained(gpt2_path)
+        logger.info(f"Tiny GPT-2 checkpoint written to {gpt2_path}.")
+    return bert_path, gpt2_path
+
+
+def _byte_characters():
+    """
+    Return the 256 printable characters GPT-2's byte-level BPE uses for the bytes 0-255, in byte order.
+    """
+    printable = list(range(ord('!'), ord('~') + 1)) + list(range(ord('\xa1'), ord('\xac') + 1)) + list(range(ord('\xae'), ord('\xff') + 1))
+    characters = {}
+    shifted = 0
+    for byte in range(256):
+        if byte in printable:
+            characters[byte] = chr(byte)
+        else:
+            characters[byte] = chr(256 + shifted)
+            shifted += 1
+    return [characters[byte] for byte in range(256)]
+
+
+def _best_time(run, repeat, min_seconds=None):
+    """
+    Time ``run`` like timeit.Timer.autorange: pick a loop count whose sample lasts at least
+    ``min_seconds`` (MIN_SAMPLE_SECONDS by default), take ``repeat`` such samples and return
+    the fastest time per call, in seconds.
+
+    The first timed call doubles as the warm-up.
+    """
+    min_seconds = MIN_SAMPLE_SECONDS if min_seconds is None else min_seconds
+    number = 1
+    while True:
+        elapsed = _sample(run, number)
+        if elapsed >= min_seconds:
+            break
+        # Aim straight for the minimum duration, growing at least 2x and at most 10x per step
+        number = max(number * 2, min(number * 10, int(number * min_seconds * 1.2 / max(elapsed, 1e-9))))
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        best = min(best, _sample(run, number) / number)
+    return best
+
+
+def _sample(run, number):
+    """
+    Return the wall-clock time of ``number`` calls to ``run``.
+    """
+    start = time.perf_counter()
+    for _ in range(number):
+        run()
+    return time.perf_counter() - start
+
+
+def _result(value, unit, higher_is_better=True, seconds=None):
+    """
+    Build one result entry; ``seconds`` is the time of one measured call, when known.
+    """
+    result = {'value': value, 'unit': unit, 'higher_is_better': higher_is_better}
+    if seconds is not None:
+        result['seconds'] = seconds
+    return result
+
+
+def bench_reviews(context):
+    """
+    Single vs batched review classification throughput.
+    """
+    model = ReviewModel(model_name=context['bert'], device='cpu')
+    reviews = synthetic_reviews(context['sizes']['reviews'])
+    best = {}
+    for _ in range(context['repeat']):
+        report = benchmark_review_batching(model, reviews, batch_size=32)
+        for key in ('single_reviews_per_sec', 'batched_reviews_per_sec'):
+            best[key] = max(best.get(key, 0.0), report[key])
+    return {
+        'review.single': _result(best['single_reviews_per_sec'], 'reviews/s'),
+        'review.batched': _result(best['batched_reviews_per_sec'], 'reviews/s'),
+    }
+
+
+def bench_chat(context):
+    """
+    Chat generation latency per turn, through generate_response and through a KV-cached session.
+    """
+    model = ChatModel(model_name=context['gpt2'], device='cpu')
+    model.adjust_parameters(do_sample=False)
+    turns = synthetic_turns(context['sizes']['turns'])
+    new_tokens = 16
+    eos = model.tokenizer.eos_token
+    prompt_lengths = [len(model.tokenizer.encode(f" {eos} {turn} {eos}")) for turn in turns]
+
+    def respond():
+        for turn, prompt_length in zip(turns, prompt_lengths):
+            model.generate_response("", turn, max_length=prompt_length + new_tokens)
+
+    response_ms = _best_time(respond, context['repeat']) / len(turns) * 1000
+    session = min((summarize(run_session(model, turns, new_tokens)) for _ in range(context['repeat'])),
+                  key=lambda summary: summary['mean_ms'])
+    return {
+        'chat.generate_response': _result(response_ms, 'ms/turn', higher_is_better=False, seconds=response_ms / 1000),
+        'chat.session.mean': _result(session['mean_ms'], 'ms/turn', higher_is_better=False, seconds=session['mean_ms'] / 1000),
+        'chat.session.last': _result(session['last_ms'], 'ms/turn', higher_is_better=False, seconds=session['last_ms'] / 1000),
+    }
+
+
+def bench_json(context):
+    """
+    JSON validation and formatting throughput at several input sizes.
+    """
+    results = {}
+    for size in context['sizes']['records']:
+        records = synthetic_transactions(size, invalid_ratio=0.0)
+        texts = [json.dumps(record) for record in records]
+        Validator.clear_json_schema_cache()
+        elapsed = _best_time(lambda: Validator.validate_json_many(records, TRANSACTION_SCHEMA), context['repeat'])
+        results[f'json.validate_many.{size}'] = _result(size / elapsed, 'records/s', seconds=elapsed)
+        elapsed = _best_time(lambda: [Validator.validate_json(text, TRANSACTION_SCHEMA) for text in texts], context['repeat'])
+        results[f'json.validate.{size}'] = _result(size / elapsed, 'records/s', seconds=elapsed)
+        elapsed = _best_time(lambda: [Formatter.format_json(text) for text in texts], context['repeat'])
+        results[f'json.format.{size}'] = _result(size / elapsed, 'records/s', seconds=elapsed)
+    return results
+
+
+def bench_xml(context):
+    """
+    XML validation and formatting throughput at several document sizes.
+    """
+    results = {}
+    for size in context['sizes']['xml']:
+        document = wide_document(size)
+        elapsed = _best_time(lambda: Validator.validate_xml(document), context['repeat'])
+        results[f'xml.validate.{size}'] = _result(size / elapsed, 'elements/s', seconds=elapsed)
+        elapsed = _best_time(lambda: Formatter.format_xml(document), context['repeat'])
+        results[f'xml.format.{size}'] = _result(size / elapsed, 'elements/s', seconds=elapsed)
+        elapsed = _best_time(
+            lambda: Formatter.format_xml_stream(io.BytesIO(document.encode('utf-8')), io.StringIO()), context['repeat']
+        )
+        results[f'xml.format_stream.{size}'] = _result(size / elapsed, 'elements/s', seconds=elapsed)
+    return results
+
+
+def bench_datetime(context):
+    """
+    Date validation and reformatting throughput at several column sizes.
+    """
+    results = {}
+    for size in context['sizes']['dates']:
+        values = [f"{day % 28 + 1:02d}/{day % 12 + 1:02d}/{2015 + day % 10} {day % 24:02d}:{day % 60:02d}"
+                  for day in range(size)]
+        elapsed = _best_time(lambda: Validator.validate_datetimes(values, '%d/%m/%Y %H:%M'), context['repeat'])
+        results[f'datetime.validate.{size}'] = _result(size / elapsed, 'values/s', seconds=elapsed)
+        elapsed = _best_time(lambda: Formatter.format_datetimes(values, '%d/%m/%Y %H:%M'), context['repeat'])
+        results[f'datetime.format.{size}'] = _result(size / elapsed, 'values/s', seconds=elapsed)
+    return results
+
+
+# Benchmark groups, by name, in the order they run
+GROUPS = {
+    'review': bench_reviews,
+    'chat': bench_chat,
+    'json': bench_json,
+    'xml': bench_xml,
+    'datetime': bench_datetime,
+}
+
+
+def environment():
+    """
+    Describe the machine and versions the results were measured with.
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'torch': torch.__version__,
+        'transformers': transformers.__version__,
+        'torch_threads': torch.get_num_threads(),
+        'commit': commit or None,
+    }
+
+
+def run_suite(groups=None, quick=False, repeat=5, checkpoints=None, threads=1):
+    """
+    Run the benchmark suite.
+
+    Args:
+        groups (list of str): Groups to run (default: all of GROUPS).
+        quick (bool): Use the smaller input sizes.
+        repeat (int): Repetitions per measurement; the best one is kept.
+        checkpoints (str): Directory for the tiny model checkpoints.
+        threads (int): PyTorch intra-op threads, fixed for reproducible model timings.
+
+    Returns:
+        dict: 'version', 'created', 'environment', 'settings' and 'results'
+        (benchmark name -> value, unit and direction).
+    """
+    groups = list(groups or GROUPS)
+    unknown = set(groups) - set(GROUPS)
+    if unknown:
+        raise ValueError(f"Unknown benchmark groups: {', '.join(sorted(unknown))}")
+    torch.set_num_threads(threads)
+    checkpoints = checkpoints or os.path.join(tempfile.gettempdir(), 'autodevops-benchmark-checkpoints')
+    bert, gpt2 = build_tiny_checkpoints(checkpoints)
+    context = {'bert': bert, 'gpt2': gpt2, 'repeat': repeat, 'sizes': SIZES['quick' if quick else 'full']}
+
+    results = {}
+    for group in groups:
+        start = time.perf_counter()
+        results.update(GROUPS[group](context))
+        logger.info(f"Benchmark group '{group}' finished in {time.perf_counter() - start:.1f}s.")
+    return {
+        'version': RESULTS_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'environment': environment(),
+        'settings': {'groups': groups, 'quick': quick, 'repeat': repeat, 'threads': threads},
+        'results': results,
+    }
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compare results with a baseline.
+
+    Args:
+        results (dict): Output of run_suite.
+        baseline (dict): A previous output of run_suite.
+        tolerance (float): Relative change in the bad direction that counts as a regression.
+            Measurements whose single call took under NOISY_SECONDS in either run use at least
+            NOISY_TOLERANCE instead.
+
+    Returns:
+        list: One dict per benchmark present in both runs with the baseline and current
+        values, the relative change (positive is better), the tolerance applied and its
+        status: 'regression', 'improvement' or 'ok'.
+    """
+    if baseline.get('version') != results.get('version'):
+        raise ValueError(f"Baseline layout version {baseline.get('version')} does not match {results.get('version')}.")
+    rows = []
+    for name, current in results['results'].items():
+        previous = baseline['results'].get(name)
+        if previous is None or not previous['value']:
+            continue
+        change = (current['value'] - previous['value']) / previous['value']
+        if not current['higher_is_better']:
+            change = -change
+        limit = tolerance
+        if min(current.get('seconds', NOISY_SECONDS), previous.get('seconds', NOISY_SECONDS)) < NOISY_SECONDS:
+            limit = max(tolerance, NOISY_TOLERANCE)
+        status = 'regression' if change < -limit else 'improvement' if change > limit else 'ok'
+        rows.append({'name': name, 'baseline': previous['value'], 'current': current['value'],
+                     'unit': current['unit'], 'change': change, 'tolerance': limit, 'status': status})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite and compare against a baseline.")
+    parser.add_argument("--groups", nargs="+", choices=list(GROUPS), default=None, help="Benchmark groups to run.")
+    parser.add_argument("--quick", action="store_true", help="Use smaller inputs.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing samples per measurement (the best is kept).")
+    parser.add_argument("--threads", type=int, default=1, help="PyTorch intra-op threads.")
+    parser.add_argument("--checkpoints", default=None, help="Directory for the tiny model checkpoints.")
+    parser.add_argument("--output", default=None, help="Write the results to this JSON file.")
+    parser.add_argument("--baseline", default=None, help="Baseline JSON file to compare against.")
+    parser.add_argument("--save-baseline", action="store_true", help="Also write the results to --baseline.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Relative slowdown flagged as a regression.")
+    args = parser.parse_args()
+
+    results = run_suite(args.groups, args.quick, args.repeat, args.checkpoints, args.threads)
+    for name, result in results['results'].items():
+        print(f"{name:<32} {result['value']:>14.2f} {result['unit']}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            json.dump(results, handle, indent=2)
+
+    if args.baseline and args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as handle:
+            json.dump(results, handle, indent=2)
+        logger.info(f"Baseline saved to {args.baseline}.")
+    elif args.baseline:
+        with open(args.baseline, encoding='utf-8') as handle:
+            baseline = json.load(handle)
+        rows = compare(results, baseline, args.tolerance)
+        print()
+        for row in rows:
+            print(f"{row['name']:<32} {row['baseline']:>14.2f} -> {row['current']:>14.2f} {row['unit']:<12} "
+                  f"{row['change']:+7.1%}  {row['status']}")
+        regressions = [row['name'] for row in rows if row['status'] == 'regression']
+        if regressions:
+            logger.error(f"{len(regressions)} regressions beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import io
+import time
+import logging
+
+from tools.formatter import Formatter
+
+logger = logging.getLogger(__name__)
+
+
+def deep_document(elements):
+    """
+    Build a document nested ``elements`` levels deep.
+    """
+    return ''.join(f'<node level="{i}">' for i in range(elements)) + 'leaf' + '</node>' * elements
+
+
+def wide_document(elements):
+    """
+    Build a document whose root has ``elements`` small children.
+    """
+    return '<root>' + ''.join(f'<item id="{i}">value {i}</item>' for i in range(elements)) + '</root>'
+
+
+def benchmark_xml_formatting(shapes):
+    """
+    Time format_xml and format_xml_stream on documents of increasing size.
+
+    The formatter is linear in the size of its output, so nanoseconds per output character
+    stay flat as documents grow. Note that the indented output of a deep document is itself
+    quadratic in its depth (line n carries n indents).
+
+    Args:
+        shapes (dict): Element counts to test per document shape ('deep', 'wide').
+
+    Returns:
+        list: One dict per (shape, size) with timings in seconds and nanoseconds per output character.
+    """
+    builders = {'deep': deep_document, 'wide': wide_document}
+    report = []
+    for shape, sizes in shapes.items():
+        for size in sizes:
+            document = builders[shape](size)
+            start = time.perf_counter()
+            output = Formatter.format_xml(document)
+            in_memory = time.perf_counter() - start
+
+            start = time.perf_counter()
+            Formatter.format_xml_stream(io.BytesIO(document.encode('utf-8')), io.StringIO())
+            streaming = time.perf_counter() - start
+            report.append({
+                'shape': shape,
+                'elements': size,
+                'output_chars': len(output),
+                'format_xml': in_memory,
+                'format_xml_stream': streaming,
+                'ns_per_char': in_memory / len(output) * 1e9,
+            })
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark XML pretty-printing on deep and wide documents.")
+    parser.add_argument("--deep", type=int, nargs="+", default=[500, 1000, 2000, 4000], help="Depths of the deep documents.")
+    parser.add_argument("--wide", type=int, nargs="+", default=[10000, 40000, 160000], help="Children of the wide documents.")
+    args = parser.parse_args()
+
+    for row in benchmark_xml_formatting({'deep': args.deep, 'wide': args.wide}):
+        print(
+            f"{row['shape']:<5} {row['elements']:>7} elements {row['output_chars']:>11} chars  "
+            f"format_xml {row['format_xml']:7.3f}s  format_xml_stream {row['format_xml_stream']:7.3f}s  "
+            f"({row['ns_per_char']:.1f} ns/char)"
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
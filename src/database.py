@@ -0,0 +1,578 @@
+import os
+import time
+import queue
+import asyncio
+import sqlite3
+import hashlib
+import tempfile
+import threading
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+
+from tools.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Statements prepared once per connection and reused from sqlite3's statement cache
+CACHED_STATEMENTS = 256
+# Page cache per connection in KiB, and WAL pages written before an automatic checkpoint;
+# both keep bulk inserts from re-reading and re-copying the randomly ordered input_hash index
+CACHE_KIB = 65536
+WAL_AUTOCHECKPOINT = 10000
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS results ("
+    "id INTEGER PRIMARY KEY, kind TEXT NOT NULL, model TEXT, input_hash INTEGER NOT NULL, input TEXT NOT NULL, "
+    "label TEXT, confidence REAL, output TEXT, created REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS results_label ON results (label, created)",
+    "CREATE INDEX IF NOT EXISTS results_created ON results (created)",
+    "CREATE INDEX IF NOT EXISTS results_input_hash ON results (input_hash, created)",
+)
+
+INSERT = (
+    "INSERT INTO results (kind, model, input_hash, input, label, confidence, output, created) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+COLUMNS = ('id', 'kind', 'model', 'input_hash', 'input', 'label', 'confidence', 'output', 'created')
+
+# Values in each row passed to INSERT: every column but id
+ROW_LENGTH = len(COLUMNS) - 1
+
+# Errors a row can raise when written: sqlite3 errors, and binding errors such as OverflowError
+# for an integer beyond 64 bits or TypeError for an unsupported value type
+WRITE_ERRORS = (sqlite3.Error, OverflowError, ValueError, TypeError)
+
+
+class DatabaseError(Exception):
+    """Custom exception for database errors."""
+    pass
+
+
+def hash_input(text):
+    """
+    Hash a model input for indexed lookups.
+
+    A signed 64-bit integer keeps the index entries small, so more of them share a page and
+    bulk inserts dirty fewer pages than they would with a hex digest.
+
+    Args:
+        text (str): The review text or chat prompt.
+
+    Returns:
+        int: The first 8 bytes of a BLAKE2b digest, as a signed integer.
+    """
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'big', signed=True)
+
+
+def review_row(text, result, model=None, created=None):
+    """
+    Build the row of a review classification.
+
+    Args:
+        text (str): The review text.
+        result (dict): The result from ReviewModel, with 'label' and 'confidence'.
+        model (str): Model name or path.
+        created (float): Unix timestamp (defaults to now).
+
+    Returns:
+        tuple: A row for ResultStore.insert, insert_many or submit.
+    """
+    return ('review', model, hash_input(text), text, result['label'], result['confidence'], None,
+            created if created is not None else time.time())
+
+
+def chat_row(prompt, response, model=None, created=None):
+    """
+    Build the row of a chat response.
+
+    Args:
+        prompt (str): The user input (or full prompt).
+        response (str): The generated response.
+        model (str): Model name or path.
+        created (float): Unix timestamp (defaults to now).
+
+    Returns:
+        tuple: A row for ResultStore.insert, insert_many or submit.
+    """
+    return ('chat', model, hash_input(prompt), prompt, None, None, response,
+            created if created is not None else time.time())
+
+
+def _check_row(row):
+    """
+    Check that a row has the shape INSERT expects, so a malformed row fails where it is submitted.
+    """
+    if not isinstance(row, (tuple, list)) or len(row) != ROW_LENGTH:
+        raise DatabaseError(f"Expected a tuple or list of {ROW_LENGTH} values (see review_row), got {row!r}.")
+
+
+def _timestamp(value):
+    """
+    Convert a time bound (Unix timestamp, datetime or ISO 8601 string) to a Unix timestamp.
+    """
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            raise DatabaseError(f"Invalid time bound: {value!r}")
+    return value.timestamp()
+
+
+class ConnectionPool:
+    """
+    A fixed-size pool of SQLite connections in WAL mode, shareable between threads.
+
+    Connections are opened on demand up to ``size`` and handed out one caller at a time, so
+    readers run concurrently with the single writer WAL allows. Each connection keeps its own
+    cache of prepared statements, reused whenever the same SQL text runs again. Async code
+    uses the pool from worker threads (see ResultStore's async methods), never from the event
+    loop itself.
+    """
+
+    def __init__(self, path, size=4, timeout=30.0):
+        """
+        Initialize the pool.
+
+        Args:
+            path (str): SQLite database file.
+            size (int): Maximum number of open connections.
+            timeout (float): Seconds to wait for a free connection or a database lock.
+        """
+        if size < 1:
+            raise DatabaseError("Pool size must be a positive integer.")
+        self.path = path
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrow a connection for the duration of a ``with`` block.
+
+        Yields:
+            sqlite3.Connection: A connection in autocommit mode; use BEGIN/COMMIT for transactions.
+
+        Raises:
+            DatabaseError: If the pool is closed or no connection frees up in time.
+        """
+        connection = self._acquire()
+        try:
+            yield connection
+        except BaseException:
+            if connection.in_transaction:
+                connection.rollback()
+            raise
+        finally:
+            if self._closed:
+                connection.close()
+            else:
+                self._idle.put(connection)
+
+    def close(self):
+        """
+        Close every idle connection; connections still borrowed are closed when returned to a closed pool.
+        """
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def _acquire(self):
+        """
+        Private helper that takes an idle connection, opening a new one while under the size limit.
+        """
+        if self._closed:
+            raise DatabaseError("Connection pool is closed.")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._opened < self.size:
+                self._opened += 1
+                return self._connect()
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise DatabaseError(f"No database connection became free within {self.timeout}s.")
+
+    def _connect(self):
+        """
+        Private helper that opens and configures one connection.
+        """
+        connection = sqlite3.connect(
+            self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False,
+            cached_statements=CACHED_STATEMENTS,
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA temp_store=MEMORY")
+        connection.execute(f"PRAGMA cache_size=-{CACHE_KIB}")
+        connection.execute(f"PRAGMA wal_autocheckpoint={WAL_AUTOCHECKPOINT}")
+        return connection
+
+
+class ResultStore:
+    """
+    Persistent storage of review classifications and chat responses in SQLite.
+
+    Rows can be written three ways: ``insert`` commits one row, ``insert_many`` writes a list
+    of rows with one executemany in a single transaction, and ``submit`` (or ``submit_async``
+    from a coroutine) hands rows to a background writer that buffers them and flushes batches
+    of up to ``batch_size`` rows with insert_many, so no row waits longer than about ``flush_interval`` seconds.
+    Submitted rows are checked for shape up front; if a batch still fails (e.g. a NOT NULL
+    column is None), its rows are retried one at a time and only the rows that fail are
+    dropped, logged and reported by the next ``flush``.
+    The buffer holds at most ``max_pending`` rows; beyond that submitters wait, so a slow disk
+    pushes back on producers instead of growing memory.
+
+    Results are indexed by label, creation time and input hash, and can be queried with
+    ``find`` and ``label_counts`` (or their async variants, which run on worker threads).
+    """
+
+    def __init__(self, path='data/results.db', pool_size=4, batch_size=10000, flush_interval=0.5, max_pending=100000):
+        """
+        Open (and if needed create) the store.
+
+        Args:
+            path (str): SQLite database file.
+            pool_size (int): Maximum number of open connections.
+            batch_size (int): Maximum rows per background write.
+            flush_interval (float): Longest time, in seconds, a submitted row waits to be written.
+            max_pending (int): Maximum rows buffered by the background writer.
+        """
+        if batch_size < 1:
+            raise DatabaseError("batch_size must be a positive integer.")
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pool = ConnectionPool(path, size=pool_size)
+        self._pending = queue.Queue(max_pending)
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._error = None
+        try:
+            with self.pool.connection() as connection:
+                for statement in SCHEMA:
+                    connection.execute(statement)
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Failed to open result store at {path}: {e}")
+        logger.info(f"Result store opened at {path}.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def insert(self, row):
+        """
+        Write one row in its own transaction.
+
+        Args:
+            row (tuple): A row from review_row or chat_row.
+
+        Returns:
+            int: The id of the new row.
+        """
+        try:
+            with self.pool.connection() as connection:
+                cursor = connection.execute(INSERT, row)
+        except WRITE_ERRORS as e:
+            raise DatabaseError(f"Insert failed: {e}")
+        metrics.increment('database_rows_written_total')
+        return cursor.lastrowid
+
+    @metrics.timed('database_write_seconds')
+    def insert_many(self, rows):
+        """
+        Write rows with one executemany in a single transaction.
+
+        Args:
+            rows (list of tuple): Rows from review_row or chat_row.
+
+        Returns:
+            int: Number of rows written.
+        """
+        if not rows:
+            return 0
+        try:
+            with self.pool.connection() as connection:
+                connection.execute("BEGIN")
+                connection.executemany(INSERT, rows)
+                connection.execute("COMMIT")
+        except WRITE_ERRORS as e:
+            raise DatabaseError(f"Bulk insert of {len(rows)} rows failed: {e}")
+        metrics.increment('database_rows_written_total', len(rows))
+        return len(rows)
+
+    def submit(self, row):
+        """
+        Queue a row for the background writer, waiting while the buffer is full.
+
+        Args:
+            row (tuple): A row from review_row or chat_row.
+
+        Raises:
+            DatabaseError: If the row does not have one value per column.
+        """
+        _check_row(row)
+        self._ensure_writer()
+        self._pending.put(row)
+
+    def submit_many(self, rows):
+        """
+        Queue several rows for the background writer.
+
+        Args:
+            rows (iterable of tuple): Rows from review_row or chat_row.
+
+        Raises:
+            DatabaseError: If any row does not have one value per column (no row is queued then).
+        """
+        rows = list(rows)
+        for row in rows:
+            _check_row(row)
+        self._ensure_writer()
+        for row in rows:
+            self._pending.put(row)
+
+    async def submit_async(self, row):
+        """
+        Queue a row for the background writer without blocking the event loop.
+
+        Args:
+            row (tuple): A row from review_row or chat_row.
+
+        Raises:
+            DatabaseError: If the row does not have one value per column.
+        """
+        _check_row(row)
+        self._ensure_writer()
+        try:
+            self._pending.put_nowait(row)
+        except queue.Full:
+            await asyncio.to_thread(self._pending.put, row)
+
+    def flush(self):
+        """
+        Wait until every submitted row has been written.
+
+        Raises:
+            DatabaseError: If a background write failed, or rows were dropped, since the last flush.
+        """
+        if self._writer is not None:
+            self._pending.join()
+        error, self._error = self._error, None
+        if error is not None:
+            raise DatabaseError(f"Background write failed: {error}")
+
+    async def flush_async(self):
+        """
+        Wait, without blocking the event loop, until every submitted row has been written.
+        """
+        await asyncio.to_thread(self.flush)
+
+    def find(self, label=None, kind=None, since=None, until=None, input_hash=None, text=None, limit=100):
+        """
+        Query stored results, newest first.
+
+        Args:
+            label (str): Only results with this label.
+            kind (str): Only 'review' or 'chat' results.
+            since (float, datetime or str): Only results created at or after this time.
+            until (float, datetime or str): Only results created before this time.
+            input_hash (int): Only results for this input hash.
+            text (str): Only results for this exact input (looked up by its hash).
+            limit (int): Maximum number of results (None for all).
+
+        Returns:
+            list: One dict per result, with the columns as keys.
+        """
+        if text is not None:
+            input_hash = hash_input(text)
+        clauses, params = self._filters(
+            label=label, kind=kind, since=since, until=until, input_hash=input_hash, input=text,
+        )
+        sql = f"SELECT {', '.join(COLUMNS)} FROM results{clauses} ORDER BY created DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        rows = self._query(sql, params)
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    async def find_async(self, **filters):
+        """
+        Run find on a worker thread.
+
+        Args:
+            **filters: Passed to find.
+
+        Returns:
+            list: One dict per result.
+        """
+        return await asyncio.to_thread(self.find, **filters)
+
+    def label_counts(self, kind='review', since=None, until=None):
+        """
+        Count stored results per label.
+
+        Args:
+            kind (str): Only 'review' or 'chat' results (None for both).
+            since (float, datetime or str): Only results created at or after this time.
+            until (float, datetime or str): Only results created before this time.
+
+        Returns:
+            dict: Label -> number of results.
+        """
+        clauses, params = self._filters(kind=kind, since=since, until=until)
+        return dict(self._query(f"SELECT label, COUNT(*) FROM results{clauses} GROUP BY label", params))
+
+    async def label_counts_async(self, **filters):
+        """
+        Run label_counts on a worker thread.
+        """
+        return await asyncio.to_thread(self.label_counts, **filters)
+
+    def count(self):
+        """
+        Return the number of stored results.
+        """
+        return self._query("SELECT COUNT(*) FROM results", [])[0][0]
+
+    def close(self):
+        """
+        Write every submitted row, stop the background writer and close the connections.
+        """
+        try:
+            self.flush()
+        finally:
+            self._stopped.set()
+            if self._writer is not None:
+                self._writer.join()
+                self._writer = None
+            self.pool.close()
+
+    def _ensure_writer(self):
+        """
+        Private helper that starts the background writer on first use.
+        """
+        if self._writer is not None:
+            return
+        with self._writer_lock:
+            if self._writer is None:
+                if self._stopped.is_set():
+                    raise DatabaseError("Result store is closed.")
+                self._writer = threading.Thread(target=self._write_loop, name="result-store-writer", daemon=True)
+                self._writer.start()
+
+    def _write_loop(self):
+        """
+        Private writer loop: gather rows for up to flush_interval seconds (or a full batch), write them in one transaction.
+        """
+        while not self._stopped.is_set() or not self._pending.empty():
+            try:
+                batch = [self._pending.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self._pending.get(timeout=remaining) if remaining > 0 else self._pending.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self.insert_many(batch)
+            except DatabaseError as e:
+                logger.warning(f"{e}; retrying its rows one at a time.")
+                self._insert_each(batch)
+            except Exception as e:
+                # Whatever goes wrong, the writer keeps running so flush and close cannot hang
+                logger.exception(f"Background write of {len(batch)} rows failed: {e}")
+                self._error = e
+            finally:
+                for _ in batch:
+                    self._pending.task_done()
+
+    def _insert_each(self, rows):
+        """
+        Private helper that writes a failed batch one statement per row in a single transaction,
+        dropping and reporting only the rows that fail.
+        """
+        dropped = []
+        try:
+            with self.pool.connection() as connection:
+                connection.execute("BEGIN")
+                for row in rows:
+                    try:
+                        connection.execute(INSERT, row)
+                    except WRITE_ERRORS as e:
+                        # A constraint or binding error only undoes its own statement
+                        if not connection.in_transaction:
+                            raise
+                        logger.error(f"Dropped result row {row!r}: {e}")
+                        dropped.append(e)
+                connection.execute("COMMIT")
+        except WRITE_ERRORS as e:
+            logger.error(f"Row-by-row insert of {len(rows)} rows failed: {e}")
+            self._error = e
+            return
+        metrics.increment('database_rows_written_total', len(rows) - len(dropped))
+        metrics.increment('database_rows_dropped_total', len(dropped))
+        if dropped:
+            self._error = DatabaseError(f"Dropped {len(dropped)} of {len(rows)} rows; first error: {dropped[0]}")
+
+    @staticmethod
+    def _filters(**filters):
+        """
+        Private helper that turns the given filters into a WHERE clause and its parameters.
+        """
+        clauses, params = [], []
+        for name in ('label', 'kind', 'input_hash', 'input'):
+            if filters.get(name) is not None:
+                clauses.append(f"{name} = ?")
+                params.append(filters[name])
+        if filters.get('since') is not None:
+            clauses.append("created >= ?")
+            params.append(_timestamp(filters['since']))
+        if filters.get('until') is not None:
+            clauses.append("created < ?")
+            params.append(_timestamp(filters['until']))
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def _query(self, sql, params):
+        """
+        Private helper that runs a read query on a pooled connection.
+        """
+        try:
+            with self.pool.connection() as connection:
+                return connection.execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Query failed: {e}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    # Example usage
+    with ResultStore(os.path.join(tempfile.mkdtemp(), 'results.db')) as store:
+        store.insert(review_row("Great product!", {'label': 'positive', 'confidence': 0.97}, 'bert-base-uncased'))
+        store.submit_many(
+            review_row(f"Review {i}", {'label': 'neutral', 'confidence': 0.5}, 'bert-base-uncased') for i in range(10)
+        )
+        store.flush()
+        print(store.label_counts())
+        print(store.find(text="Great product!"))
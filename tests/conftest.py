@@ -0,0 +1,28 @@
+import pytest
+
+
+@pytest.fixture(scope='session')
+def tiny_checkpoints(tmp_path_factory):
+    """
+    Paths to the benchmark suite's tiny, randomly initialized BERT and GPT-2 checkpoints.
+    """
+    pytest.importorskip('torch')
+    pytest.importorskip('transformers')
+    from benchmarks.suite import build_tiny_checkpoints
+    return build_tiny_checkpoints(str(tmp_path_factory.mktemp('checkpoints')))
+
+
+@pytest.fixture(scope='session')
+def tiny_gpt2(tiny_checkpoints):
+    """
+    Path to a two-layer GPT-2 checkpoint with a byte-level tokenizer.
+    """
+    return tiny_checkpoints[1]
+
+
+@pytest.fixture(scope='session')
+def tiny_bert(tiny_checkpoints):
+    """
+    Path to a two-layer, three-label BERT classifier with a small WordPiece vocabulary.
+    """
+    return tiny_checkpoints[0]
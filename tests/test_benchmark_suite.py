@@ -0,0 +1,57 @@
+import pytest
+
+pytest.importorskip('torch')
+
+from benchmarks.suite import NOISY_TOLERANCE, RESULTS_VERSION, _best_time, _result, compare
+
+
+def _run(**results):
+    return {'version': RESULTS_VERSION, 'results': results}
+
+
+def test_compare_flags_changes_in_the_bad_direction():
+    baseline = _run(
+        fast=_result(100.0, 'records/s', seconds=0.01),
+        slow=_result(100.0, 'records/s', seconds=0.01),
+        latency=_result(10.0, 'ms/turn', higher_is_better=False, seconds=0.01),
+        steady=_result(100.0, 'records/s', seconds=0.01),
+        removed=_result(1.0, 'records/s'),
+    )
+    current = _run(
+        fast=_result(120.0, 'records/s', seconds=0.01),
+        slow=_result(80.0, 'records/s', seconds=0.01),
+        latency=_result(12.0, 'ms/turn', higher_is_better=False, seconds=0.01),
+        steady=_result(110.0, 'records/s', seconds=0.01),
+        added=_result(1.0, 'records/s'),
+    )
+    rows = {row['name']: row for row in compare(current, baseline)}
+    assert {name: row['status'] for name, row in rows.items()} == {
+        'fast': 'improvement', 'slow': 'regression', 'latency': 'regression', 'steady': 'ok',
+    }
+    assert rows['slow']['change'] == pytest.approx(-0.2)
+    assert rows['latency']['change'] == pytest.approx(-0.2)
+    assert compare(current, baseline, tolerance=0.25)[1]['status'] == 'ok'
+
+
+def test_compare_tolerates_noise_in_sub_millisecond_measurements():
+    baseline = _run(tiny=_result(100.0, 'elements/s', seconds=0.0004), old=_result(100.0, 'elements/s'))
+    current = _run(tiny=_result(60.0, 'elements/s', seconds=0.0006), old=_result(60.0, 'elements/s'))
+    rows = {row['name']: row for row in compare(current, baseline)}
+    assert (rows['tiny']['status'], rows['tiny']['tolerance']) == ('ok', NOISY_TOLERANCE)
+    # Without a recorded duration the default tolerance applies
+    assert rows['old']['status'] == 'regression'
+    current['results']['tiny']['value'] = 40.0
+    assert compare(current, baseline)[0]['status'] == 'regression'
+
+
+def test_compare_rejects_another_layout_version():
+    with pytest.raises(ValueError):
+        compare(_run(), {'version': RESULTS_VERSION + 1, 'results': {}})
+
+
+def test_best_time_loops_fast_calls_until_a_sample_is_long_enough():
+    calls = []
+    per_call = _best_time(lambda: calls.append(None), repeat=3, min_seconds=0.02)
+    # Every sample ran enough calls to last 20 ms, far more than the 3 samples alone
+    assert len(calls) > 1000
+    assert 0 < per_call < 1e-4
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from ai_models.chat_model import ChatModel, ChatModelError
+from ai_models.chat_server import ChatBatchScheduler
+
+PROMPTS = [
+    ("", "hello there"),
+    ("we talked about the weather", "is it going to rain tomorrow?"),
+    ("a", "b"),
+    ("a much longer conversation history that pads every other prompt in the batch", "ok"),
+    ("", "what is the capital of france"),
+]
+
+
+@pytest.fixture(scope='module')
+def chat_model(tiny_gpt2):
+    model = ChatModel(tiny_gpt2, max_length=24, device='cpu')
+    # Top-1 sampling is deterministic, so batched and unbatched decoding must agree
+    model.top_k = 1
+    return model
+
+
+def _alone(chat_model, history, user_input, max_new_tokens):
+    with ChatBatchScheduler(chat_model, max_batch_size=1) as scheduler:
+        return scheduler.submit(history, user_input, max_new_tokens).result(timeout=60)
+
+
+def test_each_future_gets_its_own_response(chat_model):
+    expected = [_alone(chat_model, history, user_input, 12) for history, user_input in PROMPTS]
+    with ChatBatchScheduler(chat_model, max_batch_size=4) as scheduler:
+        futures = [scheduler.submit(history, user_input, 12) for history, user_input in PROMPTS]
+        responses = [future.result(timeout=60) for future in futures]
+        stats = scheduler.stats()
+    assert responses == expected
+    assert stats['requests_completed'] == len(PROMPTS)
+    assert stats['active'] == stats['queued'] == 0
+
+
+def test_sequences_join_and_leave_between_steps(chat_model):
+    lengths = [2, 16, 5, 9, 1]
+    expected = [_alone(chat_model, history, user_input, n) for (history, user_input), n in zip(PROMPTS, lengths)]
+    with ChatBatchScheduler(chat_model, max_batch_size=2) as scheduler:
+        futures = [scheduler.submit(history, user_input, n) for (history, user_input), n in zip(PROMPTS, lengths)]
+        assert [future.result(timeout=60) for future in futures] == expected
+
+
+def test_generate_from_event_loop(chat_model):
+    async def run(scheduler):
+        return await asyncio.gather(*(scheduler.generate(history, user_input, 6) for history, user_input in PROMPTS))
+
+    expected = [_alone(chat_model, history, user_input, 6) for history, user_input in PROMPTS]
+    with ChatBatchScheduler(chat_model, max_batch_size=8) as scheduler:
+        assert asyncio.run(run(scheduler)) == expected
+
+
+def test_submit_requires_running_scheduler(chat_model):
+    scheduler = ChatBatchScheduler(chat_model)
+    with pytest.raises(ChatModelError):
+        scheduler.submit("", "hi")
+    with pytest.raises(ChatModelError):
+        ChatBatchScheduler(chat_model, max_batch_size=0)
+
+
+def test_stop_fails_pending_requests(chat_model):
+    scheduler = ChatBatchScheduler(chat_model, max_batch_size=1).start()
+    futures = [scheduler.submit("", "hi", 200) for _ in range(3)]
+    scheduler.stop()
+    for future in futures:
+        if not future.cancelled():
+            assert future.done()
+
+
+def test_greedy_batches_match_generate_response(tiny_gpt2):
+    model = ChatModel(tiny_gpt2, max_length=24, device='cpu')
+    model.adjust_parameters(do_sample=False)
+    expected = []
+    for history, user_input in PROMPTS:
+        prompt = f"{history} {model.tokenizer.eos_token} {user_input} {model.tokenizer.eos_token}"
+        expected.append(model.generate_response(history, user_input, max_length=len(model._encode(prompt)) + 10))
+    with ChatBatchScheduler(model, max_batch_size=4) as scheduler:
+        futures = [scheduler.submit(history, user_input, 10) for history, user_input in PROMPTS]
+        assert [future.result(timeout=60) for future in futures] == expected
@@ -0,0 +1,90 @@
+import pytest
+
+torch = pytest.importorskip('torch')
+
+from ai_models.chat_model import ChatModel
+
+TURNS = ["hello there", "is it going to rain tomorrow?", "ok", "what is the capital of france"]
+
+
+@pytest.fixture(scope='module')
+def chat_model(tiny_gpt2):
+    model = ChatModel(tiny_gpt2, max_length=40, device='cpu')
+    model.adjust_parameters(do_sample=False)
+    return model
+
+
+def _greedy_ids(chat_model, token_ids, max_new_tokens):
+    """
+    Greedy continuation of ``token_ids`` recomputed from scratch, without any reused cache.
+    """
+    input_ids = torch.tensor([token_ids])
+    with torch.inference_mode():
+        output = chat_model.model.generate(input_ids, max_new_tokens=max_new_tokens, do_sample=False,
+                                           pad_token_id=chat_model.tokenizer.eos_token_id)
+    ids = output[0, input_ids.shape[-1]:].tolist()
+    return ids[:ids.index(chat_model.tokenizer.eos_token_id)] if chat_model.tokenizer.eos_token_id in ids else ids
+
+
+def test_first_turn_matches_generate_response(chat_model):
+    for history in ["", "we talked about the weather"]:
+        prompt_length = len(chat_model._encode(f"{history} {chat_model.tokenizer.eos_token} {TURNS[0]} {chat_model.tokenizer.eos_token}"))
+        expected = chat_model.generate_response(history, TURNS[0], max_length=prompt_length + 12)
+        assert chat_model.start_session(history).send(TURNS[0], max_new_tokens=12) == expected
+
+
+def test_reused_cache_matches_recomputing_every_turn(chat_model):
+    session = chat_model.start_session("we talked about the weather")
+    eos = chat_model.tokenizer.eos_token
+    for turn in TURNS:
+        context = session.token_ids + chat_model._encode(f" {eos} {turn} {eos}")
+        expected = _greedy_ids(chat_model, context, 10)
+        response = session.send(turn, max_new_tokens=10)
+        assert response == chat_model.tokenizer.decode(expected, skip_special_tokens=True).strip()
+        # The cache covers the whole conversation except the last sampled token
+        assert session.token_ids == context + expected
+        assert session.cached_length >= len(context)
+
+
+def test_truncate_starts_at_a_turn_boundary(chat_model):
+    eos_token_id = chat_model.tokenizer.eos_token_id
+    session = chat_model.start_session(max_context=40, keep_ratio=0.5)
+    session.token_ids = [1, 2, 3, eos_token_id, 4, 5, 6, eos_token_id, 7, 8] + list(range(10, 20))
+    session.past_key_values, session.cached_length = object(), len(session.token_ids)
+
+    session._truncate(30)
+    assert len(session.token_ids) == 20 and session.cached_length == 20
+
+    session._truncate(16)
+    # The last 16 tokens start mid-turn; the window is moved up to the EOS that ends that turn
+    assert session.token_ids == [eos_token_id, 7, 8] + list(range(10, 20))
+    assert session.past_key_values is None and session.cached_length == 0
+
+
+def test_truncate_without_a_boundary_keeps_the_window(chat_model):
+    session = chat_model.start_session(max_context=20, keep_ratio=0.5)
+    session.token_ids = list(range(30))
+    session._truncate(15)
+    assert session.token_ids == list(range(20, 30))
+
+
+def test_long_conversation_stays_within_the_context(chat_model):
+    session = chat_model.start_session(max_context=64, keep_ratio=0.5)
+    for turn in TURNS * 3:
+        session.send(turn, max_new_tokens=8)
+        assert len(session.token_ids) <= 64
+    # After truncation the cache is rebuilt from the kept window
+    session._truncate(20)
+    eos = chat_model.tokenizer.eos_token
+    context = session.token_ids + chat_model._encode(f" {eos} {TURNS[0]} {eos}")
+    expected = _greedy_ids(chat_model, context, 8)
+    assert session.send(TURNS[0], max_new_tokens=8) == chat_model.tokenizer.decode(expected, skip_special_tokens=True).strip()
+
+
+def test_reset_clears_the_conversation(chat_model):
+    session = chat_model.start_session("we talked about the weather")
+    first = session.send(TURNS[0], max_new_tokens=6)
+    session.reset()
+    assert (session.token_ids, session.past_key_values, session.cached_length) == ([], None, 0)
+    assert session.send(TURNS[0], max_new_tokens=6) == chat_model.start_session().send(TURNS[0], max_new_tokens=6)
+    assert first == chat_model.start_session("we talked about the weather").send(TURNS[0], max_new_tokens=6)
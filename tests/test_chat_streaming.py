@@ -0,0 +1,74 @@
+import asyncio
+import threading
+
+import pytest
+
+pytest.importorskip('torch')
+
+from ai_models.chat_model import ChatModel, ChatModelError, _stream_text
+
+MULTIBYTE = ["  café au lait", "日本語のレビュー", "great 🎉👍 product", "naïve – “quoted” ✓"]
+
+
+@pytest.fixture(scope='module')
+def chat_model(tiny_gpt2):
+    model = ChatModel(tiny_gpt2, max_length=40, device='cpu')
+    model.adjust_parameters(do_sample=False)
+    return model
+
+
+@pytest.mark.parametrize('text', MULTIBYTE)
+def test_stream_text_never_splits_a_character(chat_model, text):
+    # The tiny tokenizer has one token per byte, so every non-ASCII character spans several tokens
+    ids = chat_model.tokenizer.encode(text)
+    assert len(ids) == len(text.encode('utf-8'))
+    chunks = list(_stream_text(chat_model.tokenizer, iter(ids)))
+    assert ''.join(chunks) == text.lstrip()
+    assert not any('�' in chunk for chunk in chunks)
+
+
+def test_stream_text_flushes_an_incomplete_character_at_the_end(chat_model):
+    ids = chat_model.tokenizer.encode("ok 日")[:-1]
+    chunks = list(_stream_text(chat_model.tokenizer, iter(ids)))
+    assert ''.join(chunks) == chat_model.tokenizer.decode(ids)
+
+
+def test_stream_text_stops_when_the_event_is_set(chat_model):
+    stop_event = threading.Event()
+    tokens = iter(chat_model.tokenizer.encode("abcdef"))
+    stream = _stream_text(chat_model.tokenizer, tokens, stop_event)
+    assert next(stream) == "a"
+    stop_event.set()
+    assert list(stream) == []
+    # Nothing past the current token was consumed
+    assert list(tokens) == chat_model.tokenizer.encode("bcdef")
+
+
+def test_stream_response_joins_to_generate_response(chat_model):
+    for history, user_input in [("", "hello there"), ("we talked about the weather", "is it going to rain?")]:
+        prompt = f"{history} {chat_model.tokenizer.eos_token} {user_input} {chat_model.tokenizer.eos_token}"
+        expected = chat_model.generate_response(history, user_input, max_length=len(chat_model._encode(prompt)) + 12)
+        # Trailing whitespace cannot be stripped while streaming because more text may follow it
+        assert ''.join(chat_model.stream_response(history, user_input, max_new_tokens=12)).rstrip() == expected
+
+
+def test_astream_response_matches_stream_response(chat_model):
+    async def run():
+        return [chunk async for chunk in chat_model.astream_response("", "hello there", max_new_tokens=12)]
+
+    assert asyncio.run(run()) == list(chat_model.stream_response("", "hello there", max_new_tokens=12))
+
+
+def test_astream_response_forwards_any_error(chat_model, monkeypatch):
+    def failing_encode(text):
+        raise ValueError("cannot encode")
+
+    async def run():
+        return [chunk async for chunk in chat_model.astream_response("some history", "hello", max_new_tokens=4)]
+
+    monkeypatch.setattr(chat_model, '_encode', failing_encode)
+    # An error other than ChatModelError must not end the stream as if the response were complete
+    with pytest.raises(ChatModelError, match="cannot encode"):
+        asyncio.run(run())
+    with pytest.raises(ChatModelError, match="cannot encode"):
+        chat_model.start_session("some history")
@@ -0,0 +1,132 @@
+import csv
+import json
+
+import pytest
+
+from tools.column_pipeline import ColumnPipeline
+from tools.formatter import Formatter, FormatterError
+
+BACKENDS = ['python'] + (['pandas'] if ColumnPipeline({}).backend == 'pandas' else [])
+
+SPEC = {
+    'name': ['strip', 'title'],
+    'email': ['strip', 'lower'],
+    'signup': [('datetime', {'current_format': '%d/%m/%Y', 'target_format': '%Y-%m-%d'})],
+    'meta': [('json', {'indent': 2})],
+}
+
+COLUMNS = {
+    'id': ['1', '2', '3'],
+    'name': ['  ada lovelace ', 'ALAN turing', 'grace'],
+    'email': [' Ada@Example.COM', 'alan@example.com ', 'GRACE@EXAMPLE.COM'],
+    'signup': ['27/09/2024', '01/01/2000', '31/12/1999'],
+    'meta': ['{"a": 1}', '[1, 2]', '{"nested": {"b": "é"}}'],
+}
+
+
+def _per_cell(columns, spec=SPEC):
+    """
+    The reference result: each Formatter method called on each cell.
+    """
+    result = {name: list(values) for name, values in columns.items()}
+    for column, operations in spec.items():
+        for operation in operations:
+            name, options = (operation, {}) if isinstance(operation, str) else operation
+            if name == 'strip':
+                function = str.strip
+            elif name == 'datetime':
+                function = lambda value: Formatter.format_datetime(value, options['current_format'], options['target_format'])
+            elif name == 'json':
+                function = lambda value: Formatter.format_json(value, indent=options['indent'])
+            else:
+                function = lambda value: Formatter.format_string(value, name)
+            result[column] = [function(value) for value in result[column]]
+    return result
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_apply_matches_per_cell_formatter(backend):
+    assert ColumnPipeline(SPEC, backend=backend).apply(COLUMNS) == _per_cell(COLUMNS)
+
+
+def test_apply_dataframe_keeps_its_type():
+    pd = pytest.importorskip('pandas')
+    frame = pd.DataFrame(COLUMNS)
+    for backend in BACKENDS:
+        result = ColumnPipeline(SPEC, backend=backend).apply(frame)
+        assert isinstance(result, pd.DataFrame)
+        assert result.to_dict('list') == _per_cell(COLUMNS)
+    assert frame.to_dict('list') == COLUMNS
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_bad_cells_follow_the_errors_option(backend):
+    columns = {'name': ['ada', None, 'alan'], 'signup': ['27/09/2024', 'not a date', '01/01/2000']}
+    spec = {'name': ['upper'], 'signup': SPEC['signup']}
+    with pytest.raises(FormatterError, match="must be a string"):
+        ColumnPipeline({'name': ['upper']}, backend=backend).apply(columns)
+    with pytest.raises(FormatterError, match="Date formatting error"):
+        ColumnPipeline({'signup': SPEC['signup']}, backend=backend).apply(columns)
+    assert ColumnPipeline(spec, errors='coerce', backend=backend).apply(columns) == {
+        'name': ['ADA', None, 'ALAN'], 'signup': ['2024-09-27', None, '2000-01-01'],
+    }
+    assert ColumnPipeline(spec, errors='ignore', backend=backend).apply(columns) == {
+        'name': ['ADA', None, 'ALAN'], 'signup': ['2024-09-27', 'not a date', '2000-01-01'],
+    }
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_date_format_is_inferred(backend):
+    pipeline = ColumnPipeline({'signup': [('datetime', {'target_format': '%Y-%m-%d'})]}, backend=backend)
+    assert pipeline.apply({'signup': ['27/09/2024', '13/01/2000']}) == {'signup': ['2024-09-27', '2000-01-13']}
+    with pytest.raises(FormatterError, match="Could not infer"):
+        ColumnPipeline({'signup': [('datetime', {})]}, backend=backend).apply({'signup': ['x', 'y']})
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_inferred_format_does_not_stick_to_the_spec(tmp_path, backend):
+    pipeline = ColumnPipeline({'d': [('datetime', {'target_format': '%Y-%m-%d'})]}, backend=backend)
+    assert pipeline.apply({'d': ['2024-09-27']}) == {'d': ['2024-09-27']}
+    assert pipeline.apply({'d': ['27/09/2024']}) == {'d': ['2024-09-27']}
+    assert pipeline.spec == {'d': [('datetime', {'target_format': '%Y-%m-%d'})]}
+
+    # Within a run the first chunk decides the format for the whole file
+    for name, values in [('iso.csv', ['2024-09-27', '2024-09-28']), ('uk.csv', ['27/09/2024', '28/09/2024'])]:
+        (tmp_path / name).write_text('d\n' + '\n'.join(values) + '\n', encoding='utf-8')
+        pipeline.run(str(tmp_path / name), str(tmp_path / 'out.csv'), chunk_size=1)
+        assert (tmp_path / 'out.csv').read_text(encoding='utf-8').split() == ['d', '2024-09-27', '2024-09-28']
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('chunk_size', [1, 2, 1000])
+def test_run_matches_per_cell_csv_loop(tmp_path, backend, chunk_size):
+    source, output = tmp_path / 'in.csv', tmp_path / 'out.csv'
+    with open(source, 'w', newline='', encoding='utf-8') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(list(COLUMNS))
+        writer.writerows(zip(*COLUMNS.values()))
+    report = ColumnPipeline(SPEC, backend=backend).run(str(source), str(output), chunk_size)
+    assert report['rows'] == 3
+    with open(output, newline='', encoding='utf-8') as handle:
+        rows = list(csv.DictReader(handle))
+    assert {name: [row[name] for row in rows] for name in COLUMNS} == _per_cell(COLUMNS)
+
+
+def test_invalid_specs_raise():
+    with pytest.raises(FormatterError, match="Unsupported column operation"):
+        ColumnPipeline({'name': ['shout']})
+    with pytest.raises(FormatterError, match="Unsupported options"):
+        ColumnPipeline({'meta': [('json', {'indent': 2, 'sort_keys': True})]})
+    with pytest.raises(FormatterError):
+        ColumnPipeline({}, errors='skip')
+    with pytest.raises(FormatterError):
+        ColumnPipeline({}, backend='spark')
+    with pytest.raises(FormatterError, match="Column not found"):
+        ColumnPipeline({'missing': ['upper']}).apply(COLUMNS)
+    with pytest.raises(FormatterError):
+        ColumnPipeline(SPEC).run('/nonexistent/in.csv', '/nonexistent/out.csv')
+
+
+def test_spec_round_trips_through_json():
+    spec = json.loads(json.dumps(SPEC))
+    assert ColumnPipeline(spec, backend='python').apply(COLUMNS) == _per_cell(COLUMNS)
@@ -0,0 +1,98 @@
+import pytest
+
+torch = pytest.importorskip('torch')
+
+from ai_models.chat_model import ChatModel
+from ai_models.cpu_optimization import configure_threads, conv1d_to_linear, model_size_mb, quantize_dynamic_int8
+from ai_models.review_model import ReviewModel
+
+REVIEWS = ["great product", "terrible service, would not buy again", "ok", "love this", "bad"]
+
+
+def _state(model):
+    return {name: value.clone() for name, value in model.state_dict().items()}
+
+
+def _assert_same_state(model, state):
+    current = model.state_dict()
+    assert current.keys() == state.keys()
+    for name, value in state.items():
+        assert torch.equal(current[name], value), name
+
+
+def _assert_same_results(results, expected):
+    assert [result['label'] for result in results] == [result['label'] for result in expected]
+    assert [result['confidence'] for result in results] == pytest.approx([result['confidence'] for result in expected], abs=1e-5)
+
+
+def test_quantize_leaves_the_source_model_untouched(tiny_gpt2):
+    source = ChatModel(tiny_gpt2, device='cpu').model
+    state = _state(source)
+    projection = type(source.transformer.h[0].attn.c_attn)
+    quantized = quantize_dynamic_int8(source)
+
+    assert quantized is not source
+    _assert_same_state(source, state)
+    # The source still uses its Conv1D projections and floating point weights
+    assert type(source.transformer.h[0].attn.c_attn) is projection and projection.__name__ == 'Conv1D'
+    assert all(value.dtype == torch.float32 for value in source.state_dict().values() if value.is_floating_point())
+    assert 'quantized' in type(quantized.transformer.h[0].attn.c_attn).__module__
+    assert model_size_mb(quantized) < model_size_mb(source)
+
+
+def test_conv1d_to_linear_is_equivalent(tiny_gpt2):
+    model = ChatModel(tiny_gpt2, device='cpu').model.eval()
+    input_ids = torch.tensor([[1, 2, 3, 4, 5, 6]])
+    with torch.no_grad():
+        expected = model(input_ids).logits
+        converted = conv1d_to_linear(model)
+        assert converted is model
+        assert isinstance(model.transformer.h[0].mlp.c_fc, torch.nn.Linear)
+        torch.testing.assert_close(model(input_ids).logits, expected)
+
+
+def test_review_model_optimized_round_trip(tiny_bert, tmp_path):
+    model = ReviewModel(tiny_bert, device='cpu')
+    model.optimize_for_cpu(num_threads=1)
+    expected = list(model.classify_reviews(REVIEWS, batch_size=2))
+    model.save_optimized(str(tmp_path / 'optimized'))
+
+    loaded = ReviewModel(tiny_bert, device='cpu', cache_size=8)
+    loaded.load_optimized(str(tmp_path / 'optimized'))
+    assert isinstance(loaded.model, torch.jit.ScriptModule)
+    _assert_same_results(list(loaded.classify_reviews(REVIEWS, batch_size=2)), expected)
+    # Dynamic quantization picks activation ranges per batch, so unbatched results only agree closely
+    single = [loaded.classify_review(review)['confidence'] for review in REVIEWS]
+    assert single == pytest.approx([result['confidence'] for result in expected], abs=1e-3)
+
+
+def test_quantized_review_model_stays_close_to_fp32(tiny_bert):
+    model = ReviewModel(tiny_bert, device='cpu')
+    expected = list(model.classify_reviews(REVIEWS))
+    model.optimize_for_cpu(num_threads=1)
+    results = list(model.classify_reviews(REVIEWS))
+    assert [result['confidence'] for result in results] == pytest.approx([result['confidence'] for result in expected], abs=0.05)
+
+
+def test_chat_model_optimized_round_trip(tiny_gpt2, tmp_path):
+    model = ChatModel(tiny_gpt2, max_length=60, device='cpu')
+    model.adjust_parameters(do_sample=False)
+    model.optimize_for_cpu(num_threads=1)
+    expected = model.generate_response("we talked about the weather", "hello there")
+    model.save_optimized(str(tmp_path / 'optimized'))
+
+    loaded = ChatModel(tiny_gpt2, max_length=60, device='cpu')
+    loaded.adjust_parameters(do_sample=False)
+    loaded.load_optimized(str(tmp_path / 'optimized'))
+    assert type(loaded.model.transformer.h[0].attn.c_attn) is type(model.model.transformer.h[0].attn.c_attn)
+    assert loaded.generate_response("we talked about the weather", "hello there") == expected
+
+
+def test_configure_threads():
+    previous = torch.get_num_threads()
+    try:
+        assert configure_threads(2) == 2
+        assert configure_threads(0) == 1
+        assert configure_threads() >= 1
+    finally:
+        torch.set_num_threads(previous)
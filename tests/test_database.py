@@ -0,0 +1,187 @@
+import asyncio
+import threading
+from datetime import datetime
+
+import pytest
+
+from src.database import ConnectionPool, DatabaseError, ResultStore, chat_row, hash_input, review_row
+
+LABELS = ['positive', 'negative', 'neutral']
+
+
+@pytest.fixture
+def store(tmp_path):
+    with ResultStore(str(tmp_path / 'data' / 'results.db'), batch_size=50, flush_interval=0.05) as store:
+        yield store
+
+
+def _reviews(count, start=1000.0):
+    return [
+        review_row(f"review {index}", {'label': LABELS[index % 3], 'confidence': index / count}, 'bert', start + index)
+        for index in range(count)
+    ]
+
+
+def test_rows_and_hashes():
+    row = review_row("great", {'label': 'positive', 'confidence': 0.9}, 'bert', created=5.0)
+    assert row == ('review', 'bert', hash_input("great"), "great", 'positive', 0.9, None, 5.0)
+    assert chat_row("hi", "hello")[:7] == ('chat', None, hash_input("hi"), "hi", None, None, "hello")
+    assert hash_input("great") != hash_input("great ") and -2 ** 63 <= hash_input("great") < 2 ** 63
+
+
+def test_insert_and_find(store):
+    first = store.insert(review_row("great", {'label': 'positive', 'confidence': 0.9}, 'bert', created=10.0))
+    assert store.insert_many(_reviews(30)) == 30
+    store.insert(chat_row("hi", "hello", created=2000.0))
+    assert store.count() == 32
+
+    [result] = store.find(text="great")
+    assert (result['id'], result['label'], result['confidence'], result['created']) == (first, 'positive', 0.9, 10.0)
+    assert store.find(input_hash=hash_input("great")) == [result]
+    assert store.find(text="missing") == []
+
+    assert [row['input'] for row in store.find(kind='review', limit=3)] == ["review 29", "review 28", "review 27"]
+    assert len(store.find(label='neutral', limit=None)) == 10
+    assert [row['created'] for row in store.find(since=1010, until=1013)] == [1012.0, 1011.0, 1010.0]
+    bound = datetime.fromtimestamp(1025)
+    assert len(store.find(since=bound, kind='review')) == 5
+    assert len(store.find(since=bound.isoformat(), kind='review')) == 5
+    assert store.find(kind='chat')[0]['output'] == "hello"
+    with pytest.raises(DatabaseError):
+        store.find(since='last tuesday')
+
+
+def test_label_counts(store):
+    store.insert_many(_reviews(30) + [chat_row("hi", "hello", created=1005.5)])
+    assert store.label_counts() == {'positive': 10, 'negative': 10, 'neutral': 10}
+    assert store.label_counts(kind=None)[None] == 1
+    assert store.label_counts(since=1000, until=1006) == {'positive': 2, 'negative': 2, 'neutral': 2}
+
+
+def test_submit_writes_in_the_background(store):
+    rows = _reviews(120)
+    store.submit(rows[0])
+    store.submit_many(iter(rows[1:]))
+    store.flush()
+    assert store.count() == 120
+    assert store.label_counts()['positive'] == 40
+
+
+def test_async_api(store):
+    async def run():
+        await asyncio.gather(*[store.submit_async(row) for row in _reviews(40)])
+        await store.flush_async()
+        return await store.find_async(label='negative', limit=None), await store.label_counts_async(kind='review')
+
+    negative, counts = asyncio.run(run())
+    assert len(negative) == 13 and counts['positive'] == 14
+
+
+def test_malformed_rows_fail_at_the_call_site(store):
+    for row in [('review', 'bert'), None, {'kind': 'review'}, _reviews(1)[0] + (1,)]:
+        with pytest.raises(DatabaseError, match="Expected a tuple or list of 8 values"):
+            store.submit(row)
+        with pytest.raises(DatabaseError):
+            asyncio.run(store.submit_async(row))
+    with pytest.raises(DatabaseError):
+        store.submit_many(_reviews(5) + [('review',)])
+    store.submit(list(_reviews(1)[0]))
+    store.flush()
+    # Nothing from the rejected submit_many call was queued
+    assert store.count() == 1
+
+
+def test_bad_row_in_a_batch_only_drops_that_row(store, caplog):
+    rows = _reviews(99)
+    # Right shape, but input is NOT NULL
+    rows.insert(42, ('review', 'bert', 0, None, 'positive', 0.5, None, 1.0))
+    store.submit_many(rows)
+    with pytest.raises(DatabaseError, match="Dropped 1 of"):
+        store.flush()
+    assert store.count() == 99
+    assert "Dropped result row" in caplog.text
+    # The error is reported once
+    store.flush()
+
+
+@pytest.mark.parametrize('bad_row', [
+    ('review', 'bert', 0, "overflow", 'positive', 2 ** 70, None, 1.0),
+    ('review', 'bert', 0, "unsupported", 'positive', {'a': 1}, None, 1.0),
+])
+def test_unbindable_row_does_not_stop_the_writer(store, bad_row):
+    store.submit_many(_reviews(20) + [bad_row] + _reviews(20, start=5000.0))
+    with pytest.raises(DatabaseError, match="Dropped 1 of 41"):
+        store.flush()
+    assert store.count() == 40
+    # The writer is still alive and later rows are written
+    store.submit(_reviews(1)[0])
+    store.flush()
+    assert store.count() == 41
+    with pytest.raises(DatabaseError):
+        store.insert(bad_row)
+    with pytest.raises(DatabaseError):
+        store.insert_many([bad_row])
+
+
+def test_whole_batch_failure_is_reported(tmp_path):
+    store = ResultStore(str(tmp_path / 'results.db'), flush_interval=0.05)
+    store.submit_many(_reviews(10))
+    store.flush()
+    with store.pool.connection() as connection:
+        connection.execute("DROP TABLE results")
+    store.submit_many(_reviews(10))
+    with pytest.raises(DatabaseError, match="no such table"):
+        store.flush()
+    store.close()
+
+
+def test_close_writes_pending_rows(tmp_path):
+    path = str(tmp_path / 'results.db')
+    store = ResultStore(path, flush_interval=0.2)
+    store.submit_many(_reviews(25))
+    store.close()
+    with pytest.raises(DatabaseError, match="closed"):
+        store.submit(_reviews(1)[0])
+    with ResultStore(path) as reopened:
+        assert reopened.count() == 25
+
+
+def test_pool_limits_and_reuses_connections(tmp_path):
+    pool = ConnectionPool(str(tmp_path / 'pool.db'), size=2, timeout=0.1)
+    with pool.connection() as first:
+        with pool.connection() as second:
+            assert first is not second
+            with pytest.raises(DatabaseError, match="No database connection"):
+                with pool.connection():
+                    pass
+    with pool.connection() as again:
+        assert again in (first, second)
+        assert again.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+
+    with pool.connection() as connection:
+        connection.execute("CREATE TABLE items (value INTEGER)")
+    with pytest.raises(RuntimeError):
+        with pool.connection() as connection:
+            connection.execute("BEGIN")
+            connection.execute("INSERT INTO items VALUES (1)")
+            raise RuntimeError("abort")
+    with pool.connection() as connection:
+        assert not connection.in_transaction
+        assert connection.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+
+    pool.close()
+    with pytest.raises(DatabaseError, match="closed"):
+        with pool.connection():
+            pass
+    with pytest.raises(DatabaseError):
+        ConnectionPool(str(tmp_path / 'pool.db'), size=0)
+
+
+def test_concurrent_submitters(store):
+    threads = [threading.Thread(target=store.submit_many, args=(_reviews(100, start=offset * 1000),)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    store.flush()
+    assert store.count() == 400
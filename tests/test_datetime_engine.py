@@ -0,0 +1,109 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from tools.datetime_engine import (
+    COMMON_FORMATS, MEMO_PROBE, compile_converter, compile_formatter, compile_parser, convert_column,
+    infer_format, parse_column,
+)
+
+FORMATS = COMMON_FORMATS + (
+    '%d/%m/%y %I:%M %p',
+    '%Y-%m-%dT%H:%M',
+    '%H:%M:%S',
+    '%j/%Y',
+    '%A %d %B %Y',
+    '%Y-%m-%d %H:%M:%S.%f',
+)
+
+
+def _moments(count, seed=0):
+    rng = random.Random(seed)
+    start = datetime(1970, 1, 1)
+    return [start + timedelta(seconds=rng.randrange(0, 80 * 365 * 86400), microseconds=rng.randrange(10**6))
+            for _ in range(count)]
+
+
+def _strptime(value, date_format):
+    try:
+        return datetime.strptime(value, date_format), None
+    except ValueError as e:
+        return None, str(e)
+
+
+def _compiled(value, date_format):
+    try:
+        return compile_parser(date_format)(value), None
+    except ValueError as e:
+        return None, str(e)
+
+
+@pytest.mark.parametrize('date_format', FORMATS)
+def test_parser_matches_strptime(date_format):
+    values = [moment.replace(tzinfo=timezone.utc).strftime(date_format) for moment in _moments(200)]
+    # Near misses: truncated, padded, swapped separators, out-of-range fields
+    values += [value[:-1] for value in values[:20]] + [value + ' ' for value in values[:20]]
+    values += [value.replace('-', '/') for value in values[:20]] + ['2024-02-30', '2024-13-01 00:00:00', '', 'garbage']
+    values += ['2024-09-27 7:05:03', '2024-9-7', '2024-09-27T12:00:00+0200', '27/09/24 12:30 am', '1/2/2024']
+    for value in values:
+        assert _compiled(value, date_format) == _strptime(value, date_format), value
+
+
+@pytest.mark.parametrize('date_format', FORMATS + ('%Y', '%m/%Y %%'))
+def test_formatter_matches_strftime(date_format):
+    moments = _moments(200) + [datetime(1, 1, 1), datetime(999, 12, 31, 23, 59), datetime(2024, 9, 27, tzinfo=timezone.utc)]
+    format_ = compile_formatter(date_format)
+    for moment in moments:
+        assert format_(moment) == moment.strftime(date_format)
+
+
+@pytest.mark.parametrize('source', ['%d/%m/%Y %H:%M:%S', '%Y-%m-%d %H:%M:%S', '%Y%m%d', '%d/%m/%Y %H:%M:%S%z'])
+@pytest.mark.parametrize('target', ['%Y-%m-%d', '%Y-%m-%dT%H:%M:%S', '%d %b %Y'])
+def test_converter_matches_parse_then_format(source, target):
+    convert = compile_converter(source, target)
+    for moment in _moments(100):
+        value = moment.replace(tzinfo=timezone.utc).strftime(source)
+        assert convert(value) == datetime.strptime(value, source).strftime(target)
+    with pytest.raises(ValueError):
+        convert('not a date')
+
+
+def test_infer_format():
+    assert infer_format(['2024-09-27 12:00:00', '2024-09-28 08:15:00']) == '%Y-%m-%d %H:%M:%S'
+    # Ambiguous day/month columns prefer day-first; an unambiguous value decides it
+    assert infer_format(['01/02/2024', '03/04/2024']) == '%d/%m/%Y'
+    assert infer_format(['01/02/2024', '12/31/2024']) == '%m/%d/%Y'
+    assert infer_format(['27 Sep 2024', '', None, 'n/a']) == '%d %b %Y'
+    assert infer_format(['nothing', 'parses']) is None
+
+
+def test_parse_column_errors():
+    values = ['2024-09-27', 'bad', '2024-09-28']
+    with pytest.raises(ValueError, match="Row 1"):
+        parse_column(values, '%Y-%m-%d')
+    assert parse_column(values, '%Y-%m-%d', errors='coerce') == [datetime(2024, 9, 27), None, datetime(2024, 9, 28)]
+    with pytest.raises(ValueError):
+        parse_column(values, '%Y-%m-%d', errors='ignore')
+    with pytest.raises(ValueError):
+        parse_column(['x', 'y'])
+
+
+def test_convert_column_infers_and_memoizes():
+    values = ['27/09/2024', '28/09/2024', None, '27/09/2024'] * 50
+    expected = ['2024-09-27', '2024-09-28', None, '2024-09-27'] * 50
+    assert convert_column(values, target_format='%Y-%m-%d', errors='coerce') == expected
+
+
+def test_convert_column_with_mostly_distinct_values():
+    moments = _moments(MEMO_PROBE * 2, seed=1)
+    values = [moment.strftime('%Y-%m-%d %H:%M:%S') for moment in moments]
+    assert convert_column(values, '%Y-%m-%d %H:%M:%S', '%d/%m/%Y %H:%M') == [moment.strftime('%d/%m/%Y %H:%M') for moment in moments]
+
+
+def test_columns_accept_numpy_and_pandas():
+    np = pytest.importorskip('numpy')
+    pd = pytest.importorskip('pandas')
+    values = ['2024-09-27', '2024-09-28']
+    for column in (np.array(values), pd.Series(values)):
+        assert convert_column(column, '%Y-%m-%d', '%d.%m.%Y') == ['27.09.2024', '28.09.2024']
@@ -0,0 +1,86 @@
+import pytest
+
+from ai_models.tokenization import EncodingCache
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = EncodingCache(max_size=2)
+    cache.put("a", [1])
+    cache.put("b", [2])
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get("a") == (1,)
+    cache.put("c", [3])
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == ((1,), (3,))
+    # Overwriting an entry refreshes it instead of growing the cache
+    cache.put("a", [4])
+    cache.put("d", [5])
+    assert cache.get("c") is None and cache.get("a") == (4,)
+    assert cache.stats()['size'] == 2
+
+
+def test_stats_and_clear():
+    cache = EncodingCache(max_size=3)
+    assert cache.stats() == {'hits': 0, 'misses': 0, 'hit_ratio': 0.0, 'size': 0, 'max_size': 3}
+    cache.get("a")
+    cache.put("a", [1, 2])
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+    assert cache.stats() == {'hits': 2, 'misses': 2, 'hit_ratio': 0.5, 'size': 1, 'max_size': 3}
+    cache.clear()
+    assert cache.stats() == {'hits': 0, 'misses': 0, 'hit_ratio': 0.0, 'size': 0, 'max_size': 3}
+    assert cache.get("a") is None
+
+
+def test_get_or_encode_only_encodes_misses():
+    calls = []
+
+    def encode(text):
+        calls.append(text)
+        return [len(text)]
+
+    cache = EncodingCache(max_size=2)
+    assert cache.get_or_encode("abc", encode) == (3,)
+    assert cache.get_or_encode("abc", encode) == (3,)
+    assert cache.get_or_encode("de", encode) == (2,)
+    assert calls == ["abc", "de"]
+    # Stored ids are immutable so callers cannot corrupt the cache
+    assert isinstance(cache.get("abc"), tuple)
+
+
+def test_invalid_size_raises():
+    with pytest.raises(ValueError):
+        EncodingCache(max_size=0)
+
+
+def test_review_model_cache_does_not_change_results(tiny_bert):
+    pytest.importorskip('torch')
+    from ai_models.review_model import ReviewModel
+
+    texts = ["great product", "bad", "great product", "ok", "bad", "love this"]
+    uncached = ReviewModel(tiny_bert, device='cpu')
+    cached = ReviewModel(tiny_bert, device='cpu', cache_size=2)
+    assert uncached.cache_stats() is None
+    expected = list(uncached.classify_reviews(texts, batch_size=3))
+    results = list(cached.classify_reviews(texts, batch_size=3))
+    assert [result['label'] for result in results] == [result['label'] for result in expected]
+    assert [result['confidence'] for result in results] == pytest.approx([result['confidence'] for result in expected], abs=1e-5)
+    stats = cached.cache_stats()
+    assert stats['hits'] + stats['misses'] > 0 and stats['size'] <= 2
+    assert cached._encode(texts) == uncached._encode(texts)
+
+
+def test_chat_model_cache_encodes_turns_like_the_tokenizer(tiny_gpt2):
+    pytest.importorskip('torch')
+    from ai_models.chat_model import ChatModel
+
+    cached = ChatModel(tiny_gpt2, device='cpu', cache_size=8)
+    eos = cached.tokenizer.eos_token
+    history = f" {eos} great product {eos} thanks, anything else? {eos} great product {eos}"
+    assert cached._encode(history) == cached.tokenizer.encode(history)
+    first = cached.cache_stats()
+    cached._encode(history + " bad service " + eos)
+    second = cached.cache_stats()
+    # Only the new turn (and the empty tail) are looked up again as misses
+    assert second['hits'] > first['hits'] and second['misses'] - first['misses'] <= 1
@@ -0,0 +1,124 @@
+import io
+import json
+import random
+
+import pytest
+
+from tools.json_stream import iter_json_records, JSONStreamError
+from tools.validator import Validator
+
+RECORDS = [
+    12.5, 3, -0.25, 1e-07, 6.02e+23, 0, -17, 123456789012345678901234567890,
+    "plain", "esc \" \\ / \b \f \n \r \t", "café ☃ \U0001f600", "",
+    {"id": 1, "rating": 4.75, "text": "naïve \\u not an escape"},
+    [1, [2.5, "x"], {"k": None}], True, False, None,
+]
+
+
+class SplitStream:
+    """
+    A binary stream whose reads stop at the given byte offsets, then return ``size`` bytes.
+    """
+
+    def __init__(self, data, splits=()):
+        self.data = data
+        self.pos = 0
+        self.splits = sorted(splits)
+
+    def read(self, size=-1):
+        end = len(self.data) if size is None or size < 0 else self.pos + size
+        while self.splits and self.splits[0] <= self.pos:
+            self.splits.pop(0)
+        if self.splits:
+            end = min(end, self.splits[0])
+        chunk = self.data[self.pos:end]
+        self.pos += len(chunk)
+        return chunk
+
+
+def _records(data, chunk_size, splits=()):
+    return [record for _, _, record in iter_json_records(SplitStream(data, splits), chunk_size=chunk_size)]
+
+
+def test_array_split_at_every_offset():
+    data = json.dumps(RECORDS).encode('utf-8')
+    for split in range(1, len(data)):
+        assert _records(data, 1 << 16, [split]) == RECORDS, f"split at byte {split}"
+
+
+def test_escapes_split_at_every_offset():
+    data = b'["\\u00e9\\/\\ud83d\\ude00\\n\\"", "\\\\", 10.75e-3]'
+    expected = json.loads(data)
+    for split in range(1, len(data)):
+        assert _records(data, 1 << 16, [split]) == expected, f"split at byte {split}"
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 5, 7, 16])
+def test_array_small_chunks(chunk_size):
+    data = json.dumps(RECORDS, ensure_ascii=False).encode('utf-8')
+    assert _records(data, chunk_size) == RECORDS
+
+
+def test_numbers_cut_at_chunk_boundary():
+    # '12' ends the first chunk and '.5' starts the next
+    assert _records(b'[1, 12.5, 3]', 6) == [1, 12.5, 3]
+    assert _records(b'[1, 12.5, 3]', 7) == [1, 12.5, 3]
+    assert _records(b'[1e5, -2E-3]', 2) == [1e5, -2e-3]
+
+
+def test_random_splits_match_json_loads():
+    rng = random.Random(0)
+    for _ in range(200):
+        records = [rng.choice([rng.uniform(-1e6, 1e6), rng.randint(-10**6, 10**6), "sé\\\"" * rng.randint(0, 3),
+                               {"v": rng.random()}]) for _ in range(rng.randint(0, 12))]
+        data = json.dumps(records, ensure_ascii=rng.random() < 0.5).encode('utf-8')
+        splits = rng.sample(range(1, max(len(data), 2)), min(len(data) - 1, rng.randint(0, 8))) if len(data) > 1 else []
+        assert _records(data, rng.randint(1, 32), splits) == records
+
+
+def test_offsets_are_byte_offsets():
+    data = '[ "é", {"a": 1},\n 7 ]'.encode('utf-8')
+    offsets = [offset for _, offset, _ in iter_json_records(io.BytesIO(data), chunk_size=3)]
+    assert offsets == [2, 8, 19]
+    assert [data[offset:offset + 1] for offset in offsets] == [b'"', b'{', b'7']
+
+
+def test_jsonl_small_chunks():
+    lines = [{"id": i, "text": "xé" * i} for i in range(20)]
+    data = ('\n'.join(json.dumps(line, ensure_ascii=False) for line in lines) + '\n\n').encode('utf-8')
+    for chunk_size in (1, 4, 64):
+        assert _records(data, chunk_size) == lines
+
+
+def test_empty_array_and_auto_detection():
+    assert _records(b'  []  ', 1) == []
+    assert _records(b'{"a": 1}\n{"a": 2}', 3) == [{"a": 1}, {"a": 2}]
+
+
+def test_malformed_array_element():
+    with pytest.raises(JSONStreamError) as raised:
+        _records(b'[1, {"a": }, 3]', 4)
+    assert raised.value.index == 1
+    assert raised.value.offset == 4
+    results = list(iter_json_records(io.BytesIO(b'[1, 2 3]'), on_error='yield', chunk_size=2))
+    assert [record for _, _, record in results][:2] == [1, 2]
+    assert isinstance(results[-1][2], JSONStreamError)
+
+
+def test_malformed_jsonl_line_is_skipped_when_yielding():
+    results = list(iter_json_records(io.BytesIO(b'{"a": 1}\n{oops\n{"a": 3}\n'), on_error='yield'))
+    assert isinstance(results[1][2], JSONStreamError)
+    assert [results[0][2], results[2][2]] == [{"a": 1}, {"a": 3}]
+
+
+def test_text_streams_are_rejected():
+    with pytest.raises(TypeError):
+        list(iter_json_records(io.StringIO('[]')))
+
+
+def test_validate_json_stream_reports_invalid_records(tmp_path):
+    path = tmp_path / 'records.json'
+    path.write_text(json.dumps([{"rating": 1}, {"rating": "x"}, {"rating": 12.5}]), encoding='utf-8')
+    report = Validator.validate_json_stream(str(path), {'type': 'object', 'properties': {'rating': {'type': 'number'}}})
+    assert (report['records'], report['valid'], report['invalid']) == (3, 2, 1)
+    assert report['errors'][0]['index'] == 1
@@ -0,0 +1,119 @@
+import jsonschema
+import pytest
+
+from tools.validator import Validator, ValidatorError, _CompiledJSONSchema, fastjsonschema
+
+BACKENDS = ['jsonschema'] + (['fastjsonschema'] if fastjsonschema is not None else [])
+
+SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'name': {'type': 'string'},
+        'rating': {'type': 'integer', 'minimum': 1, 'maximum': 5},
+        'ts': {'type': 'string', 'format': 'date-time'},
+        'd': {'type': 'integer', 'default': 5},
+    },
+    'required': ['name', 'rating'],
+}
+
+
+@pytest.fixture(params=BACKENDS + ['auto'])
+def backend(request):
+    previous = Validator.json_schema_backend
+    Validator.json_schema_backend = request.param
+    Validator.clear_json_schema_cache()
+    yield request.param
+    Validator.json_schema_backend = previous
+    Validator.clear_json_schema_cache()
+
+
+def test_validate_json_accepts_valid_record(backend):
+    assert Validator.validate_json({'name': 'a', 'rating': 3}, SCHEMA)
+    assert Validator.validate_json('{"name": "a", "rating": 3}', SCHEMA)
+
+
+def test_validate_json_rejects_invalid_record(backend):
+    with pytest.raises(ValidatorError):
+        Validator.validate_json({'name': 'a', 'rating': 9}, SCHEMA)
+    with pytest.raises(ValidatorError):
+        Validator.validate_json('{"name": ', SCHEMA)
+
+
+def test_format_is_not_enforced(backend):
+    # jsonschema.validate treats 'format' as an annotation; every backend must agree
+    assert Validator.validate_json({'name': 'a', 'rating': 3, 'ts': 'not a date'}, SCHEMA)
+
+
+def test_defaults_are_not_written_into_instance(backend):
+    record = {'name': 'a', 'rating': 3}
+    Validator.validate_json(record, SCHEMA)
+    assert record == {'name': 'a', 'rating': 3}
+
+
+def test_validate_json_many_collects_every_error(backend):
+    records = [{'name': 'a', 'rating': 3}, {'name': 'b'}, '{"name": "c", "rating": 0}', 'not json']
+    errors = Validator.validate_json_many(records, SCHEMA)
+    assert [index for index, _, _ in errors] == [1, 2, 3]
+    assert errors[1][1] == 'rating'
+    assert len(Validator.validate_json_many(records, SCHEMA, max_errors=1)) == 1
+
+
+def test_compiled_schema_is_cached(backend):
+    Validator.validate_json({'name': 'a', 'rating': 3}, SCHEMA)
+    Validator.validate_json({'name': 'b', 'rating': 4}, SCHEMA)
+    info = Validator.json_schema_cache_info()
+    assert (info['hits'], info['misses'], info['size']) == (1, 1, 1)
+
+
+def test_invalid_schema_raises(backend):
+    with pytest.raises(ValidatorError):
+        Validator.validate_json({}, {'type': 'no-such-type'})
+
+
+# Keywords added after draft-07, with instances that pass and fail them
+LATEST_DRAFT_CASES = [
+    ({'type': 'array', 'prefixItems': [{'type': 'integer'}]}, [[1, 'x'], ['x'], []]),
+    ({'type': 'object', 'dependentRequired': {'a': ['b']}}, [{'a': 1, 'b': 2}, {'a': 1}, {'b': 2}]),
+    ({'type': 'object', 'properties': {'a': {}}, 'unevaluatedProperties': False}, [{'a': 1}, {'a': 1, 'c': 2}]),
+    ({'type': 'array', 'contains': {'type': 'string'}, 'minContains': 2}, [['a', 'b', 1], ['a', 1], []]),
+    ({'type': 'object', 'dependentSchemas': {'a': {'required': ['b']}}}, [{'a': 1, 'b': 2}, {'a': 1}]),
+]
+
+
+def _reference(instance, schema):
+    try:
+        jsonschema.validate(instance, schema)
+        return True
+    except jsonschema.ValidationError:
+        return False
+
+
+def _validates(instance, schema):
+    try:
+        return Validator.validate_json(instance, schema)
+    except ValidatorError:
+        return False
+
+
+@pytest.mark.parametrize('draft', [None, 'https://json-schema.org/draft/2019-09/schema', 'https://json-schema.org/draft/2020-12/schema'])
+@pytest.mark.parametrize('schema, instances', LATEST_DRAFT_CASES)
+def test_latest_draft_keywords_match_jsonschema(schema, instances, draft):
+    if draft is not None:
+        schema = {'$schema': draft, **schema}
+    for backend in ['auto', 'jsonschema']:
+        Validator.json_schema_backend = backend
+        try:
+            for instance in instances:
+                assert _validates(instance, schema) == _reference(instance, schema), (backend, instance)
+        finally:
+            Validator.json_schema_backend = 'auto'
+
+
+def test_auto_backend_picks_fastjsonschema_only_for_named_old_drafts():
+    assert _CompiledJSONSchema(SCHEMA).backend == 'jsonschema'
+    assert _CompiledJSONSchema({'$schema': 'https://json-schema.org/draft/2020-12/schema', **SCHEMA}).backend == 'jsonschema'
+    expected = 'fastjsonschema' if fastjsonschema is not None else 'jsonschema'
+    for draft in ['04', '06', '07']:
+        schema = {'$schema': f'http://json-schema.org/draft-{draft}/schema#', **SCHEMA}
+        assert _CompiledJSONSchema(schema).backend == expected
+        assert Validator.validate_json({'name': 'a', 'rating': 3}, schema)
@@ -0,0 +1,224 @@
+import json
+import os
+import random
+import shutil
+from datetime import datetime, timedelta
+
+import pytest
+
+from analytics.data_analysis import (
+    INDEX_VERSION, LogAnalysisError, LogAnalyzer, LogIndex, latency_percentile, parse_minute, scan_range, template,
+)
+
+MESSAGES = [
+    ('INFO', "Classified {n} reviews in {s}s"),
+    ('INFO', "Request {hex} took {ms} ms"),
+    ('INFO', "Loaded model 'bert-base-uncased'"),
+    ('WARNING', "Queue depth {n} above limit"),
+    ('ERROR', "Review classification failed: batch {n}"),
+    ('CRITICAL', "Worker {n} died after {s} seconds"),
+]
+
+
+def _lines(count, start, seed):
+    """
+    Log lines in the logging module's default format, a few minutes apart, with tracebacks mixed in.
+    """
+    rng = random.Random(seed)
+    moment = start
+    lines = []
+    for _ in range(count):
+        moment += timedelta(seconds=rng.randrange(1, 120), milliseconds=rng.randrange(1000))
+        level, message = rng.choice(MESSAGES)
+        message = message.format(n=rng.randrange(1000), s=round(rng.uniform(0, 3), 2), ms=rng.randrange(1, 900),
+                                 hex=f"{rng.getrandbits(40):010x}")
+        lines.append(f"{moment:%Y-%m-%d %H:%M:%S},{moment.microsecond // 1000:03d} - {level} - {message}\n")
+        if level == 'ERROR':
+            lines.append("Traceback (most recent call last):\n  File \"x.py\", line 1\nValueError: bad\n")
+    return lines, moment
+
+
+def _write(path, lines, mode='a'):
+    with open(path, mode, encoding='utf-8') as handle:
+        handle.write(''.join(lines))
+
+
+def _rounded(value):
+    """
+    Round floats so summaries built from different chunkings compare equal.
+    """
+    if isinstance(value, float):
+        return round(value, 9)
+    if isinstance(value, dict):
+        return {key: _rounded(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_rounded(item) for item in value]
+    return value
+
+
+def _full_scan(path, since=None, until=None):
+    return _rounded(scan_range(str(path), 0, os.path.getsize(path), parse_minute(since), parse_minute(until)))
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setattr('analytics.data_analysis.CHUNK_BYTES', 2000)
+
+
+def test_template_masks_variable_parts():
+    assert template("Classified 32 reviews in 0.41s") == "Classified # reviews in #s"
+    assert template("Request 0x1f and deadbeef42 for 'user' took 5 ms") == "Request # and # for '*' took # ms"
+
+
+def test_scan_range_counts_lines_levels_and_latency(tmp_path):
+    path = tmp_path / 'app.log'
+    _write(path, [
+        "2024-09-27 12:00:01,000 - INFO - Classified 10 reviews in 0.5s\n",
+        "2024-09-27 12:00:59,999 - INFO - Classified 20 reviews in 1.5s\n",
+        "2024-09-27 12:01:00,000 - ERROR - Request abc took 250 ms\n",
+        "  a continuation line\n",
+    ])
+    summary = scan_range(str(path), 0, os.path.getsize(path))
+    assert summary['lines'] == 3
+    assert summary['levels'] == {'INFO': 2, 'ERROR': 1}
+    assert summary['minutes'] == {'2024-09-27 12:00': {'INFO': 2}, '2024-09-27 12:01': {'ERROR': 1}}
+    assert (summary['first'], summary['last']) == ('2024-09-27 12:00', '2024-09-27 12:01')
+    assert summary['messages'] == {'INFO': {"Classified # reviews in #s": 2}, 'ERROR': {"Request abc took # ms": 1}}
+    histogram = summary['latency']["Classified # reviews in #s"]
+    assert (histogram['count'], histogram['sum'], histogram['max']) == (2, 2.0, 1.5)
+    assert latency_percentile(histogram, 0.5) <= latency_percentile(histogram, 0.95) <= 1.5
+    assert summary['latency']["Request abc took # ms"]['sum'] == pytest.approx(0.25)
+
+
+def test_incremental_updates_match_a_full_scan(tmp_path, small_chunks):
+    path = tmp_path / 'app.log'
+    lines, moment = _lines(60, datetime(2024, 9, 27, 10), seed=0)
+    _write(path, lines)
+    index = LogIndex(str(path), workers=1)
+    assert index.update() == os.path.getsize(path)
+    assert len(index._state['chunks']) > 1
+    assert _rounded(index.summary()) == _full_scan(path)
+
+    for seed in range(1, 5):
+        more, moment = _lines(25, moment, seed)
+        _write(path, more)
+        before = index.size
+        assert index.update() == os.path.getsize(path) - before
+        assert _rounded(index.summary()) == _full_scan(path)
+    assert index.update() == 0
+
+
+def test_partial_trailing_line_waits_for_its_newline(tmp_path):
+    path = tmp_path / 'app.log'
+    lines, _ = _lines(5, datetime(2024, 9, 27, 10), seed=0)
+    _write(path, lines + ["2024-09-27 11:00:00,000 - ERROR - Review classification fa"])
+    index = LogIndex(str(path), workers=1)
+    index.update()
+    assert index.size == len(''.join(lines))
+    _write(path, ["iled: batch 7\n"])
+    index.update()
+    summary = index.summary()
+    assert summary['messages']['ERROR']["Review classification failed: batch #"] >= 1
+    assert _rounded(summary) == _full_scan(path)
+
+
+def test_time_range_queries_match_a_filtered_scan(tmp_path, small_chunks):
+    path = tmp_path / 'app.log'
+    lines, _ = _lines(200, datetime(2024, 9, 27, 10), seed=3)
+    _write(path, lines)
+    index = LogIndex(str(path), workers=1)
+    index.update()
+    bounds = [
+        ('2024-09-27T11:00', None), (None, '2024-09-27 12:30'), ('2024-09-27 10:47', '2024-09-27T13:05:59'),
+        ('2030-01-01', None), (datetime(2024, 9, 27, 10, 30), datetime(2024, 9, 27, 10, 30)),
+    ]
+    for since, until in bounds:
+        assert _rounded(index.summary(since, until)) == _full_scan(path, since, until), (since, until)
+    with pytest.raises(LogAnalysisError):
+        index.summary(since='yesterday')
+
+
+def test_saved_index_is_reused_and_invalidated(tmp_path):
+    path = tmp_path / 'app.log'
+    lines, moment = _lines(40, datetime(2024, 9, 27, 10), seed=0)
+    _write(path, lines)
+    first = LogIndex(str(path), workers=1)
+    first.update()
+    assert os.path.exists(first.index_path)
+    assert first.index_path == str(tmp_path / '.index' / 'app.log.json')
+
+    # A second process picks up where the first stopped
+    more, _ = _lines(10, moment, seed=1)
+    _write(path, more)
+    second = LogIndex(str(path), workers=1)
+    assert second.update() == len(''.join(more))
+
+    # Truncation, or a rewrite with different leading bytes, rebuilds the index
+    lines, _ = _lines(30, datetime(2025, 1, 1), seed=2)
+    _write(path, lines, mode='w')
+    assert second.update() == os.path.getsize(path)
+    assert _rounded(second.summary()) == _full_scan(path)
+    with open(path, 'r+b') as handle:
+        handle.write(b'2025-01-01 00:00:00,000 - ERROR - rewritten')
+    more, _ = _lines(5, datetime(2025, 2, 1), seed=3)
+    _write(path, more)
+    assert second.update() == os.path.getsize(path)
+    assert _rounded(second.summary()) == _full_scan(path)
+
+    # Rotation swaps in a new file (a new inode) even if it is larger
+    rotated = tmp_path / 'rotated.log'
+    _write(rotated, [path.read_text(encoding='utf-8')] + lines)
+    os.replace(rotated, path)
+    assert second.update() == os.path.getsize(path)
+    assert _rounded(second.summary()) == _full_scan(path)
+
+
+@pytest.mark.parametrize('contents', ['not json', json.dumps({'version': INDEX_VERSION - 1, 'end': 10 ** 9})])
+def test_stale_or_corrupt_index_is_rebuilt(tmp_path, contents):
+    path = tmp_path / 'app.log'
+    lines, _ = _lines(20, datetime(2024, 9, 27, 10), seed=0)
+    _write(path, lines)
+    index_path = tmp_path / '.index' / 'app.log.json'
+    index_path.parent.mkdir()
+    index_path.write_text(contents, encoding='utf-8')
+    index = LogIndex(str(path), workers=1)
+    assert index.update() == os.path.getsize(path)
+    assert json.loads(index_path.read_text(encoding='utf-8'))['version'] == INDEX_VERSION
+
+
+def test_parallel_scan_matches_serial_scan(tmp_path, small_chunks):
+    path = tmp_path / 'app.log'
+    lines, _ = _lines(150, datetime(2024, 9, 27, 10), seed=4)
+    _write(path, lines)
+    parallel = LogIndex(str(path), index_path=str(tmp_path / 'parallel.json'), workers=2)
+    serial = LogIndex(str(path), index_path=str(tmp_path / 'serial.json'), workers=1)
+    parallel.update()
+    serial.update()
+    assert parallel._state['chunks'] == serial._state['chunks']
+
+
+def test_report_after_appends_matches_a_fresh_analyzer(tmp_path, small_chunks):
+    log_dir = tmp_path / 'logs'
+    log_dir.mkdir()
+    lines, moment = _lines(80, datetime(2024, 9, 27, 10), seed=0)
+    _write(log_dir / 'app.log', lines)
+    _write(log_dir / 'ignored.txt', lines)
+    analyzer = LogAnalyzer(str(log_dir), workers=1)
+    report = analyzer.report(top=5)
+    assert list(report['files']) == ['app.log']
+    assert report['lines'] == 80
+
+    more, _ = _lines(40, moment, seed=1)
+    _write(log_dir / 'app.log', more)
+    other, _ = _lines(30, datetime(2024, 9, 27, 12), seed=2)
+    _write(log_dir / 'worker.log', other)
+    assert analyzer.update() == {str(log_dir / 'app.log'): len(''.join(more)), str(log_dir / 'worker.log'): len(''.join(other))}
+
+    options = {'since': '2024-09-27 11:00', 'top': 5, 'resolution': 'minute'}
+    incremental = analyzer.report(**options)
+    shutil.rmtree(log_dir / '.index')
+    assert _rounded(incremental) == _rounded(LogAnalyzer(str(log_dir), workers=1).report(**options))
+    assert incremental['lines'] == sum(entry['lines'] for entry in incremental['timeline'])
+    assert all(entry['level'] in ('ERROR', 'CRITICAL') for entry in incremental['top_errors'])
+    with pytest.raises(LogAnalysisError):
+        analyzer.report(resolution='week')
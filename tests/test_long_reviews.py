@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+torch = pytest.importorskip('torch')
+
+from ai_models.review_model import LABEL_MAP, ReviewModel, ReviewModelError
+
+WORDS = "the product was excellent great bad terrible good okay service fast slow".split()
+SHORT = ["great product", "terrible service", "", "okay"]
+
+
+@pytest.fixture(scope='module')
+def review_model(tiny_bert):
+    return ReviewModel(tiny_bert, device='cpu')
+
+
+def _review(length, seed):
+    rng = random.Random(seed)
+    return ' '.join(rng.choice(WORDS) for _ in range(length))
+
+
+def _reference(model, text, window_size, overlap, aggregation):
+    """
+    The expected result: every window run on its own, then aggregated by hand.
+    """
+    ids = model.tokenizer(text, add_special_tokens=False)['input_ids']
+    content = window_size - 2
+    starts = range(0, max(len(ids) - overlap, 1), content - overlap)
+    rows = []
+    for start in starts:
+        chunk = [model.tokenizer.cls_token_id] + ids[start:start + content] + [model.tokenizer.sep_token_id]
+        with torch.no_grad():
+            rows.append(model.model(input_ids=torch.tensor([chunk])).logits[0])
+    logits = torch.stack(rows)
+    if aggregation == 'max':
+        combined = logits.max(dim=0).values
+    elif aggregation == 'attention':
+        log_probs = logits.log_softmax(dim=1)
+        weights = (log_probs.exp() * log_probs).sum(dim=1).softmax(dim=0)
+        combined = (weights[:, None] * logits).sum(dim=0)
+    else:
+        combined = logits.mean(dim=0)
+    probs = combined.softmax(dim=0)
+    return {'label': LABEL_MAP[int(probs.argmax())], 'confidence': float(probs.max()), 'windows': len(rows)}
+
+
+def _assert_results(results, expected):
+    assert [(result['label'], result.get('windows')) for result in results] == [(result['label'], result.get('windows')) for result in expected]
+    assert [result['confidence'] for result in results] == pytest.approx([result['confidence'] for result in expected], abs=1e-5)
+
+
+def test_short_reviews_match_classify_review(review_model):
+    results = list(review_model.classify_long_reviews(SHORT))
+    assert [result.pop('windows') for result in results] == [1] * len(SHORT)
+    _assert_results(results, [review_model.classify_review(text) for text in SHORT])
+
+
+@pytest.mark.parametrize('aggregation', ['mean', 'max', 'attention'])
+def test_windows_are_aggregated(review_model, aggregation):
+    texts = [_review(length, seed) for seed, length in enumerate([3, 8, 9, 20, 41, 100])]
+    results = list(review_model.classify_long_reviews(texts, batch_size=4, window_size=10, overlap=2, aggregation=aggregation))
+    _assert_results(results, [_reference(review_model, text, 10, 2, aggregation) for text in texts])
+    assert [result['windows'] for result in results] == [1, 1, 2, 3, 7, 17]
+
+
+def test_results_do_not_depend_on_packing(review_model):
+    texts = [_review(length, seed) for seed, length in enumerate([50, 2, 17, 0, 33, 8, 70])]
+    expected = list(review_model.classify_long_reviews(texts, batch_size=1, window_size=16, overlap=4, sort_window=1))
+    for batch_size, sort_window in [(3, None), (64, 2), (5, 100)]:
+        results = review_model.classify_long_reviews(iter(texts), batch_size, window_size=16, overlap=4, sort_window=sort_window)
+        _assert_results(list(results), expected)
+
+
+def test_windows_cover_every_token_with_the_overlap():
+    ids = list(range(23))
+    windows = ReviewModel._split_windows(ids, 8, 3)
+    assert windows == [ids[0:8], ids[5:13], ids[10:18], ids[15:23]]
+    assert ReviewModel._split_windows([], 8, 3) == [[]]
+    assert ReviewModel._split_windows(ids[:8], 8, 3) == [ids[:8]]
+
+
+def test_invalid_arguments_raise(review_model):
+    for options in [{'batch_size': 0}, {'aggregation': 'median'}, {'window_size': 2}, {'window_size': 10, 'overlap': 4}]:
+        with pytest.raises(ReviewModelError):
+            list(review_model.classify_long_reviews(SHORT, **options))
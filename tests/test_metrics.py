@@ -0,0 +1,130 @@
+import json
+import pstats
+import time
+
+import pytest
+
+from tools.metrics import _NULL_TIMER, Metrics, MetricsError, metrics
+
+
+def _recorded(buckets=(0.01, 0.1)):
+    recorder = Metrics(enabled=True, buckets=buckets)
+    recorder.increment('requests_total')
+    recorder.increment('requests_total', 2)
+    recorder.increment('tokens-total', 1.5)
+    for value in [0.005, 0.05, 0.05, 3.0]:
+        recorder.observe('stage_seconds', value)
+    return recorder
+
+
+def test_disabled_metrics_record_nothing():
+    recorder = Metrics()
+    assert recorder.timer('stage_seconds') is _NULL_TIMER
+    with recorder.timer('stage_seconds') as timer:
+        assert timer is _NULL_TIMER
+    recorder.increment('requests_total')
+    recorder.observe('stage_seconds', 1.0)
+
+    @recorder.timed('call_seconds')
+    def call(value):
+        return value * 2
+
+    assert call(4) == 8
+    assert recorder.snapshot() == {'counters': {}, 'histograms': {}}
+    assert recorder.export_prometheus() == ''
+
+
+def test_enable_and_disable_keep_what_was_recorded():
+    recorder = Metrics()
+    recorder.enable()
+    assert recorder.timer('stage_seconds') is not _NULL_TIMER
+    with recorder.timer('stage_seconds'):
+        time.sleep(0.002)
+
+    @recorder.timed('call_seconds')
+    def call():
+        return 'done'
+
+    assert call() == 'done' and call.__name__ == 'call'
+    recorder.disable()
+    assert recorder.timer('stage_seconds') is _NULL_TIMER
+    call()
+    histograms = recorder.snapshot()['histograms']
+    assert histograms['stage_seconds']['count'] == 1 and histograms['stage_seconds']['sum'] >= 0.002
+    assert histograms['call_seconds']['count'] == 1
+    recorder.reset()
+    assert recorder.snapshot() == {'counters': {}, 'histograms': {}}
+
+
+def test_snapshot_and_json_export():
+    recorder = _recorded()
+    snapshot = recorder.snapshot()
+    assert snapshot['counters'] == {'requests_total': 3, 'tokens-total': 1.5}
+    histogram = snapshot['histograms']['stage_seconds']
+    assert (histogram['count'], histogram['sum'], histogram['mean']) == (4, pytest.approx(3.105), pytest.approx(3.105 / 4))
+    assert histogram['buckets'] == [[0.01, 1], [0.1, 3], [float('inf'), 4]]
+
+    exported = json.loads(recorder.export_json(indent=2))
+    assert exported['counters'] == snapshot['counters']
+    assert exported['histograms']['stage_seconds']['buckets'] == [[0.01, 1], [0.1, 3], ['+Inf', 4]]
+    # Exporting does not alter what the snapshot reports
+    assert recorder.snapshot()['histograms']['stage_seconds']['buckets'][-1][0] == float('inf')
+
+
+def test_prometheus_export():
+    lines = _recorded().export_prometheus(prefix='app_').splitlines()
+    assert lines == [
+        '# TYPE app_requests_total counter',
+        'app_requests_total 3',
+        '# TYPE app_tokens_total counter',
+        'app_tokens_total 1.5',
+        '# TYPE app_stage_seconds histogram',
+        'app_stage_seconds_bucket{le="0.01"} 1',
+        'app_stage_seconds_bucket{le="0.1"} 3',
+        'app_stage_seconds_bucket{le="+Inf"} 4',
+        f'app_stage_seconds_sum {0.005 + 0.05 + 0.05 + 3.0!r}',
+        'app_stage_seconds_count 4',
+    ]
+    assert Metrics._metric_name('9 lives') == '_9_lives'
+
+
+def test_sampled_profiling(tmp_path):
+    recorder = Metrics(enabled=True)
+    recorder.enable(profile_rate=1.0)
+    for _ in range(3):
+        with recorder.timer('stage_seconds'):
+            sorted(range(1000), reverse=True)
+    assert 'sorted' in recorder.profile_stats()
+    path = str(tmp_path / 'stages.prof')
+    recorder.dump_profile(path)
+    assert pstats.Stats(path).total_calls > 0
+
+    with pytest.raises(MetricsError):
+        Metrics(enabled=True).dump_profile(path)
+    assert Metrics(enabled=True).profile_stats() == ''
+
+
+def test_invalid_settings_raise():
+    with pytest.raises(MetricsError):
+        Metrics(buckets=(1.0, 0.5))
+    with pytest.raises(MetricsError):
+        Metrics().enable(profile_rate=1.5)
+
+
+def test_models_report_into_the_default_registry(tiny_bert):
+    pytest.importorskip('torch')
+    from ai_models.review_model import ReviewModel
+
+    model = ReviewModel(tiny_bert, device='cpu')
+    was_enabled = metrics.enabled
+    metrics.enable()
+    metrics.reset()
+    try:
+        list(model.classify_reviews(["great product", "bad", "ok"], batch_size=2))
+        snapshot = metrics.snapshot()
+    finally:
+        metrics.reset()
+        if not was_enabled:
+            metrics.disable()
+    assert snapshot['histograms'], "no stage was timed"
+    assert all(name.startswith('review_') for name in list(snapshot['counters']) + list(snapshot['histograms']))
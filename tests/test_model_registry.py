@@ -0,0 +1,80 @@
+import subprocess
+import sys
+
+import pytest
+
+from ai_models.registry import LazyModule, ModelRegistry, lazy_import
+
+
+def test_importing_the_model_modules_does_not_load_torch():
+    code = (
+        "import sys\n"
+        "import ai_models.registry, ai_models.review_model, ai_models.chat_model, ai_models.cpu_optimization\n"
+        "print(sorted(name for name in ('torch', 'transformers', 'numpy') if name in sys.modules))\n"
+    )
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == '[]'
+
+
+def test_lazy_module_imports_on_first_attribute_access():
+    module = lazy_import('json')
+    assert isinstance(module, LazyModule) and 'not loaded' in repr(module)
+    assert module.loads('[1]') == [1]
+    assert "'json' (loaded)" in repr(module)
+    with pytest.raises(ModuleNotFoundError):
+        lazy_import('no_such_module_here').anything
+
+
+@pytest.fixture
+def registry():
+    pytest.importorskip('torch')
+    return ModelRegistry()
+
+
+def test_models_with_the_same_settings_are_shared(registry, tiny_bert):
+    from ai_models.review_model import ReviewModel
+
+    first = ReviewModel(tiny_bert, device='cpu', registry=registry)
+    second = ReviewModel(tiny_bert, device='cpu', registry=registry)
+    assert first.model is second.model and first.tokenizer is second.tokenizer
+    assert ReviewModel(tiny_bert, device='cpu', use_fast_tokenizer=False, registry=registry).tokenizer is not first.tokenizer
+    assert ReviewModel(tiny_bert, device='cpu', registry=ModelRegistry()).model is not first.model
+
+
+def test_head_swaps_share_the_encoder(registry, tiny_bert):
+    import torch
+    from ai_models.review_model import ReviewModel
+
+    model = ReviewModel(tiny_bert, device='cpu', registry=registry)
+    original = model.model
+    classifier = original.classifier.weight.clone()
+    model.adjust_model_params(num_labels=5)
+
+    assert model.model is not original
+    assert model.model.bert is original.bert
+    assert all(shared is own for shared, own in zip(model.model.bert.parameters(), original.bert.parameters()))
+    assert model.model.classifier.out_features == 5 and model.model.config.num_labels == 5
+    # The cached three-label model is left as it was
+    assert original.classifier.out_features == 3 and original.config.num_labels == 3
+    assert torch.equal(original.classifier.weight, classifier)
+    assert ReviewModel(tiny_bert, device='cpu', registry=registry).model is original
+
+    input_ids = torch.tensor([[2, 10, 11, 3]])
+    with torch.no_grad():
+        assert model.model(input_ids).logits.shape == (1, 5)
+        torch.testing.assert_close(model.model.bert(input_ids).last_hidden_state, original.bert(input_ids).last_hidden_state)
+
+
+def test_refresh_and_clear_reload_from_disk(registry, tiny_bert):
+    key = ('BertForSequenceClassification', tiny_bert)
+    first = registry.get_model(*key, num_labels=3)
+    assert registry.get_model(*key, num_labels=3) is first
+    assert registry.get_model(*key, num_labels=3, refresh=True) is not first
+    # A refreshed head swap loads a full model instead of reusing the encoder
+    refreshed = registry.get_model(*key, num_labels=2, refresh=True)
+    assert refreshed.bert is not first.bert
+
+    tokenizer = registry.get_tokenizer('BertTokenizerFast', 'BertTokenizer', tiny_bert)
+    registry.clear()
+    assert registry.get_tokenizer('BertTokenizerFast', 'BertTokenizer', tiny_bert) is not tokenizer
+    assert registry.get_model(*key, num_labels=3) is not first
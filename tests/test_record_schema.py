@@ -0,0 +1,84 @@
+import itertools
+
+import pytest
+
+from tools.record_schema import RecordSchema
+from tools.validator import Validator, ValidatorError
+
+FIELDS = {
+    'email': {'type': str, 'pattern': 'named:email', 'max_length': 40},
+    'name': {'min_length': 1, 'max_length': 8},
+    'age': {'type': int, 'nullable': True},
+    'signup_date': {'datetime_format': '%Y-%m-%d', 'nullable': True},
+    "odd 'field' \"name\"": {'type': (int, float), 'required': False},
+}
+
+VALUES = {
+    'email': ['user@example.com', 'bad', 5, None, 'x' * 30 + '@example.com'],
+    'name': ['Ada', '', 'a very long name', 7, None],
+    'age': [36, None, '36', 3.5],
+    'signup_date': ['2024-09-27', '27/09/2024', None, 20240927],
+    "odd 'field' \"name\"": [1, 2.5, 'x'],
+}
+
+
+def _reference(record):
+    """
+    The errors chained per-call Validator checks report: the first failing check of each field.
+    """
+    errors = []
+    for name, spec in FIELDS.items():
+        if name not in record:
+            if spec.get('required', True):
+                errors.append((name, 'Missing required field.'))
+            continue
+        value = record[name]
+        if value is None and spec.get('nullable', False):
+            continue
+        try:
+            if 'type' in spec:
+                Validator.validate_type(value, spec['type'])
+            if {'pattern', 'min_length', 'max_length'} & set(spec):
+                Validator.validate_string(value, spec.get('pattern'), spec.get('min_length'), spec.get('max_length'))
+            if 'datetime_format' in spec:
+                try:
+                    Validator.validate_datetime(value, spec['datetime_format'])
+                except TypeError as e:
+                    raise ValidatorError(f"Date format validation failed: {e}")
+        except ValidatorError as e:
+            errors.append((name, str(e)))
+    return errors
+
+
+def _records():
+    names = list(FIELDS)
+    for combination in itertools.product(*(VALUES[name] for name in names)):
+        yield dict(zip(names, combination))
+    yield {}
+    yield {'email': 'user@example.com'}
+
+
+def test_validate_matches_per_call_validation():
+    schema = RecordSchema(FIELDS)
+    for record in _records():
+        assert schema.validate(record) == _reference(record), record
+
+
+def test_validate_many_reports_record_indices():
+    schema = RecordSchema(FIELDS)
+    records = list(_records())
+    expected = [(index,) + error for index, record in enumerate(records) for error in _reference(record)]
+    assert schema.validate_many(records) == expected
+    assert schema.validate_many(iter([])) == []
+
+
+def test_valid_record_has_no_errors():
+    schema = RecordSchema(FIELDS)
+    assert schema.validate({'email': 'user@example.com', 'name': 'Ada', 'age': None, 'signup_date': '2024-09-27'}) == []
+
+
+def test_invalid_definitions_raise():
+    with pytest.raises(ValidatorError, match="Unknown options"):
+        RecordSchema({'name': {'type': str, 'maxlength': 3}})
+    with pytest.raises(ValidatorError):
+        RecordSchema({'name': {'pattern': '('}})
@@ -0,0 +1,87 @@
+import json
+import os
+
+import pytest
+
+pytest.importorskip('autopep8')
+
+from tools.formatter import Formatter, FormatterError
+from tools.repo_formatter import CACHE_FILENAME, RepoFormatter
+
+UNFORMATTED = "import os,sys\ndef f( a ):\n  return a+1\n"
+FORMATTED = Formatter.format_code_style(UNFORMATTED)
+
+
+def _tree(root, count=3):
+    (root / 'pkg').mkdir()
+    (root / 'build').mkdir()
+    (root / 'build' / 'generated.py').write_text(UNFORMATTED, encoding='utf-8')
+    (root / 'notes.txt').write_text(UNFORMATTED, encoding='utf-8')
+    (root / 'clean.py').write_text(FORMATTED, encoding='utf-8')
+    (root / 'broken.py').write_bytes(b'\xff\xfe not utf-8')
+    (root / 'windows.py').write_bytes(UNFORMATTED.replace('\n', '\r\n').encode('utf-8'))
+    for index in range(count):
+        (root / 'pkg' / f'module{index}.py').write_text(UNFORMATTED, encoding='utf-8')
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_run_formats_and_then_skips_via_cache(tmp_path, workers, monkeypatch):
+    monkeypatch.setattr('tools.repo_formatter.MIN_FILES_FOR_POOL', 2)
+    _tree(tmp_path)
+    formatter = RepoFormatter(str(tmp_path), workers=workers)
+
+    first = formatter.run()
+    assert (first['files'], first['cached'], first['unchanged'], first['reformatted']) == (6, 0, 1, 4)
+    assert [error['path'] for error in first['errors']] == ['broken.py']
+    assert (tmp_path / 'pkg' / 'module0.py').read_text(encoding='utf-8') == FORMATTED
+    assert (tmp_path / 'windows.py').read_bytes() == FORMATTED.replace('\n', '\r\n').encode('utf-8')
+    assert (tmp_path / 'build' / 'generated.py').read_text(encoding='utf-8') == UNFORMATTED
+    assert os.path.exists(tmp_path / CACHE_FILENAME)
+
+    second = formatter.run()
+    assert (second['cached'], second['reformatted'], len(second['errors'])) == (5, 0, 1)
+
+
+def test_touched_but_unchanged_files_are_skipped_by_hash(tmp_path):
+    _tree(tmp_path)
+    formatter = RepoFormatter(str(tmp_path), workers=1)
+    formatter.run()
+    path = tmp_path / 'pkg' / 'module1.py'
+    os.utime(path, ns=(0, 0))
+    assert formatter.run()['cached'] == 5
+
+
+def test_check_mode_does_not_write(tmp_path):
+    _tree(tmp_path, count=1)
+    formatter = RepoFormatter(str(tmp_path), workers=1)
+    report = formatter.run(check=True, diff=True)
+    assert sorted(change['path'] for change in report['changed']) == [os.path.join('pkg', 'module0.py'), 'windows.py']
+    assert all(change['diff'].startswith('---') for change in report['changed'])
+    assert (tmp_path / 'pkg' / 'module0.py').read_text(encoding='utf-8') == UNFORMATTED
+
+    again = formatter.run(check=True)
+    assert (again['reformatted'], again['added'], again['removed']) == (2, report['added'], report['removed'])
+    assert again['cached'] == 3
+
+
+def test_cache_from_another_style_or_version_is_discarded(tmp_path):
+    _tree(tmp_path, count=1)
+    formatter = RepoFormatter(str(tmp_path), workers=1)
+    formatter.run()
+    cache_path = tmp_path / CACHE_FILENAME
+    cache = json.loads(cache_path.read_text(encoding='utf-8'))
+    assert cache['fingerprint'] == formatter.fingerprint
+    cache['fingerprint'] = 'pep8:autopep8-0.0'
+    cache_path.write_text(json.dumps(cache), encoding='utf-8')
+    assert formatter.run()['cached'] == 0
+    assert formatter.run()['cached'] == 3
+
+
+def test_exclude_patterns_and_missing_root(tmp_path):
+    _tree(tmp_path)
+    files = RepoFormatter(str(tmp_path), exclude=('pkg/module1.py', 'windows.*')).iter_files()
+    assert [os.path.relpath(path, tmp_path) for path in files] == [
+        'broken.py', 'clean.py', os.path.join('pkg', 'module0.py'), os.path.join('pkg', 'module2.py'),
+    ]
+    with pytest.raises(FormatterError):
+        RepoFormatter(str(tmp_path / 'missing'))
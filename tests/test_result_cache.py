@@ -0,0 +1,115 @@
+import pytest
+
+from ai_models.result_cache import ResultCache, make_key, weights_fingerprint
+
+torch = pytest.importorskip('torch')
+
+
+def test_make_key_depends_on_every_part():
+    key = make_key('model', 'weights', 'text', {'task': 'classify'})
+    assert key == make_key('model', 'weights', 'text', {'task': 'classify'})
+    assert len({
+        key,
+        make_key('other', 'weights', 'text', {'task': 'classify'}),
+        make_key('model', 'changed', 'text', {'task': 'classify'}),
+        make_key('model', 'weights', 'text ', {'task': 'classify'}),
+        make_key('model', 'weights', 'text', {'task': 'generate'}),
+        make_key('model', 'weights', 'text'),
+    }) == 6
+
+
+def test_weights_fingerprint_tracks_the_weights():
+    torch.manual_seed(0)
+    model = torch.nn.Linear(4, 2)
+    fingerprint = weights_fingerprint(model)
+    assert fingerprint == weights_fingerprint(model)
+    with torch.no_grad():
+        model.bias[0] += 1
+    assert weights_fingerprint(model) != fingerprint
+
+
+def test_memory_tier_is_an_lru():
+    cache = ResultCache(max_size=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+    stats = cache.stats()
+    assert (stats['memory_hits'], stats['misses'], stats['size'], stats['disk_size']) == (3, 1, 2, None)
+    with pytest.raises(ValueError):
+        ResultCache(max_size=0)
+
+
+def test_persistent_tier_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / 'cache' / 'results.db')
+    first = ResultCache(path=path)
+    assert first.get_or_compute('key', lambda: {'label': 'positive', 'confidence': 0.9}) == {'label': 'positive', 'confidence': 0.9}
+    first.close()
+
+    second = ResultCache(path=path)
+    assert second.get_or_compute('key', lambda: pytest.fail("recomputed a persisted result")) == {'label': 'positive', 'confidence': 0.9}
+    assert second.get('key') is not None
+    stats = second.stats()
+    assert (stats['disk_hits'], stats['memory_hits'], stats['disk_size']) == (1, 1, 1)
+    second.clear()
+    assert second.get('key') is None and second.stats()['disk_size'] == 0
+    second.close()
+
+
+def test_entries_expire(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('ai_models.result_cache.time.time', lambda: now[0])
+    cache = ResultCache(path=str(tmp_path / 'results.db'), ttl=10)
+    cache.put('key', 'value')
+    now[0] += 5
+    assert cache.get('key') == 'value'
+    now[0] += 10
+    assert cache.get('key') is None
+    cache.close()
+
+
+def test_persistent_tier_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr('ai_models.result_cache.EVICTION_INTERVAL', 4)
+    cache = ResultCache(max_size=1, path=str(tmp_path / 'results.db'), max_disk_entries=3)
+    for index in range(8):
+        cache.put(f"key{index}", index)
+    assert cache.stats()['disk_size'] == 3
+    cache.close()
+
+
+def test_seconds_saved_counts_the_cost_of_hits():
+    cache = ResultCache()
+    cache.put('key', 'value', cost=0.25)
+    cache.get('key')
+    cache.get('key')
+    assert cache.stats()['seconds_saved'] == pytest.approx(0.5)
+
+
+def test_review_model_serves_repeated_reviews_from_the_cache(tiny_bert):
+    from ai_models.review_model import ReviewModel
+
+    cache = ResultCache()
+    model = ReviewModel(tiny_bert, device='cpu', result_cache=cache)
+    uncached = ReviewModel(tiny_bert, device='cpu')
+    texts = ["great product", "great   product", "bad service", "great product"]
+    expected = [uncached.classify_review(text) for text in texts]
+    assert [model.classify_review(text) for text in texts] == expected
+    # Whitespace differences share an entry with the original review
+    assert cache.stats()['hits'] == 2
+    assert list(model.classify_reviews(texts, batch_size=2)) == list(uncached.classify_reviews(texts, batch_size=2))
+
+
+def test_chat_model_caches_only_greedy_responses(tiny_gpt2):
+    from ai_models.chat_model import ChatModel
+
+    cache = ResultCache()
+    model = ChatModel(tiny_gpt2, max_length=40, device='cpu', result_cache=cache)
+    model.generate_response("", "hello")
+    assert cache.stats()['size'] == 0
+
+    model.adjust_parameters(do_sample=False)
+    response = model.generate_response("", "hello")
+    assert model.generate_response("", "hello") == response
+    assert (cache.stats()['misses'], cache.stats()['hits']) == (1, 1)
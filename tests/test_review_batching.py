@@ -0,0 +1,61 @@
+import pytest
+
+pytest.importorskip('torch')
+
+from ai_models.review_model import ReviewModel, ReviewModelError
+
+TEXTS = [
+    "great product", "terrible service, would not buy again", "ok", "", "great product",
+    "the delivery was slow but the price and quality were excellent and support was fast", "bad", "ok",
+    "love this", "i had a very bad experience with this product and would never buy it again",
+]
+
+
+@pytest.fixture(scope='module')
+def review_model(tiny_bert):
+    return ReviewModel(tiny_bert, device='cpu')
+
+
+def _assert_results(results, expected):
+    assert [result['label'] for result in results] == [result['label'] for result in expected]
+    assert [result['confidence'] for result in results] == pytest.approx([result['confidence'] for result in expected], abs=1e-5)
+
+
+@pytest.mark.parametrize('batch_size, sort_window', [(1, None), (3, None), (4, 4), (32, None), (2, 5)])
+def test_classify_reviews_matches_classify_review_in_input_order(review_model, batch_size, sort_window):
+    expected = [review_model.classify_review(text) for text in TEXTS]
+    results = list(review_model.classify_reviews(iter(TEXTS), batch_size=batch_size, sort_window=sort_window))
+    _assert_results(results, expected)
+
+
+def test_empty_input_yields_nothing(review_model):
+    assert list(review_model.classify_reviews([])) == []
+    assert list(review_model.classify_reviews(iter(()))) == []
+
+
+def test_duplicates_within_a_window_get_identical_results(review_model):
+    texts = ["great product", "bad", "great product", "great product", "bad"]
+    results = list(review_model.classify_reviews(texts, batch_size=2))
+    assert results[0] == results[2] == results[3] and results[1] == results[4]
+    assert results[0] is not results[2]
+
+
+def test_batches_are_bucketed_by_length(review_model, monkeypatch):
+    shapes = []
+    forward = review_model._forward
+
+    def recording_forward(input_ids, attention_mask):
+        shapes.append(tuple(input_ids.shape))
+        return forward(input_ids, attention_mask)
+
+    monkeypatch.setattr(review_model, '_forward', recording_forward)
+    list(review_model.classify_reviews(TEXTS, batch_size=4))
+    assert [rows for rows, _ in shapes] == [4, 4, 2]
+    # Sorted by length, so padding grows from batch to batch instead of every batch reaching the longest review
+    assert [length for _, length in shapes] == sorted(length for _, length in shapes)
+    assert shapes[0][1] < shapes[-1][1]
+
+
+def test_invalid_batch_size_raises(review_model):
+    with pytest.raises(ReviewModelError):
+        list(review_model.classify_reviews(TEXTS, batch_size=0))
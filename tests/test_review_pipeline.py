@@ -0,0 +1,112 @@
+import csv
+import json
+import os
+
+import pytest
+
+pytest.importorskip('torch')
+
+from ai_models.review_model import ReviewModel
+from ai_models.review_pipeline import ReviewPipeline, ReviewPipelineError, iter_records
+
+WORDS = "great product bad service okay fast slow terrible love this".split()
+RECORDS = [{'id': str(index), 'review': ' '.join(WORDS[index % 7:index % 7 + 1 + index % 4])} for index in range(11)]
+
+
+@pytest.fixture(scope='module')
+def expected(tiny_bert):
+    model = ReviewModel(tiny_bert, device='cpu')
+    return list(model.classify_reviews([record['review'] for record in RECORDS]))
+
+
+def _pipeline(tiny_bert, **options):
+    return ReviewPipeline(tiny_bert, workers=1, threads_per_worker=1, chunk_size=3, batch_size=2, **options)
+
+
+def _write_csv(path, records):
+    with open(path, 'w', newline='', encoding='utf-8') as handle:
+        writer = csv.DictWriter(handle, fieldnames=list(records[0]))
+        writer.writeheader()
+        writer.writerows(records)
+
+
+def _read_output(path):
+    if str(path).endswith('.csv'):
+        with open(path, newline='', encoding='utf-8') as handle:
+            return [dict(row, confidence=float(row['confidence'])) for row in csv.DictReader(handle)]
+    with open(path, encoding='utf-8') as handle:
+        return [json.loads(line) for line in handle]
+
+
+def _assert_labelled(rows, expected):
+    assert [row['id'] for row in rows] == [record['id'] for record in RECORDS]
+    assert [row['review'] for row in rows] == [record['review'] for record in RECORDS]
+    assert [row['label'] for row in rows] == [result['label'] for result in expected]
+    assert [row['confidence'] for row in rows] == pytest.approx([result['confidence'] for result in expected], abs=1e-5)
+
+
+def test_iter_records_reads_every_format(tmp_path):
+    _write_csv(tmp_path / 'in.csv', RECORDS)
+    (tmp_path / 'in.json').write_text(json.dumps(RECORDS), encoding='utf-8')
+    (tmp_path / 'in.jsonl').write_text(''.join(json.dumps(record) + '\n' for record in RECORDS), encoding='utf-8')
+    for name in ['in.csv', 'in.json', 'in.jsonl']:
+        assert list(iter_records(str(tmp_path / name))) == RECORDS
+    with pytest.raises(ReviewPipelineError):
+        list(iter_records(str(tmp_path / 'in.txt')))
+
+
+def test_csv_chunks_are_written_in_input_order(tmp_path, tiny_bert, expected):
+    _write_csv(tmp_path / 'in.csv', RECORDS)
+    output = tmp_path / 'out.csv'
+    pipeline = _pipeline(tiny_bert)
+    report = pipeline.run(str(tmp_path / 'in.csv'), str(output))
+    assert (report['rows'], report['resumed_from']) == (len(RECORDS), 0)
+    _assert_labelled(_read_output(output), expected)
+    checkpoint = json.loads((tmp_path / 'out.csv.checkpoint').read_text())
+    assert checkpoint == {'offset': len(RECORDS), 'output_size': os.path.getsize(output)}
+
+    # Resuming after the header and the first chunk keeps a single header
+    complete = output.read_bytes()
+    kept = b''.join(complete.splitlines(keepends=True)[:4])
+    output.write_bytes(kept)
+    ReviewPipeline._write_checkpoint(f"{output}.checkpoint", 3, len(kept))
+    pipeline.run(str(tmp_path / 'in.csv'), str(output), resume=True)
+    assert output.read_bytes() == complete
+
+
+def test_jsonl_output_and_resume_after_a_partial_write(tmp_path, tiny_bert, expected):
+    (tmp_path / 'in.json').write_text(json.dumps(RECORDS), encoding='utf-8')
+    output = tmp_path / 'out.jsonl'
+    pipeline = _pipeline(tiny_bert)
+    pipeline.run(str(tmp_path / 'in.json'), str(output))
+    complete = output.read_bytes()
+    _assert_labelled(_read_output(output), expected)
+
+    # Interrupted after two chunks, in the middle of writing the third
+    lines = complete.splitlines(keepends=True)
+    kept = b''.join(lines[:6])
+    output.write_bytes(kept + lines[6][:10])
+    ReviewPipeline._write_checkpoint(f"{output}.checkpoint", 6, len(kept))
+    report = pipeline.run(str(tmp_path / 'in.json'), str(output), resume=True)
+    assert (report['rows'], report['resumed_from']) == (len(RECORDS) - 6, 6)
+    assert output.read_bytes() == complete
+
+    # Without resume the output starts over
+    pipeline.run(str(tmp_path / 'in.json'), str(output))
+    assert output.read_bytes() == complete
+
+
+def test_missing_text_column_raises(tmp_path, tiny_bert):
+    _write_csv(tmp_path / 'in.csv', RECORDS)
+    with pytest.raises(ReviewPipelineError, match="Row 0 has no 'text' field"):
+        _pipeline(tiny_bert, text_column='text').run(str(tmp_path / 'in.csv'), str(tmp_path / 'out.csv'))
+
+    records = RECORDS[:4] + [{'id': '4'}] + RECORDS[5:]
+    (tmp_path / 'in.jsonl').write_text(''.join(json.dumps(record) + '\n' for record in records), encoding='utf-8')
+    with pytest.raises(ReviewPipelineError, match="Row 4 has no 'review' field"):
+        _pipeline(tiny_bert).run(str(tmp_path / 'in.jsonl'), str(tmp_path / 'out.jsonl'))
+
+
+def test_json_array_output_is_rejected(tmp_path, tiny_bert):
+    with pytest.raises(ReviewPipelineError, match="cannot be appended"):
+        _pipeline(tiny_bert).run(str(tmp_path / 'in.csv'), str(tmp_path / 'out.json'))
@@ -0,0 +1,149 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip('torch')
+
+from ai_models.review_model import ReviewModel
+from ai_models.review_server import MAX_BODY_BYTES, ReviewBatchServer, ReviewServerBusy
+
+TEXTS = ["great product", "terrible service, would not buy again", "ok", "it broke after a week"]
+
+
+@pytest.fixture(scope='module')
+def review_model(tiny_bert):
+    return ReviewModel(tiny_bert, device='cpu')
+
+
+def _assert_results(results, expected):
+    assert [result['label'] for result in results] == [result['label'] for result in expected]
+    assert [result['confidence'] for result in results] == pytest.approx([result['confidence'] for result in expected], abs=1e-5)
+
+
+async def _request(port, raw):
+    """
+    Send raw bytes to the server and read until it closes the connection.
+
+    Returns:
+        tuple: Status code, headers and the decoded body of the first response.
+    """
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(raw)
+    await writer.drain()
+    response = await asyncio.wait_for(reader.read(), 10)
+    writer.close()
+    head, _, body = response.partition(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    headers = dict(line.split(': ', 1) for line in lines[1:])
+    body = body[:int(headers['Content-Length'])]
+    return int(lines[0].split()[1]), headers, json.loads(body) if headers['Content-Type'] == 'application/json' else body.decode()
+
+
+def _http(method, path, payload=None, headers=None):
+    body = json.dumps(payload).encode() if payload is not None else b''
+    headers = {'Content-Length': str(len(body)), 'Connection': 'close', **(headers or {})}
+    head = f"{method} {path} HTTP/1.1\r\n" + ''.join(f"{name}: {value}\r\n" for name, value in headers.items())
+    return head.encode('latin-1') + b'\r\n' + body
+
+
+async def _serve(review_model, requests, **options):
+    async with ReviewBatchServer(review_model, **options) as batch_server:
+        server = await batch_server.serve('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return [await _request(port, raw) for raw in requests]
+        finally:
+            server.close()
+            await server.wait_closed()
+
+
+def test_classify_matches_review_model(review_model):
+    async def run():
+        async with ReviewBatchServer(review_model, max_batch_size=3, max_wait_ms=20) as server:
+            results = await asyncio.gather(*[server.classify(text) for text in TEXTS * 2])
+            return results, server.stats()
+
+    results, stats = asyncio.run(run())
+    _assert_results(results, [review_model.classify_review(text) for text in TEXTS * 2])
+    assert stats['requests_completed'] == 8
+    assert stats['batches'] >= 3
+
+
+def test_classify_requires_a_running_server(review_model):
+    from ai_models.review_model import ReviewModelError
+
+    with pytest.raises(ReviewModelError, match="not running"):
+        asyncio.run(ReviewBatchServer(review_model).classify("great product"))
+    with pytest.raises(ReviewModelError):
+        ReviewBatchServer(review_model, max_batch_size=0)
+
+
+def test_full_queue_rejects_requests(review_model):
+    async def run():
+        async with ReviewBatchServer(review_model, max_queue_size=1) as server:
+            results = await asyncio.gather(*[server.classify(text) for text in TEXTS[:2]], return_exceptions=True)
+            return results, server.stats()
+
+    results, stats = asyncio.run(run())
+    assert isinstance(results[1], ReviewServerBusy)
+    assert stats['requests_rejected'] == 1
+
+
+def test_http_routes(review_model):
+    responses = asyncio.run(_serve(review_model, [
+        _http('POST', '/classify', {'text': TEXTS[0]}),
+        _http('POST', '/classify', {'texts': TEXTS}),
+        _http('GET', '/health'),
+        _http('GET', '/stats'),
+        _http('GET', '/classify'),
+        _http('POST', '/health'),
+        _http('GET', '/missing'),
+        _http('POST', '/classify', {'texts': [1, 2]}),
+        _http('POST', '/classify', headers={'Content-Length': '1'}) + b'{',
+    ]))
+    statuses = [status for status, _, _ in responses]
+    assert statuses == [200, 200, 200, 200, 405, 405, 404, 400, 400]
+    _assert_results([responses[0][2]], [review_model.classify_review(TEXTS[0])])
+    _assert_results(responses[1][2], [review_model.classify_review(text) for text in TEXTS])
+    assert responses[2][2] == {'status': 'ok'}
+    assert responses[3][2]['requests_completed'] == 5
+    assert responses[4][1]['Allow'] == 'POST'
+
+
+def test_keep_alive_serves_several_requests(review_model):
+    raw = _http('GET', '/health', headers={'Connection': 'keep-alive'}) + _http('GET', '/health')
+    [(status, headers, _)] = asyncio.run(_serve(review_model, [raw]))
+    # Only the first response is parsed; the connection stayed open for the second
+    assert (status, headers['Connection']) == (200, 'keep-alive')
+
+
+@pytest.mark.parametrize('length', ['abc', '-5', '1e3', ' 12x', '+4'])
+def test_invalid_content_length_is_rejected(review_model, length):
+    [(status, headers, payload)] = asyncio.run(_serve(review_model, [
+        _http('POST', '/classify', headers={'Content-Length': length}),
+    ]))
+    assert (status, headers['Connection']) == (400, 'close')
+    assert payload == {'error': 'Invalid Content-Length header.'}
+
+
+def test_body_that_is_not_utf8_is_rejected(review_model):
+    raw = _http('POST', '/classify', headers={'Content-Length': '4'}) + b'\xff\xfe{}'
+    [(status, _, payload)] = asyncio.run(_serve(review_model, [raw]))
+    assert status == 400 and payload['error'].startswith('Invalid JSON')
+
+
+def test_unexpected_errors_get_a_500(review_model, monkeypatch):
+    def broken(self):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(ReviewBatchServer, 'stats', broken)
+    [(status, headers, payload)] = asyncio.run(_serve(review_model, [_http('GET', '/stats')]))
+    assert (status, headers['Connection'], payload) == (500, 'close', {'error': 'Internal server error.'})
+
+
+def test_oversized_body_is_rejected(review_model):
+    [(status, headers, _)] = asyncio.run(_serve(review_model, [
+        _http('POST', '/classify', headers={'Content-Length': str(MAX_BODY_BYTES + 1)}),
+    ]))
+    assert (status, headers['Connection']) == (413, 'close')
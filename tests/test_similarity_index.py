@@ -0,0 +1,193 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+torch = pytest.importorskip('torch')
+
+from ai_models.review_model import ReviewModel, ReviewModelError
+from ai_models.similarity_index import INITIAL_CAPACITY, SimilarityIndex, SimilarityIndexError
+
+TEXTS = ["great product", "terrible service, very slow", "okay", "great product", "i love this, fast service!", ""]
+
+
+@pytest.fixture(scope='module')
+def review_model(tiny_bert):
+    return ReviewModel(tiny_bert, device='cpu')
+
+
+def _unit(vectors):
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _planted(count=200, dim=16, seed=0):
+    """
+    Random vectors where every fifth row is a slightly perturbed copy of the row before it.
+    """
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((count, dim)).astype(np.float32)
+    for row in range(1, count, 5):
+        vectors[row] = vectors[row - 1] + 0.01 * rng.standard_normal(dim)
+    return vectors
+
+
+def _brute_pairs(vectors, threshold):
+    scores = _unit(vectors) @ _unit(vectors).T
+    return [(i, j) for i in range(len(vectors)) for j in range(i + 1, len(vectors)) if scores[i, j] >= threshold]
+
+
+@pytest.mark.parametrize('pooling', ['mean', 'cls'])
+def test_embed_reviews_matches_unbatched_encoder(review_model, pooling):
+    embeddings = review_model.embed_reviews(TEXTS, batch_size=4, pooling=pooling)
+    assert embeddings.shape == (len(TEXTS), 32) and embeddings.dtype == np.float32
+    for text, embedding in zip(TEXTS, embeddings):
+        inputs = review_model.tokenizer(text, return_tensors='pt')
+        with torch.no_grad():
+            states = review_model.model.base_model(**inputs).last_hidden_state[0]
+        expected = states[0] if pooling == 'cls' else states.mean(dim=0)
+        np.testing.assert_allclose(embedding, torch.nn.functional.normalize(expected, dim=0).numpy(), atol=1e-5)
+    np.testing.assert_allclose(embeddings[0], embeddings[3])
+
+
+def test_embed_reviews_writes_a_memory_map(review_model, tmp_path):
+    path = str(tmp_path / 'embeddings.npy')
+    in_memory = review_model.embed_reviews(TEXTS, batch_size=2, normalize=False)
+    written = review_model.embed_reviews(iter(TEXTS), batch_size=5, normalize=False, dtype='float16', path=path)
+    assert isinstance(written, np.memmap)
+    loaded = np.load(path, mmap_mode='r')
+    assert loaded.dtype == np.float16 and loaded.shape == in_memory.shape
+    np.testing.assert_allclose(loaded, in_memory, rtol=1e-2, atol=1e-2)
+    assert not np.allclose(np.linalg.norm(in_memory, axis=1), 1)
+
+
+def test_embed_reviews_rejects_invalid_arguments(review_model):
+    with pytest.raises(ReviewModelError):
+        review_model.embed_reviews(TEXTS, pooling='max')
+    with pytest.raises(ReviewModelError):
+        review_model.embed_reviews(TEXTS, batch_size=0)
+
+
+@pytest.mark.parametrize('dtype', ['float32', 'float16'])
+def test_exact_search_matches_brute_force(dtype):
+    vectors = _planted()
+    queries = np.random.default_rng(1).standard_normal((30, 16)).astype(np.float32)
+    index = SimilarityIndex(16, dtype=dtype, block_size=7)
+    index.add(vectors[:90])
+    index.add(vectors[90:])
+    scores, ids = index.search(queries, k=5)
+    expected = _unit(queries) @ _unit(vectors).T
+    top = np.argsort(-expected, axis=1)[:, :5]
+    tolerance = 1e-5 if dtype == 'float32' else 2e-3
+    np.testing.assert_allclose(scores, np.take_along_axis(expected, top, axis=1), atol=tolerance)
+    if dtype == 'float32':
+        np.testing.assert_array_equal(ids, top)
+
+
+def test_search_pads_missing_neighbours():
+    index = SimilarityIndex(4)
+    index.add(np.eye(4)[:2])
+    scores, ids = index.search(np.eye(4)[0], k=3)
+    assert ids.tolist() == [[0, 1, -1]]
+    assert scores[0, 0] == pytest.approx(1) and scores[0, 2] == -np.inf
+    assert SimilarityIndex(4).search(np.eye(4), k=2)[1].tolist() == [[-1, -1]] * 4
+
+
+def test_lsh_search_finds_stored_and_near_vectors():
+    vectors = _planted()
+    index = SimilarityIndex(16, lsh_bits=6, lsh_tables=4)
+    index.add(vectors)
+    _, ids = index.search(vectors, k=1)
+    assert ids[:, 0].tolist() == list(range(len(vectors)))
+    # Near-duplicates nearly always share a bucket in some table
+    _, ids = index.search(vectors[1::5], k=2)
+    assert np.mean(ids[:, 1] == np.arange(0, len(vectors), 5)) >= 0.9
+    exact = SimilarityIndex(16, block_size=5)
+    exact.add(vectors)
+    np.testing.assert_array_equal(index.search(vectors[:10], k=3, exact=True)[1], exact.search(vectors[:10], k=3)[1])
+
+
+def test_near_duplicates_and_deduplicate():
+    vectors = _planted()
+    index = SimilarityIndex(16, block_size=32)
+    index.add(vectors)
+    pairs = index.near_duplicates(threshold=0.99)
+    assert [(i, j) for i, j, _ in pairs] == _brute_pairs(vectors, 0.99)
+    assert all(score >= 0.99 for _, _, score in pairs)
+
+    lsh = SimilarityIndex(16, lsh_bits=6, lsh_tables=4)
+    lsh.add(vectors)
+    assert {(i, j) for i, j, _ in lsh.near_duplicates(threshold=0.99)} <= {(i, j) for i, j, _ in pairs}
+    assert [(i, j) for i, j, _ in lsh.near_duplicates(threshold=0.99, exact=True)] == [(i, j) for i, j, _ in pairs]
+
+    representatives = index.deduplicate(threshold=0.99)
+    assert all(representatives[row] == row - 1 for row in range(1, len(vectors), 5))
+    assert len(set(representatives.tolist())) == len(vectors) - len(pairs)
+
+
+@pytest.mark.parametrize('lsh_bits', [0, 2])
+@pytest.mark.parametrize('threshold', [0.0, -1.0])
+def test_non_positive_thresholds_keep_pairs_ordered(lsh_bits, threshold):
+    vectors = np.array([[1, 0], [-1, 0], [0, 1], [1, 1]], dtype=np.float32)
+    index = SimilarityIndex(2, block_size=3, lsh_bits=lsh_bits, lsh_tables=8)
+    index.add(vectors)
+    pairs = [(i, j) for i, j, _ in index.near_duplicates(threshold)]
+    assert all(i < j for i, j in pairs)
+    assert len(set(pairs)) == len(pairs)
+    expected = _brute_pairs(vectors, threshold - 1e-6)
+    if lsh_bits:
+        assert set(pairs) <= set(expected)
+    else:
+        assert pairs == expected
+        assert index.deduplicate(threshold=0.5).tolist() == [0, 1, 0, 0]
+
+
+def test_deduplicate_groups_chains():
+    angles = np.radians([0, 5, 10, 90, 95])
+    index = SimilarityIndex(2)
+    index.add(np.stack([np.cos(angles), np.sin(angles)], axis=1))
+    # 0 and 10 degrees are below the threshold but linked through 5 degrees
+    assert index.deduplicate(threshold=np.cos(np.radians(6))).tolist() == [0, 0, 0, 3, 3]
+
+
+def test_lookup_returns_payloads():
+    index = SimilarityIndex(3)
+    assert index.add(np.eye(3), payloads=['positive', 'negative', 'neutral']).tolist() == [0, 1, 2]
+    matches = index.lookup(np.array([[1, 0.01, 0], [1, 1, 1]]), threshold=0.99)
+    assert matches[0][0] == 0 and matches[0][2] == 'positive' and matches[1] is None
+    assert index.payload(2) == 'neutral'
+
+
+def test_index_grows_past_its_initial_capacity():
+    vectors = np.random.default_rng(2).standard_normal((INITIAL_CAPACITY + 300, 8))
+    index = SimilarityIndex(8, lsh_bits=4)
+    for start in range(0, len(vectors), 250):
+        index.add(vectors[start:start + 250])
+    assert len(index) == len(vectors)
+    np.testing.assert_allclose(index.vectors, _unit(vectors), atol=1e-6)
+    with pytest.raises(ValueError):
+        index.vectors[0, 0] = 1
+
+
+@pytest.mark.parametrize('lsh_bits', [0, 6])
+def test_save_and_load_round_trip(tmp_path, lsh_bits):
+    vectors = _planted()
+    index = SimilarityIndex(16, dtype='float16', lsh_bits=lsh_bits, seed=3)
+    index.add(vectors)
+    path = str(tmp_path / 'index.npz')
+    index.save(path)
+    loaded = SimilarityIndex.load(path)
+    assert (len(loaded), loaded.dtype, loaded.lsh_bits, loaded.seed) == (len(index), 'float16', lsh_bits, 3)
+    np.testing.assert_array_equal(loaded.vectors, index.vectors)
+    for first, second in zip(loaded.search(vectors[:20], k=4), index.search(vectors[:20], k=4)):
+        np.testing.assert_array_equal(first, second)
+
+
+def test_invalid_arguments_raise():
+    for options in [{'dim': 0}, {'dim': 4, 'dtype': 'int8'}, {'dim': 4, 'lsh_bits': 63}, {'dim': 4, 'block_size': 0}]:
+        with pytest.raises(SimilarityIndexError):
+            SimilarityIndex(**options)
+    index = SimilarityIndex(4)
+    with pytest.raises(SimilarityIndexError):
+        index.add(np.ones((2, 3)))
+    with pytest.raises(SimilarityIndexError):
+        index.add(np.ones((2, 4)), payloads=['one'])
+    with pytest.raises(SimilarityIndexError):
+        index.search(np.ones(4), k=0)
@@ -0,0 +1,90 @@
+import re
+import subprocess
+import sys
+
+import pytest
+
+from tools.validator import Validator, ValidatorError
+
+VALUES = ['user@example.com', 'email', 'a@b', None, 'x' * 40, 'first.last+tag@mail.example.org']
+
+
+def test_named_patterns_need_the_prefix():
+    assert Validator.validate_string('user@example.com', 'named:email')
+    with pytest.raises(ValidatorError):
+        Validator.validate_string('email', 'named:email')
+    # Without the prefix 'email' is an ordinary regex that matches the literal word
+    assert Validator.validate_string('email', 'email')
+    with pytest.raises(ValidatorError):
+        Validator.validate_string('user@example.com', 'email')
+
+
+def test_builtin_named_patterns():
+    assert Validator.validate_string('123e4567-e89b-12d3-a456-426614174000', 'named:uuid')
+    assert Validator.validate_string('1.2.3-rc.1+build.5', 'named:semver')
+    assert Validator.validate_string('192.168.0.1', 'named:ipv4')
+    with pytest.raises(ValidatorError):
+        Validator.validate_string('256.1.1.1', 'named:ipv4')
+
+
+def test_unknown_and_invalid_patterns_raise():
+    with pytest.raises(ValidatorError, match="Unknown pattern name"):
+        Validator.validate_string('x', 'named:no-such-pattern')
+    with pytest.raises(ValidatorError, match="Invalid regex"):
+        Validator.validate_string('x', '(')
+    with pytest.raises(ValidatorError):
+        Validator.register_pattern('broken', '(')
+
+
+def test_register_pattern():
+    Validator.register_pattern('postcode', r'[A-Z]{1,2}\d[A-Z\d]? ?\d[A-Z]{2}\Z', re.IGNORECASE)
+    assert Validator.validate_string('sw1a 1aa', 'named:postcode')
+    with pytest.raises(ValidatorError):
+        Validator.validate_string('12345', 'named:postcode')
+
+
+def test_length_checks_and_types():
+    assert Validator.validate_string('abc', min_length=3, max_length=3)
+    for value, options in (('ab', {'min_length': 3}), ('abcd', {'max_length': 3}), (5, {})):
+        with pytest.raises(ValidatorError):
+            Validator.validate_string(value, **options)
+
+
+def _expected():
+    mask, failures = [], []
+    for index, value in enumerate(VALUES):
+        try:
+            Validator.validate_string(value, 'named:email', max_length=32)
+            mask.append(True)
+        except ValidatorError as e:
+            mask.append(False)
+            failures.append((index, str(e)))
+    return mask, failures
+
+
+def test_validate_strings_list_matches_validate_string():
+    assert Validator.validate_strings(VALUES, 'named:email', max_length=32) == _expected()
+
+
+def test_validate_strings_numpy_array():
+    np = pytest.importorskip('numpy')
+    mask, failures = Validator.validate_strings(np.array(VALUES, dtype=object), 'named:email', max_length=32)
+    assert isinstance(mask, np.ndarray) and mask.dtype == bool
+    assert (mask.tolist(), failures) == _expected()
+
+
+@pytest.mark.parametrize('dtype', [object, 'string'])
+def test_validate_strings_pandas_series(dtype):
+    pd = pytest.importorskip('pandas')
+    values = pd.Series(VALUES, index=[f"row{i}" for i in range(len(VALUES))], dtype=dtype)
+    mask, failures = Validator.validate_strings(values, 'named:email', max_length=32)
+    expected_mask, expected_failures = _expected()
+    assert mask.index.equals(values.index)
+    assert mask.tolist() == expected_mask
+    assert failures == [(f"row{index}", reason) for index, reason in expected_failures]
+
+
+def test_import_does_not_load_numpy_or_pandas():
+    code = "import sys, tools.validator; print('numpy' in sys.modules, 'pandas' in sys.modules)"
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    assert output.split() == ['False', 'False']
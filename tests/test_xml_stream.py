@@ -0,0 +1,91 @@
+import copy
+import io
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from tools.xml_stream import format_xml_stream, write_element
+from tools.formatter import Formatter, FormatterError
+
+DOCUMENTS = [
+    '<root />',
+    '<root>text</root>',
+    '<root><child name="test"/><child>text</child></root>',
+    '<root>\n   <a>1</a>  <b attr="x &amp; &quot;y&quot;&#10;z"><c/>tail text<d>2</d>\n</b>\n</root>',
+    '<root>lead<a/>mixed <b>bold</b> content &lt;&gt;&amp;<c/></root>',
+    '<r><a><b><c><d>deep</d></c></b></a><e/></r>',
+]
+
+
+def _reference(element, indent="  "):
+    element = copy.deepcopy(element)
+    ET.indent(element, space=indent)
+    return ET.tostring(element, encoding='unicode')
+
+
+def _written(element, indent="  "):
+    parts = []
+    write_element(element, parts.append, indent)
+    return ''.join(parts)
+
+
+@pytest.mark.parametrize('document', DOCUMENTS)
+def test_write_element_matches_et_indent(document):
+    element = ET.fromstring(document)
+    before = ET.tostring(element, encoding='unicode')
+    assert _written(element) == _reference(element)
+    assert _written(element, '\t') == _reference(element, '\t')
+    # The tree is left untouched
+    assert ET.tostring(element, encoding='unicode') == before
+
+
+@pytest.mark.parametrize('document', DOCUMENTS)
+@pytest.mark.parametrize('chunk_size', [1, 3, 1 << 16])
+def test_format_xml_stream_matches_et_indent(document, chunk_size):
+    parts = []
+    count = format_xml_stream(io.BytesIO(document.encode('utf-8')), parts.append, chunk_size=chunk_size)
+    element = ET.fromstring(document)
+    assert ''.join(parts) == _reference(element)
+    assert count == sum(1 for _ in element.iter())
+
+
+def test_deep_documents_do_not_recurse():
+    depth = 5000
+    document = '<a>' * depth + '</a>' * depth
+    parts = []
+    assert format_xml_stream(io.StringIO(document), parts.append, chunk_size=4096) == depth
+    output = ''.join(parts)
+    assert output.count('<a>') == depth - 1 and output.count('<a />') == 1
+
+    element = ET.Element('a')
+    node = element
+    for _ in range(depth - 1):
+        node = ET.SubElement(node, 'a')
+    assert _written(element) == output
+
+
+def test_namespace_prefixes_are_preserved():
+    document = '<p:root xmlns:p="urn:p" xmlns="urn:d"><p:a p:x="1"/><b/></p:root>'
+    parts = []
+    format_xml_stream(io.BytesIO(document.encode('utf-8')), parts.append)
+    assert ''.join(parts) == '<p:root xmlns:p="urn:p" xmlns="urn:d">\n  <p:a p:x="1" />\n  <b />\n</p:root>'
+
+
+def test_undeclared_namespaces_get_generated_prefixes():
+    element = ET.fromstring('<root xmlns="urn:x"><child/></root>')
+    assert ET.fromstring(_written(element)).tag == '{urn:x}root'
+    assert _written(element) == _reference(element)
+
+
+def test_malformed_documents_raise():
+    with pytest.raises(ET.ParseError):
+        format_xml_stream(io.BytesIO(b'<root><a></root>'), lambda text: None)
+    with pytest.raises(FormatterError):
+        Formatter.format_xml('<root>')
+
+
+def test_format_xml_accepts_strings_and_elements():
+    document = DOCUMENTS[3]
+    expected = _reference(ET.fromstring(document))
+    assert Formatter.format_xml(document) == expected
+    assert Formatter.format_xml(ET.fromstring(document)) == expected
@@ -0,0 +1,95 @@
+import os
+
+import pytest
+
+from tools.validator import Validator, ValidatorError
+
+XSD = """<?xml version="1.0"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:element name="review">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="text" type="xs:string"/>
+        <xs:element name="rating" type="xs:integer"/>
+      </xs:sequence>
+    </xs:complexType>
+  </xs:element>
+</xs:schema>
+"""
+
+VALID = '<review><text>good</text><rating>5</rating></review>'
+INVALID = '<review><text>bad</text><rating>five</rating></review>'
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    Validator.clear_xml_schema_cache()
+    yield
+    Validator.clear_xml_schema_cache()
+
+
+@pytest.fixture
+def schema_path(tmp_path):
+    path = tmp_path / 'review.xsd'
+    path.write_text(XSD, encoding='utf-8')
+    return str(path)
+
+
+def test_validate_xml_with_source_and_path(schema_path):
+    for schema in (XSD, schema_path):
+        assert Validator.validate_xml(VALID, schema)
+        with pytest.raises(ValidatorError):
+            Validator.validate_xml(INVALID, schema)
+    with pytest.raises(ValidatorError):
+        Validator.validate_xml('<review>', XSD)
+
+
+def test_compiled_schemas_are_cached(schema_path):
+    for _ in range(3):
+        Validator.validate_xml(VALID, schema_path)
+    info = Validator.xml_schema_cache_info()
+    assert (info['hits'], info['misses'], info['size']) == (2, 1, 1)
+
+
+def test_changed_schema_file_is_recompiled(schema_path):
+    with pytest.raises(ValidatorError):
+        Validator.validate_xml(INVALID, schema_path)
+    with open(schema_path, 'w', encoding='utf-8') as handle:
+        handle.write(XSD.replace('xs:integer', 'xs:token'))
+    stat = os.stat(schema_path)
+    os.utime(schema_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert Validator.validate_xml(INVALID, schema_path)
+
+
+def test_invalid_schema_raises(tmp_path):
+    with pytest.raises(ValidatorError):
+        Validator.validate_xml(VALID, '<xs:schema')
+    with pytest.raises(ValidatorError):
+        Validator.validate_xml(VALID, str(tmp_path / 'missing.xsd'))
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_validate_xml_many_reports_every_invalid_document(workers):
+    documents = [VALID, INVALID, '<review>', VALID] * 5
+    errors = Validator.validate_xml_many(documents, XSD, workers=workers, chunk_size=3)
+    assert [index for index, _, _ in errors] == [i for i in range(len(documents)) if i % 4 in (1, 2)]
+    assert errors[0][1] == '/review/rating'
+    assert len(Validator.validate_xml_many(iter(documents), XSD, workers=workers, chunk_size=3, max_errors=3)) == 3
+
+
+def test_validate_xml_many_without_schema_checks_well_formedness():
+    assert [index for index, _, _ in Validator.validate_xml_many([VALID, '<a>', INVALID], workers=1)] == [1]
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_validate_xml_directory(tmp_path, schema_path, workers):
+    (tmp_path / 'nested').mkdir()
+    (tmp_path / 'a.xml').write_text(VALID, encoding='utf-8')
+    (tmp_path / 'b.xml').write_text(INVALID, encoding='utf-8')
+    (tmp_path / 'nested' / 'c.xml').write_text('<review>', encoding='utf-8')
+    report = Validator.validate_xml_directory(str(tmp_path), schema_path, workers=workers, chunk_size=1)
+    assert (report['files'], report['valid'], report['invalid']) == (3, 1, 2)
+    assert sorted(os.path.basename(error['file']) for error in report['errors']) == ['b.xml', 'c.xml']
+    assert Validator.validate_xml_directory(str(tmp_path), schema_path, recursive=False, workers=workers)['files'] == 2
+    with pytest.raises(ValidatorError):
+        Validator.validate_xml_directory(str(tmp_path / 'missing'))
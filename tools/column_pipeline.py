@@ -0,0 +1,318 @@
+import argparse
+import csv
+import json
+import time
+import itertools
+import logging
+
+from tools.formatter import Formatter, FormatterError
+from tools.datetime_engine import compile_converter, convert_column, infer_format
+
+# pandas (with pyarrow-backed strings when pyarrow is installed) runs the string operations
+# vectorized; without it the pipeline falls back to pure Python
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+logger = logging.getLogger(__name__)
+
+# Number of rows read, transformed and written at a time
+CHUNK_SIZE = 50000
+
+# Formatter.format_string cases, by operation name
+STRING_OPERATIONS = ('upper', 'lower', 'capitalize', 'title', 'strip')
+
+
+class ColumnPipeline:
+    """
+    Apply Formatter operations to whole columns of a table at once.
+
+    The spec maps a column name to a list of operations applied in order. An operation is
+    either a name or a (name, options) pair:
+        'upper', 'lower', 'capitalize', 'title': Formatter.format_string cases.
+        'strip': Remove surrounding whitespace.
+        ('datetime', {'current_format': ..., 'target_format': ...}): Formatter.format_datetime;
+            the current format is inferred from the first chunk when omitted.
+        ('json', {'indent': ...}): Formatter.format_json.
+
+    Columns are transformed with pandas' vectorized string methods when pandas is installed,
+    otherwise with one pass of a builtin str method over the column. Date columns are
+    converted with a compiled parser fused with the target formatter. Results
+    match calling the Formatter methods on each cell.
+
+    Example:
+        ColumnPipeline({'email': ['strip', 'lower'], 'signup_date': [('datetime', {'target_format': '%Y-%m-%d'})]})
+    """
+
+    def __init__(self, spec, errors='raise', backend='auto'):
+        """
+        Initialize the pipeline.
+
+        Args:
+            spec (dict): Column name -> list of operations.
+            errors (str): What to do with a cell an operation cannot handle: 'raise' a
+                FormatterError, 'coerce' it to None, or 'ignore' it and keep the value.
+            backend (str): 'auto', 'pandas' or 'python'.
+
+        Raises:
+            FormatterError: If an operation, option or backend is not recognized.
+        """
+        if errors not in ('raise', 'coerce', 'ignore'):
+            raise FormatterError(f"Unsupported errors option: {errors}")
+        if backend == 'auto':
+            backend = 'pandas' if pd is not None else 'python'
+        elif backend == 'pandas' and pd is None:
+            raise FormatterError("pandas is not installed. Install it to use the pandas backend.")
+        elif backend not in ('pandas', 'python'):
+            raise FormatterError(f"Unsupported backend: {backend}")
+        self.errors = errors
+        self.backend = backend
+        self.spec = {column: [self._parse_operation(operation) for operation in operations]
+                     for column, operations in spec.items()}
+
+    def apply(self, columns):
+        """
+        Transform a table held as columns.
+
+        Args:
+            columns (dict or pandas.DataFrame): Column name -> list of values, or a DataFrame.
+
+        Returns:
+            The transformed table, of the same kind as the input. Columns not in the spec
+            are returned unchanged.
+
+        Raises:
+            FormatterError: If a column in the spec is missing, or a cell cannot be
+            transformed and errors is 'raise'.
+        """
+        return self._apply(columns, {})
+
+    def _apply(self, columns, inferred):
+        """
+        Private helper behind apply that records inferred date formats in ``inferred`` (keyed by
+        column and operation position) instead of the spec, so each call or run infers its own.
+        """
+        is_frame = pd is not None and isinstance(columns, pd.DataFrame)
+        result = columns.copy() if is_frame else dict(columns)
+        for column, operations in self.spec.items():
+            if column not in result:
+                raise FormatterError(f"Column not found: {column}")
+            values = result[column]
+            if self.backend == 'pandas' and not is_frame:
+                values = pd.Series(values, dtype=object)
+            elif self.backend == 'python' and is_frame:
+                values = values.tolist()
+            for position, (name, options) in enumerate(operations):
+                values = self._apply_operation(column, values, name, options, inferred, position)
+            if not is_frame and self.backend == 'pandas':
+                values = values.tolist()
+            result[column] = values
+        return result
+
+    def run(self, input_path, output_path, chunk_size=CHUNK_SIZE):
+        """
+        Transform a CSV file into another CSV file, one chunk of rows at a time.
+
+        Args:
+            input_path (str): Path to the input CSV file.
+            output_path (str): Path to the output CSV file.
+            chunk_size (int): Number of rows held in memory at a time.
+
+        Returns:
+            dict: Rows written, elapsed seconds and rows per second.
+
+        Raises:
+            FormatterError: If the files cannot be read or written, or a cell cannot be transformed.
+        """
+        start = time.perf_counter()
+        rows = 0
+        try:
+            with open(output_path, 'w', newline='', encoding='utf-8') as handle:
+                writer = None
+                # Date formats inferred from the first chunk apply to the rest of the file
+                inferred = {}
+                for chunk in self._read_chunks(input_path, chunk_size):
+                    chunk = self._apply(chunk, inferred)
+                    if self.backend == 'pandas':
+                        chunk.to_csv(handle, header=rows == 0, index=False, lineterminator='\r\n')
+                        rows += len(chunk)
+                    else:
+                        if writer is None:
+                            writer = csv.writer(handle)
+                            writer.writerow(list(chunk))
+                        rows_in_chunk = list(zip(*chunk.values()))
+                        writer.writerows(rows_in_chunk)
+                        rows += len(rows_in_chunk)
+        except (OSError, csv.Error) as e:
+            raise FormatterError(f"Column pipeline failed after {rows} rows: {e}")
+
+        elapsed = time.perf_counter() - start
+        logger.info(f"Transformed {rows} rows in {elapsed:.2f}s ({rows / elapsed if elapsed else 0:.0f} rows/sec).")
+        return {'rows': rows, 'elapsed': elapsed, 'rows_per_sec': rows / elapsed if elapsed else 0.0}
+
+    def _read_chunks(self, input_path, chunk_size):
+        """
+        Private helper that yields chunks of a CSV file as DataFrames or dicts of column lists.
+
+        Every cell is read as a string, as csv.DictReader would return it.
+        """
+        if self.backend == 'pandas':
+            yield from pd.read_csv(input_path, dtype=str, keep_default_na=False, chunksize=chunk_size)
+            return
+        with open(input_path, newline='', encoding='utf-8') as handle:
+            reader = csv.reader(handle)
+            header = next(reader, None)
+            if header is None:
+                return
+            while True:
+                rows = list(itertools.islice(reader, chunk_size))
+                if not rows:
+                    return
+                yield dict(zip(header, (list(column) for column in zip(*rows))))
+
+    @staticmethod
+    def _parse_operation(operation):
+        """
+        Private helper that normalizes an operation into a (name, options) pair.
+        """
+        if isinstance(operation, str):
+            operation = (operation,)
+        name, options = operation[0], dict(operation[1]) if len(operation) > 1 else {}
+        allowed = {'datetime': {'current_format', 'target_format'}, 'json': {'indent'}}.get(name, set())
+        if name not in STRING_OPERATIONS and name not in ('datetime', 'json'):
+            raise FormatterError(f"Unsupported column operation: {name}")
+        if set(options) - allowed:
+            raise FormatterError(f"Unsupported options for '{name}': {', '.join(sorted(set(options) - allowed))}")
+        return name, options
+
+    def _apply_operation(self, column, values, name, options, inferred, position):
+        """
+        Private helper that applies one operation to a column (a list or a pandas Series).
+        """
+        if name in STRING_OPERATIONS:
+            if self.backend == 'pandas':
+                return self._resolve_series(values, getattr(values.str, name)(), getattr(str, name))
+            return self._map_cells(values, getattr(str, name))
+        if name == 'datetime':
+            current_format = options.get('current_format') or inferred.get((column, position))
+            if current_format is None:
+                sample = [value for value in itertools.islice(values, 1000) if isinstance(value, str)]
+                current_format = infer_format(sample)
+                if current_format is None:
+                    raise FormatterError(f"Could not infer the date format of column '{column}'.")
+                logger.info(f"Inferred date format {current_format!r} for column '{column}'.")
+                inferred[(column, position)] = current_format
+            target_format = options.get('target_format', "%Y-%m-%d %H:%M:%S")
+            cells = values.tolist() if self.backend == 'pandas' else values
+            converted = convert_column(cells, current_format, target_format, errors='coerce')
+            function = compile_converter(current_format, target_format)
+            if self.backend == 'pandas':
+                return self._resolve_series(values, pd.Series(converted, index=values.index, dtype=object), function)
+            return self._resolve_list(values, converted, function)
+        else:
+            indent = options.get('indent', 4)
+            function = lambda value: Formatter.format_json(value, indent=indent)
+        if self.backend == 'pandas':
+            return self._resolve_series(values, values.map(self._or_none(function)), function)
+        return self._map_cells(values, function)
+
+    def _map_cells(self, values, function):
+        """
+        Private helper that applies ``function`` to every cell of a list, handling failures per ``errors``.
+        """
+        try:
+            return list(map(function, values))
+        except (TypeError, ValueError, FormatterError):
+            pass
+        results = []
+        for value in values:
+            try:
+                results.append(function(value))
+            except (TypeError, ValueError, FormatterError) as e:
+                if self.errors == 'raise':
+                    raise self._cell_error(function, e)
+                results.append(None if self.errors == 'coerce' else value)
+        return results
+
+    def _resolve_list(self, values, result, function):
+        """
+        Private helper that handles the cells a column conversion left as None because it failed on them.
+        """
+        if None not in result:
+            return result
+        for index, value in enumerate(result):
+            if value is None:
+                try:
+                    function(values[index])
+                except (TypeError, ValueError, FormatterError) as e:
+                    if self.errors == 'raise':
+                        raise self._cell_error(function, e)
+                    if self.errors == 'ignore':
+                        result[index] = values[index]
+        return result
+
+    def _resolve_series(self, values, result, function):
+        """
+        Private helper that handles the cells a pandas operation left missing because it failed on them.
+        """
+        failed = result.isna()
+        if not failed.any():
+            return result
+        if self.errors == 'raise':
+            # Re-run the failing cell through the plain function to report the Formatter error
+            try:
+                function(values[failed].iloc[0])
+            except (TypeError, ValueError, FormatterError) as e:
+                raise self._cell_error(function, e)
+        if self.errors == 'coerce':
+            return result.astype(object).where(~failed, None)
+        return result.astype(object).where(~failed, values)
+
+    @staticmethod
+    def _cell_error(function, error):
+        """
+        Private helper that builds the FormatterError the per-cell Formatter method would raise.
+        """
+        if isinstance(error, FormatterError):
+            return error
+        if getattr(function, '__objclass__', None) is str:
+            return FormatterError("Input value must be a string.")
+        return FormatterError(f"Date formatting error: {error}")
+
+    @staticmethod
+    def _or_none(function):
+        """
+        Private helper that wraps a converter to return None instead of raising.
+        """
+        def convert(value):
+            try:
+                return function(value)
+            except (TypeError, ValueError, FormatterError):
+                return None
+        return convert
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply Formatter operations column-wise to a CSV file.")
+    parser.add_argument("input", help="Input CSV file.")
+    parser.add_argument("output", help="Output CSV file.")
+    parser.add_argument("--spec", required=True, help="JSON file mapping columns to lists of operations.")
+    parser.add_argument("--errors", choices=["raise", "coerce", "ignore"], default="raise", help="Handling of bad cells.")
+    parser.add_argument("--backend", choices=["auto", "pandas", "python"], default="auto", help="Transform backend.")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Rows held in memory at a time.")
+    args = parser.parse_args()
+
+    with open(args.spec) as handle:
+        spec = json.load(handle)
+    try:
+        report = ColumnPipeline(spec, errors=args.errors, backend=args.backend).run(args.input, args.output, args.chunk_size)
+    except FormatterError as e:
+        logger.error(f"Formatting error: {e}")
+        raise SystemExit(1)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
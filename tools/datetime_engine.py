@@ -0,0 +1,367 @@
+import re
+import logging
+import functools
+import _strptime
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Formats tried, in order, when inferring the format of a column
+COMMON_FORMATS = (
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%d %H:%M:%S.%f',
+    '%Y-%m-%dT%H:%M:%S.%f',
+    '%Y-%m-%dT%H:%M:%S%z',
+    '%Y-%m-%d %H:%M',
+    '%Y-%m-%d',
+    '%Y/%m/%d %H:%M:%S',
+    '%Y/%m/%d',
+    '%d/%m/%Y %H:%M:%S',
+    '%m/%d/%Y %H:%M:%S',
+    '%d/%m/%Y',
+    '%m/%d/%Y',
+    '%d-%m-%Y',
+    '%d.%m.%Y',
+    '%Y%m%d',
+    '%d %b %Y',
+    '%d %B %Y',
+    '%b %d, %Y',
+    '%B %d, %Y',
+)
+
+# Maximum number of distinct values remembered during one column conversion
+MEMO_SIZE = 1 << 16
+
+# Values after which memoization is dropped if fewer than one in eight were repeats
+MEMO_PROBE = 4096
+
+# Compiled parsers and formatters kept per format string
+FORMAT_CACHE_SIZE = 256
+
+# ISO-8601 layouts that datetime.fromisoformat parses exactly like strptime once the length and
+# separators are checked: {format: (length, {position: separator})}
+_ISO_LAYOUTS = {
+    '%Y-%m-%d': (10, {4: '-', 7: '-'}),
+    '%Y-%m-%d %H:%M': (16, {4: '-', 7: '-', 10: ' ', 13: ':'}),
+    '%Y-%m-%dT%H:%M': (16, {4: '-', 7: '-', 10: 'T', 13: ':'}),
+    '%Y-%m-%d %H:%M:%S': (19, {4: '-', 7: '-', 10: ' ', 13: ':', 16: ':'}),
+    '%Y-%m-%dT%H:%M:%S': (19, {4: '-', 7: '-', 10: 'T', 13: ':', 16: ':'}),
+}
+
+# strptime directives the generated parsers handle themselves; any other directive is left to strptime
+_PARSED_DIRECTIVES = frozenset('YymbBdHIpMSfaA')
+
+
+def _two_digit_year(year):
+    """
+    Map a %y year to a full year the way strptime does (69-99 -> 1900s, 00-68 -> 2000s).
+    """
+    return year + (2000 if year <= 68 else 1900)
+
+
+def _twelve_hour(hour, am_pm, pm):
+    """
+    Convert a %I hour to 24-hour time the way strptime does.
+    """
+    if am_pm == pm:
+        return hour if hour == 12 else hour + 12
+    return 0 if hour == 12 else hour
+
+
+def _mismatch(value, match, date_format):
+    """
+    Raise the ValueError strptime raises for a value that does not fit its format.
+    """
+    if match is None:
+        raise ValueError(f"time data {value!r} does not match format {date_format!r}")
+    raise ValueError(f"unconverted data remains: {value[match.end():]}")
+
+
+@functools.lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def compile_parser(date_format):
+    """
+    Compile a strptime format into a specialized parser.
+
+    The format is translated once into strptime's own regular expression (so the same inputs
+    are accepted), and Python code that builds the datetime straight from the match groups is
+    generated for it. ISO-8601 layouts try datetime.fromisoformat first. Formats using
+    directives the generator does not handle (such as %z or %j) fall back to
+    datetime.strptime. Month and AM/PM names follow the locale active at compile time.
+
+    Args:
+        date_format (str): A strptime format, e.g. '%d/%m/%Y %H:%M'.
+
+    Returns:
+        callable: A function taking a string and returning a datetime. It raises ValueError
+        with strptime's messages for values that do not match.
+    """
+    parse = _generate(date_format, None)
+    return parse if parse is not None else functools.partial(_strptime_parse, date_format=date_format)
+
+
+@functools.lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def compile_formatter(date_format):
+    """
+    Compile a strftime format into a specialized formatter.
+
+    ISO-8601 layouts are written with datetime.isoformat, which is about three times faster
+    than strftime; other formats, aware datetimes and years before 1000 (which strftime does
+    not zero-pad on every platform) use strftime.
+
+    Args:
+        date_format (str): A strftime format, e.g. '%Y-%m-%d %H:%M:%S'.
+
+    Returns:
+        callable: A function taking a datetime and returning a string.
+    """
+    namespace = {'_target': date_format}
+    source = '\n'.join(["def format(d):"] + _format_lines(date_format, aware=True))
+    exec(compile(source, f"<datetime formatter {date_format!r}>", 'exec'), namespace)
+    return namespace['format']
+
+
+@functools.lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def compile_converter(source_format, target_format):
+    """
+    Compile a function that reformats date strings, fusing a parser and a formatter.
+
+    Equivalent to ``compile_formatter(target_format)(compile_parser(source_format)(value))``,
+    but generated as a single function, which matters when converting whole columns.
+
+    Args:
+        source_format (str): The strptime format of the input strings.
+        target_format (str): The strftime format of the output strings.
+
+    Returns:
+        callable: A function taking a string and returning a string. It raises ValueError
+        with strptime's messages for values that do not match.
+    """
+    convert = _generate(source_format, target_format)
+    if convert is None:
+        parse, format_ = compile_parser(source_format), compile_formatter(target_format)
+        return lambda value: format_(parse(value))
+    return convert
+
+
+def _format_lines(target_format, aware):
+    """
+    Generate the statements that return datetime ``d`` formatted with ``target_format``.
+    """
+    if target_format not in _ISO_LAYOUTS:
+        return ["    return d.strftime(_target)"]
+    if target_format == '%Y-%m-%d':
+        iso = "d.date().isoformat()"
+    else:
+        timespec = 'seconds' if target_format.endswith('%S') else 'minutes'
+        iso = f"d.isoformat({target_format[len('%Y-%m-%d')]!r}, {timespec!r})"
+    condition = "d.tzinfo is None and d.year >= 1000" if aware else "d.year >= 1000"
+    return [f"    if {condition}:", f"        return {iso}", "    return d.strftime(_target)"]
+
+
+def _generate(date_format, target_format):
+    """
+    Generate a parser for ``date_format`` (or a converter, when ``target_format`` is given).
+
+    Returns:
+        callable: The generated function, or None if the format needs strptime.
+    """
+    time_re = _strptime.TimeRE()
+    try:
+        regex = time_re.compile(date_format)
+    except (re.error, ValueError, KeyError):
+        # Repeated or unknown directives; let strptime report them
+        return None
+    fields = {name: number - 1 for name, number in regex.groupindex.items()}
+    if not set(fields) <= _PARSED_DIRECTIVES or 'H' in fields and 'I' in fields or 'Y' in fields and 'y' in fields:
+        return None
+
+    def field(name, default, convert='int({})'):
+        return convert.format(f"g[{fields[name]}]") if name in fields else default
+
+    year = field('Y', field('y', '1900', '_two_digit_year(int({}))'))
+    month = field('m', field('b', field('B', '1', '_months[{}.lower()]'), '_months[{}.lower()]'))
+    day = field('d', '1')
+    if 'I' in fields:
+        hour = f"_twelve_hour(int(g[{fields['I']}]), {field('p', repr(''), '{}.lower()')}, _pm)"
+    else:
+        hour = field('H', '0')
+    minute = field('M', '0')
+    second = field('S', '0')
+    microsecond = field('f', '0', "int({}.ljust(6, '0'))")
+
+    parse_lines = [
+        "match = _match(value)",
+        "if match is None or match.end() != len(value):",
+        "    _mismatch(value, match, _format)",
+        "g = match.groups()",
+        f"d = _datetime({year}, {month}, {day}, {hour}, {minute}, {second}, {microsecond})",
+    ]
+    lines = ["def generated(value):"]
+    if date_format in _ISO_LAYOUTS:
+        length, separators = _ISO_LAYOUTS[date_format]
+        checks = ' and '.join(f"value[{position}] == {separator!r}" for position, separator in separators.items())
+        lines += [
+            "    d = None",
+            f"    if len(value) == {length} and {checks}:",
+            "        try:",
+            "            d = _fromisoformat(value)",
+            "        except ValueError:",
+            "            pass",
+            "    if d is None:",
+        ]
+        lines += [f"        {line}" for line in parse_lines]
+    else:
+        lines += [f"    {line}" for line in parse_lines]
+    lines += ["    return d"] if target_format is None else _format_lines(target_format, aware=False)
+
+    months = {name: index for names in (time_re.locale_time.a_month, time_re.locale_time.f_month)
+              for index, name in enumerate(names) if name}
+    namespace = {
+        '_match': regex.match,
+        '_format': date_format,
+        '_target': target_format,
+        '_mismatch': _mismatch,
+        '_datetime': datetime,
+        '_fromisoformat': datetime.fromisoformat,
+        '_two_digit_year': _two_digit_year,
+        '_twelve_hour': _twelve_hour,
+        '_months': months,
+        '_pm': time_re.locale_time.am_pm[1],
+    }
+    exec(compile('\n'.join(lines), f"<datetime parser {date_format!r}>", 'exec'), namespace)
+    return namespace['generated']
+
+
+def _strptime_parse(value, date_format):
+    """
+    Parse with datetime.strptime, for formats the parser generator does not handle.
+    """
+    return datetime.strptime(value, date_format)
+
+
+def infer_format(samples, candidates=COMMON_FORMATS):
+    """
+    Infer the format of a column of date strings from a sample of its values.
+
+    Args:
+        samples (iterable of str): Sample values; empty and non-string values are ignored.
+        candidates (iterable of str): Formats to try, in order of preference.
+
+    Returns:
+        str: The candidate that parses the most samples (the earliest one on ties, e.g.
+        day-first before month-first), or None if no candidate parses any sample.
+    """
+    samples = [value for value in samples if isinstance(value, str) and value.strip()]
+    best, best_count = None, 0
+    for candidate in candidates:
+        parse = compile_parser(candidate)
+        count = 0
+        for value in samples:
+            try:
+                parse(value)
+                count += 1
+            except ValueError:
+                pass
+        if count > best_count:
+            best, best_count = candidate, count
+            if count == len(samples):
+                break
+    return best
+
+
+def _convert(values, errors, convert):
+    """
+    Apply ``convert`` to each value, memoizing results for repeated values.
+
+    Memoization is switched off once a column turns out to be mostly distinct values
+    (such as timestamps with seconds), where lookups would only add overhead.
+    """
+    if errors not in ('raise', 'coerce'):
+        raise ValueError(f"Unsupported errors option: {errors}")
+    memo = {}
+    hits = 0
+    results = []
+    for index, value in enumerate(values):
+        if memo is not None:
+            try:
+                results.append(memo[value])
+                hits += 1
+                continue
+            except (KeyError, TypeError):
+                pass
+        try:
+            result = convert(value)
+        except (ValueError, TypeError) as e:
+            if errors == 'raise':
+                raise ValueError(f"Row {index}: {e}")
+            result = None
+        results.append(result)
+        if memo is not None:
+            if index == MEMO_PROBE and hits < MEMO_PROBE // 8:
+                memo = None
+            elif len(memo) < MEMO_SIZE and isinstance(value, str):
+                memo[value] = result
+    return results
+
+
+def parse_column(values, date_format=None, errors='raise', sample_size=100):
+    """
+    Parse a whole column of date strings into datetimes.
+
+    The format is compiled once (and inferred from the first ``sample_size`` values when not
+    given); repeated values are only parsed once.
+
+    Args:
+        values (iterable of str): The date strings (a list, numpy array or pandas Series).
+        date_format (str, optional): The strptime format of the values.
+        errors (str): 'raise' to raise on the first bad value, or 'coerce' to return None for it.
+        sample_size (int): Number of values used to infer the format.
+
+    Returns:
+        list: One datetime (or None) per value.
+
+    Raises:
+        ValueError: If no format can be inferred, or a value does not parse and errors is 'raise'.
+    """
+    values = values.tolist() if hasattr(values, 'tolist') else list(values)
+    if date_format is None:
+        date_format = infer_format(values[:sample_size])
+        if date_format is None:
+            raise ValueError("Could not infer the date format from the sample.")
+        logger.info(f"Inferred date format {date_format!r}.")
+    return _convert(values, errors, compile_parser(date_format))
+
+
+def convert_column(values, source_format=None, target_format='%Y-%m-%d %H:%M:%S', errors='raise', sample_size=100):
+    """
+    Reformat a whole column of date strings from one format to another.
+
+    Args:
+        values (iterable of str): The date strings (a list, numpy array or pandas Series).
+        source_format (str, optional): The strptime format of the values; inferred when not given.
+        target_format (str): The strftime format of the results.
+        errors (str): 'raise' to raise on the first bad value, or 'coerce' to return None for it.
+        sample_size (int): Number of values used to infer the source format.
+
+    Returns:
+        list: One formatted string (or None) per value.
+
+    Raises:
+        ValueError: If no format can be inferred, or a value does not parse and errors is 'raise'.
+    """
+    values = values.tolist() if hasattr(values, 'tolist') else list(values)
+    if source_format is None:
+        source_format = infer_format(values[:sample_size])
+        if source_format is None:
+            raise ValueError("Could not infer the date format from the sample.")
+        logger.info(f"Inferred date format {source_format!r}.")
+    return _convert(values, errors, compile_converter(source_format, target_format))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    # Example usage
+    print(compile_parser('%d/%m/%Y %I:%M %p')('27/09/2024 01:30 PM'))
+    print(infer_format(['27/09/2024', '13/10/2024']))
+    print(convert_column(['2024-09-27 12:00:00', '2024-09-28 08:15:00'], target_format='%d/%m/%Y'))
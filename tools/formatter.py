@@ -1,10 +1,15 @@
+import io
 import json
+import itertools
 import xml.etree.ElementTree as ET
-from datetime import datetime
 import logging
 
-# Initialize logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+from tools.json_stream import iter_json_records, JSONStreamError
+from tools.xml_stream import format_xml_stream, write_element
+from tools.datetime_engine import compile_parser, compile_formatter, convert_column
+from tools.metrics import metrics
+
+logger = logging.getLogger(__name__)
 
 class FormatterError(Exception):
     """Custom exception for formatter errors."""
@@ -62,18 +67,76 @@ class Formatter:
         """
         try:
             if isinstance(data, str):
-                data = json.loads(data)
-            return json.dumps(data, indent=indent, ensure_ascii=False)
+                with metrics.timer('formatter_parse_seconds'):
+                    data = json.loads(data)
+            with metrics.timer('formatter_serialize_seconds'):
+                return json.dumps(data, indent=indent, ensure_ascii=False)
         except json.JSONDecodeError as e:
             raise FormatterError(f"Invalid JSON data: {e}")
 
+    @staticmethod
+    def format_json_stream(source, destination, fmt='auto', indent=4, output_format='array'):
+        """
+        Reformat a JSON array or JSON Lines file record by record, with constant memory.
+        
+        Array output is identical to format_json applied to the whole document, so a JSON
+        Lines file can also be converted to an array; JSON Lines output has one compact
+        record per line.
+        
+        Args:
+            source (str or binary file): Path or binary stream to read from.
+            destination (str or text file): Path or text stream to write to.
+            fmt (str): Input format: 'array', 'jsonl' or 'auto' (detected from the first character).
+            indent (int): Indentation level for array output.
+            output_format (str): Output format: 'array' or 'jsonl'.
+        
+        Returns:
+            int: The number of records written.
+        
+        Raises:
+            FormatterError: If the input is malformed or cannot be read or written.
+        """
+        if output_format not in ('array', 'jsonl'):
+            raise FormatterError(f"Unsupported JSON output format: {output_format}")
+        records = iter_json_records(source, fmt=fmt)
+        should_close = not isinstance(destination, io.TextIOBase)
+        count = 0
+        try:
+            first = next(records, None)
+            handle = open(destination, 'w', encoding='utf-8') if should_close else destination
+            try:
+                if output_format == 'jsonl':
+                    if first is not None:
+                        for count, (_, _, record) in enumerate(itertools.chain([first], records), 1):
+                            handle.write(json.dumps(record, ensure_ascii=False) + '\n')
+                elif first is None:
+                    handle.write('[]')
+                else:
+                    # Mirror json.dumps: nested records are shifted right by one indent level
+                    newline = '' if indent is None else '\n' + (' ' * indent if isinstance(indent, int) else indent)
+                    separator = '[' + newline
+                    for count, (_, _, record) in enumerate(itertools.chain([first], records), 1):
+                        text = json.dumps(record, indent=indent, ensure_ascii=False)
+                        handle.write(separator + text.replace('\n', newline))
+                        separator = ',' + (newline or ' ')
+                    handle.write(newline[:1] + ']')
+            finally:
+                if should_close:
+                    handle.close()
+        except (OSError, JSONStreamError) as e:
+            raise FormatterError(f"Cannot reformat JSON stream: {e}")
+        logger.info(f"Reformatted {count} JSON records as {output_format}.")
+        return count
+
     @staticmethod
     def format_xml(xml_data, indent="  "):
         """
-        Pretty format an XML string.
+        Pretty format an XML string or element tree.
+        
+        The document is serialized in a single pass; an element tree passed in is not modified.
         
         Args:
-            xml_data (str): The XML data as a string.
+            xml_data (str or ET.Element): The XML data as a string, or a parsed element.
             indent (str): The indentation character(s) to use.
         
         Returns:
@@ -82,11 +145,47 @@ class Formatter:
         Raises:
             FormatterError: If the input data is not valid XML.
         """
+        parts = []
+        try:
+            with metrics.timer('formatter_xml_seconds'):
+                if isinstance(xml_data, ET.Element):
+                    write_element(xml_data, parts.append, indent)
+                else:
+                    format_xml_stream(io.StringIO(xml_data), parts.append, indent)
+        except ET.ParseError as e:
+            raise FormatterError(f"Invalid XML data: {e}")
+        return ''.join(parts)
+
+    @staticmethod
+    def format_xml_stream(source, destination, indent="  "):
+        """
+        Pretty format an XML file of any size with memory bounded by its depth.
+        
+        Args:
+            source (str or file): Path, or a binary or text file object, to read from.
+            destination (str or text file): Path or text stream to write to.
+            indent (str): The indentation character(s) to use.
+        
+        Returns:
+            int: The number of elements written.
+        
+        Raises:
+            FormatterError: If the input is not valid XML or cannot be read or written.
+        """
+        should_close = not isinstance(destination, io.TextIOBase)
         try:
-            root = ET.fromstring(xml_data)
-            return Formatter._prettify_xml(root, indent)
+            handle = open(destination, 'w', encoding='utf-8') if should_close else destination
+            try:
+                count = format_xml_stream(source, handle.write, indent)
+            finally:
+                if should_close:
+                    handle.close()
         except ET.ParseError as e:
             raise FormatterError(f"Invalid XML data: {e}")
+        except OSError as e:
+            raise FormatterError(f"Cannot format XML stream: {e}")
+        logger.info(f"Formatted {count} XML elements.")
+        return count
 
     @staticmethod
     def format_datetime(date_str, current_format, target_format="%Y-%m-%d %H:%M:%S"):
@@ -105,38 +204,35 @@ class Formatter:
             FormatterError: If the date conversion fails.
         """
         try:
-            date_obj = datetime.strptime(date_str, current_format)
-            return date_obj.strftime(target_format)
+            date_obj = compile_parser(current_format)(date_str)
+            return compile_formatter(target_format)(date_obj)
         except ValueError as e:
             raise FormatterError(f"Date formatting error: {e}")
 
     @staticmethod
-    def _prettify_xml(elem, indent, level=0):
+    def format_datetimes(values, current_format=None, target_format="%Y-%m-%d %H:%M:%S", errors="raise"):
         """
-        Private helper function to recursively format XML elements with indentation.
+        Convert a whole column of date strings from one format to another.
+        
+        Both formats are compiled once, the current format is inferred from a sample of the
+        values when not given, and repeated values are converted only once.
         
         Args:
-            elem (ET.Element): The XML element to format.
-            indent (str): The indentation string.
-            level (int): The current indentation level.
+            values (list, numpy.ndarray or pandas.Series): Date strings to format.
+            current_format (str, optional): The current format of the date strings.
+            target_format (str): The target format for the date strings.
+            errors (str): 'raise' to fail on the first bad value, or 'coerce' to return None for it.
         
         Returns:
-            str: The pretty-formatted XML.
-        """
-        i = "\n" + level * indent
-        if len(elem):
-            if not elem.text or not elem.text.strip():
-                elem.text = i + indent
-            if not elem.tail or not elem.tail.strip():
-                elem.tail = i
-            for child in elem:
-                Formatter._prettify_xml(child, indent, level + 1)
-            if not elem.tail or not elem.tail.strip():
-                elem.tail = i
-        else:
-            if level and (not elem.tail or not elem.tail.strip()):
-                elem.tail = i
-        return ET.tostring(elem, encoding='unicode')
+            list: The formatted date strings.
+        
+        Raises:
+            FormatterError: If the format cannot be inferred or a conversion fails.
+        """
+        try:
+            return convert_column(values, current_format, target_format, errors=errors)
+        except ValueError as e:
+            raise FormatterError(f"Date formatting error: {e}")
 
     @staticmethod
     def format_code_style(code_str, style="pep8"):
@@ -157,7 +253,8 @@ class Formatter:
             # Importing autopep8 locally to avoid unnecessary overhead if not used
             try:
                 import autopep8
-                return autopep8.fix_code(code_str)
+                with metrics.timer('formatter_code_style_seconds'):
+                    return autopep8.fix_code(code_str)
             except ImportError:
                 raise FormatterError("autopep8 is not installed. Install it to use PEP8 formatting.")
         else:
@@ -165,6 +262,7 @@ class Formatter:
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     # Example usage
     try:
         print(Formatter.format_string("hello world", "upper"))
@@ -172,4 +270,4 @@ if __name__ == "__main__":
         print(Formatter.format_xml('<root><child name="test"/></root>', indent="  "))
         print(Formatter.format_datetime("2024-09-27", "%Y-%m-%d", "%d/%m/%Y"))
     except FormatterError as e:
-        logging.error(f"Formatting error: {e}")
+        logger.error(f"Formatting error: {e}")
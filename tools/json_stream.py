@@ -0,0 +1,237 @@
+import io
+import os
+import json
+import codecs
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Number of bytes read from the source at a time
+CHUNK_SIZE = 1 << 16
+
+# JSON whitespace, plus a UTF-8 byte order mark at the start of a file
+_WHITESPACE = ' \t\n\r\ufeff'
+
+# Characters that can continue a number, e.g. the '.5' of a '12.5' cut after '12'
+_NUMBER_CHARS = '0123456789.eE+-'
+
+
+class JSONStreamError(ValueError):
+    """
+    A malformed record in a JSON array or JSON Lines stream.
+
+    Attributes:
+        index (int): Index of the record within the stream.
+        offset (int): Byte offset where the record starts.
+    """
+
+    def __init__(self, message, index, offset):
+        super().__init__(message)
+        self.index = index
+        self.offset = offset
+
+
+class _Reader:
+    """
+    Incrementally decodes a binary stream into a text buffer while tracking byte offsets.
+
+    Consumed text is dropped whenever more data is read, so memory stays bounded by the
+    chunk size plus the largest single record.
+    """
+
+    def __init__(self, stream, chunk_size):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        # Byte offset of buffer[mark] and the mark itself
+        self.mark = 0
+        self.mark_offset = 0
+
+    def fill(self, size=None):
+        """
+        Read more data into the buffer. Returns False once the stream is exhausted.
+        """
+        if self.eof:
+            return False
+        self.offset_at(self.pos)
+        self.buffer = self.buffer[self.mark:]
+        self.pos -= self.mark
+        self.mark = 0
+        data = self.stream.read(size or self.chunk_size)
+        self.eof = not data
+        self.buffer += self.decoder.decode(data, final=self.eof)
+        return True
+
+    def offset_at(self, pos):
+        """
+        Return the byte offset of buffer position ``pos`` (which must not precede the last one asked for).
+        """
+        if pos != self.mark:
+            self.mark_offset += len(self.buffer[self.mark:pos].encode('utf-8'))
+            self.mark = pos
+        return self.mark_offset
+
+    def skip_whitespace(self):
+        """
+        Advance past whitespace, reading more data as needed. Returns the next character or '' at EOF.
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+
+def _open_binary(source):
+    """
+    Return (stream, should_close) for a path or binary stream.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        return open(source, 'rb'), True
+    if isinstance(source, io.TextIOBase):
+        raise TypeError("JSON streams must be opened in binary mode.")
+    return source, False
+
+
+def _maybe_truncated(error, length):
+    """
+    Whether a decode error may only mean the value continues past the end of the buffer.
+    """
+    return error.pos >= length - 6 or error.msg.startswith('Unterminated string')
+
+
+def _value_may_continue(buffer, end):
+    """
+    Whether a value decoded up to ``end`` may continue past the end of the buffer.
+
+    Strings, arrays and objects end with a closing character and fail to decode while
+    incomplete, but a number is complete as soon as it stops: '12' decodes from a buffer
+    ending in '12.', and from one ending in '12' whose '.5' is still unread.
+    """
+    return not buffer[end:].lstrip(_NUMBER_CHARS)
+
+
+def _iter_array(reader, decoder, on_error):
+    """
+    Yield (index, offset, record) for each element of a top-level JSON array.
+    """
+    index = 0
+    reader.pos += 1  # opening bracket
+    expect_value = True
+    while True:
+        char = reader.skip_whitespace()
+        if char == ']' and (index == 0 or not expect_value):
+            return
+        if not expect_value:
+            if char != ',':
+                error = JSONStreamError(f"Expected ',' or ']' after record {index - 1}", index, reader.offset_at(reader.pos))
+                if on_error == 'raise':
+                    raise error
+                yield index, error.offset, error
+                return
+            reader.pos += 1
+            reader.skip_whitespace()
+            expect_value = True
+            continue
+
+        offset = reader.offset_at(reader.pos)
+        read_size = reader.chunk_size
+        while True:
+            try:
+                record, end = decoder.raw_decode(reader.buffer, reader.pos)
+                # A value that runs to the end of the buffer may continue in the next chunk
+                if reader.eof or not _value_may_continue(reader.buffer, end):
+                    break
+            except json.JSONDecodeError as e:
+                if reader.eof or not _maybe_truncated(e, len(reader.buffer)):
+                    error = JSONStreamError(f"Invalid JSON in record {index}: {e.msg}", index, offset)
+                    if on_error == 'raise':
+                        raise error
+                    yield index, offset, error
+                    return
+            # Grow reads geometrically so very large records are not re-parsed too often
+            reader.fill(read_size)
+            read_size *= 2
+
+        reader.pos = end
+        yield index, offset, record
+        index += 1
+        expect_value = False
+
+
+def _iter_lines(reader, decoder, on_error):
+    """
+    Yield (index, offset, record) for each non-blank line of a JSON Lines stream.
+    """
+    index = 0
+    while True:
+        newline = reader.buffer.find('\n', reader.pos)
+        if newline < 0:
+            if reader.fill():
+                continue
+            newline = len(reader.buffer)
+            if reader.pos >= newline:
+                return
+
+        line = reader.buffer[reader.pos:newline]
+        if line.strip():
+            offset = reader.offset_at(reader.pos)
+            try:
+                yield index, offset, decoder.decode(line)
+            except json.JSONDecodeError as e:
+                error = JSONStreamError(f"Invalid JSON in record {index}: {e.msg}", index, offset)
+                if on_error == 'raise':
+                    raise error
+                yield index, offset, error
+            index += 1
+        reader.pos = newline + 1
+
+
+def iter_json_records(source, fmt='auto', on_error='raise', chunk_size=CHUNK_SIZE):
+    """
+    Stream records from a JSON array or JSON Lines source with constant memory.
+
+    Args:
+        source (str or binary file): Path or binary stream to read from.
+        fmt (str): 'array', 'jsonl' or 'auto' (an array if the document starts with '[').
+        on_error (str): 'raise' to raise JSONStreamError on malformed input, or 'yield'
+            to yield the JSONStreamError in place of the record. A malformed array element
+            ends the stream, since there is no reliable way to find the next element.
+        chunk_size (int): Number of bytes read at a time.
+
+    Yields:
+        tuple: (index, byte_offset, record) for each record.
+
+    Raises:
+        JSONStreamError: If the input is malformed and on_error is 'raise'.
+    """
+    if fmt not in ('auto', 'array', 'jsonl'):
+        raise ValueError(f"Unsupported JSON stream format: {fmt}")
+    stream, should_close = _open_binary(source)
+    try:
+        reader = _Reader(stream, chunk_size)
+        decoder = json.JSONDecoder()
+        first = reader.skip_whitespace()
+        if fmt == 'auto':
+            fmt = 'array' if first == '[' else 'jsonl'
+        if fmt == 'array':
+            if first != '[':
+                raise JSONStreamError("Expected a JSON array", 0, reader.offset_at(reader.pos))
+            yield from _iter_array(reader, decoder, on_error)
+        else:
+            yield from _iter_lines(reader, decoder, on_error)
+    finally:
+        if should_close:
+            stream.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    # Example usage
+    for index, offset, record in iter_json_records(io.BytesIO(b'[{"id": 1}, {"id": 2}]')):
+        print(index, offset, record)
@@ -0,0 +1,152 @@
+import logging
+
+from tools.validator import Validator, ValidatorError
+from tools.datetime_engine import compile_parser
+
+logger = logging.getLogger(__name__)
+
+# Keys accepted in a field definition
+FIELD_OPTIONS = ('type', 'pattern', 'min_length', 'max_length', 'datetime_format', 'nullable', 'required')
+
+# Placeholder for a field missing from a record
+_MISSING = object()
+
+
+class RecordSchema:
+    """
+    A declarative record schema compiled into one generated validation function.
+
+    Each field is described by a dict with any of:
+        type (type or tuple): Expected type, checked like Validator.validate_type.
+        pattern (str): Regex or 'named:' pattern name, checked like Validator.validate_string.
+        min_length / max_length (int): String length bounds, checked like Validator.validate_string.
+        datetime_format (str): Expected date format, checked like Validator.validate_datetime.
+        nullable (bool): Accept None without further checks (default False).
+        required (bool): Report a missing field (default True).
+
+    The checks of every field are unrolled into straight-line Python source, compiled once,
+    so validating a record costs no per-field dispatch and no exceptions (other than inside
+    date parsing). Error messages are the ones the per-call Validator methods raise, and each
+    field reports only its first failing check, as chained per-call validation would.
+    """
+
+    def __init__(self, fields):
+        """
+        Compile a schema.
+
+        Args:
+            fields (dict): Field name -> field definition.
+
+        Raises:
+            ValidatorError: If a field definition is invalid.
+        """
+        self.fields = {name: dict(spec) for name, spec in fields.items()}
+        self._namespace = {'_MISSING': _MISSING}
+        single, many = [], []
+        for position, (name, spec) in enumerate(self.fields.items()):
+            single.extend(self._field_source(position, name, spec, ''))
+            many.extend(self._field_source(position, name, spec, 'index, '))
+
+        self.source = '\n'.join(
+            ["def validate(record):", "    errors = []", "    append = errors.append", "    get = record.get"]
+            + [f"    {line}" for line in single]
+            + ["    return errors", "",
+               "def validate_many(records):", "    errors = []", "    append = errors.append",
+               "    for index, record in enumerate(records):", "        get = record.get"]
+            + [f"        {line}" for line in many]
+            + ["    return errors"]
+        )
+        exec(compile(self.source, '<record schema>', 'exec'), self._namespace)
+        self._validate = self._namespace['validate']
+        self._validate_many = self._namespace['validate_many']
+
+    def validate(self, record):
+        """
+        Validate one record.
+
+        Args:
+            record (dict): The record.
+
+        Returns:
+            list: (field, message) for each invalid field; empty if the record is valid.
+        """
+        return self._validate(record)
+
+    def validate_many(self, records):
+        """
+        Validate many records in one call.
+
+        Args:
+            records (iterable of dict): The records (e.g. rows from csv.DictReader).
+
+        Returns:
+            list: (index, field, message) for each invalid field; empty if all records are valid.
+        """
+        return self._validate_many(records)
+
+    def _field_source(self, position, name, spec, prefix):
+        """
+        Private helper that generates the checks of one field as lines of Python source.
+
+        Each error is appended as ``(prefix..., field, message)``.
+        """
+        unknown = set(spec) - set(FIELD_OPTIONS)
+        if unknown:
+            raise ValidatorError(f"Unknown options for field '{name}': {', '.join(sorted(unknown))}")
+        field = repr(name)
+
+        def error(message):
+            return f"append(({prefix}{field}, {message}))"
+
+        # Each check is (condition, error message expression); the first one that holds is reported
+        checks = []
+        if 'type' in spec:
+            self._namespace[f'_type_{position}'] = spec['type']
+            checks.append((
+                f"not isinstance(value, _type_{position})",
+                f"f\"Expected type {{_type_{position}}}, but got {{type(value)}}.\"",
+            ))
+        pattern, min_length, max_length = spec.get('pattern'), spec.get('min_length'), spec.get('max_length')
+        if pattern or min_length is not None or max_length is not None:
+            if spec.get('type') is not str:
+                checks.append(("not isinstance(value, str)", repr("Input value must be a string.")))
+            if min_length is not None:
+                checks.append((f"len(value) < {int(min_length)}", repr(f"String is shorter than minimum length {min_length}.")))
+            if max_length is not None:
+                checks.append((f"len(value) > {int(max_length)}", repr(f"String is longer than maximum length {max_length}.")))
+            if pattern:
+                self._namespace[f'_match_{position}'] = Validator._compiled_pattern(pattern).match
+                checks.append((
+                    f"_match_{position}(value) is None",
+                    repr(f"String does not match the required pattern: {pattern}"),
+                ))
+
+        lines = [f"value = get({field}, _MISSING)", "if value is _MISSING:"]
+        lines.append(f"    {error(repr('Missing required field.'))}" if spec.get('required', True) else "    pass")
+        if spec.get('nullable', False):
+            lines += ["elif value is None:", "    pass"]
+        for condition, message in checks:
+            lines += [f"elif {condition}:", f"    {error(message)}"]
+        if spec.get('datetime_format'):
+            self._namespace[f'_parse_{position}'] = compile_parser(spec['datetime_format'])
+            message = 'f"Date format validation failed: {e}"'
+            lines += [
+                "else:",
+                "    try:",
+                f"        _parse_{position}(value)",
+                "    except (ValueError, TypeError) as e:",
+                f"        {error(message)}",
+            ]
+        return lines
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    # Example usage
+    schema = RecordSchema({
+        'email': {'type': str, 'pattern': 'named:email'},
+        'name': {'type': str, 'min_length': 1, 'max_length': 64},
+        'signup_date': {'datetime_format': '%Y-%m-%d', 'nullable': True},
+    })
+    print(schema.validate({'email': 'user@example.com', 'name': 'Ada', 'signup_date': '2024-09-27'}))
+    print(schema.validate_many([{'email': 'bad', 'name': '', 'signup_date': '27/09/2024'}, {'name': 'Bob'}]))
@@ -0,0 +1,364 @@
+import argparse
+import os
+import json
+import time
+import fnmatch
+import difflib
+import hashlib
+import logging
+import shutil
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from tools.formatter import Formatter, FormatterError
+
+# The autopep8 version is part of the cache key, so upgrading it reformats everything once
+try:
+    import autopep8
+except ImportError:
+    autopep8 = None
+
+logger = logging.getLogger(__name__)
+
+# Cache file written at the root of the formatted tree
+CACHE_FILENAME = '.format_cache.json'
+
+# Directory names never descended into
+EXCLUDED_DIRECTORIES = ('.git', '.hg', '.svn', '__pycache__', '.tox', '.nox', '.venv', 'venv', 'node_modules', 'build', 'dist')
+
+# Files sent to a worker process at a time
+CHUNK_SIZE = 16
+
+# Below this many files to format, the pool start-up costs more than it saves
+MIN_FILES_FOR_POOL = 8
+
+
+def _digest(data):
+    """
+    Return the hex SHA-256 of ``data`` (bytes).
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write_atomically(path, data):
+    """
+    Replace the file at ``path`` with ``data`` (bytes) in one step, keeping its permissions.
+
+    The new content is written to a temporary file in the same directory and renamed over
+    the original, so readers never observe a partially written file.
+    """
+    directory, name = os.path.split(path)
+    handle, temporary = tempfile.mkstemp(prefix=f".{name}.", suffix='.tmp', dir=directory or '.')
+    try:
+        with os.fdopen(handle, 'wb') as stream:
+            stream.write(data)
+        if os.path.exists(path):
+            shutil.copymode(path, temporary)
+        else:
+            # mkstemp creates the file private to the user
+            os.chmod(temporary, 0o644)
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def _format_file(path, style, check, diff):
+    """
+    Format one file, writing it back unless ``check``.
+
+    Returns:
+        dict: path, status ('unchanged', 'reformatted' or 'error'), digest of the formatted
+        content, lines added and removed, and the unified diff if ``diff`` was requested.
+    """
+    try:
+        with open(path, 'rb') as stream:
+            original = stream.read()
+        source = original.decode('utf-8')
+        # autopep8 works on universal newlines; keep the file's own line ending
+        newline = '\r\n' if '\r\n' in source else '\n'
+        formatted = Formatter.format_code_style(source.replace('\r\n', '\n'), style)
+        result = formatted.replace('\n', newline).encode('utf-8') if newline != '\n' else formatted.encode('utf-8')
+    except (OSError, UnicodeDecodeError, FormatterError, SyntaxError, ValueError) as e:
+        return {'path': path, 'status': 'error', 'message': str(e)}
+
+    report = {'path': path, 'status': 'unchanged', 'source_digest': _digest(original), 'digest': _digest(result),
+              'added': 0, 'removed': 0}
+    if result == original:
+        return report
+    report['status'] = 'reformatted'
+    lines = difflib.unified_diff(source.splitlines(True), result.decode('utf-8').splitlines(True), path, path)
+    if diff:
+        lines = list(lines)
+        report['diff'] = ''.join(lines)
+    for line in lines:
+        if line[:1] == '+' and line[:3] != '+++':
+            report['added'] += 1
+        elif line[:1] == '-' and line[:3] != '---':
+            report['removed'] += 1
+    if not check:
+        try:
+            _write_atomically(path, result)
+        except OSError as e:
+            return {'path': path, 'status': 'error', 'message': str(e)}
+    return report
+
+
+def _format_chunk(paths, style, check, diff):
+    """
+    Format a chunk of files in a worker process.
+    """
+    return [_format_file(path, style, check, diff) for path in paths]
+
+
+class RepoFormatter:
+    """
+    Format every Python file under a directory with Formatter.format_code_style.
+
+    Three things keep repeated runs over large trees fast:
+        - A cache (CACHE_FILENAME at the root) records the hash of every file's formatted
+          output. A file whose size and mtime are unchanged since it was recorded is skipped
+          without being read; otherwise it is read and hashed, and skipped if the hash is
+          one the formatter already produced. The cache is tied to the style and the
+          autopep8 version.
+          In check mode, the line counts of files that would change are cached by their
+          content hash as well, so checking a tree with unformatted files again is also fast.
+        - The remaining files are formatted in a process pool, a chunk of files per task.
+        - Results are written atomically (temporary file + rename).
+    """
+
+    def __init__(self, root, style="pep8", cache_path=None, use_cache=True, exclude=(), workers=None):
+        """
+        Initialize the repository formatter.
+
+        Args:
+            root (str): Directory to format.
+            style (str): Code style passed to Formatter.format_code_style.
+            cache_path (str): Cache file location. Defaults to CACHE_FILENAME under ``root``.
+            use_cache (bool): Whether to read and update the cache.
+            exclude (iterable): Extra glob patterns (matched against paths relative to ``root``
+                and against file and directory names) to skip.
+            workers (int): Worker processes. Defaults to the CPU count.
+
+        Raises:
+            FormatterError: If ``root`` is not a directory.
+        """
+        if not os.path.isdir(root):
+            raise FormatterError(f"Not a directory: {root}")
+        self.root = os.path.abspath(root)
+        self.style = style
+        self.cache_path = cache_path or os.path.join(self.root, CACHE_FILENAME)
+        self.use_cache = use_cache
+        self.exclude = tuple(exclude)
+        self.workers = workers or os.cpu_count() or 1
+        self.fingerprint = f"{style}:autopep8-{getattr(autopep8, '__version__', 'missing')}"
+
+    def iter_files(self):
+        """
+        Yield the Python files under the root, in a stable order.
+
+        Returns:
+            generator: Absolute file paths.
+        """
+        for directory, subdirectories, files in os.walk(self.root):
+            subdirectories[:] = sorted(
+                name for name in subdirectories
+                if name not in EXCLUDED_DIRECTORIES and not self._excluded(os.path.join(directory, name))
+            )
+            for name in sorted(files):
+                path = os.path.join(directory, name)
+                if name.endswith('.py') and not self._excluded(path):
+                    yield path
+
+    def run(self, check=False, diff=False):
+        """
+        Format the tree, or only report what would change.
+
+        Args:
+            check (bool): Report files that would be reformatted without writing them.
+            diff (bool): Include each file's unified diff in the report.
+
+        Returns:
+            dict: Counts of files seen, skipped via the cache, unchanged and reformatted
+            (would be reformatted, with ``check``), lines added and removed, the changed
+            files (with their diffs if requested), errors and elapsed seconds.
+        """
+        start = time.perf_counter()
+        cache = self._load_cache()
+        entries = cache['files']
+        formatted = set(cache['formatted'])
+        changes = {}
+        pending = []
+        summary = {'files': 0, 'cached': 0, 'unchanged': 0, 'reformatted': 0, 'added': 0, 'removed': 0,
+                   'changed': [], 'errors': [], 'check': check}
+
+        for path in self.iter_files():
+            summary['files'] += 1
+            relative = os.path.relpath(path, self.root)
+            entry, digest = self._cached_entry(path, entries.get(relative), formatted)
+            if entry is not None:
+                entries[relative] = entry
+                summary['cached'] += 1
+            elif check and not diff and digest in cache['changes']:
+                added, removed = changes[digest] = cache['changes'][digest]
+                summary['cached'] += 1
+                summary['reformatted'] += 1
+                summary['added'] += added
+                summary['removed'] += removed
+                summary['changed'].append({'path': relative, 'added': added, 'removed': removed})
+            else:
+                pending.append(path)
+
+        for result in self._format(pending, check, diff):
+            relative = os.path.relpath(result['path'], self.root)
+            if result['status'] == 'error':
+                summary['errors'].append({'path': relative, 'message': result['message']})
+                entries.pop(relative, None)
+                continue
+            summary[result['status']] += 1
+            formatted.add(result['digest'])
+            if result['status'] == 'reformatted':
+                summary['added'] += result['added']
+                summary['removed'] += result['removed']
+                change = {'path': relative, 'added': result['added'], 'removed': result['removed']}
+                if diff:
+                    change['diff'] = result['diff']
+                summary['changed'].append(change)
+                if check:
+                    # The file on disk is not the formatted output; don't record its stat
+                    entries.pop(relative, None)
+                    changes[result['source_digest']] = [result['added'], result['removed']]
+                    continue
+            stat = os.stat(result['path'])
+            entries[relative] = [stat.st_mtime_ns, stat.st_size, result['digest']]
+
+        self._save_cache(entries, formatted, changes)
+        summary['elapsed'] = time.perf_counter() - start
+        verb = "would reformat" if check else "reformatted"
+        logger.info(
+            f"{summary['files']} files: {summary['cached']} cached, {summary['unchanged']} unchanged, "
+            f"{verb} {summary['reformatted']}, {len(summary['errors'])} errors in {summary['elapsed']:.2f}s."
+        )
+        return summary
+
+    def _excluded(self, path):
+        """
+        Private helper that checks a path against the exclude patterns.
+        """
+        relative = os.path.relpath(path, self.root)
+        name = os.path.basename(path)
+        return any(fnmatch.fnmatch(relative, pattern) or fnmatch.fnmatch(name, pattern) for pattern in self.exclude)
+
+    def _cached_entry(self, path, entry, formatted):
+        """
+        Private helper that returns a file's up-to-date cache entry if it is known to be
+        formatted already (or None), and the hash of its content if it had to be read.
+
+        The stat check avoids reading the file at all; the content hash catches files that
+        were touched or checked out again without changing.
+        """
+        if not self.use_cache:
+            return None, None
+        try:
+            stat = os.stat(path)
+            if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size and entry[2] in formatted:
+                return entry, entry[2]
+            with open(path, 'rb') as stream:
+                digest = _digest(stream.read())
+        except OSError:
+            return None, None
+        return ([stat.st_mtime_ns, stat.st_size, digest] if digest in formatted else None), digest
+
+    def _format(self, paths, check, diff):
+        """
+        Private helper that formats files, in a process pool when there are enough of them.
+
+        At most two chunks per worker are in flight, so results stream back as they complete.
+        """
+        if self.workers == 1 or len(paths) < MIN_FILES_FOR_POOL:
+            for path in paths:
+                yield _format_file(path, self.style, check, diff)
+            return
+        chunks = (paths[start:start + CHUNK_SIZE] for start in range(0, len(paths), CHUNK_SIZE))
+        with ProcessPoolExecutor(max_workers=min(self.workers, -(-len(paths) // CHUNK_SIZE))) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(_format_chunk, chunk, self.style, check, diff))
+                if len(pending) >= 2 * self.workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    def _load_cache(self):
+        """
+        Private helper that reads the cache, discarding it if it is unreadable or was made
+        with another style or autopep8 version.
+        """
+        empty = {'fingerprint': self.fingerprint, 'files': {}, 'formatted': [], 'changes': {}}
+        if not self.use_cache:
+            return empty
+        try:
+            with open(self.cache_path, encoding='utf-8') as stream:
+                cache = json.load(stream)
+        except (OSError, ValueError):
+            return empty
+        if not isinstance(cache, dict) or cache.get('fingerprint') != self.fingerprint:
+            return empty
+        return {'fingerprint': self.fingerprint, 'files': dict(cache.get('files', {})),
+                'formatted': list(cache.get('formatted', [])), 'changes': dict(cache.get('changes', {}))}
+
+    def _save_cache(self, entries, formatted, changes):
+        """
+        Private helper that writes the cache atomically, keeping only hashes still in use.
+        """
+        if not self.use_cache:
+            return
+        in_use = {entry[2] for entry in entries.values()}
+        cache = {'fingerprint': self.fingerprint, 'files': entries, 'formatted': sorted(formatted & in_use),
+                 'changes': changes}
+        try:
+            _write_atomically(self.cache_path, json.dumps(cache, separators=(',', ':')).encode('utf-8'))
+        except OSError as e:
+            logger.warning(f"Could not write the format cache {self.cache_path}: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Format every Python file in a tree with autopep8, in parallel and cached.")
+    parser.add_argument("root", nargs="?", default=".", help="Directory to format.")
+    parser.add_argument("--check", action="store_true", help="Only report files that would change; exit 1 if any would.")
+    parser.add_argument("--diff", action="store_true", help="Print the unified diff of each changed file.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--cache", default=None, help=f"Cache file (default: <root>/{CACHE_FILENAME}).")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not update the cache.")
+    parser.add_argument("--exclude", action="append", default=[], help="Glob pattern to skip; repeatable.")
+    args = parser.parse_args()
+
+    try:
+        formatter = RepoFormatter(args.root, cache_path=args.cache, use_cache=not args.no_cache,
+                                  exclude=args.exclude, workers=args.workers)
+        summary = formatter.run(check=args.check, diff=args.diff)
+    except FormatterError as e:
+        logger.error(f"Formatting error: {e}")
+        raise SystemExit(2)
+
+    for change in summary['changed']:
+        if args.diff:
+            print(change['diff'], end='')
+        prefix = "would reformat" if args.check else "reformatted"
+        print(f"{prefix} {change['path']} (+{change['added']} -{change['removed']})")
+    for error in summary['errors']:
+        print(f"error: {error['path']}: {error['message']}")
+    print(
+        f"{summary['files']} files, {summary['cached']} cached, {summary['unchanged']} unchanged, "
+        f"{summary['reformatted']} {'would be reformatted' if args.check else 'reformatted'}, "
+        f"{len(summary['errors'])} errors ({summary['elapsed']:.2f}s)"
+    )
+    if summary['errors'] or (args.check and summary['reformatted']):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
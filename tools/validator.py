@@ -1,23 +1,228 @@
+import os
 import re
+import sys
 import json
+import glob
+import hashlib
+import itertools
+import threading
 import xmlschema
-from datetime import datetime
+import xml.etree.ElementTree as ET
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 import logging
-from jsonschema import validate, ValidationError as JSONValidationError
+from tools.json_stream import iter_json_records, JSONStreamError
+from tools.datetime_engine import compile_parser, infer_format
+from tools.metrics import metrics
+from jsonschema import validators as json_validators, ValidationError as JSONValidationError, SchemaError as JSONSchemaError
 
-# Initialize logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# fastjsonschema generates Python code per schema; use it when installed
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of compiled JSON schemas kept in memory
+JSON_SCHEMA_CACHE_SIZE = 128
+
+# JSON Schema drafts supported by the fastjsonschema backend
+FASTJSONSCHEMA_DRAFTS = ('draft-04', 'draft-06', 'draft-07')
+
+# Maximum number of compiled XML schemas kept in memory
+XML_SCHEMA_CACHE_SIZE = 32
+
+# Compiled XML schema held by each bulk validation worker process
+_worker_xml_schema = None
+
+# Maximum number of compiled ad-hoc regex patterns kept in memory
+PATTERN_CACHE_SIZE = 256
+
+# Prefix that selects a named pattern instead of a regex, e.g. 'named:email'
+NAMED_PATTERN_PREFIX = 'named:'
+
+# Patterns available by name to validate_string and validate_strings (see Validator.register_pattern)
+NAMED_PATTERNS = {
+    'email': r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+\Z',
+    'uuid': r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\Z',
+    'semver': (
+        r'(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)'
+        r'(?:-((?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?'
+        r'(?:\+([0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?\Z'
+    ),
+    'ipv4': r'(?:(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)\.){3}(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)\Z',
+}
 
 class ValidatorError(Exception):
     """Custom exception for validation errors."""
     pass
 
+class _CompiledJSONSchema:
+    """
+    A JSON schema compiled once into a reusable validator.
+    
+    Uses a fastjsonschema generated function when available and the schema's ``$schema``
+    explicitly names a draft it supports (draft-04, -06 or -07), otherwise a jsonschema
+    validator instance for the schema's draft (the latest one when ``$schema`` is absent, as
+    jsonschema.validate does), whose schema has been checked once up front.
+    
+    The fastjsonschema function is compiled to accept exactly what jsonschema.validate accepts:
+    'format' is not enforced (jsonschema treats it as an annotation) and 'default' values are
+    not written into the validated instance.
+    """
+
+    def __init__(self, schema, backend='auto'):
+        """
+        Compile a schema.
+        
+        Args:
+            schema (dict): The JSON schema.
+            backend (str): 'auto', 'fastjsonschema' or 'jsonschema'.
+        
+        Raises:
+            ValidatorError: If the schema itself is invalid or the backend is unavailable.
+        """
+        # Without '$schema' jsonschema applies the latest draft, whose keywords (prefixItems,
+        # dependentRequired, ...) fastjsonschema would silently ignore
+        draft = str(schema.get('$schema', '')) if isinstance(schema, dict) else ''
+        if backend == 'auto':
+            use_fast = fastjsonschema is not None and any(name in draft for name in FASTJSONSCHEMA_DRAFTS)
+        elif backend == 'fastjsonschema':
+            if fastjsonschema is None:
+                raise ValidatorError("fastjsonschema is not installed. Install it to use the fastjsonschema backend.")
+            use_fast = True
+        elif backend == 'jsonschema':
+            use_fast = False
+        else:
+            raise ValidatorError(f"Unsupported JSON schema backend: {backend}")
+
+        try:
+            if use_fast:
+                self.backend = 'fastjsonschema'
+                self._validate = fastjsonschema.compile(schema, use_default=False, use_formats=False)
+            else:
+                self.backend = 'jsonschema'
+                validator_class = json_validators.validator_for(schema)
+                validator_class.check_schema(schema)
+                self._validator = validator_class(schema)
+        except (JSONSchemaError, getattr(fastjsonschema, 'JsonSchemaDefinitionException', JSONSchemaError)) as e:
+            raise ValidatorError(f"Invalid JSON schema: {e}")
+
+    def validate(self, instance):
+        """
+        Validate an instance, raising ValidatorError on the first failure.
+        """
+        if self.backend == 'fastjsonschema':
+            try:
+                self._validate(instance)
+            except fastjsonschema.JsonSchemaValueException as e:
+                raise ValidatorError(f"JSON schema validation failed: {e}")
+        else:
+            try:
+                self._validator.validate(instance)
+            except JSONValidationError as e:
+                raise ValidatorError(f"JSON schema validation failed: {e}")
+
+    def first_error(self, instance):
+        """
+        Return the first validation error of an instance without raising.
+        
+        Returns:
+            tuple: (path, message) where path is a '/'-separated location, or None if the instance is valid.
+        """
+        if self.backend == 'fastjsonschema':
+            try:
+                self._validate(instance)
+                return None
+            except fastjsonschema.JsonSchemaValueException as e:
+                return '/'.join(str(part) for part in e.path[1:]), e.message
+        error = next(self._validator.iter_errors(instance), None)
+        if error is None:
+            return None
+        return '/'.join(str(part) for part in error.absolute_path), error.message
+
+def _loaded_type(module_name, type_name):
+    """
+    Return a type from a module only if that module has already been imported.
+
+    A value can only be a numpy array or a pandas Series once its library is loaded, so
+    checking sys.modules keeps importing this module from paying for either library.
+    """
+    module = sys.modules.get(module_name)
+    return getattr(module, type_name, None) if module is not None else None
+
+def _string_failure(value, match, pattern, min_length, max_length):
+    """
+    Return why a value fails the string checks, or None if it passes.
+    """
+    if not isinstance(value, str):
+        return "Input value must be a string."
+    if min_length is not None and len(value) < min_length:
+        return f"String is shorter than minimum length {min_length}."
+    if max_length is not None and len(value) > max_length:
+        return f"String is longer than maximum length {max_length}."
+    if match is not None and not match(value):
+        return f"String does not match the required pattern: {pattern}"
+    return None
+
+def _xml_chunk_errors(compiled, start, items, from_files):
+    """
+    Validate a chunk of XML documents or files, returning (index, path, message) for each invalid one.
+    """
+    errors = []
+    for index, item in enumerate(items, start):
+        try:
+            root = ET.parse(item).getroot() if from_files else ET.fromstring(item)
+        except ET.ParseError as e:
+            errors.append((index, '', f"Invalid XML format: {e}"))
+            continue
+        except OSError as e:
+            errors.append((index, '', f"Cannot read XML file: {e}"))
+            continue
+        if compiled is not None:
+            error = next(compiled.iter_errors(root), None)
+            if error is not None:
+                errors.append((index, error.path or '', error.reason or error.message))
+    return errors
+
+
+def _init_xml_worker(schema):
+    """
+    Pool initializer: compile the XML schema once per worker process.
+    """
+    global _worker_xml_schema
+    _worker_xml_schema = Validator._compiled_xml_schema(schema) if schema else None
+
+
+def _validate_xml_chunk(start, items, from_files):
+    """
+    Validate one chunk of XML documents or files in a worker process.
+    """
+    return _xml_chunk_errors(_worker_xml_schema, start, items, from_files)
+
+
 class Validator:
     """
     A comprehensive validator class to handle multiple types of data validation,
     including strings, JSON, XML, and date/time formats.
     """
 
+    # Backend used to compile JSON schemas: 'auto', 'fastjsonschema' or 'jsonschema'
+    json_schema_backend = 'auto'
+
+    _json_schema_cache = OrderedDict()
+    _json_schema_cache_lock = threading.Lock()
+    _json_schema_cache_stats = {'hits': 0, 'misses': 0}
+
+    _xml_schema_cache = OrderedDict()
+    _xml_schema_cache_lock = threading.Lock()
+    _xml_schema_cache_stats = {'hits': 0, 'misses': 0}
+
+    _named_patterns = {name: re.compile(pattern) for name, pattern in NAMED_PATTERNS.items()}
+    _pattern_cache = OrderedDict()
+    _pattern_cache_lock = threading.Lock()
+
     @staticmethod
     def validate_string(value, pattern=None, min_length=None, max_length=None):
         """
@@ -25,7 +230,8 @@ class Validator:
         
         Args:
             value (str): The string to validate.
-            pattern (str): Optional regex pattern to match.
+            pattern (str or re.Pattern): Optional regex pattern to match, or a registered pattern
+                name with the 'named:' prefix, such as 'named:email', 'named:uuid' or 'named:semver'.
             min_length (int): Optional minimum length for the string.
             max_length (int): Optional maximum length for the string.
         
@@ -35,19 +241,139 @@ class Validator:
         Raises:
             ValidatorError: If the string is not valid.
         """
-        if not isinstance(value, str):
-            raise ValidatorError("Input value must be a string.")
+        match = Validator._compiled_pattern(pattern).match if pattern else None
+        failure = _string_failure(value, match, pattern, min_length, max_length)
+        if failure is not None:
+            raise ValidatorError(failure)
+        return True
+
+    @staticmethod
+    def validate_strings(values, pattern=None, min_length=None, max_length=None):
+        """
+        Validate a whole column of strings at once.
         
-        if min_length is not None and len(value) < min_length:
-            raise ValidatorError(f"String is shorter than minimum length {min_length}.")
+        Applies the same checks as validate_string to every value, but collects failures
+        instead of raising on the first one. The pattern is compiled once; a pandas Series
+        is checked with its vectorized string methods.
         
-        if max_length is not None and len(value) > max_length:
-            raise ValidatorError(f"String is longer than maximum length {max_length}.")
+        Args:
+            values (list, numpy.ndarray or pandas.Series): The values to validate.
+            pattern (str or re.Pattern): Optional regex pattern, or 'named:' and a registered pattern name.
+            min_length (int): Optional minimum length for the strings.
+            max_length (int): Optional maximum length for the strings.
         
-        if pattern and not re.match(pattern, value):
-            raise ValidatorError(f"String does not match the required pattern: {pattern}")
+        Returns:
+            tuple: (mask, failures). The mask is True for valid values and has the type of the
+            input (a boolean Series with the same index, a boolean ndarray, or a list);
+            failures lists (index, reason) for each invalid value, where index is the Series
+            label or the position.
+        """
+        compiled = Validator._compiled_pattern(pattern) if pattern else None
+        series_type = _loaded_type('pandas', 'Series')
+        if series_type is not None and isinstance(values, series_type):
+            return Validator._validate_string_series(values, compiled, pattern, min_length, max_length)
+
+        array_type = _loaded_type('numpy', 'ndarray')
+        is_array = array_type is not None and isinstance(values, array_type)
+        match = compiled.match if compiled is not None else None
+        mask = []
+        failures = []
+        for index, value in enumerate(values.tolist() if is_array else values):
+            failure = _string_failure(value, match, pattern, min_length, max_length)
+            mask.append(failure is None)
+            if failure is not None:
+                failures.append((index, failure))
+        return (sys.modules['numpy'].array(mask, dtype=bool) if is_array else mask), failures
+
+    @staticmethod
+    def register_pattern(name, pattern, flags=0):
+        """
+        Register a named pattern, compiling it once for all later validations.
         
-        return True
+        Args:
+            name (str): Name of the pattern, used as 'named:<name>', e.g. 'named:postcode'.
+            pattern (str): The regex pattern. Add '\\Z' to require a full match.
+            flags (int): Optional re flags.
+        
+        Raises:
+            ValidatorError: If the pattern is not a valid regex.
+        """
+        try:
+            Validator._named_patterns[name] = re.compile(pattern, flags)
+        except re.error as e:
+            raise ValidatorError(f"Invalid regex pattern '{name}': {e}")
+
+    @staticmethod
+    def _compiled_pattern(pattern):
+        """
+        Private helper that resolves a 'named:' pattern, or compiles a raw pattern through a bounded LRU cache.
+        
+        Args:
+            pattern (str or re.Pattern): 'named:' and a pattern name, regex source or compiled regex.
+        
+        Returns:
+            re.Pattern: The compiled pattern.
+        
+        Raises:
+            ValidatorError: If the pattern is not a valid regex or names no registered pattern.
+        """
+        if isinstance(pattern, re.Pattern):
+            return pattern
+        if pattern.startswith(NAMED_PATTERN_PREFIX):
+            name = pattern[len(NAMED_PATTERN_PREFIX):]
+            compiled = Validator._named_patterns.get(name)
+            if compiled is None:
+                raise ValidatorError(f"Unknown pattern name: {name}")
+            return compiled
+
+        cache = Validator._pattern_cache
+        with Validator._pattern_cache_lock:
+            compiled = cache.get(pattern)
+            if compiled is not None:
+                cache.move_to_end(pattern)
+                return compiled
+        try:
+            compiled = re.compile(pattern)
+        except re.error as e:
+            raise ValidatorError(f"Invalid regex pattern '{pattern}': {e}")
+        with Validator._pattern_cache_lock:
+            cache[pattern] = compiled
+            while len(cache) > PATTERN_CACHE_SIZE:
+                cache.popitem(last=False)
+        return compiled
+
+    @staticmethod
+    def _validate_string_series(values, compiled, pattern, min_length, max_length):
+        """
+        Private helper that runs validate_strings' checks on a pandas Series with vectorized string methods.
+        
+        Each value gets the reason of the first check it fails, in validate_string's order.
+        String-dtype columns keep their dtype, so Arrow-backed strings are checked in native code.
+        """
+        pd = sys.modules['pandas']
+        if isinstance(values.dtype, pd.StringDtype):
+            is_string = values.notna()
+            strings = values
+        else:
+            is_string = pd.Series([isinstance(value, str) for value in values.tolist()], index=values.index, dtype=bool)
+            strings = values.where(is_string)
+        checks = [(~is_string, "Input value must be a string.")]
+        if is_string.any():
+            if min_length is not None or max_length is not None:
+                lengths = strings.str.len()
+            if min_length is not None:
+                checks.append((is_string & (lengths < min_length), f"String is shorter than minimum length {min_length}."))
+            if max_length is not None:
+                checks.append((is_string & (lengths > max_length), f"String is longer than maximum length {max_length}."))
+            if compiled is not None:
+                matches = strings.str.match(compiled, na=False).astype(bool)
+                checks.append((is_string & ~matches, f"String does not match the required pattern: {pattern}"))
+
+        reasons = pd.Series(None, index=values.index, dtype=object)
+        for failed, reason in checks:
+            reasons = reasons.mask(failed & reasons.isna(), reason)
+        mask = reasons.isna()
+        return mask, list(reasons[~mask].items())
 
     @staticmethod
     def validate_json(data, schema=None):
@@ -66,46 +392,355 @@ class Validator:
         """
         try:
             if isinstance(data, str):
-                data = json.loads(data)
+                with metrics.timer('validator_parse_seconds'):
+                    data = json.loads(data)
             
             if schema:
-                validate(instance=data, schema=schema)
+                with metrics.timer('validator_validate_seconds'):
+                    Validator._compiled_json_schema(schema).validate(data)
             
             return True
         except json.JSONDecodeError as e:
             raise ValidatorError(f"Invalid JSON format: {e}")
-        except JSONValidationError as e:
-            raise ValidatorError(f"JSON schema validation failed: {e}")
+
+    @staticmethod
+    def validate_json_many(records, schema, max_errors=None):
+        """
+        Validate many JSON records against one schema, compiling the schema only once.
+        
+        Unlike validate_json, invalid records do not raise; every failure is collected instead.
+        
+        Args:
+            records (iterable): JSON records as dicts/lists or JSON strings.
+            schema (dict): JSON schema to validate against.
+            max_errors (int, optional): Stop after this many errors.
+        
+        Returns:
+            list: (index, path, message) tuples for invalid records; empty if all records are valid.
+        
+        Raises:
+            ValidatorError: If the schema itself is invalid.
+        """
+        compiled = Validator._compiled_json_schema(schema)
+        errors = []
+        with metrics.timer('validator_validate_many_seconds'):
+            for index, record in enumerate(records):
+                if isinstance(record, str):
+                    try:
+                        record = json.loads(record)
+                    except json.JSONDecodeError as e:
+                        errors.append((index, '', f"Invalid JSON format: {e}"))
+                        continue
+                error = compiled.first_error(record)
+                if error is not None:
+                    errors.append((index,) + error)
+                    if max_errors is not None and len(errors) >= max_errors:
+                        break
+        return errors
+
+    @staticmethod
+    def validate_json_stream(source, schema=None, fmt='auto', max_errors=100):
+        """
+        Validate every record of a JSON array or JSON Lines file with constant memory.
+        
+        Records are parsed incrementally and checked one at a time, so the file is never
+        loaded as a whole. Validation continues past failures; the report keeps the first
+        ``max_errors`` errors and counts the rest.
+        
+        Args:
+            source (str or binary file): Path or binary stream to read from.
+            schema (dict, optional): JSON schema each record must satisfy.
+            fmt (str): 'array', 'jsonl' or 'auto' (detected from the first character).
+            max_errors (int, optional): Number of errors to keep in the report (None keeps all).
+        
+        Returns:
+            dict: Record counts and a list of errors, each with the record index, byte
+            offset, error path and message.
+        
+        Raises:
+            ValidatorError: If the source cannot be read, is not a JSON array when fmt is
+            'array', or the schema itself is invalid.
+        """
+        compiled = Validator._compiled_json_schema(schema) if schema else None
+        report = {'records': 0, 'valid': 0, 'invalid': 0, 'errors': [], 'truncated': False}
+        try:
+            for index, offset, record in iter_json_records(source, fmt=fmt, on_error='yield'):
+                report['records'] += 1
+                if isinstance(record, JSONStreamError):
+                    error = ('', f"Invalid JSON format: {record}")
+                else:
+                    error = compiled.first_error(record) if compiled is not None else None
+                if error is None:
+                    report['valid'] += 1
+                    continue
+                report['invalid'] += 1
+                if max_errors is None or len(report['errors']) < max_errors:
+                    report['errors'].append({'index': index, 'offset': offset, 'path': error[0], 'message': error[1]})
+                else:
+                    report['truncated'] = True
+        except (OSError, JSONStreamError) as e:
+            raise ValidatorError(f"Cannot read JSON stream: {e}")
+        logger.info(f"Validated {report['records']} JSON records: {report['invalid']} invalid.")
+        return report
+
+    @staticmethod
+    def clear_json_schema_cache():
+        """
+        Drop all compiled JSON schemas and reset the cache statistics.
+        """
+        with Validator._json_schema_cache_lock:
+            Validator._json_schema_cache.clear()
+            Validator._json_schema_cache_stats.update(hits=0, misses=0)
+
+    @staticmethod
+    def json_schema_cache_info():
+        """
+        Report compiled JSON schema cache usage.
+        
+        Returns:
+            dict: Cache hits, misses, current size and maximum size.
+        """
+        with Validator._json_schema_cache_lock:
+            return dict(Validator._json_schema_cache_stats, size=len(Validator._json_schema_cache), max_size=JSON_SCHEMA_CACHE_SIZE)
+
+    @staticmethod
+    def _compiled_json_schema(schema):
+        """
+        Private helper that returns the compiled validator for a schema from a bounded LRU cache.
+        
+        Schemas are keyed by their '$id' when present, otherwise by a hash of their canonical JSON.
+        
+        Args:
+            schema (dict): The JSON schema.
+        
+        Returns:
+            _CompiledJSONSchema: The compiled schema.
+        """
+        schema_id = schema.get('$id') if isinstance(schema, dict) else None
+        if schema_id:
+            key = ('$id', schema_id)
+        else:
+            canonical = json.dumps(schema, sort_keys=True, separators=(',', ':'), default=str)
+            key = ('sha256', hashlib.sha256(canonical.encode('utf-8')).hexdigest())
+        key += (Validator.json_schema_backend,)
+
+        cache = Validator._json_schema_cache
+        with Validator._json_schema_cache_lock:
+            compiled = cache.get(key)
+            if compiled is not None:
+                cache.move_to_end(key)
+                Validator._json_schema_cache_stats['hits'] += 1
+                return compiled
+            Validator._json_schema_cache_stats['misses'] += 1
+
+        compiled = _CompiledJSONSchema(schema, Validator.json_schema_backend)
+        with Validator._json_schema_cache_lock:
+            cache[key] = compiled
+            cache.move_to_end(key)
+            while len(cache) > JSON_SCHEMA_CACHE_SIZE:
+                cache.popitem(last=False)
+        return compiled
 
     @staticmethod
     def validate_xml(xml_data, schema=None):
         """
         Validate XML data. Optionally validate against an XML schema.
         
+        Compiled schemas are cached, so validating many documents against the same XSD
+        file only reads and compiles it once (and again whenever the file changes).
+        
         Args:
             xml_data (str): XML data to validate.
-            schema (str, optional): Path to the XML schema (XSD file).
+            schema (str or xmlschema.XMLSchema, optional): Path to the XML schema (XSD file),
+                XSD source text, or an already compiled schema.
         
         Returns:
             bool: True if valid, otherwise raises ValidatorError.
         
         Raises:
-            ValidatorError: If the XML data is not valid.
+            ValidatorError: If the XML data is not valid or the schema cannot be compiled.
         """
+        compiled = Validator._compiled_xml_schema(schema) if schema else None
         try:
-            xmlschema_doc = None
-            if schema:
-                xmlschema_doc = xmlschema.XMLSchema(schema)
-                xmlschema_doc.validate(xml_data)
-            else:
-                ET.fromstring(xml_data)  # Simple well-formed check
-            
+            with metrics.timer('validator_parse_seconds'):
+                root = ET.fromstring(xml_data)  # Simple well-formed check
+            if compiled is not None:
+                with metrics.timer('validator_validate_seconds'):
+                    compiled.validate(root)
             return True
         except ET.ParseError as e:
             raise ValidatorError(f"Invalid XML format: {e}")
         except xmlschema.XMLSchemaValidationError as e:
             raise ValidatorError(f"XML schema validation failed: {e}")
 
+    @staticmethod
+    def validate_xml_many(documents, schema=None, workers=None, chunk_size=64, max_errors=None):
+        """
+        Validate many XML documents against one schema across a pool of worker processes.
+        
+        Each worker compiles the schema once and validates chunks of documents with it.
+        Unlike validate_xml, invalid documents do not raise; every failure is collected instead.
+        
+        Args:
+            documents (iterable of str): XML documents as strings.
+            schema (str or xmlschema.XMLSchema, optional): XSD path, XSD source text or compiled
+                schema; without one only well-formedness is checked.
+            workers (int, optional): Number of worker processes (defaults to the number of CPUs;
+                1 validates in this process).
+            chunk_size (int): Number of documents sent to a worker at a time.
+            max_errors (int, optional): Stop after this many errors.
+        
+        Returns:
+            list: (index, path, message) tuples for invalid documents, where path is the
+            location of the failing element; empty if all documents are valid.
+        
+        Raises:
+            ValidatorError: If the schema cannot be compiled.
+        """
+        errors = []
+        for chunk_errors in Validator._validate_xml_chunks(documents, schema, workers, chunk_size, from_files=False):
+            errors.extend(chunk_errors)
+            if max_errors is not None and len(errors) >= max_errors:
+                return errors[:max_errors]
+        return errors
+
+    @staticmethod
+    def validate_xml_directory(directory, schema=None, pattern='*.xml', recursive=True, workers=None, chunk_size=16):
+        """
+        Validate every XML file in a directory against one schema across a pool of worker processes.
+        
+        Workers read the files themselves, so document contents are never sent between processes.
+        
+        Args:
+            directory (str): Directory to scan.
+            schema (str or xmlschema.XMLSchema, optional): XSD path, XSD source text or compiled schema.
+            pattern (str): Glob pattern of the files to validate.
+            recursive (bool): Also scan subdirectories.
+            workers (int, optional): Number of worker processes (defaults to the number of CPUs).
+            chunk_size (int): Number of files sent to a worker at a time.
+        
+        Returns:
+            dict: File counts and a list of errors, each with the file, element path and message.
+        
+        Raises:
+            ValidatorError: If the directory does not exist or the schema cannot be compiled.
+        """
+        if not os.path.isdir(directory):
+            raise ValidatorError(f"Not a directory: {directory}")
+        files = sorted(glob.glob(os.path.join(directory, '**', pattern) if recursive else os.path.join(directory, pattern), recursive=recursive))
+        report = {'files': len(files), 'valid': len(files), 'invalid': 0, 'errors': []}
+        for chunk_errors in Validator._validate_xml_chunks(files, schema, workers, chunk_size, from_files=True):
+            for index, path, message in chunk_errors:
+                report['errors'].append({'file': files[index], 'path': path, 'message': message})
+            report['invalid'] += len(chunk_errors)
+        report['valid'] -= report['invalid']
+        logger.info(f"Validated {report['files']} XML files in {directory}: {report['invalid']} invalid.")
+        return report
+
+    @staticmethod
+    def clear_xml_schema_cache():
+        """
+        Drop all compiled XML schemas and reset the cache statistics.
+        """
+        with Validator._xml_schema_cache_lock:
+            Validator._xml_schema_cache.clear()
+            Validator._xml_schema_cache_stats.update(hits=0, misses=0)
+
+    @staticmethod
+    def xml_schema_cache_info():
+        """
+        Report compiled XML schema cache usage.
+        
+        Returns:
+            dict: Cache hits, misses, current size and maximum size.
+        """
+        with Validator._xml_schema_cache_lock:
+            return dict(Validator._xml_schema_cache_stats, size=len(Validator._xml_schema_cache), max_size=XML_SCHEMA_CACHE_SIZE)
+
+    @staticmethod
+    def _compiled_xml_schema(schema):
+        """
+        Private helper that returns a compiled XML schema from a bounded LRU cache.
+        
+        Schema files are keyed by their absolute path and recompiled when their modification
+        time or size changes (files they import or include are not tracked); XSD source text
+        is keyed by its hash.
+        
+        Args:
+            schema (str or xmlschema.XMLSchema): XSD path, XSD source text or compiled schema.
+        
+        Returns:
+            xmlschema.XMLSchema: The compiled schema.
+        
+        Raises:
+            ValidatorError: If the schema cannot be read or compiled.
+        """
+        if isinstance(schema, xmlschema.XMLSchemaBase):
+            return schema
+        if isinstance(schema, str) and schema.lstrip().startswith('<'):
+            key, stamp = ('sha256', hashlib.sha256(schema.encode('utf-8')).hexdigest()), None
+        else:
+            path = os.path.abspath(schema)
+            try:
+                stat = os.stat(path)
+            except OSError as e:
+                raise ValidatorError(f"Cannot read XML schema: {e}")
+            key, stamp = ('path', path), (stat.st_mtime_ns, stat.st_size)
+
+        cache = Validator._xml_schema_cache
+        with Validator._xml_schema_cache_lock:
+            entry = cache.get(key)
+            if entry is not None and entry[0] == stamp:
+                cache.move_to_end(key)
+                Validator._xml_schema_cache_stats['hits'] += 1
+                return entry[1]
+            Validator._xml_schema_cache_stats['misses'] += 1
+
+        try:
+            compiled = xmlschema.XMLSchema(schema)
+        except (OSError, xmlschema.XMLSchemaException, ET.ParseError) as e:
+            raise ValidatorError(f"Invalid XML schema: {e}")
+        with Validator._xml_schema_cache_lock:
+            cache[key] = (stamp, compiled)
+            cache.move_to_end(key)
+            while len(cache) > XML_SCHEMA_CACHE_SIZE:
+                cache.popitem(last=False)
+        return compiled
+
+    @staticmethod
+    def _validate_xml_chunks(items, schema, workers, chunk_size, from_files):
+        """
+        Private helper that validates documents or files in chunks, yielding each chunk's errors in order.
+        
+        At most two chunks per worker are in flight, so arbitrarily long iterables are
+        consumed lazily.
+        """
+        # Compile here first so an invalid schema fails fast, before any worker starts
+        compiled = Validator._compiled_xml_schema(schema) if schema else None
+        items = iter(items)
+        chunks = ((start, list(itertools.islice(items, chunk_size))) for start in itertools.count(0, chunk_size))
+        chunks = itertools.takewhile(lambda chunk: chunk[1], chunks)
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            for start, chunk in chunks:
+                yield _xml_chunk_errors(compiled, start, chunk, from_files)
+            return
+
+        # Each worker compiles the schema once, from its path or source, in the pool initializer
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_xml_worker, initargs=(schema,)) as pool:
+            pending = deque()
+            try:
+                for start, chunk in chunks:
+                    pending.append(pool.submit(_validate_xml_chunk, start, chunk, from_files))
+                    if len(pending) >= 2 * workers:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                # The caller may stop early (max_errors); do not validate the remaining chunks
+                for future in pending:
+                    future.cancel()
+
     @staticmethod
     def validate_datetime(date_str, date_format="%Y-%m-%d %H:%M:%S"):
         """
@@ -122,11 +757,47 @@ class Validator:
             ValidatorError: If the date string is not valid.
         """
         try:
-            datetime.strptime(date_str, date_format)
+            compile_parser(date_format)(date_str)
             return True
         except ValueError as e:
             raise ValidatorError(f"Date format validation failed: {e}")
 
+    @staticmethod
+    def validate_datetimes(values, date_format=None):
+        """
+        Validate a whole column of date strings against one format.
+        
+        The format is compiled once (or inferred from a sample of the values when not given),
+        and failures are collected instead of raising on the first one.
+        
+        Args:
+            values (list, numpy.ndarray or pandas.Series): Date strings to validate.
+            date_format (str, optional): The expected date format.
+        
+        Returns:
+            tuple: (mask, failures) as for validate_strings: a list of booleans, True for
+            valid values, and (index, reason) for each invalid value.
+        
+        Raises:
+            ValidatorError: If no format is given and none can be inferred.
+        """
+        values = values.tolist() if hasattr(values, 'tolist') else list(values)
+        if date_format is None:
+            date_format = infer_format(values[:100])
+            if date_format is None:
+                raise ValidatorError("Could not infer the date format from the sample.")
+        parse = compile_parser(date_format)
+        mask = []
+        failures = []
+        for index, value in enumerate(values):
+            try:
+                parse(value)
+                mask.append(True)
+            except (ValueError, TypeError) as e:
+                mask.append(False)
+                failures.append((index, f"Date format validation failed: {e}"))
+        return mask, failures
+
     @staticmethod
     def validate_type(value, expected_type):
         """
@@ -149,6 +820,7 @@ class Validator:
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     # Example usage
     try:
         print(Validator.validate_string("hello@example.com", pattern=r"^[\w\.-]+@[\w\.-]+\.\w+$"))
@@ -157,5 +829,5 @@ if __name__ == "__main__":
         print(Validator.validate_datetime("2024-09-27 12:00:00"))
         print(Validator.validate_type(123, int))
     except ValidatorError as e:
-        logging.error(f"Validation error: {e}")
+        logger.error(f"Validation error: {e}")
 
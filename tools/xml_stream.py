@@ -0,0 +1,281 @@
+import io
+import os
+import logging
+import xml.etree.ElementTree as ET
+
+logger = logging.getLogger(__name__)
+
+# Number of bytes (or characters) fed to the parser at a time
+CHUNK_SIZE = 1 << 16
+
+XML_NAMESPACE = 'http://www.w3.org/XML/1998/namespace'
+
+
+def _escape_text(text):
+    """
+    Escape character data the way ElementTree does.
+    """
+    if '&' in text:
+        text = text.replace('&', '&amp;')
+    if '<' in text:
+        text = text.replace('<', '&lt;')
+    if '>' in text:
+        text = text.replace('>', '&gt;')
+    return text
+
+
+def _escape_attribute(value):
+    """
+    Escape an attribute value the way ElementTree does.
+    """
+    value = _escape_text(value)
+    if '"' in value:
+        value = value.replace('"', '&quot;')
+    if '\r' in value:
+        value = value.replace('\r', '&#13;')
+    if '\n' in value:
+        value = value.replace('\n', '&#10;')
+    if '\t' in value:
+        value = value.replace('\t', '&#09;')
+    return value
+
+
+class _Frame:
+    """
+    An open element: whether its start tag has been written, and its most recent child.
+    """
+
+    __slots__ = ('element', 'namespaces', 'restore', 'opened', 'last_child')
+
+    def __init__(self, element, namespaces):
+        self.element = element
+        self.namespaces = namespaces
+        self.restore = []
+        self.opened = False
+        self.last_child = None
+
+
+class _IndentingWriter:
+    """
+    Writes indented XML from a sequence of start/end element events in a single pass.
+
+    The output matches ``ET.indent`` followed by ``ET.tostring``: whitespace-only text and
+    tails between elements are replaced by a newline and indentation, anything else is kept
+    as is. Nothing is written back to the elements. A start tag is only written once it is
+    known whether the element has children (at its first child or its end), and a tail only
+    once the next sibling or the parent's end has been seen, so the events can come straight
+    from an incremental parser.
+    """
+
+    def __init__(self, write, indent):
+        self.write = write
+        self.indent = indent
+        self.stack = []
+        # Namespace URI -> prefix currently in scope
+        self.prefixes = {XML_NAMESPACE: 'xml'}
+        self.generated = 0
+
+    def start(self, element, namespaces=()):
+        """
+        Begin an element. ``namespaces`` are the (prefix, uri) pairs it declares.
+        """
+        if self.stack:
+            parent = self.stack[-1]
+            level = len(self.stack)
+            if not parent.opened:
+                self._write_start_tag(parent, closed=False)
+                parent.opened = True
+                self._write_whitespace(parent.element.text, level)
+            else:
+                self._write_whitespace(parent.last_child.tail, level)
+        frame = _Frame(element, list(namespaces))
+        for prefix, uri in frame.namespaces:
+            self._declare(frame, prefix, uri)
+        self.stack.append(frame)
+
+    def end(self):
+        """
+        Finish the innermost open element.
+
+        Returns:
+            ET.Element: The finished element.
+        """
+        frame = self.stack[-1]
+        element = frame.element
+        if frame.opened:
+            self._write_whitespace(frame.last_child.tail, len(self.stack) - 1)
+            self.write(f"</{self._qualify(element.tag, frame, None)}>")
+        elif element.tag is ET.Comment:
+            self.write(f"<!--{element.text or ''}-->")
+        elif element.tag is ET.ProcessingInstruction:
+            self.write(f"<?{element.text or ''}?>")
+        elif element.text:
+            self._write_start_tag(frame, closed=False)
+            self.write(f"{_escape_text(element.text)}</{self._qualify(element.tag, frame, None)}>")
+        else:
+            self._write_start_tag(frame, closed=True)
+
+        for uri, previous in reversed(frame.restore):
+            if previous is None:
+                del self.prefixes[uri]
+            else:
+                self.prefixes[uri] = previous
+        self.stack.pop()
+        if self.stack:
+            self.stack[-1].last_child = element
+        return element
+
+    def _write_whitespace(self, text, level):
+        """
+        Private helper that writes text or a tail, replacing it with indentation if it is only whitespace.
+        """
+        if text and text.strip():
+            self.write(_escape_text(text))
+        else:
+            self.write('\n' + self.indent * level)
+
+    def _write_start_tag(self, frame, closed):
+        """
+        Private helper that writes an element's start tag, or its empty-element tag if ``closed``.
+        """
+        element = frame.element
+        declarations = []
+        tag = self._qualify(element.tag, frame, declarations)
+        attributes = [
+            f' {self._qualify(name, frame, declarations, attribute=True)}="{_escape_attribute(str(value))}"'
+            for name, value in element.attrib.items()
+        ]
+        namespaces = frame.namespaces + declarations
+        parts = [f"<{tag}"]
+        parts.extend(
+            f' xmlns:{prefix}="{_escape_attribute(uri)}"' if prefix else f' xmlns="{_escape_attribute(uri)}"'
+            for prefix, uri in namespaces
+        )
+        parts.extend(attributes)
+        parts.append(' />' if closed else '>')
+        self.write(''.join(parts))
+
+    def _qualify(self, name, frame, declarations, attribute=False):
+        """
+        Private helper that turns a '{uri}local' name into 'prefix:local'.
+
+        A namespace that is not in scope (or, for an attribute, is only in scope as the
+        default namespace) gets a prefix declared on ``frame``'s element.
+        """
+        if name[:1] != '{':
+            return name
+        uri, local = name[1:].split('}', 1)
+        prefix = self.prefixes.get(uri)
+        if prefix is None or (attribute and not prefix):
+            if declarations is None:
+                raise ValueError(f"Namespace '{uri}' is not declared.")
+            # ElementTree's registry of well-known prefixes (see ET.register_namespace)
+            prefix = ET._namespace_map.get(uri)
+            if not prefix or prefix in self.prefixes.values():
+                prefix = f"ns{self.generated}"
+                self.generated += 1
+            self._declare(frame, prefix, uri)
+            declarations.append((prefix, uri))
+        return f"{prefix}:{local}" if prefix else local
+
+    def _declare(self, frame, prefix, uri):
+        """
+        Private helper that brings a namespace prefix into scope until ``frame`` ends.
+        """
+        frame.restore.append((uri, self.prefixes.get(uri)))
+        self.prefixes[uri] = prefix
+
+
+def write_element(element, write, indent="  "):
+    """
+    Write an element tree as indented XML without modifying it.
+
+    The tree is walked iteratively, so very deep documents do not hit the recursion limit,
+    and every node is serialized exactly once.
+
+    Args:
+        element (ET.Element): The root element.
+        write (callable): Called with each piece of output text.
+        indent (str): The indentation string.
+    """
+    writer = _IndentingWriter(write, indent)
+    writer.start(element)
+    stack = [iter(element)]
+    while stack:
+        child = next(stack[-1], None)
+        if child is None:
+            stack.pop()
+            writer.end()
+        else:
+            writer.start(child)
+            stack.append(iter(child))
+
+
+def _open_source(source):
+    """
+    Return (stream, should_close) for a path or file object.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        return open(source, 'rb'), True
+    return source, False
+
+
+def format_xml_stream(source, write, indent="  ", chunk_size=CHUNK_SIZE):
+    """
+    Format an XML document incrementally, with memory bounded by the document depth.
+
+    The document is fed to an ``ET.XMLPullParser`` a chunk at a time. Each element is
+    written as soon as its events arrive and is then detached from its parent, so only
+    the chain of currently open elements is kept in memory. Original namespace prefixes
+    are preserved; comments and processing instructions are dropped, as in format_xml.
+
+    Args:
+        source (str or file): Path, or a binary or text file object, to read from.
+        write (callable): Called with each piece of output text.
+        indent (str): The indentation string.
+        chunk_size (int): Number of bytes (or characters) read at a time.
+
+    Returns:
+        int: The number of elements written.
+
+    Raises:
+        ET.ParseError: If the document is not well-formed.
+    """
+    stream, should_close = _open_source(source)
+    try:
+        parser = ET.XMLPullParser(events=('start', 'end', 'start-ns'))
+        writer = _IndentingWriter(write, indent)
+        namespaces = []
+        count = 0
+        while True:
+            data = stream.read(chunk_size)
+            if data:
+                parser.feed(data)
+            else:
+                parser.close()
+            for event, item in parser.read_events():
+                if event == 'start-ns':
+                    namespaces.append(item)
+                elif event == 'start':
+                    writer.start(item, namespaces)
+                    namespaces = []
+                else:
+                    element = writer.end()
+                    count += 1
+                    if writer.stack:
+                        # The finished element is still needed for its tail, but no longer
+                        # by its parent; earlier siblings are gone, so it is the first child
+                        writer.stack[-1].element.remove(element)
+            if not data:
+                return count
+    finally:
+        if should_close:
+            stream.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    # Example usage
+    output = io.StringIO()
+    format_xml_stream(io.BytesIO(b'<root><child name="test"/><child>text</child></root>'), output.write)
+    print(output.getvalue())